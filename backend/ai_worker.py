@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Worker da fila de análises de IA (ai_analysis_jobs) fora do processo da API.
+Com --enqueue-missing, enfileira antes as mãos sem análise de IA ou com a
+análise básica de debug gravada pelo upload antigo.
+
+Uso: python ai_worker.py [--workers 4] [--enqueue-missing] [--user-id 1] [--drain]
+(rodar a API com AI_WORKERS=0 quando os workers ficarem só aqui)
+"""
+
+import argparse
+import asyncio
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import or_
+
+from app.models.database import SessionLocal
+from app.models.hand import Hand
+from app.models.ai_analysis_job import AIAnalysisJob
+from app.services.ai_service import AIAnalysisService
+from app.services.ai_job_service import AIJobQueue, AIJobWorkerPool
+
+
+def enqueue_missing(queue: AIJobQueue, user_id: int = None, batch_size: int = 500) -> int:
+    db = SessionLocal()
+    total = 0
+    try:
+        last_id = 0
+        while True:
+            query = (
+                db.query(Hand)
+                .outerjoin(AIAnalysisJob, AIAnalysisJob.hand_id == Hand.id)
+                .filter(
+                    Hand.id > last_id,
+                    AIAnalysisJob.id.is_(None),
+                    or_(Hand.ai_analysis.is_(None), Hand.ai_analysis.like('%ANÁLISE BÁSICA%'))
+                )
+            )
+            if user_id:
+                query = query.filter(Hand.user_id == user_id)
+            hands = query.order_by(Hand.id).limit(batch_size).all()
+            if not hands:
+                break
+            total += queue.enqueue(db, hands)
+            db.commit()
+            last_id = hands[-1].id
+    finally:
+        db.close()
+    return total
+
+
+async def run(workers: int, drain: bool):
+    ai_service = AIAnalysisService()
+    pool = AIJobWorkerPool(ai_service, workers=workers)
+    try:
+        if drain:
+            processed = await pool.drain()
+            print(f"✅ {processed} jobs processados")
+        else:
+            pool.start()
+            await pool.join()
+    finally:
+        await pool.stop()
+        await ai_service.aclose()
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Processa a fila de análises de IA")
+    arg_parser.add_argument("--workers", type=int, default=int(os.getenv("AI_WORKERS", "4")))
+    arg_parser.add_argument("--enqueue-missing", action="store_true")
+    arg_parser.add_argument("--user-id", type=int)
+    arg_parser.add_argument("--drain", action="store_true", help="Sai quando a fila esvaziar")
+    args = arg_parser.parse_args()
+
+    print("🤖 Worker de análises de IA")
+    print("=" * 50)
+    if args.enqueue_missing:
+        print(f"📥 {enqueue_missing(AIJobQueue(), args.user_id)} mãos enfileiradas")
+    try:
+        asyncio.run(run(args.workers, args.drain))
+    except KeyboardInterrupt:
+        print("🛑 Worker interrompido")
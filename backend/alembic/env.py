@@ -26,7 +26,7 @@ if config.config_file_name is not None:
 # add your model's MetaData object here
 # for 'autogenerate' support
 from app.models.database import Base
-from app.models import user, hand, gap, tournament, coach, subscription
+from app.models import user, hand, gap, tournament, coach, subscription, hud_stats, opponent_profile, hero_decision, ai_analysis_job
 target_metadata = Base.metadata
 
 # other values from the config, defined by the needs of env.py,
@@ -0,0 +1,59 @@
+"""Add opponent_profiles table and hand_actions.player_name index
+
+Revision ID: 2d6a8f4c7b31
+Revises: 5b7f3a9c8e12
+Create Date: 2026-10-19 12:31:44.508120
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2d6a8f4c7b31'
+down_revision: Union[str, None] = '5b7f3a9c8e12'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+COUNTER_COLUMNS = (
+    'hands', 'vpip', 'pfr', 'three_bet', 'three_bet_opportunities', 'postflop_aggressive',
+    'postflop_calls', 'saw_flop', 'went_to_showdown', 'cbet', 'cbet_opportunities',
+)
+
+
+def _has_player_index() -> bool:
+    # Bancos criados pelos scripts SQL (003_add_hand_actions_table.sql) já têm o índice
+    indexes = sa.inspect(op.get_bind()).get_indexes('hand_actions')
+    return any(index['name'] == 'idx_hand_actions_player' for index in indexes)
+
+
+def upgrade() -> None:
+    op.create_table('opponent_profiles',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(length=50), nullable=False),
+        sa.Column('name_lower', sa.String(length=50), nullable=False),
+        *[sa.Column(name, sa.Integer(), nullable=False, server_default='0') for name in COUNTER_COLUMNS],
+        sa.Column('showdown_hands', sa.Text(), nullable=True),
+        sa.Column('last_seen', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('user_id', 'name', name='uq_opponent_profiles_user_name')
+    )
+    op.create_index(op.f('ix_opponent_profiles_id'), 'opponent_profiles', ['id'], unique=False)
+    op.create_index('ix_opponent_profiles_user_name_lower', 'opponent_profiles', ['user_id', 'name_lower'], unique=False)
+    if not _has_player_index():
+        op.create_index('idx_hand_actions_player', 'hand_actions', ['player_name'], unique=False)
+
+
+def downgrade() -> None:
+    # A revisão anterior não tem o índice: sai junto, tenha vindo do upgrade ou dos scripts SQL
+    if _has_player_index():
+        op.drop_index('idx_hand_actions_player', table_name='hand_actions')
+    op.drop_index('ix_opponent_profiles_user_name_lower', table_name='opponent_profiles')
+    op.drop_index(op.f('ix_opponent_profiles_id'), table_name='opponent_profiles')
+    op.drop_table('opponent_profiles')
@@ -0,0 +1,29 @@
+"""Add push/fold chart flags to hands
+
+Revision ID: 3c9d2e7a1f45
+Revises: fa1b55396e73
+Create Date: 2026-10-19 10:12:41.518204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c9d2e7a1f45'
+down_revision: Union[str, None] = 'fa1b55396e73'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Classificação da decisão do herói contra as tabelas de push/fold
+    op.add_column('hands', sa.Column('push_fold_spot', sa.String(length=20), nullable=True))
+    op.add_column('hands', sa.Column('push_fold_in_chart', sa.Boolean(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('hands', 'push_fold_in_chart')
+    op.drop_column('hands', 'push_fold_spot')
@@ -0,0 +1,49 @@
+"""Add ai_analysis_jobs table (background AI analysis queue)
+
+Revision ID: 3f8d2c6a1b47
+Revises: e5b2d7a9c413
+Create Date: 2026-10-19 16:05:12.418307
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f8d2c6a1b47'
+down_revision: Union[str, None] = 'e5b2d7a9c413'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('ai_analysis_jobs',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('hand_id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('status', sa.String(length=10), nullable=False, server_default='pending'),
+        sa.Column('priority', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('attempts', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('available_at', sa.DateTime(), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+        sa.Column('leased_until', sa.DateTime(), nullable=True),
+        sa.Column('locked_by', sa.String(length=50), nullable=True),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['hand_id'], ['hands.id'], ),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('hand_id')
+    )
+    op.create_index(op.f('ix_ai_analysis_jobs_id'), 'ai_analysis_jobs', ['id'], unique=False)
+    op.create_index(op.f('ix_ai_analysis_jobs_user_id'), 'ai_analysis_jobs', ['user_id'], unique=False)
+    op.create_index('ix_ai_analysis_jobs_queue', 'ai_analysis_jobs', ['status', 'priority', 'available_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_ai_analysis_jobs_queue', table_name='ai_analysis_jobs')
+    op.drop_index(op.f('ix_ai_analysis_jobs_user_id'), table_name='ai_analysis_jobs')
+    op.drop_index(op.f('ix_ai_analysis_jobs_id'), table_name='ai_analysis_jobs')
+    op.drop_table('ai_analysis_jobs')
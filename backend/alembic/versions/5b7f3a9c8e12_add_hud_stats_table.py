@@ -0,0 +1,43 @@
+"""Add hud_stats table
+
+Revision ID: 5b7f3a9c8e12
+Revises: 8e41b6c0d2a9
+Create Date: 2026-10-19 11:48:05.227391
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b7f3a9c8e12'
+down_revision: Union[str, None] = '8e41b6c0d2a9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+COUNTER_COLUMNS = (
+    'hands', 'vpip', 'pfr', 'three_bet', 'three_bet_opportunities', 'postflop_aggressive',
+    'postflop_calls', 'saw_flop', 'went_to_showdown', 'cbet', 'cbet_opportunities',
+)
+
+
+def upgrade() -> None:
+    op.create_table('hud_stats',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('position', sa.String(length=10), nullable=False),
+        *[sa.Column(name, sa.Integer(), nullable=False, server_default='0') for name in COUNTER_COLUMNS],
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('user_id', 'position', name='uq_hud_stats_user_position')
+    )
+    op.create_index(op.f('ix_hud_stats_id'), 'hud_stats', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_hud_stats_id'), table_name='hud_stats')
+    op.drop_table('hud_stats')
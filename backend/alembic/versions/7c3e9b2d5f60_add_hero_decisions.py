@@ -0,0 +1,58 @@
+"""Add hero_decisions table
+
+Revision ID: 7c3e9b2d5f60
+Revises: 2d6a8f4c7b31
+Create Date: 2026-10-19 13:15:22.914307
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c3e9b2d5f60'
+down_revision: Union[str, None] = '2d6a8f4c7b31'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('hero_decisions',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('hand_id', sa.Integer(), nullable=False),
+        sa.Column('decision_order', sa.SmallInteger(), nullable=False),
+        sa.Column('street', sa.SmallInteger(), nullable=False),
+        sa.Column('position', sa.SmallInteger(), nullable=False),
+        sa.Column('stack_bb10', sa.SmallInteger(), nullable=False),
+        sa.Column('pot_bb10', sa.SmallInteger(), nullable=False),
+        sa.Column('to_call_bb10', sa.SmallInteger(), nullable=False),
+        sa.Column('players', sa.SmallInteger(), nullable=False),
+        sa.Column('facing', sa.SmallInteger(), nullable=False),
+        sa.Column('aggressor_position', sa.SmallInteger(), nullable=True),
+        sa.Column('action', sa.SmallInteger(), nullable=False),
+        sa.Column('amount_bb10', sa.SmallInteger(), nullable=False, server_default='0'),
+        sa.Column('is_all_in', sa.Boolean(), nullable=False, server_default=sa.false()),
+        sa.Column('hand_class', sa.SmallInteger(), nullable=True),
+        sa.Column('board_texture', sa.SmallInteger(), nullable=False, server_default='0'),
+        sa.ForeignKeyConstraint(['hand_id'], ['hands.id'], ),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_hero_decisions_id'), 'hero_decisions', ['id'], unique=False)
+    op.create_index(op.f('ix_hero_decisions_hand_id'), 'hero_decisions', ['hand_id'], unique=False)
+    op.create_index('ix_hero_decisions_spot', 'hero_decisions',
+                    ['user_id', 'street', 'position', 'facing', 'aggressor_position', 'stack_bb10'], unique=False)
+    op.create_index('ix_hero_decisions_texture', 'hero_decisions', ['user_id', 'street', 'board_texture'], unique=False)
+    op.create_index('ix_hero_decisions_hand_class', 'hero_decisions', ['user_id', 'hand_class'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_hero_decisions_hand_class', table_name='hero_decisions')
+    op.drop_index('ix_hero_decisions_texture', table_name='hero_decisions')
+    op.drop_index('ix_hero_decisions_spot', table_name='hero_decisions')
+    op.drop_index(op.f('ix_hero_decisions_hand_id'), table_name='hero_decisions')
+    op.drop_index(op.f('ix_hero_decisions_id'), table_name='hero_decisions')
+    op.drop_table('hero_decisions')
@@ -0,0 +1,36 @@
+"""Add local analysis verdict columns and hero_stack to hands
+
+Revision ID: 8b1e4d7f2a95
+Revises: 3f8d2c6a1b47
+Create Date: 2026-10-19 17:12:40.905113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8b1e4d7f2a95'
+down_revision: Union[str, None] = '3f8d2c6a1b47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('hands', sa.Column('hero_stack', sa.Float(), nullable=True))
+    op.add_column('hands', sa.Column('local_stack_code', sa.SmallInteger(), nullable=True))
+    op.add_column('hands', sa.Column('local_position_code', sa.SmallInteger(), nullable=True))
+    op.add_column('hands', sa.Column('local_strength_code', sa.SmallInteger(), nullable=True))
+    op.add_column('hands', sa.Column('local_decision_code', sa.SmallInteger(), nullable=True))
+    op.add_column('hands', sa.Column('local_params', sa.Text(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('hands', 'local_params')
+    op.drop_column('hands', 'local_decision_code')
+    op.drop_column('hands', 'local_strength_code')
+    op.drop_column('hands', 'local_position_code')
+    op.drop_column('hands', 'local_stack_code')
+    op.drop_column('hands', 'hero_stack')
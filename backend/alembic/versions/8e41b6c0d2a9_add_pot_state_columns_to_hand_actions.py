@@ -0,0 +1,37 @@
+"""Add pot state columns to hand_actions
+
+Revision ID: 8e41b6c0d2a9
+Revises: 3c9d2e7a1f45
+Create Date: 2026-10-19 11:02:17.340615
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8e41b6c0d2a9'
+down_revision: Union[str, None] = '3c9d2e7a1f45'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Estado da mesa antes de cada ação (preenchido no upload e por backfill_action_pots.py)
+    op.add_column('hand_actions', sa.Column('pot_before', sa.Float(), nullable=True))
+    op.add_column('hand_actions', sa.Column('to_call', sa.Float(), nullable=True))
+    op.add_column('hand_actions', sa.Column('effective_stack', sa.Float(), nullable=True))
+    op.add_column('hand_actions', sa.Column('spr', sa.Float(), nullable=True))
+    op.add_column('hand_actions', sa.Column('is_all_in', sa.Boolean(), nullable=True))
+    op.add_column('hand_actions', sa.Column('side_pots', sa.Text(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('hand_actions', 'side_pots')
+    op.drop_column('hand_actions', 'is_all_in')
+    op.drop_column('hand_actions', 'spr')
+    op.drop_column('hand_actions', 'effective_stack')
+    op.drop_column('hand_actions', 'to_call')
+    op.drop_column('hand_actions', 'pot_before')
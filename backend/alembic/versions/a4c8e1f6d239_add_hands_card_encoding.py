@@ -0,0 +1,39 @@
+"""Add encoded card columns to hands
+
+Revision ID: a4c8e1f6d239
+Revises: e3f7a2c9b518
+Create Date: 2026-10-19 22:04:51.639027
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4c8e1f6d239'
+down_revision: Union[str, None] = 'e3f7a2c9b518'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Mãos já gravadas são preenchidas por encode_hand_cards.py
+    op.add_column('hands', sa.Column('hero_class', sa.SmallInteger(), nullable=True))
+    op.add_column('hands', sa.Column('hero_suited', sa.Boolean(), nullable=True))
+    op.add_column('hands', sa.Column('hero_mask', sa.BigInteger(), nullable=True))
+    op.add_column('hands', sa.Column('board_mask', sa.BigInteger(), nullable=True))
+    op.add_column('hands', sa.Column('flop_texture', sa.SmallInteger(), nullable=True))
+    op.create_index('ix_hands_user_hero_class', 'hands', ['user_id', 'hero_class'], unique=False)
+    op.create_index('ix_hands_user_flop_texture', 'hands', ['user_id', 'flop_texture'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_hands_user_flop_texture', table_name='hands')
+    op.drop_index('ix_hands_user_hero_class', table_name='hands')
+    op.drop_column('hands', 'flop_texture')
+    op.drop_column('hands', 'board_mask')
+    op.drop_column('hands', 'hero_mask')
+    op.drop_column('hands', 'hero_suited')
+    op.drop_column('hands', 'hero_class')
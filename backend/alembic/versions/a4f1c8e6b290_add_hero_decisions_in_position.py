@@ -0,0 +1,26 @@
+"""Add hero_decisions.in_position
+
+Revision ID: a4f1c8e6b290
+Revises: 7c3e9b2d5f60
+Create Date: 2026-10-19 13:52:10.301846
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4f1c8e6b290'
+down_revision: Union[str, None] = '7c3e9b2d5f60'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('hero_decisions', sa.Column('in_position', sa.Boolean(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('hero_decisions', 'in_position')
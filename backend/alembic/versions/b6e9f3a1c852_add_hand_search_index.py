@@ -0,0 +1,73 @@
+"""Add full-text search index over hand analyses
+
+Revision ID: b6e9f3a1c852
+Revises: f4b1d8c3a627
+Create Date: 2026-10-19 20:34:47.559013
+
+"""
+import sqlite3
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b6e9f3a1c852'
+down_revision: Union[str, None] = 'f4b1d8c3a627'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Preenchido por rebuild_search_index.py; depois mantido pela aplicação
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        contentless = "content='', contentless_delete=1, " if sqlite3.sqlite_version_info >= (3, 43, 0) else ""
+        op.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS hand_search USING fts5(document, owner, {contentless}"
+            "tokenize='unicode61 remove_diacritics 2')"
+        )
+    elif dialect == 'postgresql':
+        op.create_table('hand_search',
+            sa.Column('hand_id', sa.Integer(), nullable=False),
+            sa.Column('user_id', sa.Integer(), nullable=False),
+            sa.Column('search_vector', postgresql.TSVECTOR(), nullable=False),
+            sa.ForeignKeyConstraint(['hand_id'], ['hands.id'], ondelete='CASCADE'),
+            sa.PrimaryKeyConstraint('hand_id')
+        )
+        op.create_index('ix_hand_search_vector', 'hand_search', ['search_vector'], postgresql_using='gin')
+        op.create_index('ix_hand_search_user_id', 'hand_search', ['user_id'])
+    elif dialect == 'mssql':
+        op.create_table('hand_search',
+            sa.Column('hand_id', sa.Integer(), nullable=False),
+            sa.Column('user_id', sa.Integer(), nullable=False),
+            sa.Column('document', sa.UnicodeText(), nullable=True),
+            sa.ForeignKeyConstraint(['hand_id'], ['hands.id'], ondelete='CASCADE'),
+            sa.PrimaryKeyConstraint('hand_id', name='pk_hand_search')
+        )
+        op.create_index('ix_hand_search_user_id', 'hand_search', ['user_id'])
+        # DDL de full-text não roda dentro de transação
+        with op.get_context().autocommit_block():
+            op.execute("CREATE FULLTEXT CATALOG hand_search_catalog")
+            op.execute(
+                "CREATE FULLTEXT INDEX ON hand_search(document) KEY INDEX pk_hand_search "
+                "ON hand_search_catalog WITH CHANGE_TRACKING AUTO"
+            )
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        op.execute("DROP TABLE IF EXISTS hand_search")
+    elif dialect == 'postgresql':
+        op.drop_index('ix_hand_search_user_id', table_name='hand_search')
+        op.drop_index('ix_hand_search_vector', table_name='hand_search')
+        op.drop_table('hand_search')
+    elif dialect == 'mssql':
+        with op.get_context().autocommit_block():
+            op.execute("DROP FULLTEXT INDEX ON hand_search")
+            op.execute("DROP FULLTEXT CATALOG hand_search_catalog")
+        op.drop_index('ix_hand_search_user_id', table_name='hand_search')
+        op.drop_table('hand_search')
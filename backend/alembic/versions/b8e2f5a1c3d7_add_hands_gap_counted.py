@@ -0,0 +1,41 @@
+"""Replace gap_watermarks with a gap_counted flag per hand
+
+Revision ID: b8e2f5a1c3d7
+Revises: a4c8e1f6d239
+Create Date: 2026-10-19 23:41:12.518204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8e2f5a1c3d7'
+down_revision: Union[str, None] = 'a4c8e1f6d239'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('hands', sa.Column('gap_counted', sa.Boolean(), nullable=False, server_default=sa.text('0')))
+    op.create_index('ix_hands_user_gap_counted', 'hands', ['user_id', 'gap_counted'], unique=False)
+    # O watermark pode ter pulado mãos (decisões do backfill, uploads concorrentes):
+    # os contadores são zerados e refeitos a partir das mãos na próxima análise
+    op.execute(sa.table('gap_daily_counts').delete())
+    op.drop_table('gap_watermarks')
+
+
+def downgrade() -> None:
+    op.create_table('gap_watermarks',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('last_hand_id', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('user_id')
+    )
+    # Watermarks vazios: a análise recomeça da primeira mão
+    op.execute(sa.table('gap_daily_counts').delete())
+    op.drop_index('ix_hands_user_gap_counted', table_name='hands')
+    op.drop_column('hands', 'gap_counted')
@@ -0,0 +1,29 @@
+"""Remove uncalled bet refunds saved as hand actions
+
+Revision ID: c5d9a2e7f481
+Revises: b8e2f5a1c3d7
+Create Date: 2026-10-19 23:58:40.117305
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5d9a2e7f481'
+down_revision: Union[str, None] = 'b8e2f5a1c3d7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # A devolução fica só na reconstrução do pote; como ação, o replay somava o valor ao pote
+    hand_actions = sa.table('hand_actions', sa.column('action_type', sa.String))
+    op.execute(hand_actions.delete().where(hand_actions.c.action_type == 'uncalled_bet'))
+
+
+def downgrade() -> None:
+    # As linhas removidas não são recriadas: o pote das demais ações já considera a devolução
+    pass
@@ -0,0 +1,26 @@
+"""Add (user_id, date_played) index to tournaments
+
+Revision ID: c7d3a9e1f054
+Revises: 8b1e4d7f2a95
+Create Date: 2026-10-19 18:03:11.472931
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7d3a9e1f054'
+down_revision: Union[str, None] = '8b1e4d7f2a95'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_tournaments_user_date', 'tournaments', ['user_id', 'date_played'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_tournaments_user_date', table_name='tournaments')
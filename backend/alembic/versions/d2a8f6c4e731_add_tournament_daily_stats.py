@@ -0,0 +1,45 @@
+"""Add tournament_daily_stats table
+
+Revision ID: d2a8f6c4e731
+Revises: c7d3a9e1f054
+Create Date: 2026-10-19 18:41:52.318604
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2a8f6c4e731'
+down_revision: Union[str, None] = 'c7d3a9e1f054'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('tournament_daily_stats',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('tournaments_played', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('total_buy_ins', sa.Float(), nullable=False, server_default='0'),
+        sa.Column('total_prizes', sa.Float(), nullable=False, server_default='0'),
+        sa.Column('itm_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('finish_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('finish_sum', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('best_finish', sa.Integer(), nullable=True),
+        sa.Column('worst_finish', sa.Integer(), nullable=True),
+        sa.Column('biggest_win', sa.Float(), nullable=False, server_default='0'),
+        sa.Column('biggest_loss', sa.Float(), nullable=False, server_default='0'),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('user_id', 'day', name='uq_tournament_daily_stats_user_day')
+    )
+    op.create_index(op.f('ix_tournament_daily_stats_id'), 'tournament_daily_stats', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_tournament_daily_stats_id'), table_name='tournament_daily_stats')
+    op.drop_table('tournament_daily_stats')
@@ -0,0 +1,28 @@
+"""Add keyset pagination indexes to hands
+
+Revision ID: e3f7a2c9b518
+Revises: b6e9f3a1c852
+Create Date: 2026-10-19 21:12:40.218734
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e3f7a2c9b518'
+down_revision: Union[str, None] = 'b6e9f3a1c852'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_hands_user_date_played', 'hands', ['user_id', 'date_played', 'id'], unique=False)
+    op.create_index('ix_hands_user_created_at', 'hands', ['user_id', 'created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_hands_user_created_at', table_name='hands')
+    op.drop_index('ix_hands_user_date_played', table_name='hands')
@@ -0,0 +1,47 @@
+"""Add gap_daily_counts and gap_watermarks tables
+
+Revision ID: e5b2d7a9c413
+Revises: a4f1c8e6b290
+Create Date: 2026-10-19 14:27:36.882145
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5b2d7a9c413'
+down_revision: Union[str, None] = 'a4f1c8e6b290'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('gap_daily_counts',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('gap_type', sa.String(length=50), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('opportunities', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('sample_hands', sa.Text(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('user_id', 'gap_type', 'day', name='uq_gap_daily_counts_user_type_day')
+    )
+    op.create_index(op.f('ix_gap_daily_counts_id'), 'gap_daily_counts', ['id'], unique=False)
+    op.create_table('gap_watermarks',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('last_hand_id', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('user_id')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('gap_watermarks')
+    op.drop_index(op.f('ix_gap_daily_counts_id'), table_name='gap_daily_counts')
+    op.drop_table('gap_daily_counts')
@@ -0,0 +1,45 @@
+"""Add has_gap/has_error flags to hands
+
+Revision ID: f4b1d8c3a627
+Revises: a9c5e2b7d186
+Create Date: 2026-10-19 19:58:23.106447
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f4b1d8c3a627'
+down_revision: Union[str, None] = 'a9c5e2b7d186'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('hands', sa.Column('has_gap', sa.Boolean(), nullable=True))
+    op.add_column('hands', sa.Column('has_error', sa.Boolean(), nullable=True))
+
+    # Backfill com as mesmas palavras de app/utils/analysis_flags.py
+    hands = sa.table('hands', sa.column('ai_analysis', sa.Text), sa.column('has_gap', sa.Boolean),
+                     sa.column('has_error', sa.Boolean))
+    text = sa.func.lower(hands.c.ai_analysis)
+    op.execute(
+        hands.update().where(hands.c.ai_analysis.isnot(None)).values(
+            has_gap=sa.case((text.like('%gap%'), sa.true()), else_=sa.false()),
+            has_error=sa.case((sa.or_(text.like('%erro%'), text.like('%error%'), text.like('%mistake%')), sa.true()),
+                              else_=sa.false()),
+        )
+    )
+
+    op.create_index('ix_hands_user_has_gap', 'hands', ['user_id', 'has_gap'], unique=False)
+    op.create_index('ix_hands_user_has_error', 'hands', ['user_id', 'has_error'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_hands_user_has_error', table_name='hands')
+    op.drop_index('ix_hands_user_has_gap', table_name='hands')
+    op.drop_column('hands', 'has_error')
+    op.drop_column('hands', 'has_gap')
@@ -10,15 +10,16 @@ current_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 if current_dir not in sys.path:
     sys.path.insert(0, current_dir)
 
-from app.routers import auth, hands, upload_progress, users, gaps, performance, coaching
+from app.routers import auth, hands, upload_progress, users, gaps, performance, coaching, opponents
 from app.routers import subscription as subscription_router
 from app.models.database import engine, Base
+from app.services.push_fold_service import load_push_fold_tables
 
 # Carregar variáveis de ambiente
 load_dotenv()
 
 # Importar todos os modelos para criação das tabelas
-from app.models import user, hand, hand_action, gap, tournament, coach
+from app.models import user, hand, hand_action, gap, tournament, coach, hud_stats, opponent_profile, hero_decision, ai_analysis_job
 from app.models import subscription as subscription_model
 
 # Criar tabelas do banco de dados (comentado temporariamente para desenvolvimento)
@@ -37,6 +38,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],  # Cursor da paginação do histórico de mãos
 )
 
 # Criar diretório para uploads se não existir
@@ -50,8 +52,26 @@ app.include_router(upload_progress.router, prefix="/api/upload", tags=["upload"]
 app.include_router(gaps.router, prefix="/api/gaps", tags=["gaps"])
 app.include_router(performance.router, prefix="/api/performance", tags=["performance"])
 app.include_router(coaching.router, prefix="/api/coaching", tags=["coaching"])
+app.include_router(opponents.router, prefix="/api/opponents", tags=["opponents"])
 app.include_router(subscription_router.router, prefix="/api/subscription", tags=["subscription"])
 
+@app.on_event("startup")
+async def load_precomputed_tables():
+    """Carrega as tabelas de push/fold em memória mapeada antes das primeiras requisições"""
+    if load_push_fold_tables() is not None:
+        print("✅ Tabelas de push/fold carregadas")
+
+@app.on_event("startup")
+async def start_ai_workers():
+    """Workers da fila de análises de IA (AI_WORKERS=0 desliga, ex.: worker em processo separado)"""
+    hands.ai_worker_pool.start()
+
+@app.on_event("shutdown")
+async def close_ai_clients():
+    """Para os workers de IA e fecha as conexões keep-alive do cliente compartilhado"""
+    await hands.ai_worker_pool.stop()
+    await hands.ai_service.aclose()
+
 @app.get("/")
 async def root():
     return {"message": "GapHunter API - Análise Técnica de Poker"}
@@ -1,16 +1,27 @@
 # Importações de modelos para resolver referências circulares
 from .user import User
 from .hand import Hand
-from .tournament import Tournament
+from .tournament import Tournament, TournamentDailyStats, PerformanceDataVersion
 from .hand_action import HandAction
 from .coach import Coach
-from .gap import Gap
+from .gap import Gap, GapDailyCount
+from .hud_stats import HudStats
+from .opponent_profile import OpponentProfile
+from .hero_decision import HeroDecision
+from .ai_analysis_job import AIAnalysisJob
 
 __all__ = [
     "User",
     "Hand", 
     "Tournament",
+    "TournamentDailyStats",
+    "PerformanceDataVersion",
     "HandAction",
     "Coach",
-    "Gap"
+    "Gap",
+    "GapDailyCount",
+    "HudStats",
+    "OpponentProfile",
+    "HeroDecision",
+    "AIAnalysisJob"
 ]
@@ -0,0 +1,31 @@
+from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, Index
+from sqlalchemy.sql import func
+from sqlalchemy.orm import relationship
+from app.models.database import Base
+
+class AIAnalysisJob(Base):
+    """
+    Job da fila de análise de IA (um por mão).
+    Workers arrendam o job (status 'running' + leased_until); um lease vencido
+    volta a ser elegível, então um worker que morreu não prende a mão.
+    """
+    __tablename__ = "ai_analysis_jobs"
+    __table_args__ = (
+        # Próximo job: pendentes por prioridade e disponibilidade
+        Index("ix_ai_analysis_jobs_queue", "status", "priority", "available_at"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    hand_id = Column(Integer, ForeignKey("hands.id"), nullable=False, unique=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    status = Column(String(10), nullable=False, default="pending")  # pending, running, done, failed
+    priority = Column(Integer, nullable=False, default=0)  # Maior = antes (mão aberta pelo usuário)
+    attempts = Column(Integer, nullable=False, default=0)
+    available_at = Column(DateTime, nullable=False, server_default=func.now())  # Backoff entre tentativas
+    leased_until = Column(DateTime)
+    locked_by = Column(String(50))
+    last_error = Column(Text)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    finished_at = Column(DateTime)
+
+    hand = relationship("Hand", back_populates="ai_job")
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, Float
+from sqlalchemy import Column, Integer, String, DateTime, Date, Text, ForeignKey, Float, UniqueConstraint
 from sqlalchemy.sql import func
 from app.models.database import Base
 
@@ -19,3 +19,19 @@ class Gap(Base):
     # Será reativado após correção dos relacionamentos
     # user = relationship("User", back_populates="gaps")
 
+
+
+class GapDailyCount(Base):
+    """Contadores diários por regra de gap (somados de forma incremental)"""
+    __tablename__ = "gap_daily_counts"
+    __table_args__ = (
+        UniqueConstraint("user_id", "gap_type", "day", name="uq_gap_daily_counts_user_type_day"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    gap_type = Column(String(50), nullable=False)  # Nome da regra ou 'hands_analyzed'
+    day = Column(Date, nullable=False)  # Dia de upload das mãos (Hand.created_at)
+    opportunities = Column(Integer, nullable=False, default=0)
+    count = Column(Integer, nullable=False, default=0)
+    sample_hands = Column(Text)  # JSON: ids das mãos mais recentes com o leak
@@ -1,10 +1,26 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, Float, BigInteger
+from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, Float, BigInteger, Boolean, SmallInteger, Index
 from sqlalchemy.sql import func
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, validates
 from app.models.database import Base
+from app.utils.analysis_flags import classify_analysis
+from app.utils.card_encoding import board_card_columns, hero_card_columns
+from app.utils.local_verdicts import render_local_analysis
 
 class Hand(Base):
     __tablename__ = "hands"
+    __table_args__ = (
+        # Filtros de gap/erro das listagens e contagens
+        Index("ix_hands_user_has_gap", "user_id", "has_gap"),
+        Index("ix_hands_user_has_error", "user_id", "has_error"),
+        # Paginação por cursor do histórico: (data, id) dentro das mãos do usuário
+        Index("ix_hands_user_date_played", "user_id", "date_played", "id"),
+        Index("ix_hands_user_created_at", "user_id", "created_at", "id"),
+        # Filtros por cartas: classe da mão do herói e textura do flop
+        Index("ix_hands_user_hero_class", "user_id", "hero_class"),
+        Index("ix_hands_user_flop_texture", "user_id", "flop_texture"),
+        # Mãos ainda fora dos contadores diários de gaps
+        Index("ix_hands_user_gap_counted", "user_id", "gap_counted"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -22,13 +38,76 @@ class Hand(Base):
     pot_size = Column(Float)
     bet_amount = Column(Float)
     board_cards = Column(String(20))
+    hero_stack = Column(Float)
+    # Cartas codificadas (app/utils/card_encoding.py), gravadas junto com hero_cards/board_cards
+    hero_class = Column(SmallInteger)  # Classe pré-flop 0-168
+    hero_suited = Column(Boolean)
+    hero_mask = Column(BigInteger)  # Máscara de 52 bits das cartas do herói
+    board_mask = Column(BigInteger)
+    flop_texture = Column(SmallInteger)  # Código de app/utils/board_texture.py (0 = sem flop)
     raw_hand = Column(Text)  # Texto original da mão
-    local_analysis = Column(Text) # Análise local da mão
+    local_analysis_text = Column("local_analysis", Text)  # Texto da análise local (mãos anteriores aos códigos)
+    # Análise local em códigos (app/utils/local_verdicts.py); o texto é montado na leitura
+    local_stack_code = Column(SmallInteger)
+    local_position_code = Column(SmallInteger)
+    local_strength_code = Column(SmallInteger)
+    local_decision_code = Column(SmallInteger)
+    local_params = Column(Text)  # JSON só em spots de push/fold e ICM
     ai_analysis = Column(Text)  # Análise da IA
+    # Classificação da análise (app/utils/analysis_flags.py); None enquanto não há análise
+    has_gap = Column(Boolean)
+    has_error = Column(Boolean)
+    push_fold_spot = Column(String(20))  # open_shove / call_vs_shove (None = fora de push/fold)
+    push_fold_in_chart = Column(Boolean)  # Decisão do herói dentro da tabela de push/fold
+    gap_counted = Column(Boolean, nullable=False, default=False, server_default='0')  # Já somada em gap_daily_counts
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     # Relacionamentos
     user = relationship("User")
     tournament = relationship("Tournament", back_populates="hands")
     actions = relationship("HandAction", back_populates="hand", cascade="all, delete-orphan")
+    decisions = relationship("HeroDecision", back_populates="hand", cascade="all, delete-orphan")
+    ai_job = relationship("AIAnalysisJob", back_populates="hand", uselist=False, lazy="selectin",
+                          cascade="all, delete-orphan")
+
+    @validates("hero_cards")
+    def _encode_hero_cards(self, key, hero_cards):
+        for column, value in hero_card_columns(hero_cards).items():
+            setattr(self, column, value)
+        return hero_cards
+
+    @validates("board_cards")
+    def _encode_board_cards(self, key, board_cards):
+        for column, value in board_card_columns(board_cards).items():
+            setattr(self, column, value)
+        return board_cards
+
+    @validates("ai_analysis")
+    def _classify_ai_analysis(self, key, analysis):
+        """Gap/erro calculados uma vez, quando a análise é gravada"""
+        self.has_gap, self.has_error = classify_analysis(analysis)
+        return analysis
+
+    @property
+    def local_analysis(self):
+        """Análise local legível: texto gravado (legado) ou montado a partir dos códigos"""
+        if self.local_analysis_text or self.local_decision_code is None:
+            return self.local_analysis_text
+        return render_local_analysis(
+            self.hero_position,
+            self.hero_cards,
+            self.hero_action,
+            self.hero_stack,
+            self.pot_size,
+            self.local_stack_code or 0,
+            self.local_position_code or 0,
+            self.local_strength_code or 0,
+            self.local_decision_code,
+            self.local_params
+        )
+
+    @property
+    def ai_status(self):
+        """Status da análise de IA em background (None = mão anterior à fila)"""
+        return self.ai_job.status if self.ai_job else None
 
@@ -1,10 +1,15 @@
-from sqlalchemy import Column, Integer, String, DateTime, Float, ForeignKey, Text
+import json
+
+from sqlalchemy import Column, Integer, String, DateTime, Float, ForeignKey, Text, Boolean, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.models.database import Base
 
 class HandAction(Base):
     __tablename__ = "hand_actions"
+    __table_args__ = (
+        Index("idx_hand_actions_player", "player_name"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     hand_id = Column(Integer, ForeignKey("hands.id"), nullable=False)
@@ -15,6 +20,14 @@ class HandAction(Base):
     total_bet = Column(Float, default=0.0)
     timestamp = Column(DateTime(timezone=True), server_default=func.now())
     action_order = Column(Integer, nullable=False)  # Ordem da ação na street
+
+    # Estado da mesa antes da ação (reconstrução do pote)
+    pot_before = Column(Float)
+    to_call = Column(Float)
+    effective_stack = Column(Float)
+    spr = Column(Float)
+    is_all_in = Column(Boolean, default=False)
+    side_pots = Column(Text)  # JSON: [{"amount": ..., "eligible": [...]}]
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     # Relacionamento com a tabela hands
@@ -49,5 +62,11 @@ class HandAction(Base):
             'total_bet': self.total_bet,
             'timestamp': self.timestamp.isoformat() if self.timestamp else None,
             'action_order': self.action_order,
+            'pot_before': self.pot_before,
+            'to_call': self.to_call,
+            'effective_stack': self.effective_stack,
+            'spr': self.spr,
+            'is_all_in': self.is_all_in,
+            'side_pots': json.loads(self.side_pots) if self.side_pots else [],
             'created_at': self.created_at.isoformat() if self.created_at else None
         } 
\ No newline at end of file
@@ -0,0 +1,39 @@
+from sqlalchemy import Column, Integer, SmallInteger, ForeignKey, Boolean, Index
+from sqlalchemy.orm import relationship
+from app.models.database import Base
+
+class HeroDecision(Base):
+    """
+    Uma decisão do herói, com as features codificadas em inteiros
+    (códigos em app/services/hero_decision_service.py e app/utils/board_texture.py).
+    Valores em BB são guardados em décimos (stack_bb10 = 255 -> 25.5 BB).
+    """
+    __tablename__ = "hero_decisions"
+    __table_args__ = (
+        # Ex.: BB defendendo contra open do CO com 20-30 BB
+        Index("ix_hero_decisions_spot", "user_id", "street", "position", "facing", "aggressor_position", "stack_bb10"),
+        Index("ix_hero_decisions_texture", "user_id", "street", "board_texture"),
+        Index("ix_hero_decisions_hand_class", "user_id", "hand_class"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    hand_id = Column(Integer, ForeignKey("hands.id"), nullable=False, index=True)
+    decision_order = Column(SmallInteger, nullable=False)  # Ordem da decisão do herói na mão
+
+    street = Column(SmallInteger, nullable=False)       # 0 preflop, 1 flop, 2 turn, 3 river
+    position = Column(SmallInteger, nullable=False)     # Índice em POSITIONS (UTG ... BB)
+    stack_bb10 = Column(SmallInteger, nullable=False)   # Stack efetivo
+    pot_bb10 = Column(SmallInteger, nullable=False)
+    to_call_bb10 = Column(SmallInteger, nullable=False)
+    players = Column(SmallInteger, nullable=False)      # Jogadores ainda na mão
+    facing = Column(SmallInteger, nullable=False)       # FACING_* (unopened, limp, open, 3-bet, bet, ...)
+    aggressor_position = Column(SmallInteger)           # Posição do último agressor da street
+    in_position = Column(Boolean)                       # Último a agir no pós-flop entre os jogadores na mão
+    action = Column(SmallInteger, nullable=False)       # ACTION_* (fold, check, call, bet, raise)
+    amount_bb10 = Column(SmallInteger, nullable=False, default=0)
+    is_all_in = Column(Boolean, nullable=False, default=False)
+    hand_class = Column(SmallInteger)                   # 0-168 (app/utils/ranges.py)
+    board_texture = Column(SmallInteger, nullable=False, default=0)
+
+    hand = relationship("Hand", back_populates="decisions")
@@ -0,0 +1,29 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, UniqueConstraint
+from sqlalchemy.sql import func
+from app.models.database import Base
+
+class HudStats(Base):
+    """Contadores agregados de HUD por usuário e posição ('ALL' = todas as posições)"""
+    __tablename__ = "hud_stats"
+    __table_args__ = (
+        UniqueConstraint("user_id", "position", name="uq_hud_stats_user_position"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    position = Column(String(10), nullable=False)
+
+    # Pares numerador / denominador de cada estatística
+    hands = Column(Integer, nullable=False, default=0)
+    vpip = Column(Integer, nullable=False, default=0)
+    pfr = Column(Integer, nullable=False, default=0)
+    three_bet = Column(Integer, nullable=False, default=0)
+    three_bet_opportunities = Column(Integer, nullable=False, default=0)
+    postflop_aggressive = Column(Integer, nullable=False, default=0)  # Bets + raises pós-flop
+    postflop_calls = Column(Integer, nullable=False, default=0)
+    saw_flop = Column(Integer, nullable=False, default=0)
+    went_to_showdown = Column(Integer, nullable=False, default=0)
+    cbet = Column(Integer, nullable=False, default=0)
+    cbet_opportunities = Column(Integer, nullable=False, default=0)
+
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -0,0 +1,40 @@
+import json
+
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, UniqueConstraint, Index
+from sqlalchemy.sql import func
+from app.models.database import Base
+
+class OpponentProfile(Base):
+    """Contadores agregados de um oponente, por usuário (índice de oponentes)"""
+    __tablename__ = "opponent_profiles"
+    __table_args__ = (
+        UniqueConstraint("user_id", "name", name="uq_opponent_profiles_user_name"),
+        # Busca por prefixo: WHERE user_id = ? AND name_lower LIKE 'abc%'
+        Index("ix_opponent_profiles_user_name_lower", "user_id", "name_lower"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    name = Column(String(50), nullable=False)
+    name_lower = Column(String(50), nullable=False)
+
+    # Mesmos pares numerador / denominador do HUD do herói
+    hands = Column(Integer, nullable=False, default=0)
+    vpip = Column(Integer, nullable=False, default=0)
+    pfr = Column(Integer, nullable=False, default=0)
+    three_bet = Column(Integer, nullable=False, default=0)
+    three_bet_opportunities = Column(Integer, nullable=False, default=0)
+    postflop_aggressive = Column(Integer, nullable=False, default=0)
+    postflop_calls = Column(Integer, nullable=False, default=0)
+    saw_flop = Column(Integer, nullable=False, default=0)
+    went_to_showdown = Column(Integer, nullable=False, default=0)
+    cbet = Column(Integer, nullable=False, default=0)
+    cbet_opportunities = Column(Integer, nullable=False, default=0)
+
+    # Mãos mostradas no showdown (JSON, mais recentes primeiro)
+    showdown_hands = Column(Text)
+    last_seen = Column(DateTime(timezone=True))
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    def get_showdown_hands(self):
+        return json.loads(self.showdown_hands) if self.showdown_hands else []
@@ -1,6 +1,6 @@
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field
 from datetime import datetime
-from typing import Optional, List
+from typing import Annotated, Optional, List, Union
 
 # User schemas
 class UserBase(BaseModel):
@@ -71,13 +71,31 @@ class Hand(HandBase):
     id: int
     user_id: int
     created_at: datetime
+    ai_status: Optional[str] = None
+    has_gap: Optional[bool] = None
+    has_error: Optional[bool] = None
 
     class Config:
         from_attributes = True
 
+# Página do histórico com o total filtrado
+class HandPage(BaseModel):
+    hands: List[Hand]
+    total: int
+    next_cursor: Optional[str] = None
+
 # Upload response
 class UploadResponse(BaseModel):
     message: str
     hands_processed: int
     hands: List[Hand]
 
+# Ação do replay para análise; os campos da equity são validados (422 se inválidos)
+class ActionAnalysisRequest(BaseModel):
+    hero_cards: Optional[Union[str, List[str]]] = None
+    community_cards: Optional[Union[str, List[str]]] = None
+    opponents: Optional[int] = Field(1, ge=1, le=9)
+    villain_ranges: Optional[List[Annotated[str, Field(max_length=500)]]] = Field(None, max_length=9)
+
+    class Config:
+        extra = 'allow'  # street, player, action, amount... vão só para o prompt
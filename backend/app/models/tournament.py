@@ -1,10 +1,14 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, Float, Boolean
+from sqlalchemy import Column, Integer, String, DateTime, Date, Text, ForeignKey, Float, Boolean, Index, UniqueConstraint
 from sqlalchemy.sql import func
 from app.models.database import Base
 from sqlalchemy.orm import relationship
 
 class Tournament(Base):
     __tablename__ = "tournaments"
+    __table_args__ = (
+        # Janelas de performance: torneios do usuário a partir de uma data
+        Index("ix_tournaments_user_date", "user_id", "date_played"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -28,6 +32,39 @@ class Tournament(Base):
     user = relationship("User")
     hands = relationship("Hand", back_populates="tournament")
 
+class TournamentDailyStats(Base):
+    """
+    Resultados de torneios somados por usuário e dia (date_played).
+    Mantidos de forma incremental a cada torneio inserido ou alterado; as janelas
+    de performance somam no máximo 365 destas linhas.
+    """
+    __tablename__ = "tournament_daily_stats"
+    __table_args__ = (
+        UniqueConstraint("user_id", "day", name="uq_tournament_daily_stats_user_day"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    day = Column(Date, nullable=False)
+    tournaments_played = Column(Integer, nullable=False, default=0)
+    total_buy_ins = Column(Float, nullable=False, default=0.0)
+    total_prizes = Column(Float, nullable=False, default=0.0)
+    itm_count = Column(Integer, nullable=False, default=0)
+    finish_count = Column(Integer, nullable=False, default=0)  # Torneios com posição final informada
+    finish_sum = Column(Integer, nullable=False, default=0)
+    best_finish = Column(Integer)
+    worst_finish = Column(Integer)
+    biggest_win = Column(Float, nullable=False, default=0.0)  # Maior prêmio
+    biggest_loss = Column(Float, nullable=False, default=0.0)  # Maior buy-in sem prêmio
+
+class PerformanceDataVersion(Base):
+    """Versão dos resultados de torneios de cada usuário (incrementada a cada alteração)"""
+    __tablename__ = "performance_data_versions"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
 class PerformanceStats(Base):
     __tablename__ = "performance_stats"
 
@@ -24,6 +24,19 @@ async def analyze_gaps(
         "gaps": gaps
     }
 
+@router.get("/rules")
+async def evaluate_gap_rules(
+    days_back: int = Query(30, ge=7, le=90),
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Avalia todas as regras de gap: oportunidades, leaks, mãos de exemplo e confiança"""
+    evaluation = gap_service.evaluate_rules(db, current_user.id, days_back)
+    return {
+        "analysis_period_days": days_back,
+        **evaluation
+    }
+
 @router.get("/summary")
 async def get_gaps_summary(
     current_user: User = Depends(get_current_active_user),
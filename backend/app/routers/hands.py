@@ -1,6 +1,7 @@
-from fastapi import APIRouter, Depends, HTTPException, File, UploadFile, Query
+from fastapi import APIRouter, Depends, HTTPException, File, UploadFile, Query, Response
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
-from sqlalchemy import func, or_
+from sqlalchemy import false, func, or_, true
 from typing import List, Optional
 from datetime import datetime
 import sys
@@ -16,21 +17,46 @@ from app.models.user import User
 from app.models.hand import Hand
 from app.models.hand_action import HandAction
 from app.models.tournament import Tournament
-from app.models.schemas import Hand as HandSchema, UploadResponse
+from app.models.schemas import ActionAnalysisRequest, Hand as HandSchema, HandPage, UploadResponse
 from app.services.auth import get_current_active_user
 from app.utils.poker_parser import PokerStarsParser
 from app.utils.advanced_poker_parser import AdvancedPokerParser
 from app.utils.advanced_poker_parser import parse_hand_for_table_replay
+from app.utils.pot_reconstruction import reconstruct_pots, action_state_columns
+from app.utils.keyset import InvalidCursor, after_key, decode_cursor, encode_cursor, nulls_first
+from app.utils.board_texture import TEXTURE_FILTERS, texture_codes
+from app.utils.card_encoding import card_mask
+from app.utils.hand_evaluator import RANKS, parse_cards
+from app.utils.ranges import CLASS_NAMES, Range, class_suited
 from app.services.ai_service import AIAnalysisService
+from app.services.ai_job_service import AIJobQueue, AIJobWorkerPool
 from app.services.local_analysis_service import LocalAnalysisService
+from app.services.hud_stats_service import HudStatsService
+from app.services.opponent_service import OpponentService
+from app.services.hero_decision_service import HeroDecisionService
+from app.services.gap_service import GapIdentificationService
 from app.services.validation_service import ValidationService
+from app.services.equity_service import EquityService
+from app.services.performance_service import PerformanceAnalysisService
+from app.services.hand_search_service import HandSearchService
+from app.services.hand_facet_service import HandFacetService
 
 router = APIRouter()
 parser = PokerStarsParser()
 advanced_parser = AdvancedPokerParser()
 ai_service = AIAnalysisService()
+ai_job_queue = AIJobQueue()
+ai_worker_pool = AIJobWorkerPool(ai_service, ai_job_queue)
 local_analysis_service = LocalAnalysisService()
 validation_service = ValidationService()
+equity_service = EquityService()
+hud_stats_service = HudStatsService()
+opponent_service = OpponentService()
+hero_decision_service = HeroDecisionService()
+gap_service = GapIdentificationService()
+performance_service = PerformanceAnalysisService()
+hand_search_service = HandSearchService()
+hand_facet_service = HandFacetService()
 
 def get_or_create_tournament(db: Session, user_id: int, tournament_data: dict) -> Optional[Tournament]:
     """Busca ou cria um torneio na tabela tournaments"""
@@ -61,6 +87,7 @@ def get_or_create_tournament(db: Session, user_id: int, tournament_data: dict) -
         
         db.add(new_tournament)
         db.flush()  # Para obter o ID sem fazer commit
+        performance_service.record_tournaments(db, [new_tournament])
         
         print(f"✅ Torneio {pokerstars_tournament_id} criado com ID {new_tournament.id}")
         return new_tournament
@@ -114,20 +141,31 @@ async def upload_hand_history(
             raise HTTPException(status_code=400, detail="Nenhuma mão válida encontrada no arquivo")
         
         processed_hands = []
+        new_hands_data = []
         tournaments_cache = {}  # Cache para evitar múltiplas consultas
         
-        for i, hand_data in enumerate(parsed_hands):
-            print(f"📊 Processando mão {i+1}: hand_id={hand_data.get('hand_id')}")
-            
-            # Verificar se mão já existe
-            existing_hand = db.query(Hand).filter(
+        # Mãos já existentes (no banco ou repetidas no arquivo), em consultas por bloco
+        hand_ids = [h.get('hand_id') for h in parsed_hands if h.get('hand_id')]
+        seen_ids = set()
+        for start in range(0, len(hand_ids), 500):
+            seen_ids.update(row[0] for row in db.query(Hand.hand_id).filter(
                 Hand.user_id == current_user.id,
-                Hand.hand_id == hand_data.get('hand_id')
-            ).first()
-            
-            if existing_hand:
+                Hand.hand_id.in_(hand_ids[start:start + 500])
+            ))
+        new_hands = []
+        for hand_data in parsed_hands:
+            if hand_data.get('hand_id') in seen_ids:
                 print(f"⚠️ Mão {hand_data.get('hand_id')} já existe - pulando")
                 continue  # Pular mãos duplicadas
+            if hand_data.get('hand_id'):
+                seen_ids.add(hand_data['hand_id'])
+            new_hands.append(hand_data)
+        
+        # Análise local do lote inteiro em vereditos compactos, fora do event loop
+        verdicts = await run_in_threadpool(local_analysis_service.analyze_many, new_hands)
+        
+        for i, (hand_data, verdict) in enumerate(zip(new_hands, verdicts)):
+            print(f"📊 Processando mão {i+1}: hand_id={hand_data.get('hand_id')}")
             
             # Garantir valores padrão para campos obrigatórios
             hand_id = hand_data.get('hand_id') or f"unknown_{i+1}_{current_user.id}"
@@ -145,29 +183,8 @@ async def upload_hand_history(
                         tournament_db_id = tournament.id
                         tournaments_cache[pokerstars_tournament_id] = tournament_db_id
             
-            # Analisar mão com IA (ou análise básica se IA não disponível)
-            local_analysis = await local_analysis_service.analyze_hand_locally(hand_data)
-            try:
-                ai_analysis = await ai_service.analyze_hand(hand_data)
-            except Exception as e:
-                print(f"⚠️ IA indisponível, usando análise básica: {e}")
-                ai_analysis = f"""
-ANÁLISE BÁSICA (IA indisponível):
-
-Posição: {hand_data.get("hero_position", "Desconhecida")}
-Cartas: {hand_data.get("hero_cards", "Não identificadas")}
-Ação: {hand_data.get("hero_action", "Não identificada")}
-
-Esta é uma análise básica. Para análise completa com IA, verifique a configuração da API.
-
-RECOMENDAÇÕES GERAIS:
-- Analise a posição antes de tomar decisões
-- Considere o tamanho do pot e stack sizes
-- Observe os padrões dos oponentes
-- Mantenha disciplina com bankroll management
-
-Para análise mais detalhada, configure a integração com OpenRouter.
-"""
+            # A análise de IA é feita depois pela fila (ai_analysis_jobs)
+            push_fold = verdict.push_fold
             
             # Criar registro no banco
             db_hand = Hand(
@@ -186,12 +203,14 @@ Para análise mais detalhada, configure a integração com OpenRouter.
                 bet_amount=hand_data.get("bet_amount"),
                 board_cards=hand_data.get("board_cards"),
                 raw_hand=hand_data.get("raw_hand", ""),
-                local_analysis=local_analysis,
-                ai_analysis=ai_analysis
+                push_fold_spot=push_fold['spot'] if push_fold else None,
+                push_fold_in_chart=push_fold['in_chart'] if push_fold else None,
+                **verdict.columns()
             )
             
             db.add(db_hand)
             processed_hands.append(db_hand)
+            new_hands_data.append(hand_data)
             print(f"✅ Mão {hand_id} adicionada ao banco (torneio_id: {tournament_db_id})")
             
             # Parse avançado para extrair ações detalhadas
@@ -200,29 +219,39 @@ Para análise mais detalhada, configure a integração com OpenRouter.
             # Salvar ações no banco
             if advanced_replay:
                 action_order = 0
-                for street in advanced_replay.streets:
-                    for action in street.actions:
-                        db_action = HandAction(
-                            hand_id=db_hand.id,  # Será definido após o commit
-                            street=action.street,
-                            player_name=action.player,
-                            action_type=action.action_type,
-                            amount=action.amount or 0.0,
-                            total_bet=action.total_bet or 0.0,
-                            action_order=action_order
-                        )
-                        db.add(db_action)
-                        action_order += 1
+                # Pote, valor a pagar, stack efetivo, SPR e side pots de cada ação
+                for action, state in reconstruct_pots(advanced_replay):
+                    db_action = HandAction(
+                        hand_id=db_hand.id,  # Será definido após o commit
+                        street=action.street,
+                        player_name=action.player,
+                        action_type=action.action_type,
+                        amount=action.amount or 0.0,
+                        total_bet=action.total_bet or 0.0,
+                        action_order=action_order,
+                        **action_state_columns(state)
+                    )
+                    db.add(db_action)
+                    action_order += 1
                 
                 print(f"✅ {action_order} ações salvas para mão {hand_id}")
-        
+                
+                # Decisões do herói com features codificadas (hero_decisions)
+                hero_decision_service.add_hand(db, db_hand, advanced_replay)
+        
+        # Atualização incremental dos contadores de HUD e do índice de oponentes
+        hud_stats_service.add_hands(db, current_user.id, new_hands_data)
+        opponent_service.add_hands(db, current_user.id, new_hands_data)
+        # Análises de IA em background: a resposta não espera o LLM
+        ai_job_queue.enqueue(db, processed_hands)
         db.commit()
+        ai_worker_pool.notify()
         
         # Atualizar objetos com IDs
         for hand in processed_hands:
             db.refresh(hand)
         
-        print(f"🎉 Upload concluído: {len(processed_hands)} mãos processadas")
+        print(f"🎉 Upload concluído: {len(processed_hands)} mãos processadas ({len(processed_hands)} análises de IA na fila)")
         
         return UploadResponse(
             message=f"Processadas {len(processed_hands)} mãos com sucesso",
@@ -236,6 +265,27 @@ Para análise mais detalhada, configure a integração com OpenRouter.
         print(f"❌ Erro no upload: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Erro ao processar arquivo: {str(e)}")
 
+@router.get("/hud-stats")
+async def get_hud_stats(
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Painel de HUD do herói (VPIP, PFR, 3-bet, AF, WTSD, c-bet), total e por posição"""
+    return hud_stats_service.get_panel(db, current_user.id)
+
+@router.get("/ai-jobs/status")
+async def get_ai_jobs_status(
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Jobs de análise de IA do usuário por status (pending, running, done, failed)"""
+    return ai_job_queue.status_counts(db, current_user.id)
+
+@router.get("/ai-cache/stats")
+async def get_ai_cache_stats(current_user: User = Depends(get_current_active_user)):
+    """Métricas do cache de análises de IA por situação (entradas, acertos, taxa de acerto)"""
+    return ai_service.cache.stats()
+
 @router.get("/stats")
 async def get_user_stats(
     current_user: User = Depends(get_current_active_user),
@@ -269,11 +319,11 @@ async def get_user_stats(
         Hand.user_id == current_user.id
     ).order_by(Hand.created_at.desc()).limit(10).all()
     
-    # Análise de gaps (simulada por enquanto)
-    gaps_found = 0
-    for hand in recent_hands:
-        if hand.ai_analysis and ('gap' in hand.ai_analysis.lower() or 'erro' in hand.ai_analysis.lower()):
-            gaps_found += 1
+    # Mãos com gap ou erro na análise (colunas indexadas)
+    gaps_found = db.query(func.count(Hand.id)).filter(
+        Hand.user_id == current_user.id,
+        or_(Hand.has_gap == true(), Hand.has_error == true())
+    ).scalar()
     
     return {
         "total_hands": total_hands,
@@ -289,90 +339,210 @@ async def get_user_stats(
                 "hero_cards": hand.hero_cards,
                 "hero_action": hand.hero_action,
                 "date_played": hand.date_played,
-                "has_gap": 'gap' in (hand.ai_analysis or '').lower() or 'erro' in (hand.ai_analysis or '').lower()
+                "has_gap": bool(hand.has_gap or hand.has_error)
             }
             for hand in recent_hands
         ]
     }
 
-@router.get("/history/my-hands", response_model=List[HandSchema])
-async def get_my_hands(
+@router.get("/search")
+async def search_hands(
+    q: str = Query(..., min_length=2, max_length=200),
     skip: int = Query(0, ge=0),
-    limit: int = Query(50, ge=1, le=100),
-    order_by: str = Query("date_asc", regex="^(date_asc|date_desc|created_asc|created_desc)$"),
-    gap_filter: Optional[str] = Query(None, regex="^(all|ok|gap|error)$"),
-    position_filter: Optional[str] = Query(None),
-    action_filter: Optional[str] = Query(None),
-    date_from: Optional[str] = Query(None),
-    date_to: Optional[str] = Query(None),
+    limit: int = Query(20, ge=1, le=100),
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
-    """Obter histórico de mãos do usuário com filtros e ordenação"""
-    
-    # Query base
-    query = db.query(Hand).filter(Hand.user_id == current_user.id)
+    """Busca textual nas análises (IA e local) e nos nomes dos jogadores, por relevância"""
+    ranked = hand_search_service.search(db, current_user.id, q, limit, skip)
+    hands = {
+        hand.id: hand
+        for hand in db.query(Hand).filter(
+            Hand.user_id == current_user.id,
+            Hand.id.in_([hand_id for hand_id, _ in ranked])
+        )
+    } if ranked else {}
     
-    # Filtro por gap
+    return {
+        "query": q,
+        "results": [
+            {
+                "id": hands[hand_id].id,
+                "hand_id": hands[hand_id].hand_id,
+                "date_played": hands[hand_id].date_played,
+                "hero_position": hands[hand_id].hero_position,
+                "hero_cards": hands[hand_id].hero_cards,
+                "hero_action": hands[hand_id].hero_action,
+                "score": score,
+                "snippet": hand_search_service.snippet(hands[hand_id], q)
+            }
+            for hand_id, score in ranked
+            if hand_id in hands
+        ]
+    }
+
+def _hand_filters(
+    user_id: int,
+    gap_filter: Optional[str] = None,
+    position_filter: Optional[str] = None,
+    action_filter: Optional[str] = None,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    hand_range: Optional[str] = None,
+    suited: Optional[bool] = None,
+    flop_texture: Optional[str] = None,
+    flop_high: Optional[str] = None,
+    board_contains: Optional[str] = None
+) -> list:
+    """Condições dos filtros do histórico (listagem, contagem e página com total usam as mesmas)"""
+    conditions = [Hand.user_id == user_id]
+    
+    # Filtro por gap (classificação gravada junto com a análise)
     if gap_filter and gap_filter != "all":
         if gap_filter == "ok":
-            # Mãos sem gaps (análise não contém palavras de erro)
-            query = query.filter(
-                ~Hand.ai_analysis.ilike('%gap%'),
-                ~Hand.ai_analysis.ilike('%erro%'),
-                ~Hand.ai_analysis.ilike('%error%'),
-                ~Hand.ai_analysis.ilike('%mistake%')
-            )
+            # Mãos analisadas sem gaps nem erros
+            conditions += [Hand.has_gap == false(), Hand.has_error == false()]
         elif gap_filter == "gap":
-            # Mãos com gaps (análise contém palavras de gap)
-            query = query.filter(
-                Hand.ai_analysis.ilike('%gap%')
-            )
+            # Mãos com gaps
+            conditions.append(Hand.has_gap == true())
         elif gap_filter == "error":
-            # Mãos com erros (análise contém palavras de erro)
-            query = query.filter(
-                or_(
-                    Hand.ai_analysis.ilike('%erro%'),
-                    Hand.ai_analysis.ilike('%error%'),
-                    Hand.ai_analysis.ilike('%mistake%')
-                )
-            )
+            # Mãos com erros
+            conditions.append(Hand.has_error == true())
     
     # Filtro por posição
     if position_filter:
-        query = query.filter(Hand.hero_position == position_filter)
+        conditions.append(Hand.hero_position == position_filter)
     
     # Filtro por ação
     if action_filter:
-        query = query.filter(Hand.hero_action == action_filter)
+        conditions.append(Hand.hero_action == action_filter)
     
     # Filtro por data
     if date_from:
         try:
             date_from_obj = datetime.fromisoformat(date_from.replace('Z', '+00:00'))
-            query = query.filter(Hand.date_played >= date_from_obj)
+            conditions.append(Hand.date_played >= date_from_obj)
         except ValueError:
             pass
     
     if date_to:
         try:
             date_to_obj = datetime.fromisoformat(date_to.replace('Z', '+00:00'))
-            query = query.filter(Hand.date_played <= date_to_obj)
+            conditions.append(Hand.date_played <= date_to_obj)
         except ValueError:
             pass
     
-    # Ordenação
-    if order_by == "date_asc":
-        query = query.order_by(Hand.date_played.asc())
-    elif order_by == "date_desc":
-        query = query.order_by(Hand.date_played.desc())
-    elif order_by == "created_asc":
-        query = query.order_by(Hand.created_at.asc())
-    elif order_by == "created_desc":
-        query = query.order_by(Hand.created_at.desc())
+    # Filtros por cartas: colunas codificadas na ingestão, classes e texturas viram IN (...) no índice
+    if hand_range or suited is not None:
+        try:
+            classes = [CLASS_NAMES.index(name) for name in Range.parse(hand_range).hand_classes()] if hand_range else range(169)
+        except ValueError:
+            raise HTTPException(status_code=400, detail=f"Range inválido: {hand_range}")
+        if suited is not None:
+            classes = [index for index in classes if class_suited(index) == suited]
+        conditions.append(Hand.hero_class.in_(list(classes)))
+    
+    if flop_texture or flop_high:
+        required = forbidden = 0
+        for name in filter(None, (name.strip() for name in (flop_texture or '').split(','))):
+            if name not in TEXTURE_FILTERS:
+                raise HTTPException(status_code=400, detail=f"Textura inválida: {name}")
+            required |= TEXTURE_FILTERS[name][0]
+            forbidden |= TEXTURE_FILTERS[name][1]
+        high_rank = RANKS.index(flop_high.upper()) if flop_high else None
+        conditions.append(Hand.flop_texture.in_(texture_codes(required, forbidden, high_rank)))
+    
+    if board_contains:
+        try:
+            bits = card_mask(parse_cards(board_contains))
+        except ValueError:
+            raise HTTPException(status_code=400, detail=f"Cartas inválidas: {board_contains}")
+        conditions.append(Hand.board_mask.op('&')(bits) == bits)
     
-    # Aplicar paginação
-    hands = query.offset(skip).limit(limit).all()
+    return conditions
+
+def _history_page(db: Session, query, order_by: str, limit: int, skip: int, cursor: Optional[str], with_total: bool = False):
+    """
+    Ordena e pagina o histórico: depois do cursor (keyset) ou a partir de skip.
+    Com with_total, o total filtrado vem na mesma consulta da página (COUNT(*) OVER())
+    e segue dentro do cursor para as páginas seguintes.
+    Retorna (mãos, total, next_cursor)
+    """
+    # Ordenação, com o id desempatando (chave do cursor)
+    sort_column = Hand.date_played if order_by.startswith("date") else Hand.created_at
+    descending = order_by.endswith("desc")
+    if descending:
+        query = query.order_by(sort_column.desc(), Hand.id.desc())
+    else:
+        query = query.order_by(sort_column.asc(), Hand.id.asc())
+    
+    total = None
+    if cursor:
+        # Depois da última mão da página anterior, sem OFFSET
+        try:
+            value, last_id, total = decode_cursor(cursor)
+        except InvalidCursor:
+            raise HTTPException(status_code=400, detail="Cursor inválido")
+        null_first = nulls_first(db.get_bind().dialect.name, descending)
+        hands = []
+        for segment in after_key(sort_column, Hand.id, value, last_id, descending, null_first):
+            hands += query.filter(segment).limit(limit + 1 - len(hands)).all()
+            if len(hands) > limit:
+                break
+    elif with_total:
+        rows = query.add_columns(func.count().over()).offset(skip).limit(limit + 1).all()
+        hands = [row[0] for row in rows]
+        if rows:
+            total = rows[0][1]
+        elif not skip:
+            total = 0
+    else:
+        hands = query.offset(skip).limit(limit + 1).all()
+    
+    # Página além do fim ou cursor sem total: contagem separada
+    if with_total and total is None:
+        total = query.order_by(None).count()
+    
+    next_cursor = None
+    if len(hands) > limit:
+        hands = hands[:limit]
+        next_cursor = encode_cursor(getattr(hands[-1], sort_column.key), hands[-1].id, total)
+    return hands, total, next_cursor
+
+@router.get("/history/my-hands", response_model=List[HandSchema])
+async def get_my_hands(
+    response: Response,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = Query(None),
+    order_by: str = Query("date_asc", regex="^(date_asc|date_desc|created_asc|created_desc)$"),
+    gap_filter: Optional[str] = Query(None, regex="^(all|ok|gap|error)$"),
+    position_filter: Optional[str] = Query(None),
+    action_filter: Optional[str] = Query(None),
+    date_from: Optional[str] = Query(None),
+    date_to: Optional[str] = Query(None),
+    hand_range: Optional[str] = Query(None, max_length=200),
+    suited: Optional[bool] = Query(None),
+    flop_texture: Optional[str] = Query(None),
+    flop_high: Optional[str] = Query(None, regex="^[2-9TJQKAtjqka]$"),
+    board_contains: Optional[str] = Query(None, max_length=20),
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Obter histórico de mãos do usuário com filtros e ordenação.
+    Paginação por cursor: o header X-Next-Cursor traz o cursor da página seguinte
+    (ausente na última); com cursor, skip é ignorado.
+    Filtros por cartas: hand_range ('AKo, TT+'), suited, flop_texture ('monotone,connected'),
+    flop_high ('A') e board_contains ('Ah').
+    """
+    query = db.query(Hand).filter(*_hand_filters(
+        current_user.id, gap_filter, position_filter, action_filter, date_from, date_to,
+        hand_range, suited, flop_texture, flop_high, board_contains
+    ))
+    hands, _, next_cursor = _history_page(db, query, order_by, limit, skip, cursor)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
     
     return hands
 
@@ -383,57 +553,48 @@ async def get_my_hands_count(
     action_filter: Optional[str] = Query(None),
     date_from: Optional[str] = Query(None),
     date_to: Optional[str] = Query(None),
+    hand_range: Optional[str] = Query(None, max_length=200),
+    suited: Optional[bool] = Query(None),
+    flop_texture: Optional[str] = Query(None),
+    flop_high: Optional[str] = Query(None, regex="^[2-9TJQKAtjqka]$"),
+    board_contains: Optional[str] = Query(None, max_length=20),
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
     """Obter contagem total de mãos com filtros aplicados"""
-    
-    # Query base
-    query = db.query(func.count(Hand.id)).filter(Hand.user_id == current_user.id)
-    
-    # Aplicar os mesmos filtros do endpoint principal
-    if gap_filter and gap_filter != "all":
-        if gap_filter == "ok":
-            query = query.filter(
-                ~Hand.ai_analysis.ilike('%gap%'),
-                ~Hand.ai_analysis.ilike('%erro%'),
-                ~Hand.ai_analysis.ilike('%error%'),
-                ~Hand.ai_analysis.ilike('%mistake%')
-            )
-        elif gap_filter == "gap":
-            query = query.filter(Hand.ai_analysis.ilike('%gap%'))
-        elif gap_filter == "error":
-            query = query.filter(
-                or_(
-                    Hand.ai_analysis.ilike('%erro%'),
-                    Hand.ai_analysis.ilike('%error%'),
-                    Hand.ai_analysis.ilike('%mistake%')
-                )
-            )
-    
-    if position_filter:
-        query = query.filter(Hand.hero_position == position_filter)
-    
-    if action_filter:
-        query = query.filter(Hand.hero_action == action_filter)
-    
-    if date_from:
-        try:
-            date_from_obj = datetime.fromisoformat(date_from.replace('Z', '+00:00'))
-            query = query.filter(Hand.date_played >= date_from_obj)
-        except ValueError:
-            pass
-    
-    if date_to:
-        try:
-            date_to_obj = datetime.fromisoformat(date_to.replace('Z', '+00:00'))
-            query = query.filter(Hand.date_played <= date_to_obj)
-        except ValueError:
-            pass
-    
-    total = query.scalar()
+    total = db.query(func.count(Hand.id)).filter(*_hand_filters(
+        current_user.id, gap_filter, position_filter, action_filter, date_from, date_to,
+        hand_range, suited, flop_texture, flop_high, board_contains
+    )).scalar()
     return {"total": total}
 
+@router.get("/history/my-hands/page", response_model=HandPage)
+async def get_my_hands_page(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = Query(None),
+    order_by: str = Query("date_asc", regex="^(date_asc|date_desc|created_asc|created_desc)$"),
+    gap_filter: Optional[str] = Query(None, regex="^(all|ok|gap|error)$"),
+    position_filter: Optional[str] = Query(None),
+    action_filter: Optional[str] = Query(None),
+    date_from: Optional[str] = Query(None),
+    date_to: Optional[str] = Query(None),
+    hand_range: Optional[str] = Query(None, max_length=200),
+    suited: Optional[bool] = Query(None),
+    flop_texture: Optional[str] = Query(None),
+    flop_high: Optional[str] = Query(None, regex="^[2-9TJQKAtjqka]$"),
+    board_contains: Optional[str] = Query(None, max_length=20),
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Página do histórico com o total filtrado, em uma requisição (lista + contagem)"""
+    query = db.query(Hand).filter(*_hand_filters(
+        current_user.id, gap_filter, position_filter, action_filter, date_from, date_to,
+        hand_range, suited, flop_texture, flop_high, board_contains
+    ))
+    hands, total, next_cursor = _history_page(db, query, order_by, limit, skip, cursor, with_total=True)
+    return {"hands": hands, "total": total, "next_cursor": next_cursor}
+
 @router.get("/history/filters/options")
 async def get_filter_options(
     current_user: User = Depends(get_current_active_user),
@@ -441,27 +602,20 @@ async def get_filter_options(
 ):
     """Obter opções disponíveis para filtros"""
     
-    # Posições disponíveis
-    positions = db.query(Hand.hero_position).filter(
-        Hand.user_id == current_user.id,
-        Hand.hero_position.isnot(None)
-    ).distinct().all()
-    
-    # Ações disponíveis
-    actions = db.query(Hand.hero_action).filter(
-        Hand.user_id == current_user.id,
-        Hand.hero_action.isnot(None)
-    ).distinct().all()
+    # Posições e ações disponíveis (das facetas em cache)
+    facets = hand_facet_service.facets(db, current_user.id)
     
     return {
-        "positions": [pos[0] for pos in positions if pos[0]],
-        "actions": [action[0] for action in actions if action[0]],
+        "positions": [facet["value"] for facet in facets["positions"]],
+        "actions": [facet["value"] for facet in facets["actions"]],
+        "facets": facets,
         "gap_options": [
             {"value": "all", "label": "Todas as mãos"},
             {"value": "ok", "label": "Mãos OK (sem gaps)"},
             {"value": "gap", "label": "Mãos com gaps"},
             {"value": "error", "label": "Mãos com erros"}
         ],
+        "texture_options": list(TEXTURE_FILTERS),
         "order_options": [
             {"value": "date_asc", "label": "Data (mais antiga primeiro)"},
             {"value": "date_desc", "label": "Data (mais recente primeiro)"},
@@ -470,6 +624,14 @@ async def get_filter_options(
         ]
     }
 
+@router.get("/history/facets")
+async def get_hand_facets(
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Contagem de mãos por posição, ação, status de gap e mês (uma consulta agrupada, em cache)"""
+    return hand_facet_service.facets(db, current_user.id)
+
 @router.get("/history/my-hands/{hand_id}", response_model=HandSchema)
 async def get_hand_detail(
     hand_id: int,
@@ -485,6 +647,11 @@ async def get_hand_detail(
     if not hand:
         raise HTTPException(status_code=404, detail="Mão não encontrada")
     
+    # Mão aberta com análise ainda na fila: passa na frente do lote do upload
+    if ai_job_queue.prioritize(db, hand.id):
+        db.commit()
+        ai_worker_pool.notify()
+    
     return hand
 
 @router.delete("/history/my-hands/{hand_id}")
@@ -502,6 +669,16 @@ async def delete_hand(
     if not hand:
         raise HTTPException(status_code=404, detail="Mão não encontrada")
     
+    # Remover a contribuição da mão dos contadores de HUD, do índice de oponentes e dos contadores de gaps
+    removed_hand = {
+        "raw_hand": hand.raw_hand,
+        "hand_id": hand.hand_id,
+        "hero_name": hand.hero_name,
+        "hero_position": hand.hero_position
+    }
+    hud_stats_service.add_hands(db, current_user.id, [removed_hand], sign=-1)
+    opponent_service.add_hands(db, current_user.id, [removed_hand], sign=-1)
+    gap_service.remove_hands(db, [hand])
     db.delete(hand)
     db.commit()
     
@@ -526,6 +703,10 @@ async def get_hand_replay(
     if not hand:
         raise HTTPException(status_code=404, detail="Mão não encontrada")
     
+    if ai_job_queue.prioritize(db, hand.id):
+        db.commit()
+        ai_worker_pool.notify()
+    
     # Parse avançado da mão para reprodução
     replay_data = parse_hand_for_table_replay(hand.raw_hand)
     
@@ -537,6 +718,7 @@ async def get_hand_replay(
         'hand_db_id': hand.id,
         'date_played': hand.date_played,
         'ai_analysis': hand.ai_analysis,
+        'ai_status': hand.ai_status,
         'local_analysis': hand.local_analysis,
         'hero_position_name': hand.hero_position,
         'hero_action_summary': hand.hero_action,
@@ -550,11 +732,12 @@ async def get_hand_replay(
 @router.post("/replay/{hand_id}/analyze-action")
 async def analyze_specific_action(
     hand_id: int,
-    action_data: dict,
+    action_request: ActionAnalysisRequest,
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
     """Analisar uma ação específica da mão com IA"""
+    action_data = action_request.model_dump()
     
     # Buscar mão no banco
     hand = db.query(Hand).filter(
@@ -565,6 +748,9 @@ async def analyze_specific_action(
     if not hand:
         raise HTTPException(status_code=404, detail="Mão não encontrada")
     
+    # Monte Carlo fora do event loop (a chamada bloqueia até o resultado)
+    equity = await run_in_threadpool(_calculate_action_equity, hand, action_data)
+    
     try:
         # Análise específica da ação com contexto
         analysis_prompt = f"""
@@ -579,6 +765,7 @@ async def analyze_specific_action(
         - Cartas comunitárias: {action_data.get('community_cards', [])}
         - Posição: {action_data.get('position', 'unknown')}
         - Tamanho do pot: {action_data.get('pot_size', 0)}
+        - Equity do herói: {f"{equity['equity'] * 100:.1f}%" if equity and equity.get('equity') is not None else 'N/A'}
         
         Contexto da mão:
         {hand.raw_hand[:500]}...
@@ -596,6 +783,7 @@ async def analyze_specific_action(
         return {
             'action_analysis': specific_analysis,
             'action_context': action_data,
+            'equity': equity,
             'recommendations': [
                 'Considere o tamanho do pot e odds',
                 'Analise a força relativa da mão',
@@ -622,6 +810,7 @@ async def analyze_specific_action(
             - Padrões dos oponentes
             """,
             'action_context': action_data,
+            'equity': equity,
             'recommendations': [
                 'Configure IA para análise detalhada',
                 'Considere fatores básicos de poker',
@@ -630,6 +819,28 @@ async def analyze_specific_action(
             'error': str(e)
         }
 
+def _calculate_action_equity(hand: Hand, action_data: dict) -> Optional[dict]:
+    """Equity do herói no momento da ação contra os ranges dos oponentes"""
+    hero_cards = action_data.get('hero_cards') or hand.hero_cards
+    board_cards = action_data.get('community_cards') or []
+    villain_ranges = action_data.get('villain_ranges')
+    if not villain_ranges:
+        villain_ranges = ['random'] * (action_data.get('opponents') or 1)
+    
+    if not hero_cards:
+        return None
+    
+    try:
+        return equity_service.calculate_equity(
+            hero_cards,
+            board_cards,
+            villain_ranges,
+            use_processes=len(villain_ranges) > 1
+        )
+    except ValueError as e:
+        print(f"⚠️ Não foi possível calcular equity da mão {hand.id}: {e}")
+        return None
+
 @router.get("/{hand_id}/replay")
 async def get_hand_replay(
     hand_id: str,
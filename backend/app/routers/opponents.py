@@ -0,0 +1,39 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+
+from app.models.database import get_db
+from app.models.user import User
+from app.services.auth import get_current_active_user
+from app.services.opponent_service import OpponentService
+
+router = APIRouter()
+opponent_service = OpponentService()
+
+@router.get("")
+async def search_opponents(
+    q: str = Query("", max_length=50),
+    min_hands: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Busca oponentes por prefixo do nome, com VPIP/PFR/AF/WTSD agregados"""
+    opponents = opponent_service.search(db, current_user.id, q, min_hands, limit, offset)
+    return {
+        "query": q,
+        "count": len(opponents),
+        "opponents": opponents
+    }
+
+@router.get("/{name}")
+async def get_opponent(
+    name: str,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Perfil completo de um oponente, incluindo as mãos mostradas no showdown"""
+    profile = opponent_service.get_profile(db, current_user.id, name)
+    if not profile:
+        raise HTTPException(status_code=404, detail="Oponente não encontrado")
+    return profile
@@ -21,6 +21,14 @@ class TournamentCreate(BaseModel):
     players_count: int = None
     date_played: str = None
 
+class TournamentUpdate(BaseModel):
+    name: str = None
+    buy_in: float = None
+    prize: float = None
+    position: int = None
+    players_count: int = None
+    date_played: str = None
+
 class TournamentResponse(BaseModel):
     id: int
     tournament_id: str
@@ -47,7 +55,8 @@ async def get_performance_stats(
     return {
         "user_id": current_user.id,
         "period_analyzed": f"{days_back} days",
-        "stats": stats
+        "stats": stats,
+        "confidence_intervals": performance_service.confidence_intervals(db, current_user.id, days_back)
     }
 
 @router.get("/tournaments")
@@ -113,18 +122,56 @@ async def add_tournament(
         }
     }
 
+@router.put("/tournaments/{tournament_id}")
+async def update_tournament(
+    tournament_id: int,
+    tournament_data: TournamentUpdate,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Atualiza o resultado de um torneio (prêmio, posição, buy-in...)"""
+    from datetime import datetime
+    
+    changes = tournament_data.dict(exclude_unset=True)
+    if changes.get('date_played'):
+        try:
+            changes['date_played'] = datetime.fromisoformat(changes['date_played'])
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Data inválida")
+    else:
+        changes.pop('date_played', None)
+    
+    tournament = performance_service.update_tournament_result(db, current_user.id, tournament_id, changes)
+    if not tournament:
+        raise HTTPException(status_code=404, detail="Torneio não encontrado")
+    
+    return {
+        "message": "Tournament updated successfully",
+        "tournament": {
+            "id": tournament.id,
+            "tournament_id": tournament.tournament_id,
+            "buy_in": tournament.buy_in,
+            "prize": tournament.prize,
+            "position": tournament.position,
+            "roi": tournament.roi,
+            "is_itm": tournament.is_itm
+        }
+    }
+
 @router.get("/roi-chart")
 async def get_roi_chart(
     days_back: int = Query(30, ge=7, le=365),
+    max_points: int = Query(500, ge=3, le=5000),
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
-    """Obtém dados para gráfico de ROI"""
-    chart_data = performance_service.get_roi_chart_data(db, current_user.id, days_back)
+    """Obtém dados para gráfico de ROI (no máximo max_points pontos)"""
+    chart_data = performance_service.get_roi_chart_data(db, current_user.id, days_back, max_points)
     
     return {
         "period_days": days_back,
         "data_points": len(chart_data),
+        "total_tournaments": chart_data[-1]['tournaments'] if chart_data else 0,
         "chart_data": chart_data
     }
 
@@ -135,10 +182,9 @@ async def get_performance_summary(
 ):
     """Obtém resumo geral de performance"""
     
-    # Stats para diferentes períodos
-    stats_7d = performance_service.calculate_performance_stats(db, current_user.id, 7)
-    stats_30d = performance_service.calculate_performance_stats(db, current_user.id, 30)
-    stats_90d = performance_service.calculate_performance_stats(db, current_user.id, 90)
+    # Stats para diferentes períodos (somadas das linhas diárias)
+    windows = performance_service.rollup_windows(db, current_user.id, (7, 30, 90))
+    stats_7d, stats_30d, stats_90d = windows[7], windows[30], windows[90]
     
     return {
         "summary": {
@@ -146,6 +192,11 @@ async def get_performance_summary(
             "last_30_days": stats_30d,
             "last_90_days": stats_90d
         },
+        "confidence_intervals": {
+            "last_7_days": performance_service.confidence_intervals(db, current_user.id, 7),
+            "last_30_days": performance_service.confidence_intervals(db, current_user.id, 30),
+            "last_90_days": performance_service.confidence_intervals(db, current_user.id, 90)
+        },
         "trends": {
             "roi_trend": _calculate_trend(stats_7d['roi_percentage'], stats_30d['roi_percentage']),
             "volume_trend": _calculate_trend(stats_7d['tournaments_played'], stats_30d['tournaments_played']),
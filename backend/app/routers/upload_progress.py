@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from typing import Dict, Any
@@ -17,14 +18,22 @@ from app.models.schemas import UploadResponse
 from app.services.auth import get_current_active_user
 from app.utils.poker_parser import PokerStarsParser
 from app.utils.advanced_poker_parser import AdvancedPokerParser
-from app.services.ai_service import AIAnalysisService
+from app.services.ai_job_service import AIJobQueue
 from app.services.local_analysis_service import LocalAnalysisService
+from app.services.hud_stats_service import HudStatsService
+from app.services.opponent_service import OpponentService
+from app.services.hero_decision_service import HeroDecisionService
+from app.services.performance_service import PerformanceAnalysisService
 
 router = APIRouter()
 parser = PokerStarsParser()
 advanced_parser = AdvancedPokerParser()
-ai_service = AIAnalysisService()
+ai_job_queue = AIJobQueue()
 local_service = LocalAnalysisService()
+hud_stats_service = HudStatsService()
+opponent_service = OpponentService()
+hero_decision_service = HeroDecisionService()
+performance_service = PerformanceAnalysisService()
 
 # Armazenar progresso de uploads em memória (em produção, usar Redis)
 upload_progress: Dict[str, Dict[str, Any]] = {}
@@ -124,6 +133,19 @@ async def process_upload_background(
         processed_hands = []
         tournaments_cache = {}  # Cache para evitar múltiplas consultas
         
+        # Mãos já existentes em consultas por bloco; análise local das novas em um lote
+        hand_ids = [h.get('hand_id') for h in parsed_hands if h.get('hand_id')]
+        existing_ids = set()
+        for start in range(0, len(hand_ids), 500):
+            existing_ids.update(row[0] for row in db.query(Hand.hand_id).filter(
+                Hand.user_id == user_id,
+                Hand.hand_id.in_(hand_ids[start:start + 500])
+            ))
+        new_indexes = [i for i, h in enumerate(parsed_hands) if h.get('hand_id') not in existing_ids]
+        # A análise em lote é CPU-bound: roda em thread para o polling de progresso seguir respondendo
+        new_verdicts = await run_in_threadpool(local_service.analyze_many, [parsed_hands[i] for i in new_indexes])
+        verdicts = dict(zip(new_indexes, new_verdicts))
+        
         for i, hand_data in enumerate(parsed_hands):
             try:
                 # Permitir que outras tarefas executem (incluindo polling) a cada 5 mãos
@@ -140,8 +162,8 @@ async def process_upload_background(
                 if i % 5 == 0:  # Log a cada 5 mãos
                     print(f"📊 Processando mão {i+1}/{total_hands} - Progresso: {progress_percent}%")
                 
-                # Verificar se mão já existe
-                existing_hand = db.query(Hand).filter(
+                # Verificar se mão já existe (repetidas no arquivo caem aqui após o commit da primeira)
+                existing_hand = i not in verdicts or db.query(Hand.id).filter(
                     Hand.user_id == user_id,
                     Hand.hand_id == hand_data.get('hand_id')
                 ).first()
@@ -184,6 +206,7 @@ async def process_upload_background(
                                 
                                 db.add(new_tournament)
                                 db.flush()  # Para obter o ID sem fazer commit
+                                performance_service.record_tournaments(db, [new_tournament])
                                 
                                 tournament_db_id = new_tournament.id
                                 tournaments_cache[pokerstars_tournament_id] = tournament_db_id
@@ -194,19 +217,9 @@ async def process_upload_background(
                                 tournament_db_id = None
                 
 
-                # Análise local
-                local_analysis = await local_service.analyze_hand_locally(hand_data)
-                                
-                # Análise básica (sem IA por enquanto para debug)
-                ai_analysis = f"""
-ANÁLISE BÁSICA:
-
-Posição: {hand_data.get('hero_position', 'Desconhecida')}
-Cartas: {hand_data.get('hero_cards', 'Não identificadas')}
-Ação: {hand_data.get('hero_action', 'Não identificada')}
-
-Esta é uma análise básica para debug.
-"""
+                # Análise local (veredito do lote)
+                verdict = verdicts[i]
+                push_fold = verdict.push_fold
                 
                 # Criar registro no banco
                 db_hand = Hand(
@@ -220,12 +233,14 @@ Esta é uma análise básica para debug.
                     hero_position=hand_data.get('hero_position'),
                     hero_cards=hand_data.get('hero_cards'),
                     hero_action=hand_data.get('hero_action'),
+                    hero_stack=hand_data.get('hero_stack'),
                     pot_size=hand_data.get('pot_size'),
                     bet_amount=hand_data.get('bet_amount'),
                     board_cards=hand_data.get('board_cards'),
                     raw_hand=hand_data.get('raw_hand', ''),
-                    ai_analysis=ai_analysis,
-                    local_analysis=local_analysis
+                    push_fold_spot=push_fold['spot'] if push_fold else None,
+                    push_fold_in_chart=push_fold['in_chart'] if push_fold else None,
+                    **verdict.columns()
                 )
                 
                 db.add(db_hand)
@@ -234,6 +249,13 @@ Esta é uma análise básica para debug.
                 # REMOVIDO: Parse avançado durante upload para economizar espaço no banco
                 # As ações serão geradas on-demand quando o usuário clicar em "Ver Análise"
                 
+                # Decisões do herói, contadores de HUD e índice de oponentes entram na mesma transação da mão
+                hero_decision_service.add_hand(db, db_hand)
+                hud_stats_service.add_hands(db, user_id, [hand_data])
+                opponent_service.add_hands(db, user_id, [hand_data])
+                # Análise de IA pela fila; os workers preenchem ai_analysis depois
+                ai_job_queue.enqueue(db, [db_hand])
+                
                 # Commit da mão (sem ações)
                 db.commit()
                 
@@ -0,0 +1,272 @@
+"""
+Fila persistente de análises de IA
+O upload só grava a mão e enfileira um job em ai_analysis_jobs; um pool de
+workers arrenda os jobs (lease com prazo, por UPDATE condicional, seguro com
+vários processos), chama o AIAnalysisService e grava a análise na mão.
+Falhas temporárias voltam para a fila com backoff exponencial até AI_JOB_MAX_ATTEMPTS
+(erros que não se resolvem sozinhos, como 401/403, falham de imediato); o resultado
+só é gravado por quem ainda detém o lease. A mão que o usuário abre ganha prioridade
+e passa na frente do lote do upload.
+"""
+
+import asyncio
+import os
+import uuid
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterable, List, Optional
+
+from sqlalchemy import and_, func, or_
+from sqlalchemy.orm import Session
+
+from app.models.ai_analysis_job import AIAnalysisJob
+from app.models.hand import Hand
+from app.services.ai_service import AIAnalysisService, is_retryable
+from app.services import hand_search_service  # noqa: F401 (listener que indexa a análise gravada)
+
+JOB_PENDING = 'pending'
+JOB_RUNNING = 'running'
+JOB_DONE = 'done'
+JOB_FAILED = 'failed'
+JOB_STATUSES = (JOB_PENDING, JOB_RUNNING, JOB_DONE, JOB_FAILED)
+
+PRIORITY_UPLOAD = 0
+PRIORITY_OPENED = 10  # Mão aberta pelo usuário
+
+
+def hand_data_from_model(hand: Hand) -> Dict:
+    """Campos da mão gravada no formato do parser, para montar o prompt"""
+    return {
+        'hand_id': hand.hand_id,
+        'tournament_id': hand.pokerstars_tournament_id,
+        'table_name': hand.table_name,
+        'date_played': hand.date_played,
+        'hero_name': hand.hero_name,
+        'hero_position': hand.hero_position,
+        'hero_cards': hand.hero_cards,
+        'hero_action': hand.hero_action,
+        'pot_size': hand.pot_size,
+        'bet_amount': hand.bet_amount,
+        'board_cards': hand.board_cards,
+        'raw_hand': hand.raw_hand or '',
+        'local_analysis': hand.local_analysis,
+    }
+
+
+class AIJobQueue:
+    def __init__(self, lease_seconds: Optional[float] = None, max_attempts: Optional[int] = None,
+                 backoff_seconds: Optional[float] = None):
+        self.lease_seconds = lease_seconds if lease_seconds is not None else float(os.getenv("AI_JOB_LEASE_SECONDS", "300"))
+        self.max_attempts = max_attempts if max_attempts is not None else int(os.getenv("AI_JOB_MAX_ATTEMPTS", "5"))
+        self.backoff_seconds = backoff_seconds if backoff_seconds is not None else float(os.getenv("AI_JOB_BACKOFF_SECONDS", "30"))
+
+    def enqueue(self, db: Session, hands: Iterable[Hand], priority: int = PRIORITY_UPLOAD) -> int:
+        """Enfileira as mãos (sem commit; entra na transação do upload)"""
+        new_hands = [hand for hand in hands if hand.ai_job is None]
+        db.add_all(
+            AIAnalysisJob(hand=hand, user_id=hand.user_id, priority=priority, status=JOB_PENDING,
+                          available_at=datetime.utcnow())
+            for hand in new_hands
+        )
+        return len(new_hands)
+
+    def prioritize(self, db: Session, hand_id: int, priority: int = PRIORITY_OPENED) -> bool:
+        """Sobe a prioridade de um job ainda pendente (sem commit)"""
+        updated = db.query(AIAnalysisJob).filter(
+            AIAnalysisJob.hand_id == hand_id,
+            AIAnalysisJob.status == JOB_PENDING,
+            AIAnalysisJob.priority < priority
+        ).update({AIAnalysisJob.priority: priority, AIAnalysisJob.available_at: datetime.utcnow()},
+                 synchronize_session=False)
+        return updated > 0
+
+    def _eligible(self, now: datetime):
+        return or_(
+            and_(AIAnalysisJob.status == JOB_PENDING, AIAnalysisJob.available_at <= now),
+            # Lease vencido: o worker que pegou o job morreu ou travou
+            and_(AIAnalysisJob.status == JOB_RUNNING, AIAnalysisJob.leased_until < now),
+        )
+
+    def lease(self, db: Session, worker_id: str, limit: int = 1) -> List[AIAnalysisJob]:
+        """
+        Arrenda até `limit` jobs, maior prioridade primeiro. Cada job é tomado por um
+        UPDATE condicional; se outro worker chegou antes, o rowcount é 0 e o job é pulado.
+        """
+        now = datetime.utcnow()
+        candidates = [row[0] for row in db.query(AIAnalysisJob.id).filter(self._eligible(now)).order_by(
+            AIAnalysisJob.priority.desc(), AIAnalysisJob.available_at, AIAnalysisJob.id
+        ).limit(limit * 4)]
+
+        claimed = []
+        for job_id in candidates:
+            updated = db.query(AIAnalysisJob).filter(
+                AIAnalysisJob.id == job_id, self._eligible(now)
+            ).update({
+                AIAnalysisJob.status: JOB_RUNNING,
+                AIAnalysisJob.leased_until: now + timedelta(seconds=self.lease_seconds),
+                AIAnalysisJob.locked_by: worker_id,
+                AIAnalysisJob.attempts: AIAnalysisJob.attempts + 1,
+            }, synchronize_session=False)
+            db.commit()
+            if updated:
+                claimed.append(job_id)
+                if len(claimed) == limit:
+                    break
+        if not claimed:
+            return []
+        return db.query(AIAnalysisJob).filter(AIAnalysisJob.id.in_(claimed)).order_by(
+            AIAnalysisJob.priority.desc(), AIAnalysisJob.id
+        ).all()
+
+    def _release(self, db: Session, job: AIAnalysisJob, worker_id: str, values: Dict) -> bool:
+        """
+        UPDATE condicional ao lease: se ele venceu e outro worker retomou o job
+        (ou já o concluiu), o rowcount é 0 e nada é gravado
+        """
+        updated = db.query(AIAnalysisJob).filter(
+            AIAnalysisJob.id == job.id,
+            AIAnalysisJob.status == JOB_RUNNING,
+            AIAnalysisJob.locked_by == worker_id
+        ).update({**values, AIAnalysisJob.leased_until: None}, synchronize_session=False)
+        if not updated:
+            db.rollback()
+            return False
+        return True
+
+    def complete(self, db: Session, job: AIAnalysisJob, analysis: str, worker_id: str) -> bool:
+        """Grava a análise; False se o lease foi perdido"""
+        if not self._release(db, job, worker_id, {
+            AIAnalysisJob.status: JOB_DONE,
+            AIAnalysisJob.last_error: None,
+            AIAnalysisJob.finished_at: datetime.utcnow(),
+        }):
+            return False
+        job.hand.ai_analysis = analysis
+        db.commit()
+        db.refresh(job)
+        return True
+
+    def fail(self, db: Session, job: AIAnalysisJob, worker_id: str, error: str,
+             fallback: Optional[str] = None, retryable: bool = True) -> bool:
+        """
+        Volta para a fila com backoff; na última tentativa (ou se o erro não vale
+        nova tentativa) falha de vez e grava a análise básica. False se o lease foi perdido.
+        """
+        now = datetime.utcnow()
+        final = not retryable or job.attempts >= self.max_attempts
+        if final:
+            values = {AIAnalysisJob.status: JOB_FAILED, AIAnalysisJob.finished_at: now}
+        else:
+            values = {
+                AIAnalysisJob.status: JOB_PENDING,
+                AIAnalysisJob.available_at: now + timedelta(seconds=self.backoff_seconds * 2 ** (job.attempts - 1)),
+            }
+        if not self._release(db, job, worker_id, {**values, AIAnalysisJob.last_error: error[:1000]}):
+            return False
+        if final and fallback and not job.hand.ai_analysis:
+            job.hand.ai_analysis = fallback
+        db.commit()
+        db.refresh(job)
+        return True
+
+    def status_counts(self, db: Session, user_id: Optional[int] = None) -> Dict[str, int]:
+        query = db.query(AIAnalysisJob.status, func.count(AIAnalysisJob.id))
+        if user_id is not None:
+            query = query.filter(AIAnalysisJob.user_id == user_id)
+        counts = dict(query.group_by(AIAnalysisJob.status).all())
+        return {status: counts.get(status, 0) for status in JOB_STATUSES}
+
+
+class AIJobWorkerPool:
+    """Workers asyncio no processo da API (ou no script ai_worker.py)"""
+
+    def __init__(self, ai_service: AIAnalysisService, queue: Optional[AIJobQueue] = None,
+                 session_factory: Optional[Callable[[], Session]] = None,
+                 workers: Optional[int] = None, poll_seconds: Optional[float] = None):
+        self.ai_service = ai_service
+        self.queue = queue or AIJobQueue()
+        self._session_factory = session_factory
+        self.workers = workers if workers is not None else int(os.getenv("AI_WORKERS", "4"))
+        self.poll_seconds = poll_seconds if poll_seconds is not None else float(os.getenv("AI_JOB_POLL_SECONDS", "2"))
+        self.name = f"{os.getpid()}-{uuid.uuid4().hex[:6]}"
+        self._tasks: List[asyncio.Task] = []
+        self._wake: Optional[asyncio.Event] = None
+
+    def session(self) -> Session:
+        if self._session_factory is None:
+            from app.models.database import SessionLocal
+            self._session_factory = SessionLocal
+        return self._session_factory()
+
+    async def run_once(self, worker_id: str) -> bool:
+        """Processa um job; False se a fila estiver vazia"""
+        db = self.session()
+        try:
+            jobs = self.queue.lease(db, worker_id)
+            if not jobs:
+                return False
+            job = jobs[0]
+            hand_data = hand_data_from_model(job.hand)
+            retryable = True
+            try:
+                analysis = await self.ai_service.analyze_hand(hand_data, job.user_id, fallback=False)
+            except Exception as e:
+                analysis, error, retryable = None, str(e), is_retryable(e)
+            else:
+                error = "IA indisponível"
+            if analysis:
+                released = self.queue.complete(db, job, analysis, worker_id)
+            else:
+                print(f"⚠️ Análise da mão {job.hand_id} falhou (tentativa {job.attempts}): {error}")
+                released = self.queue.fail(db, job, worker_id, error,
+                                           self.ai_service._fallback_analysis(hand_data), retryable)
+            if not released:
+                print(f"⚠️ Lease do job da mão {job.hand_id} perdido; resultado descartado")
+            return True
+        finally:
+            db.close()
+
+    async def drain(self) -> int:
+        """Processa até a fila esvaziar (jobs em backoff ficam para depois)"""
+        processed = 0
+        while True:
+            done = await asyncio.gather(*(self.run_once(f"{self.name}-{i}") for i in range(max(self.workers, 1))))
+            if not any(done):
+                return processed
+            processed += sum(done)
+
+    async def _worker(self, worker_id: str):
+        while True:
+            try:
+                if await self.run_once(worker_id):
+                    continue
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"❌ Worker de IA {worker_id}: {e}")
+            self._wake.clear()
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.poll_seconds)
+            except asyncio.TimeoutError:
+                pass
+
+    def notify(self):
+        """Acorda os workers ociosos (novos jobs enfileirados neste processo)"""
+        if self._wake is not None:
+            self._wake.set()
+
+    def start(self):
+        if self._tasks or self.workers <= 0:
+            return
+        self._wake = asyncio.Event()
+        self._tasks = [asyncio.create_task(self._worker(f"{self.name}-{i}")) for i in range(self.workers)]
+        print(f"🤖 {self.workers} workers de análise de IA iniciados")
+
+    async def join(self):
+        """Aguarda os workers (até stop() ou cancelamento)"""
+        await asyncio.gather(*self._tasks)
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
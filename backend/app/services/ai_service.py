@@ -1,112 +1,261 @@
+import asyncio
+import random
+import time
 import httpx
 import os
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 from dotenv import load_dotenv
 
+from app.services.analysis_cache_service import AnalysisCache, describe_situation, situation_signature
+from app.services.hand_encoding_service import ENCODING_LEGEND, encode_hand, local_analysis_notes
+
 load_dotenv()
 
+SYSTEM_PROMPT = "Você é um especialista em poker GTO (Game Theory Optimal) focado em torneios (MTTs). Analise mãos de poker e forneça feedback técnico detalhado."
+
+ANALYSIS_SECTIONS = """RESPONDA EM SEÇÕES CURTAS:
+1. **RESUMO DA SITUAÇÃO**: stacks relativos, posição e dinâmica da mão
+2. **AVALIAÇÃO DA JOGADA**: Excelente/Boa/Aceitável/Ruim/Terrível, com justificativa GTO
+3. **ANÁLISE TÉCNICA**: ranges, pot odds/implied odds, leitura das ações dos oponentes
+4. **ALTERNATIVAS ESTRATÉGICAS**: outras linhas e quando preferi-las
+5. **PONTOS DE MELHORIA**: gaps identificados e conceitos para estudar
+6. **CONTEXTO DE TORNEIO**: ICM, estágio do torneio e gestão de stack, quando relevante
+"""
+
+# Respostas que valem nova tentativa (limite de taxa e falhas temporárias do provedor)
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+
+def is_retryable(error: Exception) -> bool:
+    """Falhas de rede e status de RETRY_STATUS; 4xx (ex.: 401/403 sem API key válida) não se resolvem sozinhos"""
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code in RETRY_STATUS
+    return True
+
+
+class TokenBucket:
+    """Limite de taxa por usuário: `rate` requisições por segundo, rajadas de até `capacity`"""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
 class AIAnalysisService:
-    def __init__(self):
+    def __init__(self, transport: Optional[httpx.AsyncBaseTransport] = None):
         self.api_key = os.getenv("OPENROUTER_API_KEY") or os.getenv("OPENAI_API_KEY")
         self.base_url = os.getenv("OPENROUTER_BASE_URL", "https://openrouter.ai/api/v1")
         self.model = "mistralai/mistral-7b-instruct"
 
-    async def analyze_hand(self, hand_data: Dict) -> Optional[str]:
-        """Analisa uma mão de poker usando IA"""
-        try:
-            prompt = self._build_analysis_prompt(hand_data)
-            
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{self.base_url}/chat/completions",
-                    headers={
-                        "Authorization": f"Bearer {self.api_key}",
-                        "Content-Type": "application/json"
-                    },
-                    json={
-                        "model": self.model,
-                        "messages": [
-                            {
-                                "role": "system",
-                                "content": "Você é um especialista em poker GTO (Game Theory Optimal) focado em torneios (MTTs). Analise mãos de poker e forneça feedback técnico detalhado."
-                            },
-                            {
-                                "role": "user",
-                                "content": prompt
-                            }
-                        ],
-                        "max_tokens": 1000,
-                        "temperature": 0.7
-                    },
-                    timeout=30.0
-                )
-                
+        # Cliente compartilhado (keep-alive) e paralelismo limitado
+        self.max_concurrency = int(os.getenv("AI_MAX_CONCURRENCY", "8"))
+        self.max_retries = int(os.getenv("AI_MAX_RETRIES", "3"))
+        self.backoff_base = float(os.getenv("AI_BACKOFF_BASE", "0.5"))
+        self.timeout = float(os.getenv("AI_TIMEOUT", "30"))
+        self.user_rate_per_minute = float(os.getenv("AI_USER_RATE_PER_MINUTE", "120"))
+        self.user_burst = float(os.getenv("AI_USER_BURST", "20"))
+        self._transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._buckets: Dict[int, TokenBucket] = {}
+
+        # Cache por usuário e assinatura da situação; chamadas simultâneas da mesma
+        # situação esperam a primeira em vez de repetir a chamada ao LLM
+        self.cache = AnalysisCache()
+        self._in_flight: Dict[str, asyncio.Future] = {}
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Cliente HTTP de longa duração: reaproveita conexões TCP/TLS entre mãos"""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                headers={
+                    "Authorization": f"Bearer {self.api_key}",
+                    "Content-Type": "application/json"
+                },
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=self.max_concurrency,
+                    max_keepalive_connections=self.max_concurrency
+                ),
+                transport=self._transport
+            )
+        return self._client
+
+    @property
+    def semaphore(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    def _bucket(self, user_id: Optional[int]) -> Optional[TokenBucket]:
+        if user_id is None or self.user_rate_per_minute <= 0:
+            return None
+        if user_id not in self._buckets:
+            self._buckets[user_id] = TokenBucket(self.user_rate_per_minute / 60.0, self.user_burst)
+        return self._buckets[user_id]
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _complete(self, messages: List[Dict], user_id: Optional[int] = None, max_tokens: int = 1000) -> str:
+        """
+        Chamada de chat completion com limite por usuário, semáforo global e
+        novas tentativas com backoff exponencial e jitter (respeita Retry-After).
+        Levanta exceção se todas as tentativas falharem.
+        """
+        bucket = self._bucket(user_id)
+        if bucket:
+            await bucket.acquire()
+
+        payload = {
+            "model": self.model,
+            "messages": messages,
+            "max_tokens": max_tokens,
+            "temperature": 0.7
+        }
+        for attempt in range(self.max_retries + 1):
+            retry_after = None
+            try:
+                async with self.semaphore:
+                    response = await self.client.post("/chat/completions", json=payload)
                 if response.status_code == 200:
-                    result = response.json()
-                    return result["choices"][0]["message"]["content"]
-                else:
-                    print(f"Erro na API: {response.status_code} - {response.text}")
-                    return self._fallback_analysis(hand_data)
-                    
+                    return response.json()["choices"][0]["message"]["content"]
+                if response.status_code not in RETRY_STATUS or attempt == self.max_retries:
+                    raise httpx.HTTPStatusError(
+                        f"Erro na API: {response.status_code} - {response.text}",
+                        request=response.request, response=response
+                    )
+                retry_after = response.headers.get("Retry-After")
+            except httpx.TransportError:
+                if attempt == self.max_retries:
+                    raise
+
+            delay = self.backoff_base * (2 ** attempt) * random.uniform(0.5, 1.5)
+            if retry_after:
+                try:
+                    delay = max(delay, float(retry_after))
+                except ValueError:
+                    pass
+            await asyncio.sleep(delay)
+
+    async def analyze_hand(self, hand_data: Dict, user_id: Optional[int] = None,
+                           fallback: bool = True) -> Optional[str]:
+        """
+        Analisa uma mão de poker usando IA (situações repetidas vêm do cache).
+        Se a IA falhar, devolve a análise básica; com fallback=False a exceção sobe
+        (ou None, se esperava outra chamada da mesma situação que falhou).
+        """
+        situation = situation_signature(hand_data)
+        if situation is None:
+            return await self._analyze_uncached(hand_data, user_id, fallback)
+        # Cache por usuário; o prompt sai só da assinatura, então nada da mão original vaza
+        signature = f"{user_id if user_id is not None else '-'}|{situation}"
+
+        cached = self.cache.get(signature)
+        if cached is not None:
+            return cached
+        pending = self._in_flight.get(signature)
+        if pending is not None:
+            analysis = await asyncio.shield(pending)
+            return analysis if analysis is not None or not fallback else self._fallback_analysis(hand_data)
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[signature] = future
+        analysis = None
+        try:
+            analysis = await self._analyze_uncached(hand_data, user_id, fallback=False, situation=situation)
+            if analysis is not None:
+                self.cache.set(signature, analysis)
+        except Exception:
+            if not fallback:
+                raise
+        finally:
+            del self._in_flight[signature]
+            future.set_result(analysis)
+        return analysis if analysis is not None or not fallback else self._fallback_analysis(hand_data)
+
+    async def _analyze_uncached(self, hand_data: Dict, user_id: Optional[int] = None,
+                                fallback: bool = True, situation: Optional[str] = None) -> Optional[str]:
+        """Chamada ao LLM; com a assinatura da situação, o prompt não leva nada específico da mão"""
+        try:
+            if situation is not None:
+                prompt = self._build_situation_prompt(situation)
+            else:
+                prompt = self._build_analysis_prompt(hand_data)
+            return await self._complete([
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {"role": "user", "content": prompt}
+            ], user_id)
         except Exception as e:
             print(f"Erro ao analisar mão: {e}")
+            if not fallback:
+                raise
             return self._fallback_analysis(hand_data)
 
-    def _build_analysis_prompt(self, hand_data: Dict) -> str:
-        """Constrói o prompt para análise da mão"""
-        prompt = f"""
-Você é um coach profissional de poker especializado em torneios (MTTs) e estratégia GTO. Analise esta mão de poker e forneça feedback técnico detalhado.
-
-INFORMAÇÕES DA MÃO:
-- ID da Mão: {hand_data.get("hand_id", "N/A")}
-- Torneio: {hand_data.get("tournament_id", "N/A")}
-- Mesa: {hand_data.get("table_name", "N/A")}
-- Herói: {hand_data.get("hero_name", "N/A")}
-- Posição: {hand_data.get("hero_position", "N/A")}
-- Cartas do Herói: {hand_data.get("hero_cards", "N/A")}
-- Ação Principal: {hand_data.get("hero_action", "N/A")}
-- Stack do Herói: {hand_data.get("hero_stack", "N/A")}
-- Tamanho do Pot: {hand_data.get("pot_size", "N/A")}
-- Board: {hand_data.get("board_cards", "N/A")}
+    async def analyze_hands(self, hands: List[Dict], user_id: Optional[int] = None) -> List[str]:
+        """Analisa várias mãos em paralelo (limitado pelo semáforo), na ordem recebida"""
+        return await asyncio.gather(*(self.analyze_hand(hand_data, user_id) for hand_data in hands))
 
-HAND HISTORY COMPLETA:
-{hand_data.get("raw_hand", "")}
+    async def analyze_custom_prompt(self, prompt: str, user_id: Optional[int] = None) -> str:
+        """Análise livre (ex.: uma ação específica da mão); exceções sobem para quem chamou"""
+        return await self._complete([
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": prompt}
+        ], user_id)
 
-ANÁLISE LOCAL (gerada pelo sistema):
-{hand_data.get("local_analysis", "N/A")}
+    def _build_analysis_prompt(self, hand_data: Dict) -> str:
+        """
+        Constrói o prompt para análise da mão, com a mão na codificação compacta
+        (hand_encoding_service); o hand history completo só entra se a codificação falhar
+        """
+        encoded = encode_hand(hand_data.get("raw_hand", ""))
+        if encoded:
+            hand_text = f"MÃO ({ENCODING_LEGEND}):\n{encoded}"
+        else:
+            hand_text = f"""Herói: {hand_data.get("hero_name", "N/A")} | Posição: {hand_data.get("hero_position", "N/A")} | Cartas: {hand_data.get("hero_cards", "N/A")}
 
-ANÁLISE SOLICITADA:
+HAND HISTORY COMPLETA:
+{hand_data.get("raw_hand", "")}"""
 
-1. **RESUMO DA SITUAÇÃO**
-   - Contexto da mão (nível de blinds, stack sizes relativos)
-   - Dinâmica da mesa e posicionamento
+        notes = local_analysis_notes(hand_data.get("local_analysis"))
+        notes_text = "\n\nNOTAS DA ANÁLISE LOCAL:\n" + "\n".join(notes) if notes else ""
 
-2. **AVALIAÇÃO DA JOGADA**
-   - A ação do herói foi correta? (Escala: Excelente/Boa/Aceitável/Ruim/Terrível)
-   - Justificativa técnica baseada em GTO
+        return f"""Analise esta mão de torneio (MTT) como coach de poker GTO.
 
-3. **ANÁLISE TÉCNICA**
-   - Range de mãos apropriado para a posição
-   - Considerações sobre pot odds e implied odds
-   - Leitura de oponentes baseada nas ações
+{hand_text}{notes_text}
 
-4. **ALTERNATIVAS ESTRATÉGICAS**
-   - Outras linhas de jogo possíveis
-   - Quando cada alternativa seria preferível
+{ANALYSIS_SECTIONS}"""
 
-5. **PONTOS DE MELHORIA**
-   - Gaps específicos identificados
-   - Conceitos para estudar
-   - Situações similares para praticar
+    def _build_situation_prompt(self, situation: str) -> str:
+        """
+        Prompt das análises servidas do cache: só posição, classe da mão, faixa de stack,
+        linha de ações e textura do board, sem cartas exatas nem nomes de jogadores
+        """
+        return f"""Analise esta situação de torneio (MTT) como coach de poker GTO.
+A análise vale para todas as mãos da mesma situação: não cite naipes, cartas exatas do board nem nomes.
 
-6. **CONTEXTO DE TORNEIO**
-   - Considerações sobre ICM (Independent Chip Model)
-   - Ajustes baseados no estágio do torneio
-   - Gestão de stack e bubble considerations
+SITUAÇÃO:
+{describe_situation(situation)}
 
-Seja específico, educativo e construtivo. Use terminologia técnica apropriada mas mantenha explicações claras.
-"""
-        return prompt
+{ANALYSIS_SECTIONS}"""
 
     def _fallback_analysis(self, hand_data: Dict) -> str:
         """Análise básica quando a IA não está disponível"""
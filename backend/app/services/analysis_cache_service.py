@@ -0,0 +1,157 @@
+"""
+Cache de análises de IA por situação
+Mãos estrategicamente iguais ("UTG folda 72o com 40 BB") recebem a mesma
+assinatura canônica: posição, classe da mão, faixa de stack, linha de ações
+(com os tamanhos de aposta em BB) e classe de textura do board. A análise de uma
+situação já vista é servida do cache (LRU com TTL) em vez de uma nova chamada ao LLM.
+O prompt dessas chamadas sai só da assinatura (describe_situation): a análise em cache
+não cita cartas, naipes ou nomes de uma mão específica.
+"""
+
+import os
+import re
+from typing import Dict, Optional
+
+from app.utils.board_texture import FLAG_MASK, board_texture, texture_high_rank, texture_names
+from app.utils.lru_cache import LRUCache
+from app.utils.ranges import hand_class
+
+# Faixas de stack efetivo em BB (limite superior de cada faixa)
+STACK_BUCKETS = (10, 15, 20, 30, 50, 100)
+
+ACTION_SYMBOLS = {'folds': 'f', 'checks': 'x', 'calls': 'c', 'bets': 'b', 'raises': 'r'}
+
+SITUATION_LEGEND = (
+    "streets separadas por '/', herói em maiúsculas, f=fold x=check c=call b=bet r=raise "
+    "com o tamanho total em BB; folds dos oponentes omitidos"
+)
+
+_patterns = {
+    'blinds': r'Level [IVXLC]+ \((\d+)/(\d+)\)',
+    'seat': r'^Seat \d+: (.+?) \((\d+) in chips',
+    'action': r'^(.+?): (folds|checks|calls|bets|raises)\b(?: \d+ to (\d+)| (\d+))?',
+}
+
+
+def stack_bucket(stack_bb: float) -> str:
+    lower = 0
+    for upper in STACK_BUCKETS:
+        if stack_bb < upper:
+            return f"{lower}-{upper}"
+        lower = upper
+    return f"{lower}+"
+
+
+def _size(amount: Optional[str], big_blind: float) -> str:
+    """Tamanho da aposta em BB, arredondado a 0.5 BB"""
+    if not amount:
+        return ''
+    return f"{round(float(amount) / big_blind * 2) / 2:g}"
+
+
+def _action_line(raw_hand: str, hero: str, big_blind: float) -> Optional[Dict]:
+    """
+    Linha de ações até a última decisão do herói: símbolos por street separados
+    por '/', herói em maiúsculas, apostas e raises com o tamanho total em BB;
+    folds de outros jogadores são omitidos.
+    """
+    streets = []
+    current = None
+    stacks = {}
+    last_hero_street = -1
+    for line in raw_hand.split('\n'):
+        line = line.strip()
+        if line.startswith('***'):
+            if 'HOLE CARDS' in line or 'FLOP' in line or 'TURN' in line or 'RIVER' in line:
+                current = []
+                streets.append(current)
+            elif current is not None:
+                break
+            continue
+        if current is None:
+            seat = re.match(_patterns['seat'], line)
+            if seat:
+                stacks[seat.group(1).strip()] = float(seat.group(2))
+            continue
+        action = re.match(_patterns['action'], line)
+        if not action:
+            continue
+        player, verb = action.group(1).strip(), action.group(2)
+        size = _size(action.group(3) or action.group(4), big_blind) if verb in ('bets', 'raises') else ''
+        if player == hero:
+            current.append(ACTION_SYMBOLS[verb].upper() + size)
+            last_hero_street = len(streets) - 1
+        elif verb != 'folds':
+            current.append(ACTION_SYMBOLS[verb] + size)
+
+    if last_hero_street < 0:
+        return None
+    streets = streets[:last_hero_street + 1]
+    last = streets[-1]
+    hero_last = max(i for i, symbol in enumerate(last) if symbol[0].isupper())
+    streets[-1] = last[:hero_last + 1]
+    return {'line': '/'.join(''.join(street) for street in streets), 'streets': len(streets), 'stacks': stacks}
+
+
+def situation_signature(hand_data: Dict) -> Optional[str]:
+    """Assinatura canônica da situação do herói, ou None se faltar informação"""
+    raw_hand = hand_data.get('raw_hand') or ''
+    hero = hand_data.get('hero_name')
+    blinds = re.search(_patterns['blinds'], raw_hand)
+    if not raw_hand or not hero or not blinds or not hand_data.get('hero_cards'):
+        return None
+    try:
+        holding = hand_class(hand_data['hero_cards'])
+    except ValueError:
+        return None
+
+    big_blind = float(blinds.group(2))
+    action = _action_line(raw_hand, hero, big_blind)
+    if not action or hero not in action['stacks']:
+        return None
+    opponents = [stack for name, stack in action['stacks'].items() if name != hero]
+    effective = min(action['stacks'][hero], max(opponents)) if opponents else action['stacks'][hero]
+
+    # Textura só das cartas que o herói viu antes da última decisão
+    board = (hand_data.get('board_cards') or '').split()
+    visible = {1: 0, 2: 3, 3: 4, 4: 5}[action['streets']]
+    texture = 'pf'
+    if visible:
+        try:
+            code = board_texture(board[:visible])
+            texture = f"{code & FLAG_MASK}{'h' if texture_high_rank(code) >= 8 else 'l'}"
+        except ValueError:
+            return None
+
+    return '|'.join((
+        hand_data.get('hero_position') or '?',
+        holding,
+        stack_bucket(effective / big_blind),
+        action['line'],
+        texture,
+    ))
+
+
+def describe_situation(signature: str) -> str:
+    """Texto da situação montado só com os campos da assinatura, para o prompt do LLM"""
+    position, holding, stack, line, texture = signature.split('|')
+    if texture == 'pf':
+        board = 'pré-flop'
+    else:
+        names = texture_names(int(texture[:-1])) or ['rainbow', 'sem par', 'desconectado']
+        board = f"{', '.join(names)}; carta mais alta {'T ou maior' if texture[-1] == 'h' else 'abaixo de T'}"
+    return (
+        f"Posição do herói: {position} | Mão: {holding} | Stack efetivo: {stack} BB\n"
+        f"Linha de ações ({SITUATION_LEGEND}): {line}\n"
+        f"Board: {board}"
+    )
+
+
+class AnalysisCache(LRUCache):
+    """Cache das análises por assinatura, com limites de AI_CACHE_MAX_ENTRIES / AI_CACHE_TTL_SECONDS"""
+
+    def __init__(self, max_entries: Optional[int] = None, ttl_seconds: Optional[float] = None):
+        super().__init__(
+            max_entries if max_entries is not None else int(os.getenv("AI_CACHE_MAX_ENTRIES", "5000")),
+            ttl_seconds if ttl_seconds is not None else float(os.getenv("AI_CACHE_TTL_SECONDS", "604800"))
+        )
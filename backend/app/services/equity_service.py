@@ -0,0 +1,229 @@
+"""
+Cálculo de equity do herói contra um ou mais ranges em qualquer street.
+Enumeração exata quando o número de combinações é pequeno; Monte Carlo
+vetorizado (NumPy) caso contrário, com opção de pool de processos para potes multiway.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import combinations, product
+from math import comb
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from app.utils.hand_evaluator import evaluate, parse_cards
+from app.utils.ranges import Range
+
+_process_pool: Optional[ProcessPoolExecutor] = None
+_process_pool_workers = 0
+
+
+def _showdown_shares(hero_scores: np.ndarray, villain_scores: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Retorna (fração do pote do herói, flag de empate) por amostra"""
+    best = np.maximum(hero_scores, villain_scores.max(axis=1))
+    hero_best = hero_scores == best
+    tied = (villain_scores == best[:, None]).sum(axis=1)
+    share = hero_best / (1 + tied)
+    return share, hero_best & (tied > 0)
+
+
+def _summarize(share: np.ndarray, tie: np.ndarray, method: str) -> Dict:
+    samples = int(share.shape[0])
+    if samples == 0:
+        return {'equity': None, 'win': None, 'tie': None, 'samples': 0, 'method': method}
+    return {
+        'equity': float(share.mean()),
+        'win': float((share == 1.0).mean()),
+        'tie': float(tie.mean()),
+        'samples': samples,
+        'method': method,
+    }
+
+
+def _exact(hero: Tuple[int, ...], board: Tuple[int, ...], combo_arrays: List[np.ndarray]) -> Dict:
+    """Enumeração completa de combos dos vilões x runouts do board"""
+    dead = set(hero) | set(board)
+    missing = 5 - len(board)
+
+    villain_sets = []
+    for combo_set in product(*(arr.tolist() for arr in combo_arrays)):
+        cards = [c for combo in combo_set for c in combo]
+        if len(set(cards)) == len(cards):
+            villain_sets.append(cards)
+    if not villain_sets:
+        return _summarize(np.empty(0), np.empty(0, dtype=bool), 'exact')
+
+    villains = np.array(villain_sets, dtype=np.int64)           # (V, 2 * n)
+    deck = [c for c in range(52) if c not in dead]
+    runout_list = list(combinations(deck, missing))
+    runouts = np.array(runout_list, dtype=np.int64).reshape(len(runout_list), missing)
+
+    # Todos os pares (vilões, runout) sem cartas em comum
+    used = np.zeros((villains.shape[0], 52), dtype=bool)
+    np.put_along_axis(used, villains, True, axis=1)
+    valid = ~used[:, runouts].any(axis=2)                        # (V, R)
+    v_idx, r_idx = np.nonzero(valid)
+
+    full_board = np.concatenate(
+        [np.broadcast_to(np.array(board, dtype=np.int64), (len(r_idx), len(board))), runouts[r_idx]],
+        axis=1,
+    )
+    hero_scores = evaluate(np.concatenate([np.broadcast_to(np.array(hero), (len(r_idx), 2)), full_board], axis=1))
+    villain_scores = np.stack(
+        [
+            evaluate(np.concatenate([villains[v_idx, 2 * i:2 * i + 2], full_board], axis=1))
+            for i in range(len(combo_arrays))
+        ],
+        axis=1,
+    )
+    share, tie = _showdown_shares(hero_scores, villain_scores)
+    return _summarize(share, tie, 'exact')
+
+
+def _monte_carlo_chunk(hero: Tuple[int, ...], board: Tuple[int, ...],
+                       combo_arrays: List[np.ndarray], iterations: int, seed: int) -> Tuple[float, float, float, int]:
+    """Monte Carlo vetorizado; retorna (soma das frações, vitórias, empates, amostras válidas)"""
+    rng = np.random.default_rng(seed)
+    dead = np.zeros(52, dtype=bool)
+    dead[list(hero) + list(board)] = True
+    missing = 5 - len(board)
+
+    share_total = 0.0
+    win_total = 0.0
+    tie_total = 0.0
+    valid_total = 0
+    # Rejeição das amostras com cartas repetidas entre vilões; poucas rodadas bastam
+    for _ in range(8):
+        needed = iterations - valid_total
+        if needed <= 0:
+            break
+        villains = np.concatenate(
+            [arr[rng.integers(arr.shape[0], size=needed)] for arr in combo_arrays], axis=1
+        )
+        if len(combo_arrays) > 1:
+            ordered = np.sort(villains, axis=1)
+            villains = villains[(np.diff(ordered, axis=1) != 0).all(axis=1)]
+        if villains.shape[0] == 0:
+            continue
+        n = villains.shape[0]
+
+        keys = rng.random((n, 52))
+        keys[:, dead] = 2.0
+        np.put_along_axis(keys, villains, 2.0, axis=1)
+        if missing:
+            runout = np.argpartition(keys, missing - 1, axis=1)[:, :missing]
+        else:
+            runout = np.empty((n, 0), dtype=np.int64)
+        full_board = np.concatenate([np.broadcast_to(np.array(board, dtype=np.int64), (n, len(board))), runout], axis=1)
+
+        hero_scores = evaluate(np.concatenate([np.broadcast_to(np.array(hero), (n, 2)), full_board], axis=1))
+        villain_scores = np.stack(
+            [evaluate(np.concatenate([villains[:, 2 * i:2 * i + 2], full_board], axis=1))
+             for i in range(len(combo_arrays))],
+            axis=1,
+        )
+        share, tie = _showdown_shares(hero_scores, villain_scores)
+        share_total += float(share.sum())
+        win_total += float((share == 1.0).sum())
+        tie_total += float(tie.sum())
+        valid_total += n
+
+    return share_total, win_total, tie_total, valid_total
+
+
+def _get_process_pool() -> Tuple[ProcessPoolExecutor, int]:
+    """Pool de processos compartilhado e o número de workers dele"""
+    global _process_pool, _process_pool_workers
+    if _process_pool is None:
+        _process_pool_workers = max(1, int(os.getenv("EQUITY_WORKERS", os.cpu_count() or 2)))
+        _process_pool = ProcessPoolExecutor(max_workers=_process_pool_workers)
+    return _process_pool, _process_pool_workers
+
+
+class EquityService:
+    def __init__(self, exact_threshold: int = 250_000, default_iterations: int = 20_000):
+        self.exact_threshold = exact_threshold
+        self.default_iterations = default_iterations
+
+    def calculate_equity(
+        self,
+        hero_cards: Union[str, Sequence[str]],
+        board_cards: Union[str, Sequence[str], None],
+        villain_ranges: Sequence[Union[str, Sequence[str], Range]],
+        iterations: Optional[int] = None,
+        use_processes: bool = False,
+    ) -> Dict:
+        """
+        Equity do herói contra um range por oponente.
+
+        hero_cards: 'Ah Kd' ou ['Ah', 'Kd']
+        board_cards: 0, 3, 4 ou 5 cartas
+        villain_ranges: objetos Range ou notação, ex. ['22+, A2s+, KTo+', 'random']
+        """
+        hero = parse_cards(hero_cards)
+        board = parse_cards(board_cards)
+        if len(hero) != 2:
+            raise ValueError("O herói precisa de exatamente 2 cartas")
+        if len(board) not in (0, 3, 4, 5):
+            raise ValueError("O board precisa ter 0, 3, 4 ou 5 cartas")
+        if set(hero) & set(board):
+            raise ValueError("Cartas do herói repetidas no board")
+        if not villain_ranges:
+            raise ValueError("Informe pelo menos um range de oponente")
+
+        # Chave canônica: ordem das cartas e dos oponentes não altera a equity
+        ranges = tuple(sorted(Range.parse(r) for r in villain_ranges))
+        result = _calculate_cached(
+            tuple(sorted(hero)),
+            tuple(sorted(board)),
+            ranges,
+            iterations or self.default_iterations,
+            use_processes,
+            self.exact_threshold,
+        )
+        return dict(result)
+
+    def cache_info(self):
+        return _calculate_cached.cache_info()
+
+
+@lru_cache(maxsize=2048)
+def _calculate_cached(hero: Tuple[int, ...], board: Tuple[int, ...], ranges: Tuple[Range, ...],
+                      iterations: int, use_processes: bool, exact_threshold: int) -> Dict:
+    missing = 5 - len(board)
+    remaining = 52 - len(hero) - len(board) - 2 * len(ranges)
+    # Remoção de cartas: combos que usam cartas do herói ou do board saem do range
+    combo_arrays = [r.combos(list(hero) + list(board)) for r in ranges]
+    if any(arr.shape[0] == 0 for arr in combo_arrays):
+        return {'equity': None, 'win': None, 'tie': None, 'samples': 0, 'method': 'exact'}
+
+    enumeration_size = comb(remaining, missing)
+    for arr in combo_arrays:
+        enumeration_size *= arr.shape[0]
+
+    if enumeration_size <= exact_threshold:
+        return _exact(hero, board, combo_arrays)
+
+    if use_processes and len(ranges) > 1:
+        pool, workers = _get_process_pool()
+        chunk = -(-iterations // workers)
+        futures = [
+            pool.submit(_monte_carlo_chunk, hero, board, combo_arrays, chunk, seed)
+            for seed in range(workers)
+        ]
+        totals = [f.result() for f in futures]
+        share_total, win_total, tie_total, samples = (sum(values) for values in zip(*totals))
+    else:
+        share_total, win_total, tie_total, samples = _monte_carlo_chunk(hero, board, combo_arrays, iterations, 0)
+
+    if samples == 0:
+        return {'equity': None, 'win': None, 'tie': None, 'samples': 0, 'method': 'monte_carlo'}
+    return {
+        'equity': share_total / samples,
+        'win': win_total / samples,
+        'tie': tie_total / samples,
+        'samples': samples,
+        'method': 'monte_carlo',
+    }
@@ -0,0 +1,226 @@
+"""
+Motor de regras de gaps sobre as decisões estruturadas (hero_decisions)
+Uma consulta carrega as decisões recentes do usuário em colunas NumPy; cada regra
+é um par de máscaras vetorizadas (oportunidade, leak) avaliado sobre o conjunto
+inteiro de uma vez. Resultado por regra: oportunidades, leaks, frequência,
+mãos de exemplo e confiança de que a frequência real passa do limite da regra.
+"""
+
+import math
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.models.hand import Hand
+from app.models.hero_decision import HeroDecision
+from app.services.hero_decision_service import (
+    ACTION_CODES, FACING_BET, FACING_NONE, FACING_OPEN, POSITION_CODES, STREET_CODES
+)
+
+DECISION_COLUMNS = (
+    'hand_id', 'decision_order', 'street', 'position', 'stack_bb10', 'to_call_bb10',
+    'facing', 'aggressor_position', 'in_position', 'action',
+)
+SAMPLE_HANDS = 10
+HANDS_COUNTER = 'hands_analyzed'  # Contador diário de mãos, ao lado das regras
+MIN_OPPORTUNITIES = 5
+MIN_CONFIDENCE = 0.8
+
+Columns = Dict[str, np.ndarray]
+
+
+@dataclass(frozen=True)
+class GapRule:
+    name: str
+    description: str
+    suggestion: str
+    threshold: float  # Frequência de leak acima da qual a regra acusa o gap
+    opportunity: Callable[[Columns], np.ndarray]
+    leak: Callable[[Columns], np.ndarray]
+
+
+def _is(column: np.ndarray, *values) -> np.ndarray:
+    return np.isin(column, values)
+
+
+EARLY_POSITIONS = tuple(POSITION_CODES[p] for p in ('UTG', 'UTG+1', 'MP', 'LJ'))
+STEAL_POSITIONS = tuple(POSITION_CODES[p] for p in ('CO', 'BTN', 'SB'))
+
+GAP_RULES = (
+    GapRule(
+        name='open_limp_ep',
+        description='Open-limp em posição inicial',
+        suggestion='Em posição inicial, entre no pote com raise ou desista da mão',
+        threshold=0.05,
+        opportunity=lambda c: (c['street'] == STREET_CODES['preflop']) & (c['facing'] == FACING_NONE)
+            & _is(c['position'], *EARLY_POSITIONS) & c['first_on_street'],
+        leak=lambda c: c['action'] == ACTION_CODES['call'],
+    ),
+    GapRule(
+        name='missed_cbet_ip',
+        description='C-bet perdida em posição',
+        suggestion='Como agressor pré-flop em posição, aposte o flop com mais frequência quando checarem para você',
+        threshold=0.5,
+        opportunity=lambda c: (c['street'] == STREET_CODES['flop']) & (c['facing'] == FACING_NONE)
+            & c['first_on_street'] & c['in_position'] & c['preflop_aggressor'],
+        leak=lambda c: c['action'] == ACTION_CODES['check'],
+    ),
+    GapRule(
+        name='bb_overfold',
+        description='Fold excessivo no BB contra roubo',
+        suggestion='Defenda o BB com mais mãos contra opens de CO, BTN e SB (pot odds favoráveis)',
+        threshold=0.6,
+        opportunity=lambda c: (c['street'] == STREET_CODES['preflop']) & (c['position'] == POSITION_CODES['BB'])
+            & (c['facing'] == FACING_OPEN) & _is(c['aggressor_position'], *STEAL_POSITIONS)
+            & (c['to_call_bb10'] <= 30) & (c['stack_bb10'] > 150) & c['first_on_street'],
+        leak=lambda c: c['action'] == ACTION_CODES['fold'],
+    ),
+    GapRule(
+        name='fold_to_cbet',
+        description='Fold excessivo contra c-bet no flop',
+        suggestion='Continue contra c-bets com pares, draws e overcards com backdoors',
+        threshold=0.55,
+        opportunity=lambda c: (c['street'] == STREET_CODES['flop']) & (c['facing'] == FACING_BET)
+            & ~c['preflop_aggressor'],
+        leak=lambda c: c['action'] == ACTION_CODES['fold'],
+    ),
+    GapRule(
+        name='passive_postflop',
+        description='Jogo passivo no pós-flop',
+        suggestion='Quando ninguém apostou, aposte por valor e como bluff em vez de checar sempre',
+        threshold=0.8,
+        opportunity=lambda c: (c['street'] > STREET_CODES['preflop']) & (c['facing'] == FACING_NONE),
+        leak=lambda c: c['action'] == ACTION_CODES['check'],
+    ),
+)
+
+
+def exceed_confidence(leaks: int, opportunities: int, threshold: float) -> float:
+    """P(frequência real > limite), aproximação normal da binomial"""
+    if opportunities <= 0:
+        return 0.0
+    rate = leaks / opportunities
+    spread = math.sqrt(threshold * (1 - threshold) / opportunities)
+    return 0.5 * (1 + math.erf((rate - threshold) / (spread * math.sqrt(2))))
+
+
+class GapRulesService:
+    def __init__(self, rules=GAP_RULES):
+        self.rules = rules
+
+    def load_columns(self, db: Session, user_id: int, days_back: Optional[int] = 30,
+                     hand_ids: Optional[List[int]] = None) -> Columns:
+        """
+        Decisões do usuário em colunas NumPy, ordenadas por (mão, ordem).
+        days_back limita pela data de upload; hand_ids carrega só essas mãos.
+        A coluna 'day' traz o dia de upload (date.toordinal) para os contadores diários.
+        """
+        query = (
+            db.query(*[getattr(HeroDecision, name) for name in DECISION_COLUMNS], Hand.created_at)
+            .join(Hand, Hand.id == HeroDecision.hand_id)
+            .filter(HeroDecision.user_id == user_id)
+        )
+        if hand_ids is not None:
+            query = query.filter(HeroDecision.hand_id.in_(hand_ids))
+        if days_back:
+            query = query.filter(Hand.created_at >= datetime.utcnow() - timedelta(days=days_back))
+        rows = query.order_by(HeroDecision.hand_id, HeroDecision.decision_order).all()
+
+        today = date.today().toordinal()
+        data = np.array(
+            [[-1 if value is None else int(value) for value in row[:-1]]
+             + [row[-1].date().toordinal() if row[-1] else today] for row in rows],
+            dtype=np.int64
+        ).reshape(len(rows), len(DECISION_COLUMNS) + 1)
+        columns = {name: data[:, i] for i, name in enumerate(DECISION_COLUMNS + ('day',))}
+        columns['in_position'] = columns['in_position'] == 1
+        return self._derive(columns)
+
+    def _derive(self, columns: Columns) -> Columns:
+        hand_id, street = columns['hand_id'], columns['street']
+        count = len(hand_id)
+        new_hand = np.ones(count, dtype=bool)
+        new_hand[1:] = hand_id[1:] != hand_id[:-1]
+        columns['first_on_street'] = new_hand.copy()
+        columns['first_on_street'][1:] |= street[1:] != street[:-1]
+
+        # Agressor pré-flop: a última decisão pré-flop do herói na mão foi raise
+        preflop = street == STREET_CODES['preflop']
+        last_preflop = preflop.copy()
+        last_preflop[:-1] &= ~(preflop[1:] & ~new_hand[1:])
+        hands, inverse = np.unique(hand_id, return_inverse=True)
+        aggressor = np.zeros(len(hands), dtype=bool)
+        raised = last_preflop & (columns['action'] == ACTION_CODES['raise'])
+        aggressor[inverse[raised]] = True
+        columns['preflop_aggressor'] = aggressor[inverse] if count else np.zeros(0, dtype=bool)
+        return columns
+
+    def evaluate(self, db: Session, user_id: int, days_back: int = 30) -> Dict:
+        """Avalia todas as regras sobre as decisões recentes em uma chamada"""
+        return self.evaluate_columns(self.load_columns(db, user_id, days_back))
+
+    def evaluate_columns(self, columns: Columns) -> Dict:
+        hand_id = columns['hand_id']
+        results: List[Dict] = []
+        for rule in self.rules:
+            opportunity = rule.opportunity(columns)
+            leak = opportunity & rule.leak(columns)
+            opportunities = int(opportunity.sum())
+            leaks = int(leak.sum())
+            samples = [int(h) for h in np.unique(hand_id[leak])[::-1]]  # Mais recentes
+            results.append(self.rule_result(rule, opportunities, leaks, samples))
+        return {
+            'hands_analyzed': int(len(np.unique(hand_id))),
+            'decisions_analyzed': int(len(hand_id)),
+            'rules': results,
+        }
+
+    def rule_result(self, rule: GapRule, opportunities: int, leaks: int, sample_hands: List[int]) -> Dict:
+        confidence = exceed_confidence(leaks, opportunities, rule.threshold)
+        return {
+            'rule': rule.name,
+            'description': rule.description,
+            'suggestion': rule.suggestion,
+            'opportunities': opportunities,
+            'count': leaks,
+            'frequency': round(leaks / opportunities, 3) if opportunities else None,
+            'threshold': rule.threshold,
+            'confidence': round(confidence, 3),
+            'flagged': opportunities >= MIN_OPPORTUNITIES and confidence >= MIN_CONFIDENCE,
+            'sample_hands': sample_hands[:SAMPLE_HANDS],
+        }
+
+    def daily_counts(self, columns: Columns) -> Dict[Tuple[str, int], Dict]:
+        """
+        Oportunidades, leaks e mãos de exemplo por (regra, dia), com bincount sobre os
+        dias presentes; inclui o contador de mãos (HANDS_COUNTER) de cada dia.
+        """
+        hand_id = columns['hand_id']
+        days, day_index = np.unique(columns['day'], return_inverse=True)
+        counts: Dict[Tuple[str, int], Dict] = {}
+
+        first_of_hand = np.ones(len(hand_id), dtype=bool)
+        first_of_hand[1:] = hand_id[1:] != hand_id[:-1]
+        hands_per_day = np.bincount(day_index[first_of_hand], minlength=len(days))
+        for i, day in enumerate(days):
+            if hands_per_day[i]:
+                counts[(HANDS_COUNTER, int(day))] = {
+                    'opportunities': int(hands_per_day[i]), 'count': int(hands_per_day[i]), 'sample_hands': []
+                }
+
+        for rule in self.rules:
+            opportunity = rule.opportunity(columns)
+            leak = opportunity & rule.leak(columns)
+            opportunities = np.bincount(day_index[opportunity], minlength=len(days))
+            leaks = np.bincount(day_index[leak], minlength=len(days))
+            for i in np.nonzero(opportunities)[0]:
+                samples = np.unique(hand_id[leak & (day_index == i)])[::-1][:SAMPLE_HANDS]
+                counts[(rule.name, int(days[i]))] = {
+                    'opportunities': int(opportunities[i]),
+                    'count': int(leaks[i]),
+                    'sample_hands': [int(h) for h in samples],
+                }
+        return counts
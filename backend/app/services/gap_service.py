@@ -1,76 +1,38 @@
+from sqlalchemy import false
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from typing import List, Dict
-import re
-from datetime import datetime, timedelta
+from typing import Iterable, List, Dict
+import json
+from collections import defaultdict
+from datetime import date, datetime, timedelta
 
+from app.models.gap import Gap, GapDailyCount
 from app.models.hand import Hand
-from app.models.gap import Gap
-from app.models.user import User
+from app.services.gap_rules_service import GapRulesService, HANDS_COUNTER, SAMPLE_HANDS
+
+COUNT_BATCH = 1000  # Mãos por lote (listas IN abaixo do limite de parâmetros do SQL Server)
 
 class GapIdentificationService:
     def __init__(self):
-        self.gap_patterns = {
-            'preflop_aggression': {
-                'keywords': ['fold', 'call', 'passive', 'tight'],
-                'description': 'Falta de agressividade no pré-flop',
-                'suggestion': 'Considere aumentar a frequência de raises em posições favoráveis'
-            },
-            'postflop_betting': {
-                'keywords': ['check', 'call', 'passive betting'],
-                'description': 'Jogo passivo no pós-flop',
-                'suggestion': 'Trabalhe em estratégias de value betting e bluff'
-            },
-            'position_awareness': {
-                'keywords': ['early position', 'out of position', 'position'],
-                'description': 'Problemas com consciência posicional',
-                'suggestion': 'Estude ranges por posição e ajuste sua estratégia'
-            },
-            'stack_management': {
-                'keywords': ['stack', 'all-in', 'short stack', 'deep stack'],
-                'description': 'Gestão inadequada de stack',
-                'suggestion': 'Pratique conceitos de ICM e gestão de bankroll'
-            },
-            'bluff_frequency': {
-                'keywords': ['bluff', 'semi-bluff', 'missed draw'],
-                'description': 'Frequência de bluff inadequada',
-                'suggestion': 'Balance sua frequência de bluff baseado em pot odds'
-            }
-        }
+        self.rules_service = GapRulesService()
 
     def analyze_user_gaps(self, db: Session, user_id: int, days_back: int = 30) -> List[Dict]:
         """Analisa gaps recorrentes do usuário baseado nas últimas mãos"""
-        
-        # Buscar mãos recentes do usuário
-        cutoff_date = datetime.utcnow() - timedelta(days=days_back)
-        recent_hands = db.query(Hand).filter(
-            Hand.user_id == user_id,
-            Hand.created_at >= cutoff_date
-        ).all()
-
-        if len(recent_hands) < 5:  # Mínimo de mãos para análise
+        evaluation = self.evaluate_rules(db, user_id, days_back)
+        if evaluation['hands_analyzed'] < 5:  # Mínimo de mãos para análise
             return []
 
-        # Analisar padrões nas análises da IA
-        identified_gaps = {}
-        
-        for hand in recent_hands:
-            if hand.ai_analysis:
-                gaps_found = self._extract_gaps_from_analysis(hand.ai_analysis)
-                for gap_type, details in gaps_found.items():
-                    if gap_type not in identified_gaps:
-                        identified_gaps[gap_type] = {
-                            'count': 0,
-                            'details': details,
-                            'hands': []
-                        }
-                    identified_gaps[gap_type]['count'] += 1
-                    identified_gaps[gap_type]['hands'].append(hand.id)
-
-        # Filtrar gaps significativos (aparecem em pelo menos 20% das mãos)
-        min_frequency = max(1, len(recent_hands) * 0.2)
         significant_gaps = {
-            gap_type: data for gap_type, data in identified_gaps.items()
-            if data['count'] >= min_frequency
+            result['rule']: {
+                'count': result['count'],
+                'details': {
+                    'description': result['description'],
+                    'suggestion': result['suggestion'],
+                    'confidence': result['confidence']
+                },
+                'hands': result['sample_hands']
+            }
+            for result in evaluation['rules'] if result['flagged']
         }
 
         # Salvar ou atualizar gaps no banco
@@ -78,23 +40,116 @@ class GapIdentificationService:
 
         return self._format_gaps_response(significant_gaps)
 
-    def _extract_gaps_from_analysis(self, analysis_text: str) -> Dict:
-        """Extrai gaps da análise da IA usando padrões de texto"""
-        gaps_found = {}
-        analysis_lower = analysis_text.lower()
-
-        for gap_type, pattern_data in self.gap_patterns.items():
-            keyword_matches = sum(1 for keyword in pattern_data['keywords'] 
-                                if keyword in analysis_lower)
-            
-            if keyword_matches >= 2:  # Pelo menos 2 keywords relacionadas
-                gaps_found[gap_type] = {
-                    'description': pattern_data['description'],
-                    'suggestion': pattern_data['suggestion'],
-                    'confidence': min(keyword_matches / len(pattern_data['keywords']), 1.0)
-                }
+    def evaluate_rules(self, db: Session, user_id: int, days_back: int = 30) -> Dict:
+        """Processa as mãos novas e avalia as regras na janela a partir dos contadores diários"""
+        self.update_gap_counters(db, user_id)
+        return self.windowed_rules(db, user_id, days_back)
+
+    def update_gap_counters(self, db: Session, user_id: int) -> int:
+        """
+        Soma nos contadores diários (gap_daily_counts) as mãos com decisões ainda não
+        contadas (gap_counted), em lotes: cada lote é reivindicado por um UPDATE
+        condicional e somado na mesma transação. Pega também mãos antigas que só
+        ganharam decisões depois (backfill) e uploads que gravaram fora de ordem.
+        Retorna as mãos processadas.
+        """
+        hand_ids = [row[0] for row in db.query(Hand.id).filter(
+            Hand.user_id == user_id,
+            Hand.gap_counted == false(),
+            Hand.decisions.any()
+        ).order_by(Hand.id)]
+
+        processed = 0
+        for start in range(0, len(hand_ids), COUNT_BATCH):
+            batch = hand_ids[start:start + COUNT_BATCH]
+            claimed = db.query(Hand).filter(Hand.id.in_(batch), Hand.gap_counted == false()).update(
+                {Hand.gap_counted: True}, synchronize_session=False
+            )
+            if claimed != len(batch):
+                # Outra análise do mesmo usuário está contando parte do lote: fica para a próxima
+                db.rollback()
+                continue
+            columns = self.rules_service.load_columns(db, user_id, days_back=None, hand_ids=batch)
+            self._apply_counts(db, user_id, self.rules_service.daily_counts(columns))
+            try:
+                db.commit()
+            except IntegrityError:
+                # Linha do dia criada em paralelo; o lote volta a ficar pendente
+                db.rollback()
+                continue
+            processed += len(batch)
+        return processed
+
+    def remove_hands(self, db: Session, hands: Iterable[Hand]) -> int:
+        """
+        Tira dos contadores diários a contribuição das mãos já contadas e as marca como
+        pendentes; chamar antes de apagar a mão ou de recalcular suas decisões (sem commit)
+        """
+        by_user = defaultdict(list)
+        for hand in hands:
+            if hand.gap_counted:
+                by_user[hand.user_id].append(hand.id)
+        for user_id, hand_ids in by_user.items():
+            columns = self.rules_service.load_columns(db, user_id, days_back=None, hand_ids=hand_ids)
+            self._apply_counts(db, user_id, self.rules_service.daily_counts(columns), sign=-1)
+            db.query(Hand).filter(Hand.id.in_(hand_ids)).update({Hand.gap_counted: False}, synchronize_session=False)
+        return sum(len(hand_ids) for hand_ids in by_user.values())
+
+    def _apply_counts(self, db: Session, user_id: int, counts: Dict, sign: int = 1) -> None:
+        """Soma (sign=1) ou subtrai (sign=-1) contagens de daily_counts nas linhas de cada dia"""
+        days = sorted({date.fromordinal(day) for _, day in counts})
+        existing = {
+            (row.gap_type, row.day): row
+            for row in db.query(GapDailyCount).filter(
+                GapDailyCount.user_id == user_id,
+                GapDailyCount.day.in_(days)
+            )
+        } if days else {}
+        for (gap_type, day), data in counts.items():
+            day = date.fromordinal(day)
+            row = existing.get((gap_type, day))
+            if row is None:
+                if sign > 0:
+                    db.add(GapDailyCount(
+                        user_id=user_id, gap_type=gap_type, day=day,
+                        opportunities=data['opportunities'], count=data['count'],
+                        sample_hands=json.dumps(data['sample_hands'])
+                    ))
+                continue
+            row.opportunities = GapDailyCount.opportunities + sign * data['opportunities']
+            row.count = GapDailyCount.count + sign * data['count']
+            if data['sample_hands']:
+                previous = json.loads(row.sample_hands) if row.sample_hands else []
+                if sign > 0:
+                    samples = sorted(set(previous + data['sample_hands']), reverse=True)[:SAMPLE_HANDS]
+                else:
+                    samples = [hand_id for hand_id in previous if hand_id not in data['sample_hands']]
+                row.sample_hands = json.dumps(samples)
+
+    def windowed_rules(self, db: Session, user_id: int, days_back: int = 30) -> Dict:
+        """Soma os contadores diários da janela: poucas linhas por regra, sem reler mãos"""
+        cutoff_day = date.today() - timedelta(days=days_back)
+        totals = defaultdict(lambda: {'opportunities': 0, 'count': 0, 'sample_hands': []})
+        for row in db.query(GapDailyCount).filter(
+            GapDailyCount.user_id == user_id,
+            GapDailyCount.day >= cutoff_day
+        ).order_by(GapDailyCount.day.desc()):
+            total = totals[row.gap_type]
+            total['opportunities'] += row.opportunities or 0
+            total['count'] += row.count or 0
+            if row.sample_hands:
+                total['sample_hands'].extend(json.loads(row.sample_hands))
 
-        return gaps_found
+        return {
+            'hands_analyzed': totals[HANDS_COUNTER]['count'],
+            'rules': [
+                self.rules_service.rule_result(
+                    rule, totals[rule.name]['opportunities'], totals[rule.name]['count'],
+                    totals[rule.name]['sample_hands']
+                )
+                for rule in self.rules_service.rules
+            ]
+        }
 
     def _update_user_gaps(self, db: Session, user_id: int, gaps_data: Dict):
         """Atualiza gaps do usuário no banco de dados"""
@@ -105,8 +160,8 @@ class GapIdentificationService:
             ).first()
 
             if existing_gap:
-                # Atualizar gap existente
-                existing_gap.frequency += data['count']
+                # Atualizar gap existente (frequência da janela, não acumulada entre chamadas)
+                existing_gap.frequency = data['count']
                 existing_gap.last_seen = datetime.utcnow()
                 existing_gap.severity = self._calculate_severity(existing_gap.frequency)
             else:
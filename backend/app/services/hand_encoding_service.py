@@ -0,0 +1,136 @@
+"""
+Codificação compacta e canônica da mão para os prompts de IA
+Em vez do hand history completo (assentos, antes, resumo), o prompt recebe só o
+que importa para a decisão: stacks em BB por posição, cartas do herói e uma
+linha de ações por street com o pote e o tamanho das apostas em fração do pote.
+
+Exemplo:
+    Blinds 100/200 | 6 jogadores | valores em BB | * = herói
+    Stacks: LJ 40 | HJ 40 | CO 40 | BTN 40 | SB 40 | BB* 25 [Kh Qh]
+    PF (1.5): CO r2.5 | BB* c
+    F [Ks 9h 2h] (5.5): BB* x | CO b3 (55%) | BB* c
+    T [2c] (11.5): BB* x | CO x
+    R [5d] (11.5): BB* b5 (43%) | CO f
+    Resultado: BB* leva 12.5
+"""
+
+from typing import Dict, List, Optional
+
+from app.services.hero_decision_service import POSITIONS, table_positions
+from app.utils.advanced_poker_parser import AdvancedPokerParser, HandReplay
+from app.utils.pot_reconstruction import reconstruct_pots
+
+STREET_LABELS = {'preflop': 'PF', 'flop': 'F', 'turn': 'T', 'river': 'R'}
+ACTION_SYMBOLS = {'fold': 'f', 'check': 'x', 'call': 'c', 'bet': 'b', 'raise': 'r'}
+ENCODING_LEGEND = (
+    "PF/F/T/R = pré-flop/flop/turn/river, (n) = pote em BB no início da street; "
+    "f fold, x check, c call, bN aposta de N BB, rN raise para N BB, % = fração do pote, ai = all-in"
+)
+
+# Linhas da análise local que acrescentam informação ao prompt (o resto é genérico)
+LOCAL_NOTE_PREFIXES = ('👉 PUSH/FOLD:', '👉 ICM:', '📌 DIAGNÓSTICO:')
+
+_parser = AdvancedPokerParser(verbose=False)  # Sem o debug por linha
+
+
+def _bb(value: float, big_blind: float) -> str:
+    return f"{value / big_blind:.1f}".rstrip('0').rstrip('.')
+
+
+def encode_replay(hand_replay: HandReplay) -> Optional[str]:
+    """Mão codificada a partir do replay, ou None se faltar blinds/posições"""
+    big_blind = float(hand_replay.blinds.get('big') or 0)
+    codes = table_positions(hand_replay.players)
+    if big_blind <= 0 or not codes:
+        return None
+    hero = hand_replay.hero_name
+    labels = {name: POSITIONS[code] + ('*' if name == hero else '') for name, code in codes.items()}
+
+    blinds = f"Blinds {hand_replay.blinds.get('small') or 0}/{hand_replay.blinds['big']}"
+    if hand_replay.blinds.get('ante'):
+        blinds += f" ante {hand_replay.blinds['ante']}"
+    lines = [f"{blinds} | {len(codes)} jogadores | valores em BB | * = herói"]
+
+    seats = sorted(hand_replay.players, key=lambda p: codes.get(p.name, -1))
+    stacks = []
+    for player in seats:
+        if player.name not in labels:
+            continue
+        entry = f"{labels[player.name]} {_bb(player.stack, big_blind)}"
+        if player.name == hero and hand_replay.hero_cards:
+            entry += f" [{' '.join(hand_replay.hero_cards)}]"
+        stacks.append(entry)
+    lines.append("Stacks: " + " | ".join(stacks))
+
+    street_lines: Dict[str, List[str]] = {}
+    street_pots: Dict[str, float] = {}
+    street_bets: Dict[str, float] = {}
+    voluntary = set()
+    shown, results = [], []
+    for action, state in reconstruct_pots(hand_replay):
+        street, kind, player = action.street, action.action_type, action.player
+        label = labels.get(player, player)
+        # Showdown e resultado podem vir na street 'showdown'
+        if kind == 'shows' and action.cards:
+            shown.append(f"{label} mostra [{action.cards}]")
+            continue
+        if kind in ('collected', 'won'):
+            results.append(f"{label} leva {_bb(action.amount, big_blind)}")
+            continue
+        if kind not in ACTION_SYMBOLS or street not in STREET_LABELS:
+            continue
+        if street not in street_lines:
+            street_lines[street] = []
+            street_pots[street] = state.pot_before
+            street_bets = {}
+
+        # Folds pré-flop de quem não entrou na mão não mudam a decisão
+        if kind == 'fold' and street == 'preflop' and player not in voluntary and player != hero:
+            continue
+        token = f"{label} {ACTION_SYMBOLS[kind]}"
+        if kind in ('bet', 'raise'):
+            size = action.total_bet if kind == 'raise' else action.amount
+            token += _bb(size, big_blind)
+            if street != 'preflop' and state.pot_before > 0:
+                token += f" ({round((size - street_bets.get(player, 0.0)) / state.pot_before * 100)}%)"
+        if action.is_all_in or state.is_all_in:
+            token += " ai"
+        street_lines[street].append(token)
+        if kind in ('call', 'bet', 'raise'):
+            voluntary.add(player)
+            street_bets[player] = size if kind != 'call' else street_bets.get(player, 0.0) + action.amount
+
+    for street in hand_replay.streets:
+        tokens = street_lines.get(street.name)
+        if street.name not in STREET_LABELS or (not tokens and not street.cards):
+            continue
+        line = STREET_LABELS[street.name]
+        if street.name != 'preflop':
+            line += f" [{' '.join(street.cards or [])}]"
+        if tokens:
+            # Sem ações (all-in antes da street): só as cartas
+            line += f" ({_bb(street_pots[street.name], big_blind)}): " + " | ".join(tokens)
+        lines.append(line)
+    if shown or results:
+        lines.append("Resultado: " + " | ".join(shown + results))
+    return "\n".join(lines)
+
+
+def encode_hand(raw_hand: str) -> Optional[str]:
+    """Mão codificada a partir do texto do hand history"""
+    if not raw_hand:
+        return None
+    hand_replay = _parser.parse_hand_for_replay(raw_hand)
+    if not hand_replay:
+        return None
+    return encode_replay(hand_replay)
+
+
+def local_analysis_notes(local_analysis: Optional[str]) -> List[str]:
+    """Veredito de push/fold, ICM e diagnóstico da análise local, quando se aplicam"""
+    notes = []
+    for line in (local_analysis or '').splitlines():
+        line = line.strip()
+        if line.startswith(LOCAL_NOTE_PREFIXES) and 'Não se aplica' not in line and 'Inconclusivo' not in line:
+            notes.append(line.lstrip('👉📌 '))
+    return notes
@@ -0,0 +1,112 @@
+"""
+Contagens dos filtros do histórico de mãos (facetas): posição, ação, status de gap e mês
+Uma única consulta agrupa as mãos do usuário pela combinação das dimensões
+(posição, ação, has_gap, has_error, ano, mês) e cada faceta é somada em Python
+a partir dessas células: uma varredura só, em qualquer dialeto (o SQLite não tem
+GROUPING SETS). O resultado fica em cache por usuário; listeners da sessão
+invalidam o cache após o commit de mãos inseridas, removidas ou alteradas nas
+colunas agrupadas. O cache é do processo: o TTL limita o atraso entre workers.
+"""
+
+import os
+import weakref
+from collections import Counter
+from typing import Dict, List
+
+from sqlalchemy import event, extract, func
+from sqlalchemy.orm import Session, attributes
+
+from app.models.hand import Hand
+from app.utils.lru_cache import LRUCache
+
+# Colunas da mão que mudam alguma faceta
+FACET_ATTRIBUTES = ('hero_position', 'hero_action', 'has_gap', 'has_error', 'date_played')
+
+_services = weakref.WeakSet()  # Instâncias com cache a invalidar
+
+
+def _facet_changes(hand: Hand) -> bool:
+    return any(attributes.get_history(hand, key).has_changes() for key in FACET_ATTRIBUTES)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_changed_users(session, flush_context):
+    """Usuários com mãos alteradas nesta transação (invalidados só no commit)"""
+    changed = [obj for obj in session.new if isinstance(obj, Hand)]
+    changed += [obj for obj in session.deleted if isinstance(obj, Hand)]
+    changed += [obj for obj in session.dirty if isinstance(obj, Hand) and _facet_changes(obj)]
+    if changed:
+        session.info.setdefault('facet_users', set()).update(hand.user_id for hand in changed)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_changed_users(session):
+    for user_id in session.info.pop('facet_users', ()):
+        for service in list(_services):
+            service.invalidate(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changed_users(session):
+    session.info.pop('facet_users', None)
+
+
+def _counts(counter: Counter) -> List[Dict]:
+    """Valores mais frequentes primeiro"""
+    return [{'value': value, 'count': count}
+            for value, count in sorted(counter.items(), key=lambda item: (-item[1], item[0]))]
+
+
+class HandFacetService:
+    def __init__(self):
+        self.cache = LRUCache(
+            max_entries=int(os.getenv("HAND_FACET_CACHE_ENTRIES", "5000")),
+            ttl_seconds=float(os.getenv("HAND_FACET_CACHE_TTL_SECONDS", "300"))
+        )
+        self._generations: Dict[int, int] = {}  # Geração do cache por usuário (invalidar = nova chave)
+        _services.add(self)
+
+    def invalidate(self, user_id: int) -> None:
+        self._generations[user_id] = self._generations.get(user_id, 0) + 1
+
+    def facets(self, db: Session, user_id: int) -> Dict:
+        """Total e contagem por valor de cada dimensão de filtro do histórico"""
+        key = f"{user_id}|{self._generations.get(user_id, 0)}"
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        year = extract('year', Hand.date_played)
+        month = extract('month', Hand.date_played)
+        cells = db.query(
+            Hand.hero_position, Hand.hero_action, Hand.has_gap, Hand.has_error, year, month, func.count(Hand.id)
+        ).filter(Hand.user_id == user_id).group_by(
+            Hand.hero_position, Hand.hero_action, Hand.has_gap, Hand.has_error, year, month
+        ).all()
+
+        total = 0
+        positions, actions, months = Counter(), Counter(), Counter()
+        gap_status = Counter({'all': 0, 'ok': 0, 'gap': 0, 'error': 0})
+        for position, action, has_gap, has_error, cell_year, cell_month, count in cells:
+            total += count
+            if position:
+                positions[position] += count
+            if action:
+                actions[action] += count
+            if cell_year is not None:
+                months[f"{int(cell_year):04d}-{int(cell_month):02d}"] += count
+            # Mesmas regras do gap_filter: uma mão com gap e erro conta nas duas opções
+            gap_status['all'] += count
+            gap_status['ok'] += count if has_gap is False and has_error is False else 0
+            gap_status['gap'] += count if has_gap else 0
+            gap_status['error'] += count if has_error else 0
+
+        result = {
+            'total': total,
+            'positions': _counts(positions),
+            'actions': _counts(actions),
+            'gap_status': [{'value': value, 'count': count} for value, count in gap_status.items()],
+            'months': [{'value': value, 'count': months[value]} for value in sorted(months)],
+        }
+        self.cache.set(key, result)
+        return result
@@ -0,0 +1,196 @@
+"""
+Busca textual nas análises das mãos
+Índice full-text por dialeto, na tabela hand_search (uma linha por mão):
+- SQLite: tabela virtual FTS5 sem conteúdo (rowid = hands.id), ranking bm25; o dono
+  da mão é um token na coluna owner, então o filtro por usuário é feito no índice
+- PostgreSQL: coluna tsvector com índice GIN, ranking ts_rank
+- SQL Server: catálogo full-text sobre o documento, ranking CONTAINSTABLE
+O documento indexado é a análise de IA, as linhas relevantes da análise local
+(push/fold, ICM, diagnóstico) e os nomes dos jogadores da mão. Um listener de
+after_flush mantém o índice em dia em toda mão inserida, alterada ou removida.
+"""
+
+import re
+import sqlite3
+import weakref
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session, attributes
+
+from app.models.hand import Hand
+from app.services.hand_encoding_service import local_analysis_notes
+
+# Colunas da mão que entram no documento
+INDEXED_ATTRIBUTES = ('ai_analysis', 'local_analysis_text', 'local_decision_code', 'local_params', 'raw_hand')
+MAX_TERMS = 8
+
+_SEAT_RE = re.compile(r'^Seat \d+: (.+?) \(', re.MULTILINE)
+_TERM_RE = re.compile(r'\w+', re.UNICODE)
+
+# FTS5 sem conteúdo com DELETE por rowid exige SQLite 3.43+; antes disso a tabela guarda o texto
+SQLITE_CONTENTLESS = sqlite3.sqlite_version_info >= (3, 43, 0)
+SQLITE_DDL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS hand_search USING fts5(document, owner, "
+    + ("content='', contentless_delete=1, " if SQLITE_CONTENTLESS else "")
+    + "tokenize='unicode61 remove_diacritics 2')"
+)
+
+_sqlite_ready = weakref.WeakSet()  # Engines SQLite com a tabela FTS5 garantida
+
+
+def search_document(hand: Hand) -> str:
+    """Texto indexado da mão"""
+    parts = [hand.ai_analysis or '']
+    parts.extend(local_analysis_notes(hand.local_analysis))
+    parts.extend(sorted(set(_SEAT_RE.findall(hand.raw_hand or ''))))
+    return "\n".join(part for part in parts if part)
+
+
+def query_terms(query: str) -> List[str]:
+    """Termos da busca (só letras e dígitos: nada da sintaxe de cada dialeto passa)"""
+    return _TERM_RE.findall(query.lower())[:MAX_TERMS]
+
+
+def _bind(db):
+    """Engine/conexão de uma Session ou a própria Connection (no listener de flush)"""
+    return db.get_bind() if isinstance(db, Session) else db
+
+
+def _dialect(db) -> str:
+    return _bind(db).dialect.name
+
+
+def ensure_search_index(db) -> None:
+    """Cria a tabela FTS5 no SQLite (bancos sem migração, como os de teste); nos outros dialetos vem da migração"""
+    bind = _bind(db)
+    if bind.dialect.name != 'sqlite':
+        return
+    engine = getattr(bind, 'engine', bind)
+    if engine in _sqlite_ready:
+        return
+    db.execute(text(SQLITE_DDL))
+    _sqlite_ready.add(engine)
+
+
+def write_documents(db, documents: Sequence[Tuple[int, int, str]]) -> None:
+    """Grava (hand_id, user_id, documento) no índice, substituindo o anterior"""
+    if not documents:
+        return
+    dialect = _dialect(db)
+    if dialect == 'sqlite':
+        ensure_search_index(db)
+        remove_documents(db, [hand_id for hand_id, _, _ in documents])
+        db.execute(text("INSERT INTO hand_search (rowid, document, owner) VALUES (:hand_id, :document, :owner)"),
+                   [{'hand_id': hand_id, 'document': document, 'owner': f"u{user_id}"}
+                    for hand_id, user_id, document in documents])
+    elif dialect == 'postgresql':
+        db.execute(text(
+            "INSERT INTO hand_search (hand_id, user_id, search_vector) "
+            "VALUES (:hand_id, :user_id, to_tsvector('simple', :document)) "
+            "ON CONFLICT (hand_id) DO UPDATE SET search_vector = EXCLUDED.search_vector"
+        ), [{'hand_id': hand_id, 'user_id': user_id, 'document': document}
+            for hand_id, user_id, document in documents])
+    elif dialect == 'mssql':
+        db.execute(text(
+            "MERGE hand_search AS target USING (SELECT :hand_id AS hand_id) AS source "
+            "ON target.hand_id = source.hand_id "
+            "WHEN MATCHED THEN UPDATE SET document = :document "
+            "WHEN NOT MATCHED THEN INSERT (hand_id, user_id, document) VALUES (:hand_id, :user_id, :document);"
+        ), [{'hand_id': hand_id, 'user_id': user_id, 'document': document}
+            for hand_id, user_id, document in documents])
+
+
+def remove_documents(db, hand_ids: Iterable[int]) -> None:
+    hand_ids = list(hand_ids)
+    if not hand_ids:
+        return
+    dialect = _dialect(db)
+    if dialect == 'sqlite':
+        ensure_search_index(db)
+        db.execute(text("DELETE FROM hand_search WHERE rowid = :hand_id"), [{'hand_id': hand_id} for hand_id in hand_ids])
+    elif dialect in ('postgresql', 'mssql'):
+        db.execute(text("DELETE FROM hand_search WHERE hand_id = :hand_id"), [{'hand_id': hand_id} for hand_id in hand_ids])
+
+
+def _indexed_changes(hand: Hand) -> bool:
+    return any(attributes.get_history(hand, key).has_changes() for key in INDEXED_ATTRIBUTES)
+
+
+@event.listens_for(Session, "after_flush")
+def _sync_search_index(session, flush_context):
+    """Mãos novas ou com análise alterada entram no índice na mesma transação"""
+    changed = [obj for obj in session.new if isinstance(obj, Hand)]
+    changed += [obj for obj in session.dirty if isinstance(obj, Hand) and _indexed_changes(obj)]
+    removed = [obj.id for obj in session.deleted if isinstance(obj, Hand) and obj.id is not None]
+    if not changed and not removed:
+        return
+    connection = session.connection()
+    write_documents(connection, [(hand.id, hand.user_id, search_document(hand)) for hand in changed])
+    remove_documents(connection, removed)
+
+
+class HandSearchService:
+    def search(self, db: Session, user_id: int, query: str, limit: int = 20, skip: int = 0) -> List[Tuple[int, float]]:
+        """(hand_id, score) das mãos do usuário, mais relevantes primeiro"""
+        terms = query_terms(query)
+        if not terms:
+            return []
+        params = {'user_id': user_id, 'limit': limit, 'skip': skip}
+        dialect = _dialect(db)
+
+        if dialect == 'sqlite':
+            ensure_search_index(db)
+            # Cada termo como prefixo entre aspas ("overb"* casa overbet), só nas mãos do usuário
+            params['match'] = f'owner:"u{user_id}" AND document:(' + " ".join(f'"{term}"*' for term in terms) + ")"
+            sql = (
+                "SELECT rowid, -bm25(hand_search, 1.0, 0.0) AS score FROM hand_search "
+                "WHERE hand_search MATCH :match "
+                "ORDER BY bm25(hand_search, 1.0, 0.0) LIMIT :limit OFFSET :skip"
+            )
+        elif dialect == 'postgresql':
+            params['match'] = " & ".join(f"{term}:*" for term in terms)
+            sql = (
+                "SELECT hand_id, ts_rank(search_vector, to_tsquery('simple', :match)) AS score FROM hand_search "
+                "WHERE user_id = :user_id AND search_vector @@ to_tsquery('simple', :match) "
+                "ORDER BY score DESC LIMIT :limit OFFSET :skip"
+            )
+        elif dialect == 'mssql':
+            params['match'] = " AND ".join(f'"{term}*"' for term in terms)
+            sql = (
+                "SELECT hs.hand_id, ft.[RANK] AS score FROM CONTAINSTABLE(hand_search, document, :match) AS ft "
+                "JOIN hand_search hs ON hs.hand_id = ft.[KEY] WHERE hs.user_id = :user_id "
+                "ORDER BY ft.[RANK] DESC OFFSET :skip ROWS FETCH NEXT :limit ROWS ONLY"
+            )
+        else:
+            return []
+        return [(row[0], float(row[1])) for row in db.execute(text(sql), params)]
+
+    def snippet(self, hand: Hand, query: str, width: int = 80) -> Optional[str]:
+        """Trecho do documento em volta do primeiro termo encontrado"""
+        document = search_document(hand)
+        lowered = document.lower()
+        for term in query_terms(query):
+            position = lowered.find(term)
+            if position >= 0:
+                start = max(0, position - width)
+                excerpt = document[start:position + len(term) + width].replace("\n", " ").strip()
+                return ("…" if start else "") + excerpt + ("…" if position + len(term) + width < len(document) else "")
+        return None
+
+    def rebuild(self, db: Session, user_id: Optional[int] = None, batch_size: int = 1000) -> int:
+        """Reindexa as mãos (backfill), em lotes por id; retorna as mãos indexadas"""
+        last_id = 0
+        total = 0
+        while True:
+            query = db.query(Hand).filter(Hand.id > last_id)
+            if user_id is not None:
+                query = query.filter(Hand.user_id == user_id)
+            hands = query.order_by(Hand.id).limit(batch_size).all()
+            if not hands:
+                return total
+            write_documents(db, [(hand.id, hand.user_id, search_document(hand)) for hand in hands])
+            db.commit()
+            total += len(hands)
+            last_id = hands[-1].id
+            db.expunge_all()
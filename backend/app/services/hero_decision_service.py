@@ -0,0 +1,158 @@
+"""
+Extração das decisões do herói para a tabela hero_decisions
+Cada ação do herói (fold/check/call/bet/raise) vira uma linha com features
+codificadas em inteiros: street, posição, stack efetivo / pote / valor a pagar
+em décimos de BB, jogadores na mão, ação enfrentada, classe da mão e textura do board.
+Consultas de leak ("BB defendendo contra open do CO com 20-30 BB") viram
+varreduras de intervalo nos índices compostos da tabela.
+"""
+
+from typing import Dict, List, Optional
+
+from sqlalchemy.orm import Session
+
+from app.models.hand import Hand
+from app.models.hero_decision import HeroDecision
+from app.utils.advanced_poker_parser import AdvancedPokerParser, HandReplay, Player
+from app.utils.board_texture import board_texture
+from app.utils.pot_reconstruction import reconstruct_pots
+from app.utils.ranges import hand_class_index
+
+STREETS = ('preflop', 'flop', 'turn', 'river')
+STREET_CODES = {name: code for code, name in enumerate(STREETS)}
+
+# Posições na ordem de ação pré-flop (9-max); mesas menores perdem as primeiras
+POSITIONS = ('UTG', 'UTG+1', 'MP', 'LJ', 'HJ', 'CO', 'BTN', 'SB', 'BB')
+POSITION_CODES = {name: code for code, name in enumerate(POSITIONS)}
+
+# Ação enfrentada pelo herói
+FACING_NONE = 0          # Pote não aberto (pré-flop) ou ninguém apostou na street
+FACING_LIMP = 1
+FACING_OPEN = 2
+FACING_THREE_BET = 3
+FACING_FOUR_BET = 4      # 4-bet ou mais
+FACING_BET = 5
+FACING_RAISE = 6         # Raise pós-flop (qualquer número)
+FACING_NAMES = ('none', 'limp', 'open', '3bet', '4bet+', 'bet', 'raise')
+
+ACTIONS = ('fold', 'check', 'call', 'bet', 'raise')
+ACTION_CODES = {name: code for code, name in enumerate(ACTIONS)}
+
+SMALLINT_MAX = 32767
+
+
+def table_positions(players: List[Player]) -> Dict[str, int]:
+    """Código de posição de cada jogador a partir dos assentos e do button"""
+    seats = sorted(players, key=lambda p: p.position)
+    button = next((i for i, p in enumerate(seats) if p.is_button), None)
+    if button is None or len(seats) < 2:
+        return {}
+    from_sb = seats[button + 1:] + seats[:button + 1]
+    if len(from_sb) == 2:
+        # Heads-up: o button posta o SB
+        return {from_sb[1].name: POSITION_CODES['SB'], from_sb[0].name: POSITION_CODES['BB']}
+
+    positions = {from_sb[0].name: POSITION_CODES['SB'], from_sb[1].name: POSITION_CODES['BB']}
+    # Do button para trás: BTN, CO, HJ, ... ; excedentes (10-max) ficam como UTG
+    for offset, player in enumerate(reversed(from_sb[2:])):
+        positions[player.name] = max(POSITION_CODES['BTN'] - offset, 0)
+    return positions
+
+
+def postflop_order(position: int) -> int:
+    """Ordem de ação pós-flop (SB age primeiro, BTN por último)"""
+    return (position + 2) % len(POSITIONS)
+
+
+def _bb10(value: float, big_blind: float) -> int:
+    return max(min(int(round(value / big_blind * 10)), SMALLINT_MAX), 0)
+
+
+class HeroDecisionService:
+    def __init__(self):
+        # Sem o debug por linha do parser avançado na ingestão
+        self.parser = AdvancedPokerParser(verbose=False)
+
+    def parse_replay(self, raw_hand: str) -> Optional[HandReplay]:
+        return self.parser.parse_hand_for_replay(raw_hand or "")
+
+    def extract_decisions(self, hand_replay: HandReplay) -> List[Dict]:
+        """Colunas de hero_decisions para cada decisão do herói na mão"""
+        hero = hand_replay.hero_name
+        big_blind = float(hand_replay.blinds.get('big') or 0)
+        positions = table_positions(hand_replay.players)
+        if not hero or big_blind <= 0 or hero not in positions:
+            return []
+        try:
+            hero_class = hand_class_index(hand_replay.hero_cards)
+        except (ValueError, TypeError, IndexError):
+            hero_class = None
+
+        boards = {}
+        board: List[str] = []
+        for street in hand_replay.streets:
+            board = board + [card for card in street.cards if card not in board]
+            boards[street.name] = list(board)
+
+        decisions = []
+        active = set(positions)
+        street = None
+        for action, state in reconstruct_pots(hand_replay):
+            if action.street != street:
+                street = action.street
+                aggressions = 0
+                limped = False
+                aggressor = None
+            if action.action_type not in ACTION_CODES or street not in STREET_CODES:
+                continue
+
+            if action.player == hero:
+                if street == 'preflop':
+                    facing = (FACING_LIMP if limped else FACING_NONE) if aggressions == 0 else \
+                        min(FACING_OPEN + aggressions - 1, FACING_FOUR_BET)
+                else:
+                    facing = (FACING_NONE, FACING_BET)[aggressions] if aggressions < 2 else FACING_RAISE
+                amount = action.total_bet if action.action_type == 'raise' else action.amount
+                try:
+                    texture = board_texture(boards.get(street, [])) if street != 'preflop' else 0
+                except ValueError:
+                    texture = 0
+                decisions.append({
+                    'decision_order': len(decisions),
+                    'street': STREET_CODES[street],
+                    'position': positions[hero],
+                    'stack_bb10': _bb10(state.effective_stack, big_blind),
+                    'pot_bb10': _bb10(state.pot_before, big_blind),
+                    'to_call_bb10': _bb10(state.to_call, big_blind),
+                    'players': len(active),
+                    'facing': facing,
+                    'aggressor_position': positions.get(aggressor),
+                    'in_position': max(active, key=lambda p: postflop_order(positions[p])) == hero,
+                    'action': ACTION_CODES[action.action_type],
+                    'amount_bb10': _bb10(amount or 0, big_blind),
+                    'is_all_in': bool(action.is_all_in),
+                    'hand_class': hero_class,
+                    'board_texture': texture,
+                })
+
+            if action.action_type == 'fold':
+                active.discard(action.player)
+            elif action.action_type in ('bet', 'raise'):
+                aggressions += 1
+                aggressor = action.player
+            elif action.action_type == 'call' and street == 'preflop' and aggressions == 0:
+                limped = True
+        return decisions
+
+    def add_hand(self, db: Session, hand: Hand, hand_replay: Optional[HandReplay] = None) -> int:
+        """Grava as decisões da mão (sem commit; entra na transação do upload)"""
+        if hand_replay is None:
+            hand_replay = self.parse_replay(hand.raw_hand)
+        if not hand_replay:
+            return 0
+        rows = [
+            HeroDecision(user_id=hand.user_id, hand=hand, **columns)
+            for columns in self.extract_decisions(hand_replay)
+        ]
+        db.add_all(rows)
+        return len(rows)
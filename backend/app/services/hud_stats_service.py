@@ -0,0 +1,195 @@
+"""
+Estatísticas de HUD do herói (VPIP, PFR, 3-bet, AF, WTSD, c-bet)
+Os contadores (numerador / denominador) são extraídos do histórico de ações de
+cada mão no upload e somados de forma incremental na tabela hud_stats, por
+usuário e posição; ler um painel completo é uma consulta a poucas linhas indexadas.
+"""
+
+import re
+from collections import Counter
+from typing import Dict, Iterable, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.models.hud_stats import HudStats
+
+ALL_POSITIONS = 'ALL'
+
+HUD_COUNTERS = (
+    'hands', 'vpip', 'pfr', 'three_bet', 'three_bet_opportunities', 'postflop_aggressive',
+    'postflop_calls', 'saw_flop', 'went_to_showdown', 'cbet', 'cbet_opportunities',
+)
+
+# Estatística -> (numerador, denominador); AF é uma razão, não percentual
+HUD_STATS = {
+    'vpip': ('vpip', 'hands'),
+    'pfr': ('pfr', 'hands'),
+    'three_bet': ('three_bet', 'three_bet_opportunities'),
+    'af': ('postflop_aggressive', 'postflop_calls'),
+    'wtsd': ('went_to_showdown', 'saw_flop'),
+    'cbet': ('cbet', 'cbet_opportunities'),
+}
+
+
+def format_hud(row) -> Dict:
+    """Estatísticas a partir dos contadores de uma linha (hud_stats ou opponent_profiles)"""
+    counters = {name: (getattr(row, name) or 0) if row else 0 for name in HUD_COUNTERS}
+    stats = {}
+    for stat, (numerator, denominator) in HUD_STATS.items():
+        if counters[denominator] <= 0:
+            stats[stat] = None
+        elif stat == 'af':
+            stats[stat] = round(counters[numerator] / counters[denominator], 2)
+        else:
+            stats[stat] = round(counters[numerator] / counters[denominator] * 100, 1)
+    return {'hands': counters['hands'], 'stats': stats, 'counters': counters}
+
+
+class HudStatsService:
+    def __init__(self):
+        self.patterns = {
+            'seat': r'^Seat (\d+): (.+?) \((\d+) in chips',
+            'action': r'^(.+?): (folds|checks|calls|bets|raises)\b',
+            'shows': r'^(.+?): shows \[([^\]]+)\]',
+        }
+
+    def extract_player_counters(self, raw_hand: str) -> Tuple[Dict[str, Counter], Dict[str, str]]:
+        """
+        Contadores de HUD de todos os jogadores da mão, em uma passada pelas linhas
+        do histórico. Retorna (contadores por jogador, cartas mostradas no showdown).
+        """
+        counters: Dict[str, Counter] = {}
+        shown: Dict[str, str] = {}
+        street = 'setup'
+        folded = set()
+        preflop_raises = 0
+        last_preflop_raiser = None
+        faced_open = set()
+        acted_flop = set()
+        flop_bet = False
+
+        for line in (raw_hand or '').split('\n'):
+            line = line.strip()
+            if line.startswith('***'):
+                if 'HOLE CARDS' in line:
+                    street = 'preflop'
+                elif 'FLOP' in line:
+                    street = 'flop'
+                    for player, player_counters in counters.items():
+                        if player not in folded:
+                            player_counters['saw_flop'] = 1
+                elif 'TURN' in line:
+                    street = 'turn'
+                elif 'RIVER' in line:
+                    street = 'river'
+                elif 'SHOW DOWN' in line:
+                    for player, player_counters in counters.items():
+                        if player not in folded and player_counters['saw_flop']:
+                            player_counters['went_to_showdown'] = 1
+                    street = 'showdown'
+                elif 'SUMMARY' in line:
+                    break
+                continue
+
+            if street == 'setup':
+                seat = re.match(self.patterns['seat'], line)
+                if seat:
+                    counters[seat.group(2).strip()] = Counter(hands=1)
+                continue
+            if street == 'showdown':
+                shows = re.match(self.patterns['shows'], line)
+                if shows:
+                    shown[shows.group(1).strip()] = shows.group(2)
+                continue
+
+            action = re.match(self.patterns['action'], line)
+            if not action:
+                continue
+            player, verb = action.group(1).strip(), action.group(2)
+            player_counters = counters.setdefault(player, Counter(hands=1))
+
+            if street == 'preflop':
+                if verb in ('calls', 'bets', 'raises'):
+                    player_counters['vpip'] = 1
+                if verb == 'raises':
+                    player_counters['pfr'] = 1
+                if preflop_raises == 1 and player not in faced_open:
+                    # Primeira decisão contra exatamente um raise: oportunidade de 3-bet
+                    faced_open.add(player)
+                    player_counters['three_bet_opportunities'] = 1
+                    player_counters['three_bet'] = int(verb == 'raises')
+                if verb == 'raises':
+                    preflop_raises += 1
+                    last_preflop_raiser = player
+            else:
+                if street == 'flop' and player not in acted_flop:
+                    acted_flop.add(player)
+                    if last_preflop_raiser == player and not flop_bet:
+                        player_counters['cbet_opportunities'] = 1
+                        player_counters['cbet'] = int(verb == 'bets')
+                if verb in ('bets', 'raises'):
+                    player_counters['postflop_aggressive'] += 1
+                elif verb == 'calls':
+                    player_counters['postflop_calls'] += 1
+                if street == 'flop' and verb in ('bets', 'raises'):
+                    flop_bet = True
+
+            if verb == 'folds':
+                folded.add(player)
+
+        return counters, shown
+
+    def extract_counters(self, hand_data: Dict) -> Optional[Counter]:
+        """Contadores de HUD do herói em uma mão"""
+        raw_hand = hand_data.get('raw_hand') or ''
+        hero = hand_data.get('hero_name')
+        if not raw_hand or not hero:
+            return None
+        counters, _ = self.extract_player_counters(raw_hand)
+        return counters.get(hero)
+
+    def accumulate(self, batch: Dict[str, Counter], hand_data: Dict) -> None:
+        """Soma os contadores da mão na posição do herói e no total ('ALL')"""
+        counters = self.extract_counters(hand_data)
+        if not counters:
+            return
+        position = (hand_data.get('hero_position') or 'UNKNOWN')[:10]
+        for key in (position, ALL_POSITIONS):
+            batch.setdefault(key, Counter()).update(counters)
+
+    def apply_batch(self, db: Session, user_id: int, batch: Dict[str, Counter], sign: int = 1) -> None:
+        """
+        Incrementa os agregados do usuário (sem commit; entra na transação do upload).
+        UPDATE com coluna = coluna + delta evita perder contagens em uploads simultâneos.
+        """
+        for position, counters in batch.items():
+            deltas = {name: sign * counters[name] for name in HUD_COUNTERS if counters[name]}
+            if not deltas:
+                continue
+            updated = db.query(HudStats).filter(
+                HudStats.user_id == user_id,
+                HudStats.position == position
+            ).update(
+                {getattr(HudStats, name): getattr(HudStats, name) + delta for name, delta in deltas.items()},
+                synchronize_session=False
+            )
+            if not updated:
+                db.add(HudStats(user_id=user_id, position=position, **deltas))
+                db.flush()
+
+    def add_hands(self, db: Session, user_id: int, hands: Iterable[Dict], sign: int = 1) -> None:
+        batch: Dict[str, Counter] = {}
+        for hand_data in hands:
+            self.accumulate(batch, hand_data)
+        if batch:
+            self.apply_batch(db, user_id, batch, sign)
+
+    def get_panel(self, db: Session, user_id: int) -> Dict:
+        """Painel completo: uma consulta pelo índice (user_id, position)"""
+        rows = db.query(HudStats).filter(HudStats.user_id == user_id).all()
+        panels = {row.position: format_hud(row) for row in rows}
+        total = panels.pop(ALL_POSITIONS, format_hud(None))
+        return {
+            **total,
+            'positions': [{'position': position, **panel} for position, panel in sorted(panels.items())],
+        }
@@ -0,0 +1,344 @@
+"""
+ICM (Independent Chip Model) pelo modelo de Malmuth-Harville.
+Programação dinâmica sobre bitmasks dos jogadores já colocados, vetorizada
+em NumPy e memoizada, rápida o bastante para mesas finais de 9-10 jogadores.
+"""
+
+import re
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Estrutura de mesa final (percentual do prize pool) usada na mesa final quando os
+# prêmios reais do torneio não são conhecidos; truncada para o número de jogadores na mesa
+DEFAULT_FINAL_TABLE_PAYOUTS: Tuple[float, ...] = (25.0, 17.0, 12.5, 10.0, 8.5, 7.5, 6.5, 5.5, 4.5, 3.0)
+
+# Stacks a partir dos quais o spot deixa de ser push/fold
+PUSH_FOLD_MAX_BB = 20
+
+# Ranges genéricos usados para estimar a equity nos spots de all-in
+DEFAULT_SHOVE_RANGE = "22+, A2s+, A7o+, K9s+, KTo+, QTs+, QJo, JTs"
+DEFAULT_CALLING_RANGE = "66+, ATs+, KQs, AJo+"
+
+# Fração desprezível usada no lugar de stack zero: o jogador eliminado termina
+# (com probabilidade ~1) no último lugar restante, como no ICM tradicional
+_BUSTED_EPSILON = 1e-9
+
+
+def _icm_batch(stacks: np.ndarray, payouts: np.ndarray) -> np.ndarray:
+    """
+    $EV de um lote de configurações de stacks.
+
+    stacks: (B, n) fichas por jogador; payouts: prêmios do 1º ao k-ésimo lugar.
+    prob[b, mask] = probabilidade de os jogadores em `mask` ocuparem os primeiros
+    popcount(mask) lugares; cada lugar seguinte é sorteado proporcional às fichas.
+    """
+    batch, n = stacks.shape
+    places = min(len(payouts), n)
+    totals = stacks.sum(axis=1, keepdims=True)
+    stacks = np.maximum(stacks, totals * _BUSTED_EPSILON)
+
+    size = 1 << n
+    masks = np.arange(size)
+    bits = (masks[:, None] >> np.arange(n)) & 1
+    popcount = bits.sum(axis=1)
+    remaining = stacks.sum(axis=1, keepdims=True) - stacks @ bits.T
+
+    prob = np.zeros((batch, size))
+    prob[:, 0] = 1.0
+    ev = np.zeros((batch, n))
+
+    for place in range(places):
+        layer = masks[popcount == place]
+        for player in range(n):
+            source = layer[(layer >> player & 1) == 0]
+            contribution = prob[:, source] * stacks[:, player:player + 1] / remaining[:, source]
+            ev[:, player] += contribution.sum(axis=1) * payouts[place]
+            if place + 1 < places:
+                prob[:, source | (1 << player)] += contribution
+
+    return ev
+
+
+@lru_cache(maxsize=4096)
+def _icm_cached(stacks: Tuple[float, ...], payouts: Tuple[float, ...]) -> Tuple[float, ...]:
+    ev = _icm_batch(np.array([stacks], dtype=float), np.array(payouts, dtype=float))
+    return tuple(float(v) for v in ev[0])
+
+
+def icm_equity(stacks: Sequence[float], payouts: Sequence[float]) -> List[float]:
+    """$EV de cada jogador para os stacks e a estrutura de prêmios informados"""
+    if not stacks:
+        return []
+    if any(s < 0 for s in stacks):
+        raise ValueError("Stacks não podem ser negativos")
+    if sum(stacks) <= 0:
+        raise ValueError("A soma dos stacks precisa ser positiva")
+    return list(_icm_cached(tuple(float(s) for s in stacks), tuple(float(p) for p in payouts)))
+
+
+@lru_cache(maxsize=1024)
+def _bubble_factors_cached(stacks: Tuple[float, ...], payouts: Tuple[float, ...]) -> Tuple[Tuple[Optional[float], ...], ...]:
+    n = len(stacks)
+    base = np.array(stacks, dtype=float)
+    pairs = [(i, j) for i in range(n) for j in range(n) if i != j]
+
+    # Todas as configurações de "i ganha de j" em um único lote; "i perde para j"
+    # é a mesma configuração que "j ganha de i"
+    configs = np.repeat(base[None, :], len(pairs) + 1, axis=0)
+    for row, (i, j) in enumerate(pairs, start=1):
+        effective = min(base[i], base[j])
+        configs[row, i] += effective
+        configs[row, j] -= effective
+    ev = _icm_batch(configs, np.array(payouts, dtype=float))
+    current = ev[0]
+    win_row = {pair: row for row, pair in enumerate(pairs, start=1)}
+
+    matrix = []
+    for i in range(n):
+        line = []
+        for j in range(n):
+            if i == j or min(base[i], base[j]) <= 0:
+                line.append(None)
+                continue
+            gain = ev[win_row[(i, j)], i] - current[i]
+            loss = current[i] - ev[win_row[(j, i)], i]
+            line.append(float(loss / gain) if gain > 0 else None)
+        matrix.append(tuple(line))
+    return tuple(matrix)
+
+
+def bubble_factors(stacks: Sequence[float], payouts: Sequence[float]) -> List[List[Optional[float]]]:
+    """
+    Matriz de bubble factors: [i][j] = $EV perdido ao perder um all-in para j
+    dividido pelo $EV ganho ao vencê-lo (1.0 = sem pressão de ICM)
+    """
+    icm_equity(stacks, payouts)  # Validação
+    matrix = _bubble_factors_cached(tuple(float(s) for s in stacks), tuple(float(p) for p in payouts))
+    return [list(line) for line in matrix]
+
+
+def required_equity(risk: float, reward: float, bubble_factor: float = 1.0) -> float:
+    """Equity mínima para um all-in: risco ponderado pelo bubble factor contra o prêmio"""
+    weighted_risk = risk * bubble_factor
+    if weighted_risk + reward <= 0:
+        return 0.0
+    return weighted_risk / (weighted_risk + reward)
+
+
+class ICMService:
+    def __init__(self, payouts: Sequence[float] = DEFAULT_FINAL_TABLE_PAYOUTS):
+        self.payouts = tuple(payouts)
+        self.patterns = {
+            'blinds': r'Level [IVXLC]+ \((\d+)/(\d+)\)',
+            'seat': r'^Seat (\d+): (.+?) \((\d+) in chips',
+            'ante': r'^(.+?): posts the ante (\d+)',
+            'blind': r'^(.+?): posts (?:small|big) blind (\d+)',
+            'action': r'^(.+?): (folds|checks|calls|bets|raises)(?: (\d+))?(?: to (\d+))?( and is all-in)?',
+        }
+
+    def table_payouts(self, players: int, payouts: Optional[Sequence[float]] = None) -> Tuple[float, ...]:
+        return tuple(payouts or self.payouts)[:players]
+
+    def payout_structure(self, hand_data: Dict, players: int) -> Optional[str]:
+        """
+        De onde vêm os prêmios do spot: 'informed' (hand_data['payouts'], prêmios dos
+        jogadores da mesa), 'final_table' (hand_data['final_table'] ou players_remaining
+        que cabem na mesa) ou None: numa mesa qualquer do torneio os prêmios que
+        importam dependem do field inteiro, e o ICM só da mesa não vale
+        """
+        if hand_data.get('payouts'):
+            return 'informed'
+        remaining = hand_data.get('players_remaining')
+        if hand_data.get('final_table') or (remaining is not None and remaining <= players):
+            return 'final_table'
+        return None
+
+    def analyze_push_fold_spot(self, hand_data: Dict, equity_service=None) -> Optional[Dict]:
+        """
+        Identifica um spot de all-in pré-flop do herói com stack curto e calcula
+        o veredito ajustado por ICM. Retorna None se a mão não for push/fold.
+        Sem prêmios conhecidos (payout_structure None) os números usam a estrutura de
+        mesa final só como referência e o spot volta com icm_applies=False.
+        """
+        raw_hand = hand_data.get('raw_hand') or ''
+        hero = hand_data.get('hero_name')
+        blinds = re.search(self.patterns['blinds'], raw_hand)
+        if not raw_hand or not hero or not blinds:
+            return None
+        big_blind = float(blinds.group(2))
+
+        stacks: Dict[str, float] = {}
+        preflop: List[str] = []
+        antes = 0.0
+        committed: Dict[str, float] = {}
+        section = 'setup'
+        for line in raw_hand.split('\n'):
+            line = line.strip()
+            if line.startswith('*** HOLE CARDS'):
+                section = 'preflop'
+                continue
+            if line.startswith('***'):
+                if section == 'preflop':
+                    break
+                continue
+            seat = re.match(self.patterns['seat'], line)
+            if seat and section == 'setup':
+                stacks[seat.group(2).strip()] = float(seat.group(3))
+                continue
+            ante = re.match(self.patterns['ante'], line)
+            if ante:
+                antes += float(ante.group(2))
+                stacks[ante.group(1).strip()] = stacks.get(ante.group(1).strip(), 0.0) - float(ante.group(2))
+                continue
+            blind = re.match(self.patterns['blind'], line)
+            if blind:
+                committed[blind.group(1).strip()] = float(blind.group(2))
+                continue
+            if section == 'preflop':
+                preflop.append(line)
+
+        if hero not in stacks or stacks[hero] / big_blind > PUSH_FOLD_MAX_BB:
+            return None
+
+        shover = None
+        shove_total = 0.0
+        for line in preflop:
+            action = re.match(self.patterns['action'], line)
+            if not action:
+                continue
+            player, verb, amount, to_amount, all_in = action.groups()
+            player = player.strip()
+
+            if shover and player == hero:
+                # Herói enfrentando um all-in
+                return self._facing_shove_verdict(
+                    hero, shover, verb, stacks, committed, antes, shove_total, big_blind, hand_data, equity_service
+                )
+
+            if all_in and shover is None and verb in ('bets', 'raises') and player == hero:
+                # Herói abre all-in (avaliado com o pote antes da sua ação)
+                return self._shove_verdict(hero, stacks, committed, antes, big_blind, hand_data, equity_service)
+
+            if verb == 'calls':
+                committed[player] = committed.get(player, 0.0) + float(amount)
+            elif verb == 'bets':
+                committed[player] = float(amount)
+            elif verb == 'raises':
+                committed[player] = float(to_amount)
+
+            if all_in and shover is None and verb in ('bets', 'raises'):
+                shover = player
+                shove_total = committed[player]
+
+        return None
+
+    def _bubble_factor_vs(self, hero: str, villain: str, stacks: Dict[str, float],
+                          hand_data: Dict) -> Tuple[float, int, Optional[str]]:
+        players = list(stacks.keys())
+        chip_stacks = [max(stacks[p], 0.0) for p in players]
+        structure = self.payout_structure(hand_data, len(players))
+        payouts = hand_data.get('payouts') if structure == 'informed' else None
+        matrix = bubble_factors(chip_stacks, self.table_payouts(len(players), payouts))
+        factor = matrix[players.index(hero)][players.index(villain)]
+        return (factor if factor is not None else 1.0), len(players), structure
+
+    def _hero_equity(self, hand_data: Dict, villain_range: str, equity_service) -> Optional[float]:
+        if equity_service is None or not hand_data.get('hero_cards'):
+            return None
+        try:
+            result = equity_service.calculate_equity(hand_data['hero_cards'], None, [villain_range], iterations=5000)
+        except ValueError:
+            return None
+        return result.get('equity')
+
+    def _facing_shove_verdict(self, hero, shover, verb, stacks, committed, antes, shove_total,
+                              big_blind, hand_data, equity_service) -> Dict:
+        hero_posted = committed.get(hero, 0.0)
+        hero_total = max(stacks[hero], 0.0)
+        risk = min(hero_total, shove_total) - hero_posted
+        # Fichas do vilão acima do stack do herói não estão em disputa
+        contested = {p: min(v, hero_total) if p == shover else v for p, v in committed.items()}
+        reward = antes + sum(contested.values())
+
+        factor, players, structure = self._bubble_factor_vs(hero, shover, stacks, hand_data)
+        chip_required = required_equity(risk, reward)
+        icm_required = required_equity(risk, reward, factor)
+        equity = self._hero_equity(hand_data, DEFAULT_SHOVE_RANGE, equity_service)
+        hero_called = verb == 'calls'
+
+        if equity is None:
+            verdict = 'Inconclusivo'
+        elif hero_called:
+            if equity >= icm_required:
+                verdict = 'Call correto sob ICM'
+            elif equity >= chip_required:
+                verdict = 'Call +chipEV, mas -$EV por ICM'
+            else:
+                verdict = 'Call incorreto'
+        else:
+            if equity >= icm_required:
+                verdict = 'Fold muito tight: o call era +$EV mesmo com ICM'
+            elif equity >= chip_required:
+                verdict = 'Fold correto por ICM (o call seria +chipEV)'
+            else:
+                verdict = 'Fold correto'
+
+        return {
+            'spot': 'call_vs_shove' if hero_called else 'fold_vs_shove',
+            'villain': shover,
+            'hero_stack_bb': round(hero_total / big_blind, 1),
+            'players': players,
+            'icm_applies': structure is not None,
+            'payouts': structure or 'assumed_final_table',
+            'bubble_factor': round(factor, 3),
+            'chip_required_equity': round(chip_required, 4),
+            'icm_required_equity': round(icm_required, 4),
+            'hero_equity': round(equity, 4) if equity is not None else None,
+            'verdict': verdict,
+        }
+
+    def _shove_verdict(self, hero, stacks, committed, antes, big_blind, hand_data, equity_service) -> Dict:
+        hero_total = max(stacks[hero], 0.0)
+        opponents = [p for p in stacks if p != hero and stacks[p] > 0]
+        raisers = [p for p in opponents if committed.get(p, 0.0) > big_blind]
+        if raisers:
+            # Re-shove: quem decide o call é o raiser
+            villain = max(raisers, key=lambda p: committed[p])
+        else:
+            # Open shove: o maior stack é quem mais pressiona o herói via ICM
+            villain = max(opponents, key=lambda p: stacks[p])
+        effective = min(hero_total, stacks[villain])
+        hero_posted = committed.get(hero, 0.0)
+        dead_money = sum(v for p, v in committed.items() if p not in (hero, villain))
+        risk = effective - hero_posted
+        reward = antes + dead_money + effective + hero_posted
+
+        factor, players, structure = self._bubble_factor_vs(hero, villain, stacks, hand_data)
+        chip_required = required_equity(risk, reward)
+        icm_required = required_equity(risk, reward, factor)
+        equity = self._hero_equity(hand_data, DEFAULT_CALLING_RANGE, equity_service)
+
+        if equity is None:
+            verdict = 'Inconclusivo'
+        elif equity >= icm_required:
+            verdict = 'Shove correto sob ICM mesmo quando pago'
+        elif equity >= chip_required:
+            verdict = 'Shove depende de fold equity: quando pago é +chipEV, mas -$EV por ICM'
+        else:
+            verdict = 'Shove depende de fold equity'
+
+        return {
+            'spot': 'shove',
+            'villain': villain,
+            'hero_stack_bb': round(hero_total / big_blind, 1),
+            'players': players,
+            'icm_applies': structure is not None,
+            'payouts': structure or 'assumed_final_table',
+            'bubble_factor': round(factor, 3),
+            'chip_required_equity': round(chip_required, 4),
+            'icm_required_equity': round(icm_required, 4),
+            'hero_equity': round(equity, 4) if equity is not None else None,
+            'verdict': verdict,
+        }
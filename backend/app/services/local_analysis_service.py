@@ -1,89 +1,157 @@
-from typing import Dict, Any
+import json
+from dataclasses import dataclass
+from typing import Dict, Any, List, Optional, Tuple
+
+from app.services.equity_service import EquityService
+from app.services.icm_service import ICMService
+from app.services.push_fold_service import PushFoldService
+from app.utils.local_verdicts import (
+    DECISION_ACCEPTABLE, DECISION_CODES, DECISION_CORRECT, DECISION_INCONCLUSIVE, DECISION_QUESTIONABLE,
+    POSITION_EARLY_PASSIVE, POSITION_EARLY_RAISE, POSITION_LATE_CALL, POSITION_LATE_RAISE, POSITION_NONE,
+    STACK_DEEP, STACK_MEDIUM, STACK_NONE, STACK_PUSH_FOLD, STACK_SHORT,
+    STRENGTH_MEDIUM, STRENGTH_STRONG, STRENGTH_UNKNOWN, render_local_analysis
+)
+from app.utils.ranges import Range, hand_class
+
+# Mãos fortes pré-flop: AA, KK, QQ, JJ, AK e AQ (suited e offsuit)
+STRONG_HANDS = Range.parse("JJ+, AQ+")
+
+ICM_PARAMS = ('verdict', 'villain', 'hero_stack_bb', 'bubble_factor', 'chip_required_equity',
+              'icm_required_equity', 'hero_equity', 'icm_applies', 'payouts')
+PUSH_FOLD_PARAMS = ('spot', 'in_chart', 'position', 'stack_bb', 'decision', 'chart_action')
+
+
+@dataclass
+class LocalVerdict:
+    """Veredito da análise local em códigos (app/utils/local_verdicts.py)"""
+    stack: int
+    position: int
+    strength: int
+    decision: int
+    params: Dict
+    push_fold: Optional[Dict] = None  # Classificação completa (colunas push_fold_* da mão)
+
+    def columns(self) -> Dict:
+        """Colunas local_* da mão"""
+        return {
+            'local_stack_code': self.stack,
+            'local_position_code': self.position,
+            'local_strength_code': self.strength,
+            'local_decision_code': self.decision,
+            'local_params': json.dumps(self.params, separators=(',', ':')) if self.params else None,
+        }
+
+    def render(self, hand_data: Dict) -> str:
+        return render_local_analysis(
+            hand_data.get("hero_position", "Desconhecida"),
+            hand_data.get("hero_cards", "Não identificadas"),
+            hand_data.get("hero_action", "Não identificada"),
+            hand_data.get("hero_stack"),
+            hand_data.get("pot_size"),
+            self.stack, self.position, self.strength, self.decision,
+            self.columns()['local_params']
+        )
+
+
+class _EquityMemo:
+    """
+    Equity do herói contra um range sem board depende só da classe da mão (AKo, 77, ...):
+    no lote, cada (classe, range) é simulado uma vez
+    """
+
+    def __init__(self, equity_service: EquityService):
+        self.equity_service = equity_service
+        self.results: Dict[Tuple, Dict] = {}
+
+    def calculate_equity(self, hero_cards, board, villain_ranges, iterations=5000):
+        if board:
+            return self.equity_service.calculate_equity(hero_cards, board, villain_ranges, iterations=iterations)
+        key = (hand_class(hero_cards), tuple(villain_ranges), iterations)
+        if key not in self.results:
+            self.results[key] = self.equity_service.calculate_equity(hero_cards, None, villain_ranges, iterations=iterations)
+        return self.results[key]
+
 
 class LocalAnalysisService:
     def __init__(self):
-        pass
+        self.equity_service = EquityService()
+        self.icm_service = ICMService()
+        self.push_fold_service = PushFoldService()
+
+    def analyze_many(self, hands: List[Dict[str, Any]]) -> List[LocalVerdict]:
+        """Vereditos de um lote de mãos (CPU puro; equities repetidas simuladas uma vez)"""
+        equity = _EquityMemo(self.equity_service)
+        return [self._verdict(hand_data, equity) for hand_data in hands]
 
     async def analyze_hand_locally(self, hand_data: Dict[str, Any]) -> str:
-        """Análise local mais detalhada."""
+        """Análise local mais detalhada (texto)."""
+        return self.analyze_many([hand_data])[0].render(hand_data)
 
-        hero_position = hand_data.get("hero_position", "Desconhecida")
-        hero_cards = hand_data.get("hero_cards", "Não identificadas")
+    def _verdict(self, hand_data: Dict[str, Any], equity_service) -> LocalVerdict:
         hero_action = hand_data.get("hero_action", "Não identificada")
         hero_stack = hand_data.get("hero_stack")
-        pot_size = hand_data.get("pot_size")
+        params: Dict[str, Any] = {}
 
-        # Regra simplificada para stack
-        stack_comment = ""
-        if hero_stack is not None:
+        # Stack em big blinds quando a mão é um spot de push/fold; senão regra simplificada
+        stack = STACK_NONE
+        push_fold = self.push_fold_service.classify_decision(hand_data)
+        if push_fold:
+            stack = STACK_PUSH_FOLD
+            params['stack_bb'] = push_fold['stack_bb']
+            params['push_fold'] = {key: push_fold[key] for key in PUSH_FOLD_PARAMS}
+        elif hero_stack is not None:
             if hero_stack < 10:
-                stack_comment = "Stack curto: situação de push/fold."
+                stack = STACK_SHORT
             elif hero_stack < 30:
-                stack_comment = "Stack médio: é possível abrir mais mãos, mas cuidado com all-ins."
+                stack = STACK_MEDIUM
             else:
-                stack_comment = "Stack confortável: margem para jogadas pós-flop."
+                stack = STACK_DEEP
 
         # Verifica coerência posição x ação
-        position_action_comment = ""
-        hero_position_lower = (hero_position or "").lower()
+        position = POSITION_NONE
+        hero_position_lower = (hand_data.get("hero_position", "Desconhecida") or "").lower()
         hero_action_lower = (hero_action or "").lower()
-        
+
         if hero_position_lower in ["early", "utg", "utg+1"]:
             if hero_action_lower in ["call", "limp"]:
-                position_action_comment = "Jogada passiva em posição inicial pode ser ruim. Prefira abrir raise ou fold."
+                position = POSITION_EARLY_PASSIVE
             elif hero_action_lower in ["raise"]:
-                position_action_comment = "Ação agressiva em posição inicial é ok, desde que o range seja tight."
+                position = POSITION_EARLY_RAISE
         elif hero_position_lower in ["late", "button", "cutoff"]:
             if hero_action_lower in ["raise"]:
-                position_action_comment = "Boa agressividade em posição final."
+                position = POSITION_LATE_RAISE
             elif hero_action_lower in ["call"]:
-                position_action_comment = "Call em posição final é aceitável, mas avalie odds e agressividade."
+                position = POSITION_LATE_CALL
 
         # Avalia força pré-flop se possível (super simplificado)
-        hand_strength_comment = ""
+        strength = STRENGTH_UNKNOWN
+        hero_cards = hand_data.get("hero_cards", "Não identificadas")
         hero_cards_str = str(hero_cards) if hero_cards is not None else ""
         if hero_cards_str and hero_cards_str != "Não identificadas" and hero_cards_str != "None":
-            strong_hands = ["AA", "KK", "QQ", "AK", "JJ", "AQ"]
-            hero_cards_clean = hero_cards_str.replace(" ", "")
-            if any(strong in hero_cards_clean for strong in strong_hands):
-                hand_strength_comment = "Mão forte pré-flop."
-            else:
-                hand_strength_comment = "Mão de força média/baixa — jogue com cautela."
+            try:
+                is_strong = hero_cards_str in STRONG_HANDS
+            except ValueError:
+                is_strong = None
+            if is_strong:
+                strength = STRENGTH_STRONG
+            elif is_strong is not None:
+                strength = STRENGTH_MEDIUM
 
         # Diagnóstico final (exemplo simples)
-        decision_ok = "Inconclusivo"
-        explanation = ""
-
-        if "Mão forte" in hand_strength_comment and "raise" in hero_action_lower:
-            decision_ok = "Decisão correta"
-            explanation = "Ação agressiva com mão forte está de acordo com estratégia."
-        elif "Mão de força média" in hand_strength_comment and hero_action_lower == "call":
-            decision_ok = "Aceitável"
-            explanation = "Call com mão média pode ser ok, mas depende de posição e tamanho de stack."
-        elif "Jogada passiva" in position_action_comment:
-            decision_ok = "Questionável"
-            explanation = "Jogada passiva fora de posição com mão média geralmente não é lucrativa."
-
-        analysis_text = f"""
-ANÁLISE LOCAL DETALHADA
-
-Posição do Herói: {hero_position}
-Cartas do Herói: {hero_cards}
-Ação do Herói: {hero_action}
-Stack do Herói: {hero_stack}
-Tamanho do Pote: {pot_size}
-
-👉 STACK: {stack_comment}
-👉 POSIÇÃO vs AÇÃO: {position_action_comment}
-👉 FORÇA DA MÃO: {hand_strength_comment}
-
-📌 DIAGNÓSTICO: {decision_ok}
-💡 EXPLICAÇÃO: {explanation}
-
-RECOMENDAÇÃO GERAL:
-- Avalie o range da mão para sua posição.
-- Prefira agressividade em posições finais.
-- Evite jogadas marginais em posições iniciais.
-"""
-
-        return analysis_text
\ No newline at end of file
+        decision = DECISION_INCONCLUSIVE
+        if strength == STRENGTH_STRONG and "raise" in hero_action_lower:
+            decision = DECISION_CORRECT
+        elif strength == STRENGTH_MEDIUM and hero_action_lower == "call":
+            decision = DECISION_ACCEPTABLE
+        elif position == POSITION_EARLY_PASSIVE:
+            decision = DECISION_QUESTIONABLE
+
+        # Spots de push/fold: veredito ajustado por ICM só com prêmios conhecidos
+        # (mesa final ou estrutura informada); nos demais o ICM fica como referência
+        icm_spot = self.icm_service.analyze_push_fold_spot(hand_data, equity_service)
+        if icm_spot:
+            params['icm'] = {key: icm_spot[key] for key in ICM_PARAMS}
+            if icm_spot['icm_applies'] and icm_spot['hero_equity'] is not None:
+                decision = DECISION_CODES.get(icm_spot['verdict'], DECISION_INCONCLUSIVE)
+
+        return LocalVerdict(stack, position, strength, decision, params, push_fold)
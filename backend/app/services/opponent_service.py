@@ -0,0 +1,149 @@
+"""
+Índice de oponentes: contadores por (usuário, oponente) de mãos vistas, VPIP,
+PFR, agressão, showdown e mãos mostradas.
+Mantido de forma incremental no upload, a partir do mesmo passe pelo histórico
+usado no HUD do herói; consultar um oponente nunca varre hand_actions.
+"""
+
+import json
+from collections import Counter
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy.orm import Session
+
+from app.models.opponent_profile import OpponentProfile
+from app.services.hud_stats_service import HudStatsService, HUD_COUNTERS, format_hud
+from app.utils.ranges import hand_class
+
+MAX_SHOWDOWN_HANDS = 20
+MAX_NAME_LENGTH = 50
+# Limite do IN (...) por consulta (MSSQL aceita até ~2100 parâmetros)
+LOOKUP_CHUNK = 500
+
+
+class OpponentService:
+    def __init__(self):
+        self.hud_service = HudStatsService()
+
+    def accumulate(self, batch: Dict[str, Dict], hand_data: Dict) -> None:
+        """Soma no lote os contadores de todos os oponentes do herói na mão"""
+        raw_hand = hand_data.get('raw_hand') or ''
+        if not raw_hand:
+            return
+        hero = hand_data.get('hero_name')
+        counters, shown = self.hud_service.extract_player_counters(raw_hand)
+        date_played = hand_data.get('date_played')
+
+        for player, player_counters in counters.items():
+            if player == hero:
+                continue
+            name = player[:MAX_NAME_LENGTH]
+            entry = batch.setdefault(name, {'counters': Counter(), 'showdowns': [], 'last_seen': None})
+            entry['counters'].update(player_counters)
+            if isinstance(date_played, datetime) and (entry['last_seen'] is None or date_played > entry['last_seen']):
+                entry['last_seen'] = date_played
+            if player in shown:
+                entry['showdowns'].append(self._showdown_entry(hand_data, shown[player]))
+
+    def apply_batch(self, db: Session, user_id: int, batch: Dict[str, Dict], sign: int = 1) -> None:
+        """
+        Aplica o lote no índice do usuário (sem commit; entra na transação do upload).
+        Uma consulta por bloco de nomes; contadores como coluna = coluna + delta.
+        """
+        names = list(batch)
+        existing = {}
+        for start in range(0, len(names), LOOKUP_CHUNK):
+            for row in db.query(OpponentProfile).filter(
+                OpponentProfile.user_id == user_id,
+                OpponentProfile.name.in_(names[start:start + LOOKUP_CHUNK])
+            ):
+                existing[row.name] = row
+
+        for name, entry in batch.items():
+            deltas = {counter: sign * entry['counters'][counter] for counter in HUD_COUNTERS if entry['counters'][counter]}
+            row = existing.get(name)
+            if row is None:
+                if sign < 0:
+                    continue
+                row = OpponentProfile(
+                    user_id=user_id,
+                    name=name,
+                    name_lower=name.lower(),
+                    showdown_hands=json.dumps(self._merge_showdowns([], entry['showdowns'])),
+                    last_seen=entry['last_seen'],
+                    **deltas
+                )
+                db.add(row)
+                continue
+
+            for counter, delta in deltas.items():
+                setattr(row, counter, getattr(OpponentProfile, counter) + delta)
+            if sign > 0:
+                if entry['showdowns']:
+                    row.showdown_hands = json.dumps(self._merge_showdowns(row.get_showdown_hands(), entry['showdowns']))
+                if entry['last_seen'] and (row.last_seen is None or entry['last_seen'] > row.last_seen.replace(tzinfo=None)):
+                    row.last_seen = entry['last_seen']
+            elif entry['showdowns']:
+                removed = {showdown['hand_id'] for showdown in entry['showdowns']}
+                row.showdown_hands = json.dumps([
+                    showdown for showdown in row.get_showdown_hands() if showdown.get('hand_id') not in removed
+                ])
+        db.flush()
+
+    def add_hands(self, db: Session, user_id: int, hands: Iterable[Dict], sign: int = 1) -> None:
+        batch: Dict[str, Dict] = {}
+        for hand_data in hands:
+            self.accumulate(batch, hand_data)
+        if batch:
+            self.apply_batch(db, user_id, batch, sign)
+
+    def search(self, db: Session, user_id: int, prefix: str = '', min_hands: int = 0,
+               limit: int = 20, offset: int = 0) -> List[Dict]:
+        """Busca por prefixo do nome, pelo índice (user_id, name_lower)"""
+        query = db.query(OpponentProfile).filter(OpponentProfile.user_id == user_id)
+        prefix = (prefix or '').strip().lower()
+        if prefix:
+            escaped = prefix.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_').replace('[', '\\[')
+            query = query.filter(OpponentProfile.name_lower.like(f"{escaped}%", escape='\\'))
+        if min_hands:
+            query = query.filter(OpponentProfile.hands >= min_hands)
+        rows = query.order_by(OpponentProfile.name_lower).offset(offset).limit(limit).all()
+        return [self._summary(row) for row in rows]
+
+    def get_profile(self, db: Session, user_id: int, name: str) -> Optional[Dict]:
+        row = db.query(OpponentProfile).filter(
+            OpponentProfile.user_id == user_id,
+            OpponentProfile.name == name
+        ).first()
+        if not row:
+            return None
+        return {**self._summary(row), 'showdown_hands': row.get_showdown_hands()}
+
+    def _summary(self, row: OpponentProfile) -> Dict:
+        return {
+            'name': row.name,
+            **format_hud(row),
+            'last_seen': row.last_seen.isoformat() if row.last_seen else None,
+        }
+
+    def _showdown_entry(self, hand_data: Dict, cards: str) -> Dict:
+        try:
+            holding = hand_class(cards)
+        except ValueError:
+            holding = None
+        date_played = hand_data.get('date_played')
+        return {
+            'hand_id': hand_data.get('hand_id'),
+            'cards': cards,
+            'hand_class': holding,
+            'date_played': date_played.isoformat() if isinstance(date_played, datetime) else None,
+        }
+
+    def _merge_showdowns(self, current: List[Dict], new: List[Dict]) -> List[Dict]:
+        """Mais recentes primeiro, sem repetir a mesma mão, limitado a MAX_SHOWDOWN_HANDS"""
+        merged = {}
+        for showdown in list(reversed(new)) + current:
+            merged.setdefault((showdown.get('hand_id'), showdown.get('cards')), showdown)
+        ordered = sorted(merged.values(), key=lambda showdown: showdown.get('date_played') or '', reverse=True)
+        return ordered[:MAX_SHOWDOWN_HANDS]
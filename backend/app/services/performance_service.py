@@ -1,15 +1,54 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, func, desc
-from typing import List, Dict, Optional
-from datetime import datetime, timedelta
-import statistics
+from sqlalchemy import Float, and_, case, cast, desc, func, true
+from typing import List, Dict, Iterable, Optional
+from datetime import date, datetime, timedelta
+from collections import defaultdict
+import os
 
-from app.models.tournament import Tournament, PerformanceStats
+from app.models.tournament import Tournament, TournamentDailyStats, PerformanceDataVersion
 from app.models.user import User
+from app.utils.bootstrap import bootstrap_intervals
+from app.utils.downsampling import lttb_indices
+from app.utils.lru_cache import LRUCache
+
+# Colunas somadas e extremos (mínimo/máximo) das linhas diárias
+ROLLUP_SUMS = ('tournaments_played', 'total_buy_ins', 'total_prizes', 'itm_count', 'finish_count', 'finish_sum')
+ROLLUP_EXTREMES = ('best_finish', 'worst_finish', 'biggest_win', 'biggest_loss')
+_PICK = {'best_finish': min, 'worst_finish': max, 'biggest_win': max, 'biggest_loss': max}
+
+
+def _contribution(buy_in, prize, position, is_itm) -> Dict:
+    """Valores de um torneio nas colunas da linha diária"""
+    return {
+        'tournaments_played': 1,
+        'total_buy_ins': buy_in or 0.0,
+        'total_prizes': prize or 0.0,
+        'itm_count': 1 if is_itm else 0,
+        'finish_count': 1 if position else 0,  # Posição nula ou 0 não conta
+        'finish_sum': position or 0,
+        'best_finish': position or None,
+        'worst_finish': position or None,
+        'biggest_win': prize or 0.0,
+        'biggest_loss': buy_in if prize == 0 else 0.0,
+    }
+
+
+def _merge(totals: Dict, values: Dict, sums: bool = True) -> None:
+    if sums:
+        for key in ROLLUP_SUMS:
+            totals[key] = (totals.get(key) or 0) + (values[key] or 0)
+    for key in ROLLUP_EXTREMES:
+        current, value = totals.get(key), values[key]
+        totals[key] = value if current is None else current if value is None else _PICK[key](current, value)
 
 class PerformanceAnalysisService:
     def __init__(self):
-        pass
+        self.bootstrap_iterations = int(os.getenv("PERFORMANCE_BOOTSTRAP_ITERATIONS", "2000"))
+        # Chave inclui a versão dos dados do usuário: resultado novo invalida sozinho
+        self.interval_cache = LRUCache(
+            max_entries=int(os.getenv("PERFORMANCE_CI_CACHE_ENTRIES", "2000")),
+            ttl_seconds=float(os.getenv("PERFORMANCE_CI_CACHE_TTL_SECONDS", "86400"))
+        )
 
     def calculate_roi(self, buy_in: float, prize: float) -> float:
         """Calcula ROI de um torneio específico"""
@@ -91,12 +130,13 @@ class PerformanceAnalysisService:
         tournament.is_itm = tournament.prize > 0
         
         db.add(tournament)
+        db.flush()
+        
+        # Atualizar estatísticas diárias de performance
+        self.record_tournaments(db, [tournament])
         db.commit()
         db.refresh(tournament)
         
-        # Atualizar estatísticas de performance
-        self.update_performance_stats(db, user_id)
-        
         return tournament
 
     def get_user_tournaments(self, db: Session, user_id: int, limit: int = 50) -> List[Tournament]:
@@ -107,44 +147,57 @@ class PerformanceAnalysisService:
 
     def calculate_performance_stats(self, db: Session, user_id: int, days_back: int = 30) -> Dict:
         """Calcula estatísticas de performance"""
-        
-        cutoff_date = datetime.utcnow() - timedelta(days=days_back)
-        
-        tournaments = db.query(Tournament).filter(
-            and_(
-                Tournament.user_id == user_id,
-                Tournament.date_played >= cutoff_date
-            )
-        ).all()
-        
-        if not tournaments:
+        return self.rollup_windows(db, user_id, (days_back,))[days_back]
+
+    def calculate_performance_windows(self, db: Session, user_id: int, windows=(7, 30, 90)) -> Dict[int, Dict]:
+        """
+        Estatísticas de vários períodos em uma única consulta: agregação condicional
+        (SUM/COUNT/AVG/MIN/MAX com CASE em date_played) por janela, sem carregar os torneios.
+        Janelas exatas sobre a tabela de torneios; as rotas usam rollup_windows.
+        """
+        now = datetime.utcnow()
+        columns = []
+        for days in windows:
+            in_window = Tournament.date_played >= now - timedelta(days=days)
+            placed = and_(in_window, Tournament.position != 0)  # Posição nula ou 0 não conta
+            columns += [
+                func.count(case((in_window, Tournament.id))),
+                func.sum(case((in_window, Tournament.buy_in))),
+                func.sum(case((in_window, Tournament.prize))),
+                func.count(case((and_(in_window, Tournament.is_itm == true()), Tournament.id))),
+                # AVG de inteiro trunca no SQL Server
+                func.avg(case((placed, cast(Tournament.position, Float)))),
+                func.min(case((placed, Tournament.position))),
+                func.max(case((placed, Tournament.position))),
+                func.max(case((in_window, Tournament.prize))),
+                func.max(case((and_(in_window, Tournament.prize == 0), Tournament.buy_in))),
+            ]
+
+        row = db.query(*columns).filter(
+            Tournament.user_id == user_id,
+            Tournament.date_played >= now - timedelta(days=max(windows))
+        ).one()
+
+        stats = {}
+        for index, days in enumerate(windows):
+            values = row[index * 9:(index + 1) * 9]
+            stats[days] = self._window_stats(days, *values)
+        return stats
+
+    def _window_stats(self, days_back: int, count, total_buy_ins, total_prizes, itm_count,
+                      avg_finish, best_finish, worst_finish, biggest_win, biggest_loss) -> Dict:
+        if not count:
             return self._empty_stats()
-        
+
         # Estatísticas básicas
-        total_buy_ins = sum(t.buy_in for t in tournaments)
-        total_prizes = sum(t.prize for t in tournaments)
         net_profit = total_prizes - total_buy_ins
         roi_percentage = (net_profit / total_buy_ins * 100) if total_buy_ins > 0 else 0
-        
-        # Estatísticas de ITM
-        itm_tournaments = [t for t in tournaments if t.is_itm]
-        itm_count = len(itm_tournaments)
-        itm_percentage = (itm_count / len(tournaments) * 100) if tournaments else 0
-        
-        # Estatísticas de posicionamento
-        positions = [t.position for t in tournaments if t.position]
-        avg_finish = statistics.mean(positions) if positions else 0
-        best_finish = min(positions) if positions else 0
-        worst_finish = max(positions) if positions else 0
-        
-        # Estatísticas financeiras
-        avg_buy_in = statistics.mean([t.buy_in for t in tournaments]) if tournaments else 0
-        biggest_win = max([t.prize for t in tournaments]) if tournaments else 0
-        biggest_loss = max([t.buy_in for t in tournaments if t.prize == 0]) if tournaments else 0
-        
+        itm_percentage = itm_count / count * 100
+        avg_buy_in = total_buy_ins / count
+
         return {
             'period_days': days_back,
-            'tournaments_played': len(tournaments),
+            'tournaments_played': count,
             'total_buy_ins': round(total_buy_ins, 2),
             'total_prizes': round(total_prizes, 2),
             'net_profit': round(net_profit, 2),
@@ -152,80 +205,231 @@ class PerformanceAnalysisService:
             'itm_count': itm_count,
             'itm_percentage': round(itm_percentage, 2),
             'avg_finish_position': round(avg_finish, 1) if avg_finish else 0,
-            'best_finish': best_finish,
-            'worst_finish': worst_finish,
+            'best_finish': best_finish or 0,
+            'worst_finish': worst_finish or 0,
             'avg_buy_in': round(avg_buy_in, 2),
-            'biggest_win': round(biggest_win, 2),
-            'biggest_loss': round(biggest_loss, 2),
-            'profit_per_tournament': round(net_profit / len(tournaments), 2) if tournaments else 0
+            'biggest_win': round(biggest_win or 0, 2),
+            'biggest_loss': round(biggest_loss or 0, 2),
+            'profit_per_tournament': round(net_profit / count, 2)
         }
 
-    def update_performance_stats(self, db: Session, user_id: int):
-        """Atualiza estatísticas de performance no banco"""
-        
-        # Calcular stats para diferentes períodos
-        periods = [7, 30, 90, 365]
-        
-        for days in periods:
-            stats = self.calculate_performance_stats(db, user_id, days)
-            
-            # Verificar se já existe registro para este período
-            existing = db.query(PerformanceStats).filter(
-                and_(
-                    PerformanceStats.user_id == user_id,
-                    PerformanceStats.period_start >= datetime.utcnow() - timedelta(days=days)
-                )
+    def record_tournaments(self, db: Session, tournaments: Iterable[Tournament]) -> None:
+        """
+        Soma torneios novos nas linhas diárias (tournament_daily_stats). Sem commit:
+        entra na transação de quem inseriu os torneios.
+        """
+        by_day = defaultdict(dict)
+        for tournament in tournaments:
+            _merge(by_day[(tournament.user_id, tournament.date_played.date())], _contribution(
+                tournament.buy_in, tournament.prize, tournament.position, tournament.is_itm
+            ))
+
+        for (user_id, day), values in by_day.items():
+            row = db.query(TournamentDailyStats).filter(
+                TournamentDailyStats.user_id == user_id,
+                TournamentDailyStats.day == day
+            ).first()
+            if row is None:
+                db.add(TournamentDailyStats(user_id=user_id, day=day, **values))
+                continue
+            extremes = {key: getattr(row, key) for key in ROLLUP_EXTREMES}
+            _merge(extremes, values, sums=False)
+            for key in ROLLUP_SUMS:
+                setattr(row, key, getattr(TournamentDailyStats, key) + values[key])
+            for key, value in extremes.items():
+                setattr(row, key, value)
+        self.bump_data_version(db, {user_id for user_id, _ in by_day})
+        # A sessão não faz autoflush: a próxima soma na mesma linha precisa ver esta
+        db.flush()
+
+    def refresh_days(self, db: Session, user_id: int, days: Iterable[date]) -> None:
+        """
+        Recalcula as linhas dos dias afetados por torneios alterados ou removidos
+        (mínimos e máximos não podem ser subtraídos). Sem commit.
+        """
+        db.flush()
+        for day in set(days):
+            start = datetime.combine(day, datetime.min.time())
+            tournaments = db.query(
+                Tournament.buy_in, Tournament.prize, Tournament.position, Tournament.is_itm
+            ).filter(
+                Tournament.user_id == user_id,
+                Tournament.date_played >= start,
+                Tournament.date_played < start + timedelta(days=1)
+            ).all()
+            row = db.query(TournamentDailyStats).filter(
+                TournamentDailyStats.user_id == user_id,
+                TournamentDailyStats.day == day
             ).first()
-            
-            if existing:
-                # Atualizar existente
-                for key, value in stats.items():
-                    if hasattr(existing, key):
-                        setattr(existing, key, value)
-                existing.updated_at = datetime.utcnow()
+
+            if not tournaments:
+                if row is not None:
+                    db.delete(row)
+                continue
+            totals = {}
+            for values in tournaments:
+                _merge(totals, _contribution(*values))
+            if row is None:
+                db.add(TournamentDailyStats(user_id=user_id, day=day, **totals))
             else:
-                # Criar novo
-                performance_stats = PerformanceStats(
-                    user_id=user_id,
-                    period_start=datetime.utcnow() - timedelta(days=days),
-                    period_end=datetime.utcnow(),
-                    **{k: v for k, v in stats.items() if hasattr(PerformanceStats, k)}
-                )
-                db.add(performance_stats)
-        
+                for key, value in totals.items():
+                    setattr(row, key, value)
+        self.bump_data_version(db, {user_id})
+
+    def rebuild_daily_stats(self, db: Session, user_id: Optional[int] = None) -> int:
+        """Refaz as linhas diárias a partir dos torneios (backfill); retorna as linhas gravadas"""
+        rows = db.query(TournamentDailyStats)
+        tournaments = db.query(
+            Tournament.user_id, Tournament.date_played, Tournament.buy_in, Tournament.prize,
+            Tournament.position, Tournament.is_itm
+        )
+        if user_id is not None:
+            rows = rows.filter(TournamentDailyStats.user_id == user_id)
+            tournaments = tournaments.filter(Tournament.user_id == user_id)
+        rows.delete(synchronize_session=False)
+
+        by_day = defaultdict(dict)
+        for owner, date_played, *values in tournaments.yield_per(5000):
+            _merge(by_day[(owner, date_played.date())], _contribution(*values))
+        db.add_all(
+            TournamentDailyStats(user_id=owner, day=day, **totals)
+            for (owner, day), totals in by_day.items()
+        )
+        owners = {owner for owner, _ in by_day}
+        self.bump_data_version(db, owners | ({user_id} if user_id is not None else set()))
+        db.commit()
+        return len(by_day)
+
+    def bump_data_version(self, db: Session, user_ids: Iterable[int]) -> None:
+        """Nova versão dos resultados dos usuários (sem commit)"""
+        for user_id in user_ids:
+            updated = db.query(PerformanceDataVersion).filter(
+                PerformanceDataVersion.user_id == user_id
+            ).update({PerformanceDataVersion.version: PerformanceDataVersion.version + 1},
+                     synchronize_session=False)
+            if not updated:
+                db.add(PerformanceDataVersion(user_id=user_id, version=1))
+        db.flush()
+
+    def confidence_intervals(self, db: Session, user_id: int, days_back: int = 30) -> Dict:
+        """
+        Intervalos de confiança (95%, bootstrap) de ROI, ITM% e posição média na janela,
+        em cache por versão dos dados do usuário
+        """
+        version = db.query(PerformanceDataVersion.version).filter(
+            PerformanceDataVersion.user_id == user_id
+        ).scalar() or 0
+        today = datetime.utcnow().date()
+        key = f"{user_id}|{days_back}|{version}|{today.isoformat()}"
+        cached = self.interval_cache.get(key)
+        if cached is not None:
+            return cached
+
+        # Mesma janela alinhada ao dia de rollup_windows
+        cutoff = datetime.combine(today - timedelta(days=days_back), datetime.min.time())
+        rows = db.query(Tournament.buy_in, Tournament.prize, Tournament.is_itm, Tournament.position).filter(
+            Tournament.user_id == user_id,
+            Tournament.date_played >= cutoff
+        ).all()
+        buy_ins, prizes, itm, positions = zip(*rows) if rows else ((), (), (), ())
+        intervals = {
+            'confidence': 0.95,
+            'iterations': self.bootstrap_iterations,
+            'sample_size': len(rows),
+            **bootstrap_intervals(
+                buy_ins, [prize or 0.0 for prize in prizes], [bool(value) for value in itm], positions,
+                iterations=self.bootstrap_iterations, confidence=0.95, seed=version
+            )
+        }
+        self.interval_cache.set(key, intervals)
+        return intervals
+
+    def update_tournament_result(self, db: Session, user_id: int, tournament_id: int, changes: Dict) -> Optional[Tournament]:
+        """Altera o resultado de um torneio e recalcula os dias afetados"""
+        tournament = db.query(Tournament).filter(
+            Tournament.id == tournament_id,
+            Tournament.user_id == user_id
+        ).first()
+        if not tournament:
+            return None
+
+        previous_day = tournament.date_played.date()
+        for key in ('name', 'buy_in', 'prize', 'position', 'players_count', 'date_played'):
+            if key in changes:
+                setattr(tournament, key, changes[key])
+        tournament.roi = self.calculate_roi(tournament.buy_in, tournament.prize or 0.0)
+        tournament.is_itm = (tournament.prize or 0.0) > 0
+
+        self.refresh_days(db, user_id, {previous_day, tournament.date_played.date()})
         db.commit()
+        db.refresh(tournament)
+        return tournament
+
+    def rollup_windows(self, db: Session, user_id: int, windows=(7, 30, 90)) -> Dict[int, Dict]:
+        """
+        Estatísticas das janelas somando as linhas diárias (no máximo uma por dia).
+        As janelas são alinhadas ao dia: `days` dias antes de hoje (UTC) até hoje.
+        """
+        today = datetime.utcnow().date()
+        cutoffs = {days: today - timedelta(days=days) for days in windows}
+        totals = {days: {} for days in windows}
+        for row in db.query(TournamentDailyStats).filter(
+            TournamentDailyStats.user_id == user_id,
+            TournamentDailyStats.day >= min(cutoffs.values())
+        ):
+            values = {key: getattr(row, key) for key in ROLLUP_SUMS + ROLLUP_EXTREMES}
+            for days, cutoff in cutoffs.items():
+                if row.day >= cutoff:
+                    _merge(totals[days], values)
+
+        stats = {}
+        for days, total in totals.items():
+            finish_count = total.get('finish_count')
+            stats[days] = self._window_stats(
+                days, total.get('tournaments_played'), total.get('total_buy_ins'), total.get('total_prizes'),
+                total.get('itm_count'), total['finish_sum'] / finish_count if finish_count else None,
+                total.get('best_finish'), total.get('worst_finish'), total.get('biggest_win'), total.get('biggest_loss')
+            )
+        return stats
 
-    def get_roi_chart_data(self, db: Session, user_id: int, days_back: int = 30) -> List[Dict]:
-        """Obtém dados para gráfico de ROI"""
+    def get_roi_chart_data(self, db: Session, user_id: int, days_back: int = 30,
+                           max_points: Optional[int] = None) -> List[Dict]:
+        """
+        Obtém dados para gráfico de ROI. Os acumulados vêm do banco (SUM ... OVER em
+        ordem de data); com max_points a série é reduzida por LTTB sobre o lucro acumulado.
+        """
         
         cutoff_date = datetime.utcnow() - timedelta(days=days_back)
+        order = (Tournament.date_played, Tournament.id)
         
-        tournaments = db.query(Tournament).filter(
+        rows = db.query(
+            Tournament.date_played,
+            func.sum(Tournament.buy_in).over(order_by=order, rows=(None, 0)),
+            func.sum(func.coalesce(Tournament.prize, 0.0)).over(order_by=order, rows=(None, 0)),
+        ).filter(
             and_(
                 Tournament.user_id == user_id,
                 Tournament.date_played >= cutoff_date
             )
-        ).order_by(Tournament.date_played).all()
+        ).order_by(*order).all()
         
-        if not tournaments:
+        if not rows:
             return []
         
-        # Calcular ROI cumulativo
-        cumulative_buy_ins = 0
-        cumulative_prizes = 0
-        chart_data = []
+        profits = [cumulative_prizes - cumulative_buy_ins for _, cumulative_buy_ins, cumulative_prizes in rows]
+        indices = range(len(rows))
+        if max_points:
+            indices = lttb_indices(indices, profits, max_points)
         
-        for tournament in tournaments:
-            cumulative_buy_ins += tournament.buy_in
-            cumulative_prizes += tournament.prize
-            
-            cumulative_roi = ((cumulative_prizes - cumulative_buy_ins) / cumulative_buy_ins * 100) if cumulative_buy_ins > 0 else 0
-            
+        chart_data = []
+        for index in indices:
+            date_played, cumulative_buy_ins, cumulative_prizes = rows[index]
+            cumulative_roi = (profits[index] / cumulative_buy_ins * 100) if cumulative_buy_ins > 0 else 0
             chart_data.append({
-                'date': tournament.date_played.strftime('%Y-%m-%d'),
+                'date': date_played.strftime('%Y-%m-%d'),
                 'roi': round(cumulative_roi, 2),
-                'profit': round(cumulative_prizes - cumulative_buy_ins, 2),
-                'tournaments': len(chart_data) + 1
+                'profit': round(profits[index], 2),
+                'tournaments': index + 1
             })
         
         return chart_data
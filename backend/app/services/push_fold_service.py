@@ -0,0 +1,248 @@
+"""
+Tabelas pré-calculadas de push/fold (estilo Nash) para stacks curtos.
+Grade: stack efetivo em BB x jogadores a agir depois do shover x ante (fração do BB).
+As tabelas são geradas por build_push_fold_tables.py e carregadas em memória
+mapeada (np.load com mmap_mode) na inicialização; cada consulta é uma indexação O(1).
+"""
+
+import re
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.services.icm_service import PUSH_FOLD_MAX_BB
+from app.utils.ranges import COMBO_CLASS, Range, hand_class_index
+
+PUSH_FOLD_TABLE_PATH = Path(__file__).resolve().parent.parent / "ranges" / "push_fold_charts.npy"
+
+# Eixos da tabela: [tipo, stack, jogadores atrás, ante, classe de mão]
+SHOVE_CHART = 0
+CALL_CHART = 1
+STACK_GRID: Tuple[int, ...] = tuple(range(1, PUSH_FOLD_MAX_BB + 1))
+PLAYERS_BEHIND_GRID: Tuple[int, ...] = tuple(range(1, 9))  # 1 = SB contra BB ... 8 = UTG 9-max
+ANTE_GRID: Tuple[float, ...] = (0.0, 0.1, 0.125, 0.2)
+TABLE_PLAYERS = 9  # Jogadores pagando ante na solução das tabelas
+TABLE_SHAPE = (2, len(STACK_GRID), len(PLAYERS_BEHIND_GRID), len(ANTE_GRID), 169)
+
+# Nome das posições pelo número de jogadores que ainda agem depois do herói
+POSITION_BY_PLAYERS_BEHIND = {1: 'SB', 2: 'BTN', 3: 'CO', 4: 'HJ', 5: 'LJ', 6: 'MP', 7: 'UTG+1', 8: 'UTG'}
+
+_tables: Optional[np.ndarray] = None
+_tables_missing = False
+
+
+def solve_push_fold(equity: np.ndarray, weights: np.ndarray, stack_bb: float, players_behind: int,
+                    ante_bb: float, players: int = TABLE_PLAYERS, iterations: int = 400) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Equilíbrio aproximado shove/call por fictitious play sobre as 169 classes.
+
+    equity[i, j]: equity da classe i contra j; weights[i, j]: pares de combos
+    compatíveis (remoção de cartas). Cada jogador atrás decide o call como o BB
+    contra o range de shove; o shove é pago se qualquer um deles chamar.
+    Retorna (frequência de shove, frequência de call) por classe.
+    """
+    posted = 0.5 if players_behind == 1 else 0.0
+    behind = max(stack_bb - ante_bb, 1.0)
+    pot = 1.5 + players * ante_bb
+    called_pot = pot + (behind - posted) + (behind - 1.0)
+    shover_net = equity * called_pot - (behind - posted)      # (i, j): resultado do shove pago
+    caller_net = equity * called_pot - (behind - 1.0)         # (j, i): resultado do call
+
+    totals = weights.sum(axis=1)
+    shove = np.ones(169)
+    call = np.zeros(169)
+    for t in range(1, iterations + 1):
+        called_weight = weights @ call
+        fold_probability = (1.0 - called_weight / totals) ** players_behind
+        called_ev = np.divide((weights * shover_net) @ call, called_weight,
+                              out=np.zeros(169), where=called_weight > 0)
+        shove_ev = fold_probability * pot + (1.0 - fold_probability) * called_ev
+
+        shove_weight = weights @ shove
+        call_ev = np.divide((weights * caller_net) @ shove, shove_weight,
+                            out=np.full(169, -1.0), where=shove_weight > 0)
+
+        shove += ((shove_ev > 0) - shove) / (t + 1)
+        call += ((call_ev > 0) - call) / (t + 1)
+    return shove, call
+
+
+def load_push_fold_tables(path: Optional[Path] = None) -> Optional[np.ndarray]:
+    """Carrega as tabelas em memória mapeada (uma vez por processo)"""
+    global _tables, _tables_missing
+    if path is None and (_tables is not None or _tables_missing):
+        return _tables
+    table_path = Path(path) if path else PUSH_FOLD_TABLE_PATH
+    if not table_path.exists():
+        print(f"⚠️ Tabelas de push/fold não encontradas em {table_path}")
+        _tables_missing = path is None
+        return None
+    tables = np.load(table_path, mmap_mode='r')
+    if tables.shape != TABLE_SHAPE:
+        print(f"⚠️ Tabelas de push/fold com formato inesperado: {tables.shape}")
+        _tables_missing = path is None
+        return None
+    _tables = tables
+    return _tables
+
+
+def _nearest(grid: Tuple[float, ...], value: float) -> int:
+    return min(range(len(grid)), key=lambda i: abs(grid[i] - value))
+
+
+class PushFoldService:
+    def __init__(self, tables: Optional[np.ndarray] = None):
+        self._tables = tables
+        self.patterns = {
+            'blinds': r'Level [IVXLC]+ \((\d+)/(\d+)\)',
+            'button': r"Seat #(\d+) is the button",
+            'seat': r'^Seat (\d+): (.+?) \((\d+) in chips',
+            'ante': r'^(.+?): posts the ante (\d+)',
+            'action': r'^(.+?): (folds|checks|calls|bets|raises)(?: (\d+))?(?: to (\d+))?( and is all-in)?',
+        }
+
+    @property
+    def tables(self) -> Optional[np.ndarray]:
+        if self._tables is None:
+            self._tables = load_push_fold_tables()
+        return self._tables
+
+    def cell(self, stack_bb: float, players_behind: int, ante_bb: float) -> Tuple[int, int, int]:
+        """Índices da grade mais próximos do spot (stack arredondado para BB inteiro)"""
+        stack_idx = min(max(int(round(stack_bb)), STACK_GRID[0]), STACK_GRID[-1]) - STACK_GRID[0]
+        behind_idx = min(max(players_behind, PLAYERS_BEHIND_GRID[0]), PLAYERS_BEHIND_GRID[-1]) - PLAYERS_BEHIND_GRID[0]
+        return stack_idx, behind_idx, _nearest(ANTE_GRID, ante_bb)
+
+    def in_chart(self, chart: int, hero_cards, stack_bb: float, players_behind: int, ante_bb: float) -> Optional[bool]:
+        """Consulta O(1): a mão está no range de shove (ou de call) do spot?"""
+        if self.tables is None:
+            return None
+        return bool(self.tables[(chart,) + self.cell(stack_bb, players_behind, ante_bb) + (hand_class_index(hero_cards),)])
+
+    def chart_range(self, chart: int, stack_bb: float, players_behind: int, ante_bb: float) -> Optional[Range]:
+        if self.tables is None:
+            return None
+        class_mask = np.asarray(self.tables[(chart,) + self.cell(stack_bb, players_behind, ante_bb)], dtype=bool)
+        return Range(class_mask[COMBO_CLASS])
+
+    def classify_decision(self, hand_data: Dict) -> Optional[Dict]:
+        """
+        Classifica a decisão pré-flop do herói em stack curto contra a tabela:
+        open shove/fold (sem ação antes) ou call/fold contra um único all-in.
+        Retorna None se a mão não for um spot de push/fold.
+        """
+        raw_hand = hand_data.get('raw_hand') or ''
+        hero = hand_data.get('hero_name')
+        hero_cards = hand_data.get('hero_cards')
+        blinds = re.search(self.patterns['blinds'], raw_hand)
+        button = re.search(self.patterns['button'], raw_hand)
+        if not hero or not hero_cards or not blinds or not button or self.tables is None:
+            return None
+        big_blind = float(blinds.group(2))
+
+        seats: List[Tuple[int, str]] = []
+        stacks: Dict[str, float] = {}
+        ante = 0.0
+        preflop: List[str] = []
+        section = 'setup'
+        for line in raw_hand.split('\n'):
+            line = line.strip()
+            if line.startswith('*** HOLE CARDS'):
+                section = 'preflop'
+                continue
+            if line.startswith('***'):
+                if section == 'preflop':
+                    break
+                continue
+            seat = re.match(self.patterns['seat'], line)
+            if seat and section == 'setup':
+                seats.append((int(seat.group(1)), seat.group(2).strip()))
+                stacks[seat.group(2).strip()] = float(seat.group(3))
+                continue
+            ante_match = re.match(self.patterns['ante'], line)
+            if ante_match:
+                ante = max(ante, float(ante_match.group(2)))
+                continue
+            if section == 'preflop':
+                preflop.append(line)
+
+        if hero not in stacks or len(seats) < 2:
+            return None
+        order = self._preflop_order(seats, int(button.group(1)))
+
+        shover = None
+        for line in preflop:
+            action = re.match(self.patterns['action'], line)
+            if not action:
+                continue
+            player, verb, _, _, all_in = action.groups()
+            player = player.strip()
+            if player == hero:
+                return self._hero_decision(
+                    hero, hero_cards, verb, bool(all_in), shover, order, stacks, big_blind, ante
+                )
+            if verb == 'folds':
+                continue
+            if shover is None and all_in and verb in ('bets', 'raises'):
+                shover = player
+                continue
+            # Limp, raise sem all-in ou call antes do herói: fora das tabelas
+            return None
+        return None
+
+    def _preflop_order(self, seats: List[Tuple[int, str]], button_seat: int) -> List[str]:
+        """Ordem de ação pré-flop: do primeiro depois do BB até o BB"""
+        seats = sorted(seats)
+        start = next((i for i, (number, _) in enumerate(seats) if number > button_seat), 0)
+        from_sb = seats[start:] + seats[:start]
+        if len(from_sb) == 2:
+            # Heads-up: o button é o SB e age primeiro
+            from_sb = from_sb[::-1]
+        return [name for _, name in from_sb[2:] + from_sb[:2]]
+
+    def _hero_decision(self, hero, hero_cards, verb, all_in, shover, order, stacks, big_blind, ante) -> Optional[Dict]:
+        hero_behind = len(order) - 1 - order.index(hero)
+        if shover is None:
+            if hero_behind == 0:
+                return None  # BB sem ação antes: não há decisão de shove
+            opponents = [stacks[p] for p in order[order.index(hero) + 1:]]
+            chart, players_behind = SHOVE_CHART, hero_behind
+            effective = min(stacks[hero], max(opponents))
+            if verb == 'folds':
+                decision = 'fold'
+            elif all_in and verb in ('bets', 'raises'):
+                decision = 'shove'
+            else:
+                return None
+        else:
+            chart, players_behind = CALL_CHART, len(order) - 1 - order.index(shover)
+            effective = min(stacks[hero], stacks[shover])
+            if verb == 'folds':
+                decision = 'fold'
+            elif verb == 'calls':
+                decision = 'call'
+            else:
+                return None
+
+        stack_bb = effective / big_blind
+        if stack_bb > PUSH_FOLD_MAX_BB:
+            return None
+        ante_bb = ante / big_blind
+        try:
+            chart_says_play = self.in_chart(chart, hero_cards, stack_bb, players_behind, ante_bb)
+        except ValueError:
+            return None
+        if chart_says_play is None:
+            return None
+
+        return {
+            'spot': 'open_shove' if chart == SHOVE_CHART else 'call_vs_shove',
+            'decision': decision,
+            'in_chart': chart_says_play == (decision != 'fold'),
+            'chart_action': ('shove' if chart == SHOVE_CHART else 'call') if chart_says_play else 'fold',
+            'stack_bb': round(stack_bb, 1),
+            'players_behind': players_behind,
+            'position': POSITION_BY_PLAYERS_BEHIND.get(players_behind),
+            'ante_bb': round(ante_bb, 3),
+        }
@@ -8,6 +8,11 @@ from datetime import datetime
 from typing import Dict, List, Optional, Any
 from dataclasses import dataclass
 
+from app.utils.ranges import Range
+
+# Mãos que não deveriam ser foldadas pré-flop sem ação agressiva relevante
+PREMIUM_HANDS = Range.parse("99+, AJs+, KQs, AQo+")
+
 @dataclass
 class Player:
     """Representa um jogador na mesa"""
@@ -29,6 +34,7 @@ class Action:
     street: str = 'preflop'  # 'preflop', 'flop', 'turn', 'river'
     timestamp: int = 0  # Ordem sequencial da ação
     cards: str = "" # Adicionado para armazenar cartas do showdown
+    is_all_in: bool = False
 
 @dataclass
 class Street:
@@ -37,12 +43,17 @@ class Street:
     cards: List[str] = None  # Cartas comunitárias
     pot_size: float = 0.0
     actions: List[Action] = None
+    # Apostas não pagas devolvidas ("Uncalled bet ... returned to"): ficam fora de actions,
+    # que vai para o replay e para hand_actions; timestamp = posição na lista de ações
+    refunds: List[Action] = None
     
     def __post_init__(self):
         if self.cards is None:
             self.cards = []
         if self.actions is None:
             self.actions = []
+        if self.refunds is None:
+            self.refunds = []
 
 @dataclass
 class HandReplay:
@@ -70,15 +81,22 @@ class HandReplay:
     # Análise
     ai_analysis: str = None
     gaps_identified: List[str] = None
+
+    # Antes e blinds (postados antes do *** HOLE CARDS ***)
+    forced_bets: List[Action] = None
     
     def __post_init__(self):
         if self.gaps_identified is None:
             self.gaps_identified = []
+        if self.forced_bets is None:
+            self.forced_bets = []
 
 class AdvancedPokerParser:
     """Parser avançado para extrair todas as informações da mão"""
     
-    def __init__(self):
+    def __init__(self, verbose: bool = True):
+        # verbose=False silencia o debug por linha (ingestão, codificação e scripts em lote)
+        self.verbose = verbose
         # Padrões regex para extração em inglês
         self.patterns = {
             'hand_header': r'PokerStars Hand #(\d+): Tournament #(\d+), .+ - Level ([IVX]+) \((\d+)/(\d+)\) - (.+)',
@@ -118,6 +136,10 @@ class AdvancedPokerParser:
             9: 'BB'     # Big Blind (9-max)
         }
     
+    def _debug(self, message: str):
+        if self.verbose:
+            print(message)
+
     def parse_hand_for_replay(self, hand_text: str) -> Optional[HandReplay]:
         """
         Parse completo de uma mão para reprodução passo a passo
@@ -148,6 +170,10 @@ class AdvancedPokerParser:
             
             # Extrair ações por street
             streets = self._extract_streets_and_actions(lines, players)
+            forced_bets = self._extract_forced_bets(lines)
+            antes = [a.amount for a in forced_bets if a.action_type == 'ante']
+            if antes:
+                hand_info['blinds']['ante'] = max(antes)
             
             # Criar objeto HandReplay
             hand_replay = HandReplay(
@@ -160,7 +186,8 @@ class AdvancedPokerParser:
                 players=players,
                 hero_name=hero_name,
                 hero_cards=self._parse_cards(hero_cards),
-                streets=streets
+                streets=streets,
+                forced_bets=forced_bets
             )
             
             return hand_replay
@@ -176,13 +203,13 @@ class AdvancedPokerParser:
             if match:
                 hand_id, tournament_id, level, small_blind, big_blind, date_str = match.groups()
                 
-                print(f"🔍 DEBUG: Extraindo hand info da linha: {line.strip()}")
-                print(f"🔍 DEBUG: hand_id: {hand_id}")
-                print(f"🔍 DEBUG: tournament_id: {tournament_id}")
-                print(f"🔍 DEBUG: level: {level}")
-                print(f"🔍 DEBUG: small_blind: {small_blind}")
-                print(f"🔍 DEBUG: big_blind: {big_blind}")
-                print(f"🔍 DEBUG: date_str: {date_str}")
+                self._debug(f"🔍 DEBUG: Extraindo hand info da linha: {line.strip()}")
+                self._debug(f"🔍 DEBUG: hand_id: {hand_id}")
+                self._debug(f"🔍 DEBUG: tournament_id: {tournament_id}")
+                self._debug(f"🔍 DEBUG: level: {level}")
+                self._debug(f"🔍 DEBUG: small_blind: {small_blind}")
+                self._debug(f"🔍 DEBUG: big_blind: {big_blind}")
+                self._debug(f"🔍 DEBUG: date_str: {date_str}")
                 
                 # Parse da data
                 try:
@@ -221,18 +248,18 @@ class AdvancedPokerParser:
         players = []
         button_position = None
         
-        print(f"🔍 DEBUG: Extraindo jogadores...")
+        self._debug(f"🔍 DEBUG: Extraindo jogadores...")
         
         # Encontrar posição do botão
         for line in lines:
             table_match = re.search(self.patterns['table_info'], line)
             if table_match:
                 button_position = int(table_match.group(3))
-                print(f"🔍 DEBUG: Button encontrado na posição {button_position} da linha: {line.strip()}")
+                self._debug(f"🔍 DEBUG: Button encontrado na posição {button_position} da linha: {line.strip()}")
                 break
         
         if button_position is None:
-            print(f"⚠️  DEBUG: Button não encontrado!")
+            self._debug(f"⚠️  DEBUG: Button não encontrado!")
         
         # Extrair jogadores
         for line in lines:
@@ -244,7 +271,7 @@ class AdvancedPokerParser:
                 
                 is_button = (position == button_position)
                 if is_button:
-                    print(f"🔍 DEBUG: Jogador {name} (pos {position}) marcado como button")
+                    self._debug(f"🔍 DEBUG: Jogador {name} (pos {position}) marcado como button")
                 
                 player = Player(
                     name=name,
@@ -265,15 +292,15 @@ class AdvancedPokerParser:
                     # Small blind é a próxima posição
                     next_idx = (i + 1) % len(players)
                     players[next_idx].is_small_blind = True
-                    print(f"🔍 DEBUG: Jogador {players[next_idx].name} (pos {players[next_idx].position}) marcado como small blind")
+                    self._debug(f"🔍 DEBUG: Jogador {players[next_idx].name} (pos {players[next_idx].position}) marcado como small blind")
                     
                     # Big blind é a posição seguinte
                     bb_idx = (i + 2) % len(players)
                     players[bb_idx].is_big_blind = True
-                    print(f"🔍 DEBUG: Jogador {players[bb_idx].name} (pos {players[bb_idx].position}) marcado como big blind")
+                    self._debug(f"🔍 DEBUG: Jogador {players[bb_idx].name} (pos {players[bb_idx].position}) marcado como big blind")
                     break
         
-        print(f"🔍 DEBUG: Total de jogadores extraídos: {len(players)}")
+        self._debug(f"🔍 DEBUG: Total de jogadores extraídos: {len(players)}")
         return players
     
     def _extract_hero_info(self, lines: List[str]) -> tuple:
@@ -287,12 +314,35 @@ class AdvancedPokerParser:
         
         return None, None
     
+    def _extract_forced_bets(self, lines: List[str]) -> List[Action]:
+        """Extrai antes e blinds postados antes das cartas serem distribuídas"""
+        forced_bets = []
+        for line in lines:
+            line = line.strip()
+            if line.startswith('*** HOLE CARDS'):
+                break
+            ante = re.match(r'^([^:]+): posts the ante ([0-9,]+)', line)
+            blind = re.match(r'^([^:]+): posts (small|big) blind ([0-9,]+)', line)
+            if ante:
+                amount = int(ante.group(2).replace(',', ''))
+                forced_bets.append(Action(
+                    player=ante.group(1).strip(), action_type='ante', amount=amount, total_bet=amount,
+                    is_all_in='and is all-in' in line
+                ))
+            elif blind:
+                amount = int(blind.group(3).replace(',', ''))
+                forced_bets.append(Action(
+                    player=blind.group(1).strip(), action_type=f'{blind.group(2)}_blind', amount=amount,
+                    total_bet=amount, is_all_in='and is all-in' in line
+                ))
+        return forced_bets
+    
     def _extract_streets_and_actions(self, lines: List[str], players: List[Player]) -> List[Street]:
         """Extrai streets e ações do hand history"""
         streets = []
         current_street = None
         
-        print(f"🔍 DEBUG: Processando {len(lines)} linhas para extrair streets e ações")
+        self._debug(f"🔍 DEBUG: Processando {len(lines)} linhas para extrair streets e ações")
         
         i = 0
         while i < len(lines):
@@ -302,37 +352,37 @@ class AdvancedPokerParser:
                 i += 1
                 continue
             
-            print(f"🔍 DEBUG: Linha {i}: '{line}'")
+            self._debug(f"🔍 DEBUG: Linha {i}: '{line}'")
             
             # Detectar início de nova street
             if '*** HOLE CARDS ***' in line:
                 if current_street:
                     streets.append(current_street)
                 current_street = Street(name='preflop')
-                print(f"🔍 DEBUG: Iniciando street: preflop")
+                self._debug(f"🔍 DEBUG: Iniciando street: preflop")
                 
             elif '*** FLOP ***' in line:
                 if current_street:
                     streets.append(current_street)
-                print(f"🔍 FLOP: '{line}'")
+                self._debug(f"🔍 FLOP: '{line}'")
                 if '[' in line and ']' in line:
                     start_idx = line.find('[')
                     end_idx = line.find(']')
                     if start_idx != -1 and end_idx != -1:
                         cards_str = line[start_idx + 1:end_idx]
                         parsed_cards = self._parse_cards(cards_str)
-                        print(f"✅ FLOP cards: {parsed_cards}")
+                        self._debug(f"✅ FLOP cards: {parsed_cards}")
                         current_street = Street(name='flop', cards=parsed_cards)
                     else:
                         current_street = Street(name='flop', cards=[])
                 else:
                     current_street = Street(name='flop', cards=[])
-                print(f"🔍 DEBUG: Street mudou para: flop")
+                self._debug(f"🔍 DEBUG: Street mudou para: flop")
                     
             elif '*** TURN ***' in line:
                 if current_street:
                     streets.append(current_street)
-                print(f"🔍 TURN: '{line}'")
+                self._debug(f"🔍 TURN: '{line}'")
                 if '[' in line and ']' in line:
                     # Encontrar o segundo par de colchetes (carta do turn)
                     bracket_count = 0
@@ -352,7 +402,7 @@ class AdvancedPokerParser:
                     if start_idx != -1 and end_idx != -1:
                         cards_str = line[start_idx + 1:end_idx]
                         parsed_cards = self._parse_cards(cards_str)
-                        print(f"✅ TURN card: {parsed_cards}")
+                        self._debug(f"✅ TURN card: {parsed_cards}")
                         current_street = Street(name='turn', cards=parsed_cards)
                     else:
                         current_street = Street(name='turn', cards=[])
@@ -362,7 +412,7 @@ class AdvancedPokerParser:
             elif '*** RIVER ***' in line:
                 if current_street:
                     streets.append(current_street)
-                print(f"🔍 RIVER: '{line}'")
+                self._debug(f"🔍 RIVER: '{line}'")
                 if '[' in line and ']' in line:
                     # Encontrar o segundo par de colchetes (carta do river)
                     bracket_count = 0
@@ -382,31 +432,31 @@ class AdvancedPokerParser:
                     if start_idx != -1 and end_idx != -1:
                         cards_str = line[start_idx + 1:end_idx]
                         parsed_cards = self._parse_cards(cards_str)
-                        print(f"✅ RIVER card: {parsed_cards}")
+                        self._debug(f"✅ RIVER card: {parsed_cards}")
                         current_street = Street(name='river', cards=parsed_cards)
                     else:
-                        print(f"⚠️  DEBUG: Não foi possível extrair carta do river da linha: '{line}'")
+                        self._debug(f"⚠️  DEBUG: Não foi possível extrair carta do river da linha: '{line}'")
                         current_street = Street(name='river', cards=[])
                 else:
-                    print(f"⚠️  DEBUG: River sem colchetes na linha: '{line}'")
+                    self._debug(f"⚠️  DEBUG: River sem colchetes na linha: '{line}'")
                     current_street = Street(name='river', cards=[])
                     
             elif '*** SHOW DOWN ***' in line:
-                print(f"🔍 DEBUG: Encontrou SHOW DOWN na linha {i}")
+                self._debug(f"🔍 DEBUG: Encontrou SHOW DOWN na linha {i}")
                 if current_street:
                     streets.append(current_street)
                 # Criar street para showdown
                 current_street = Street(name='showdown')
                 
                 # Log das próximas linhas para debug
-                print(f"🔍 DEBUG: Próximas linhas após SHOW DOWN:")
+                self._debug(f"🔍 DEBUG: Próximas linhas após SHOW DOWN:")
                 for j in range(i + 1, min(i + 10, len(lines))):
-                    print(f"  Linha {j}: '{lines[j].strip()}'")
+                    self._debug(f"  Linha {j}: '{lines[j].strip()}'")
                     if lines[j].strip().startswith('*** SUMMARY ***'):
                         break
                 
             elif '*** SUMMARY ***' in line:
-                print(f"🔍 DEBUG: Encontrou SUMMARY na linha {i}")
+                self._debug(f"🔍 DEBUG: Encontrou SUMMARY na linha {i}")
                 if current_street:
                     streets.append(current_street)
                 # Criar street para summary
@@ -419,7 +469,7 @@ class AdvancedPokerParser:
                     if not summary_line or summary_line.startswith('==='):
                         break
                     
-                    print(f"🔍 DEBUG: Processando linha do summary: '{summary_line}'")
+                    self._debug(f"🔍 DEBUG: Processando linha do summary: '{summary_line}'")
                     
                     # Extrair informações do vencedor
                     won_match = re.search(r'Seat \d+: ([^(]+) \(.*\) showed \[([^\]]+)\] and won \(([0-9,]+)\)', summary_line)
@@ -427,7 +477,7 @@ class AdvancedPokerParser:
                         player_name = won_match.group(1).strip()
                         cards = won_match.group(2)
                         amount = int(won_match.group(3).replace(',', ''))
-                        print(f"🏆 DEBUG: Vencedor encontrado: {player_name} com cartas {cards} ganhou ${amount}")
+                        self._debug(f"🏆 DEBUG: Vencedor encontrado: {player_name} com cartas {cards} ganhou ${amount}")
                         
                         action = Action(
                             player=player_name,
@@ -445,20 +495,23 @@ class AdvancedPokerParser:
             
             # Processar ações se estamos em uma street
             elif current_street and line and not line.startswith('***'):
-                print(f"🔍 DEBUG: Processando linha de ação: '{line}' para street: {current_street.name}")
-                print(f"🔍 DEBUG: current_street: {current_street.name}, line: '{line}'")
+                self._debug(f"🔍 DEBUG: Processando linha de ação: '{line}' para street: {current_street.name}")
+                self._debug(f"🔍 DEBUG: current_street: {current_street.name}, line: '{line}'")
                 
                 # Extrair ação
                 action = self._parse_action_line(line, current_street.name)
-                if action:
+                if action and action.action_type == 'uncalled_bet':
+                    action.timestamp = len(current_street.actions)
+                    current_street.refunds.append(action)
+                elif action:
                     current_street.actions.append(action)
-                    print(f"🔍 DEBUG: Ação adicionada à street '{current_street.name}': {action.player} {action.action_type} ${action.amount}")
-                    print(f"🔍 DEBUG: Street atual: {current_street.name}")
-                    print(f"🔍 DEBUG: Linha processada: '{line}'")
+                    self._debug(f"🔍 DEBUG: Ação adicionada à street '{current_street.name}': {action.player} {action.action_type} ${action.amount}")
+                    self._debug(f"🔍 DEBUG: Street atual: {current_street.name}")
+                    self._debug(f"🔍 DEBUG: Linha processada: '{line}'")
                 else:
-                    print(f"⚠️  DEBUG: Falha ao processar linha: '{line}'")
+                    self._debug(f"⚠️  DEBUG: Falha ao processar linha: '{line}'")
             else:
-                print(f"🔍 DEBUG: Linha ignorada: '{line}' (current_street: {current_street.name if current_street else 'None'})")
+                self._debug(f"🔍 DEBUG: Linha ignorada: '{line}' (current_street: {current_street.name if current_street else 'None'})")
             
             i += 1
         
@@ -466,18 +519,31 @@ class AdvancedPokerParser:
         if current_street and current_street not in streets:
             streets.append(current_street)
         
-        print(f"🔍 DEBUG: Total de streets extraídas: {len(streets)}")
+        self._debug(f"🔍 DEBUG: Total de streets extraídas: {len(streets)}")
         for i, street in enumerate(streets):
-            print(f"🔍 DEBUG: Street {i+1}: {street.name} - {len(street.cards)} cartas - {len(street.actions)} ações")
+            self._debug(f"🔍 DEBUG: Street {i+1}: {street.name} - {len(street.cards)} cartas - {len(street.actions)} ações")
             for j, action in enumerate(street.actions):
                 cards_info = f" (cartas: {action.cards})" if action.cards else ""
-                print(f"      {j+1}. {action.player}: {action.action_type} {action.amount}{cards_info}")
+                self._debug(f"      {j+1}. {action.player}: {action.action_type} {action.amount}{cards_info}")
         
         return streets
     
     def _parse_action_line(self, line: str, street_name: str) -> Optional[Action]:
         """Parse uma linha de ação"""
-        print(f"🔍 DEBUG: Parseando linha: '{line}' para street: {street_name}")
+        self._debug(f"🔍 DEBUG: Parseando linha: '{line}' para street: {street_name}")
+        
+        # Aposta não paga devolvida ao jogador (fim da street)
+        uncalled = re.match(r'^Uncalled bet \(([0-9,]+)\) returned to (.+)$', line)
+        if uncalled:
+            amount = int(uncalled.group(1).replace(',', ''))
+            return Action(
+                player=uncalled.group(2).strip(),
+                action_type='uncalled_bet',
+                amount=amount,
+                total_bet=amount,
+                street=street_name,
+                timestamp=0
+            )
         
         # Padrões para diferentes tipos de ação
         patterns = {
@@ -503,7 +569,7 @@ class AdvancedPokerParser:
                 total_bet = 0
                 cards = ""
                 
-                print(f"🔍 DEBUG: Match encontrado para {action_type}: {match.groups()}")
+                self._debug(f"🔍 DEBUG: Match encontrado para {action_type}: {match.groups()}")
                 
                 if action_type in ['ante', 'small_blind', 'big_blind', 'call', 'bet', 'all-in']:
                     amount = int(match.group(2).replace(',', ''))
@@ -517,10 +583,10 @@ class AdvancedPokerParser:
                 elif action_type == 'shows':
                     # Extrair cartas do showdown
                     cards = match.group(2)
-                    print(f"🔍 DEBUG: Cartas extraídas do showdown para {player_name}: {cards}")
+                    self._debug(f"🔍 DEBUG: Cartas extraídas do showdown para {player_name}: {cards}")
                 elif action_type == 'mucks':
                     # Para mucks, não há cartas
-                    print(f"🔍 DEBUG: {player_name} mucks hand")
+                    self._debug(f"🔍 DEBUG: {player_name} mucks hand")
                 
                 action = Action(
                     player=player_name,
@@ -529,13 +595,14 @@ class AdvancedPokerParser:
                     total_bet=total_bet,
                     street=street_name,
                     timestamp=0,  # Será atualizado depois
-                    cards=cards
+                    cards=cards,
+                    is_all_in='and is all-in' in line
                 )
                 
-                print(f"🔍 DEBUG: Ação criada: {player_name} {action_type} ${amount} cartas: '{cards}'")
+                self._debug(f"🔍 DEBUG: Ação criada: {player_name} {action_type} ${amount} cartas: '{cards}'")
                 return action
         
-        print(f"⚠️  DEBUG: Nenhum padrão encontrado para linha: '{line}'")
+        self._debug(f"⚠️  DEBUG: Nenhum padrão encontrado para linha: '{line}'")
         return None
     
     def _parse_cards(self, cards_str: str) -> List[str]:
@@ -615,9 +682,11 @@ class AdvancedPokerParser:
             if action.action_type == 'fold' and action.street == 'preflop':
                 hero_cards = hand_replay.hero_cards
                 if len(hero_cards) == 2:
-                    # Verificar se são cartas premium (simplificado)
-                    ranks = [card[0] for card in hero_cards]
-                    if 'A' in ranks or 'K' in ranks:
+                    try:
+                        is_premium = hero_cards in PREMIUM_HANDS
+                    except ValueError:
+                        is_premium = False
+                    if is_premium:
                         gaps.append(f"Possível gap: fold com cartas premium ({' '.join(hero_cards)}) no preflop")
             
             # Gap: call sem odds adequadas (análise simplificada)
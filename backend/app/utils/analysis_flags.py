@@ -0,0 +1,21 @@
+"""
+Classificação da análise de IA em gap/erro
+Calculada uma vez quando a análise é gravada (colunas has_gap/has_error da mão),
+para que listagens e contagens filtrem por coluna indexada em vez de ILIKE '%...%'.
+"""
+
+from typing import Optional, Tuple
+
+GAP_KEYWORDS = ('gap',)
+ERROR_KEYWORDS = ('erro', 'error', 'mistake')
+
+
+def classify_analysis(analysis: Optional[str]) -> Tuple[Optional[bool], Optional[bool]]:
+    """(has_gap, has_error); (None, None) sem análise"""
+    if analysis is None:
+        return None, None
+    text = analysis.lower()
+    return (
+        any(keyword in text for keyword in GAP_KEYWORDS),
+        any(keyword in text for keyword in ERROR_KEYWORDS),
+    )
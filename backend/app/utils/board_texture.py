@@ -0,0 +1,105 @@
+"""
+Textura do board codificada em um inteiro pequeno
+Bits 0-4: flags (flush possível, flush draw, pareado, trinca/quadra no board, sequência possível);
+bits 5-8: rank da carta mais alta (0=2 ... 12=A). Board vazio (pré-flop) = 0.
+Cabe em SMALLINT e permite filtrar por textura com operações de bit.
+"""
+
+from typing import Dict, List, Optional, Sequence, Union
+
+from app.utils.hand_evaluator import RANKS, parse_cards
+
+FLUSH_POSSIBLE = 1   # 3+ cartas do mesmo naipe
+FLUSH_DRAW = 2       # Exatamente 2 do mesmo naipe (e nenhum flush possível)
+PAIRED = 4
+TRIPS = 8            # Trinca ou quadra no board
+STRAIGHT_POSSIBLE = 16  # 3 ranks distintos dentro de uma janela de 5
+
+FLAG_BITS = 5
+FLAG_MASK = (1 << FLAG_BITS) - 1
+
+TEXTURE_FLAGS = {
+    'flush_possible': FLUSH_POSSIBLE,
+    'flush_draw': FLUSH_DRAW,
+    'paired': PAIRED,
+    'trips': TRIPS,
+    'straight_possible': STRAIGHT_POSSIBLE,
+}
+
+# Filtros por nome: flags exigidas e proibidas (no flop, flush possível = monotone)
+TEXTURE_FILTERS = {
+    'monotone': (FLUSH_POSSIBLE, 0),
+    'two_tone': (FLUSH_DRAW, 0),
+    'rainbow': (0, FLUSH_POSSIBLE | FLUSH_DRAW),
+    'paired': (PAIRED, 0),
+    'unpaired': (0, PAIRED),
+    'trips': (TRIPS, 0),
+    'connected': (STRAIGHT_POSSIBLE, 0),
+    'disconnected': (0, STRAIGHT_POSSIBLE),
+}
+
+# Janelas de 5 ranks (a roda A-2-3-4-5 usa o ás como rank -1)
+_STRAIGHT_WINDOWS = [set(range(low, low + 5)) for low in range(-1, 9)]
+
+
+def board_texture(cards: Union[str, Sequence[str], Sequence[int]]) -> int:
+    """Código de textura de 3 a 5 cartas do board ('2c 7d Ts' ou [0, 21, 34])"""
+    if isinstance(cards, str) or (cards and isinstance(cards[0], str)):
+        values = parse_cards(cards)
+    else:
+        values = [int(c) for c in cards]
+    if len(values) < 3:
+        return 0
+
+    ranks = [card >> 2 for card in values]
+    suit_counts = [0, 0, 0, 0]
+    for card in values:
+        suit_counts[card & 3] += 1
+    rank_counts = {rank: ranks.count(rank) for rank in set(ranks)}
+
+    flags = 0
+    if max(suit_counts) >= 3:
+        flags |= FLUSH_POSSIBLE
+    elif max(suit_counts) == 2:
+        flags |= FLUSH_DRAW
+    if max(rank_counts.values()) >= 2:
+        flags |= PAIRED
+    if max(rank_counts.values()) >= 3:
+        flags |= TRIPS
+
+    distinct = set(ranks) | ({-1} if 12 in rank_counts else set())
+    if any(len(window & distinct) >= 3 for window in _STRAIGHT_WINDOWS):
+        flags |= STRAIGHT_POSSIBLE
+
+    return flags | (max(ranks) << FLAG_BITS)
+
+
+def texture_high_rank(code: int) -> int:
+    return code >> FLAG_BITS
+
+
+def describe_texture(code: int) -> Dict:
+    """Flags e carta alta de um código ({'paired': True, ..., 'high_card': 'A'})"""
+    if not code:
+        return {}
+    description: Dict[str, Union[bool, str]] = {name: bool(code & flag) for name, flag in TEXTURE_FLAGS.items()}
+    description['high_card'] = RANKS[texture_high_rank(code)]
+    return description
+
+
+def texture_names(code: int) -> List[str]:
+    return [name for name, flag in TEXTURE_FLAGS.items() if code & flag]
+
+
+def texture_codes(required: int = 0, forbidden: int = 0, high_rank: Optional[int] = None) -> List[int]:
+    """
+    Todos os códigos de board (3+ cartas) com as flags exigidas, sem as proibidas e,
+    opcionalmente, com a carta alta dada: o filtro vira IN (...) sobre uma coluna indexada
+    """
+    highs = range(13) if high_rank is None else [high_rank]
+    return [
+        flags | (high << FLAG_BITS)
+        for high in highs
+        for flags in range(FLAG_MASK + 1)
+        if flags & required == required and not flags & forbidden and (flags or high)
+    ]
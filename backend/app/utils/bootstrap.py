@@ -0,0 +1,63 @@
+"""
+Intervalos de confiança por bootstrap para resultados de torneios
+Os reamostramentos são feitos de uma vez com NumPy: uma matriz de índices
+(iterações x torneios) sorteados com reposição, da qual saem ROI, ITM% e posição
+média de cada amostra. Para amostras grandes as iterações são processadas em
+blocos, limitando a matriz a max_elements índices.
+"""
+
+from typing import Callable, Dict, Optional, Sequence
+
+import numpy as np
+
+
+def _resample(rng: np.random.Generator, size: int, iterations: int,
+              statistic: Callable[[np.ndarray], np.ndarray], max_elements: int) -> np.ndarray:
+    rows = max(1, max_elements // size)
+    values = []
+    for start in range(0, iterations, rows):
+        indices = rng.integers(0, size, size=(min(rows, iterations - start), size))
+        values.append(statistic(indices))
+    return np.concatenate(values)
+
+
+def _interval(values: np.ndarray, confidence: float, digits: int) -> Dict:
+    tail = (1 - confidence) / 2 * 100
+    low, high = np.percentile(values, [tail, 100 - tail])
+    return {'low': round(float(low), digits), 'high': round(float(high), digits)}
+
+
+def bootstrap_intervals(buy_ins: Sequence[float], prizes: Sequence[float], itm: Sequence[bool],
+                        positions: Sequence[Optional[int]], iterations: int = 2000,
+                        confidence: float = 0.95, seed: int = 0,
+                        max_elements: int = 2_000_000) -> Dict:
+    """
+    Intervalos percentis de ROI (%), ITM (%) e posição média final.
+    Com menos de 2 torneios (ou 2 posições informadas) o intervalo é None.
+    """
+    rng = np.random.default_rng(seed)
+    buy_ins = np.asarray(buy_ins, dtype=float)
+    prizes = np.asarray(prizes, dtype=float)
+    itm = np.asarray(itm, dtype=float)
+    # Posição nula ou 0 não conta, como na posição média das estatísticas
+    placed = np.asarray([position for position in positions if position], dtype=float)
+
+    intervals = {'roi': None, 'itm_percentage': None, 'avg_finish_position': None}
+    size = len(buy_ins)
+    if size >= 2:
+        def roi(indices):
+            invested = buy_ins[indices].sum(axis=1)
+            profit = prizes[indices].sum(axis=1) - invested
+            return np.divide(profit * 100, invested, out=np.zeros_like(invested), where=invested > 0)
+
+        intervals['roi'] = _interval(_resample(rng, size, iterations, roi, max_elements), confidence, 2)
+        intervals['itm_percentage'] = _interval(
+            _resample(rng, size, iterations, lambda indices: itm[indices].mean(axis=1) * 100, max_elements),
+            confidence, 2
+        )
+    if len(placed) >= 2:
+        intervals['avg_finish_position'] = _interval(
+            _resample(rng, len(placed), iterations, lambda indices: placed[indices].mean(axis=1), max_elements),
+            confidence, 1
+        )
+    return intervals
@@ -0,0 +1,50 @@
+"""
+Colunas derivadas das cartas da mão, gravadas na ingestão para filtros com índice
+- hero_class: classe pré-flop 0-168 (app/utils/ranges.py)
+- hero_suited: cartas do herói do mesmo naipe (pares = False)
+- hero_mask / board_mask: máscaras de 52 bits, bit = rank * 4 + naipe (app/utils/hand_evaluator.py)
+- flop_texture: código de textura das 3 primeiras cartas do board (app/utils/board_texture.py), 0 = sem flop
+Cartas ausentes ou inválidas deixam as colunas em None.
+"""
+
+from typing import Dict, Optional, Sequence
+
+from app.utils.board_texture import board_texture
+from app.utils.hand_evaluator import parse_cards
+from app.utils.ranges import hand_class_index
+
+HERO_CARD_COLUMNS = ('hero_class', 'hero_suited', 'hero_mask')
+BOARD_CARD_COLUMNS = ('board_mask', 'flop_texture')
+
+
+def card_mask(cards: Sequence[int]) -> int:
+    """Máscara de bits das cartas (inteiros 0-51: [51, 45] = 'Ah Kd')"""
+    mask = 0
+    for card in cards:
+        mask |= 1 << int(card)
+    return mask
+
+
+def hero_card_columns(hero_cards: Optional[str]) -> Dict:
+    try:
+        cards = parse_cards(hero_cards)
+        if len(cards) != 2:
+            raise ValueError(hero_cards)
+    except ValueError:
+        return dict.fromkeys(HERO_CARD_COLUMNS)
+    return {
+        'hero_class': hand_class_index(cards),
+        'hero_suited': cards[0] & 3 == cards[1] & 3,
+        'hero_mask': card_mask(cards),
+    }
+
+
+def board_card_columns(board_cards: Optional[str]) -> Dict:
+    try:
+        cards = parse_cards(board_cards)
+    except ValueError:
+        return dict.fromkeys(BOARD_CARD_COLUMNS)
+    return {
+        'board_mask': card_mask(cards),
+        'flop_texture': board_texture(cards[:3]),
+    }
@@ -0,0 +1,44 @@
+"""
+Redução de séries para gráficos com LTTB (Largest-Triangle-Three-Buckets)
+Mantém o primeiro e o último ponto e, em cada bucket intermediário, o ponto que
+forma o maior triângulo com o ponto escolhido no bucket anterior e a média do
+bucket seguinte: picos e vales sobrevivem, o formato da curva é preservado.
+"""
+
+from typing import List, Sequence
+
+import numpy as np
+
+
+def lttb_indices(xs: Sequence[float], ys: Sequence[float], max_points: int) -> List[int]:
+    """Índices dos pontos mantidos (ordenados); todos se a série já couber em max_points"""
+    count = len(xs)
+    if max_points >= count or count <= 2:
+        return list(range(count))
+    if max_points < 3:
+        raise ValueError("max_points deve ser pelo menos 3")
+
+    x = np.asarray(xs, dtype=float)
+    y = np.asarray(ys, dtype=float)
+    # Buckets entre o primeiro e o último ponto
+    edges = [int(edge) for edge in np.linspace(1, count - 1, max_points - 1)]
+
+    indices = [0]
+    selected = 0
+    for bucket in range(max_points - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        # Média do bucket seguinte (o último ponto no último bucket)
+        next_start, next_end = end, edges[bucket + 2] if bucket + 2 < len(edges) else count
+        average_x = x[next_start:next_end].mean()
+        average_y = y[next_start:next_end].mean()
+
+        # Dobro da área dos triângulos (ponto anterior, candidato, média seguinte)
+        area = np.abs(
+            (x[selected] - average_x) * (y[start:end] - y[selected])
+            - (x[selected] - x[start:end]) * (average_y - y[selected])
+        )
+        selected = start + int(area.argmax())
+        indices.append(selected)
+
+    indices.append(count - 1)
+    return indices
@@ -0,0 +1,182 @@
+"""
+Avaliador vetorizado de mãos de poker (NumPy)
+Avalia milhares de mãos de 5 a 7 cartas por chamada, sem loops em Python por mão.
+"""
+
+from typing import Iterable, List, Sequence, Union
+
+import numpy as np
+
+RANKS = '23456789TJQKA'
+SUITS = 'cdhs'
+
+# Categorias de mão (quanto maior, melhor)
+HIGH_CARD = 0
+ONE_PAIR = 1
+TWO_PAIR = 2
+THREE_OF_A_KIND = 3
+STRAIGHT = 4
+FLUSH = 5
+FULL_HOUSE = 6
+FOUR_OF_A_KIND = 7
+STRAIGHT_FLUSH = 8
+
+CATEGORY_NAMES = {
+    HIGH_CARD: 'Carta alta',
+    ONE_PAIR: 'Um par',
+    TWO_PAIR: 'Dois pares',
+    THREE_OF_A_KIND: 'Trinca',
+    STRAIGHT: 'Sequência',
+    FLUSH: 'Flush',
+    FULL_HOUSE: 'Full house',
+    FOUR_OF_A_KIND: 'Quadra',
+    STRAIGHT_FLUSH: 'Straight flush',
+}
+
+
+def card_to_int(card: str) -> int:
+    """Converte uma carta ('Ah', 'Td') para inteiro 0-51 (rank * 4 + naipe)"""
+    card = card.strip()
+    if len(card) != 2 or card[0].upper() not in RANKS or card[1].lower() not in SUITS:
+        raise ValueError(f"Carta inválida: '{card}'")
+    return RANKS.index(card[0].upper()) * 4 + SUITS.index(card[1].lower())
+
+
+def int_to_card(value: int) -> str:
+    """Converte inteiro 0-51 de volta para a notação 'Ah'"""
+    return RANKS[value // 4] + SUITS[value % 4]
+
+
+def parse_cards(cards: Union[str, Sequence[str], None]) -> List[int]:
+    """Parse de cartas em string ('Ah Kd', 'AhKd', '[Ah Kd]') ou lista (['Ah', 'Kd'])"""
+    if not cards:
+        return []
+    if isinstance(cards, str):
+        cleaned = cards.replace('[', '').replace(']', '').replace(',', ' ').replace(' ', '')
+        if len(cleaned) % 2 != 0:
+            raise ValueError(f"Cartas inválidas: '{cards}'")
+        tokens = [cleaned[i:i + 2] for i in range(0, len(cleaned), 2)]
+    else:
+        tokens = [c for c in cards if c]
+    values = [card_to_int(c) for c in tokens]
+    if len(set(values)) != len(values):
+        raise ValueError(f"Cartas repetidas: '{cards}'")
+    return values
+
+
+def _build_tables():
+    """Pré-calcula tabelas indexadas pela máscara de 13 bits de ranks"""
+    straight_top = np.full(8192, -1, dtype=np.int64)
+    top_five = np.zeros(8192, dtype=np.int64)
+    high_bit = np.zeros(8192, dtype=np.int64)
+    wheel = (1 << 12) | 0b1111  # A-2-3-4-5
+
+    for mask in range(1, 8192):
+        for top in range(12, 3, -1):
+            window = 0b11111 << (top - 4)
+            if mask & window == window:
+                straight_top[mask] = top
+                break
+        else:
+            if mask & wheel == wheel:
+                straight_top[mask] = 3
+
+        value = 0
+        taken = 0
+        for rank in range(12, -1, -1):
+            if mask >> rank & 1:
+                if taken == 0:
+                    high_bit[mask] = rank
+                if taken < 5:
+                    value = (value << 4) | rank
+                    taken += 1
+        top_five[mask] = value << (4 * (5 - taken))
+
+    return straight_top, top_five, high_bit
+
+
+_STRAIGHT_TOP, _TOP_FIVE, _HIGH_BIT = _build_tables()
+_RANK_RANGE = np.arange(13)
+_SUIT_RANGE = np.arange(4)
+# Quantos ranks de desempate são significativos em cada categoria
+_SIGNIFICANT_KICKERS = np.array([5, 4, 3, 3, 0, 0, 2, 2, 0])
+_KICKER_SHIFTS = np.array([16, 12, 8, 4, 0])
+
+
+def evaluate(cards: np.ndarray) -> np.ndarray:
+    """
+    Avalia um lote de mãos.
+
+    cards: array (N, k) de inteiros 0-51, com 5 <= k <= 7
+    Retorna array (N,) de scores inteiros: score maior = mão melhor, iguais = empate.
+    """
+    cards = np.asarray(cards, dtype=np.int64)
+    if cards.ndim == 1:
+        cards = cards[None, :]
+
+    ranks = cards >> 2
+    suits = cards & 3
+
+    counts = (ranks[:, :, None] == _RANK_RANGE).sum(axis=1)
+    rank_mask = ((counts > 0) << _RANK_RANGE).sum(axis=1)
+
+    suit_counts = (suits[:, :, None] == _SUIT_RANGE).sum(axis=1)
+    flush_suit = suit_counts.argmax(axis=1)
+    has_flush = suit_counts.max(axis=1) >= 5
+    # Ranks dentro de um naipe são distintos, então a soma equivale ao OR
+    flush_mask = ((1 << ranks) * (suits == flush_suit[:, None])).sum(axis=1) * has_flush
+
+    straight_top = _STRAIGHT_TOP[rank_mask]
+    straight_flush_top = _STRAIGHT_TOP[flush_mask]
+
+    # Agrupar ranks por (quantidade, rank) em ordem decrescente
+    keys = np.where(counts > 0, counts * 16 + _RANK_RANGE, -1)
+    groups = np.argsort(-keys, axis=1, kind='stable')[:, :5]
+    group_counts = np.take_along_axis(counts, groups, axis=1)
+    c0 = group_counts[:, 0]
+    c1 = group_counts[:, 1]
+
+    category = np.select(
+        [
+            straight_flush_top >= 0,
+            c0 == 4,
+            (c0 == 3) & (c1 >= 2),
+            has_flush,
+            straight_top >= 0,
+            c0 == 3,
+            (c0 == 2) & (c1 == 2),
+            c0 == 2,
+        ],
+        [STRAIGHT_FLUSH, FOUR_OF_A_KIND, FULL_HOUSE, FLUSH, STRAIGHT,
+         THREE_OF_A_KIND, TWO_PAIR, ONE_PAIR],
+        default=HIGH_CARD,
+    )
+
+    # Kicker da quadra e do dois pares: maior rank restante (pode vir de outro par)
+    group_bits = 1 << groups
+    quads_kicker = _HIGH_BIT[rank_mask & ~group_bits[:, 0]]
+    two_pair_kicker = _HIGH_BIT[rank_mask & ~(group_bits[:, 0] | group_bits[:, 1])]
+    kickers = groups.copy()
+    kickers[:, 1] = np.where(category == FOUR_OF_A_KIND, quads_kicker, kickers[:, 1])
+    kickers[:, 2] = np.where(category == TWO_PAIR, two_pair_kicker, kickers[:, 2])
+
+    significant = _SIGNIFICANT_KICKERS[category]
+    kickers = kickers * (np.arange(5) < significant[:, None])
+    tiebreak = (kickers << _KICKER_SHIFTS).sum(axis=1)
+
+    tiebreak = np.where(category == FLUSH, _TOP_FIVE[flush_mask], tiebreak)
+    tiebreak = np.where(category == STRAIGHT, straight_top << 16, tiebreak)
+    tiebreak = np.where(category == STRAIGHT_FLUSH, straight_flush_top << 16, tiebreak)
+
+    return (category << 20) | tiebreak
+
+
+def evaluate_hand(cards: Union[str, Iterable[str]]) -> int:
+    """Avalia uma única mão (conveniência para análises pontuais)"""
+    values = parse_cards(cards if isinstance(cards, str) else list(cards))
+    return int(evaluate(np.array([values]))[0])
+
+
+def hand_category(score: int) -> int:
+    """Extrai a categoria (HIGH_CARD ... STRAIGHT_FLUSH) de um score"""
+    return int(score) >> 20
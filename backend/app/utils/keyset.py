@@ -0,0 +1,67 @@
+"""
+Paginação por cursor (keyset)
+A página seguinte começa depois da última linha entregue, pela chave de ordenação
+(coluna, id), em vez de OFFSET: o banco desce pelo índice direto até o ponto certo,
+e o custo de cada página não depende da profundidade.
+O cursor é opaco para o cliente: JSON com a última chave (e o total, quando pedido) em base64 url-safe.
+"""
+
+import base64
+import json
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from sqlalchemy import and_, or_
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(value: Optional[datetime], last_id: int, total: Optional[int] = None) -> str:
+    """Cursor da última linha entregue; total (opcional) é o total filtrado da primeira página"""
+    key = [value.isoformat() if value is not None else None, last_id]
+    if total is not None:
+        key.append(total)
+    payload = json.dumps(key, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str) -> Tuple[Optional[datetime], int, Optional[int]]:
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        key = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(key, list) or len(key) not in (2, 3):
+            raise InvalidCursor(cursor)
+        value, last_id, total = key + [None] * (3 - len(key))
+        if not isinstance(last_id, int) or not isinstance(total, (int, type(None))):
+            raise InvalidCursor(cursor)
+        return (datetime.fromisoformat(value) if value is not None else None), last_id, total
+    except (ValueError, TypeError) as exc:
+        raise InvalidCursor(cursor) from exc
+
+
+def nulls_first(dialect: str, descending: bool) -> bool:
+    """Onde o ORDER BY do dialeto põe os NULLs (PostgreSQL: maiores que tudo; SQLite/SQL Server: menores)"""
+    return descending if dialect == 'postgresql' else not descending
+
+
+def after_key(column, id_column, value: Optional[datetime], last_id: int, descending: bool, null_first: bool) -> List:
+    """
+    Condições das linhas que vêm depois de (value, last_id) na ordem (column, id_column),
+    em segmentos consecutivos da ordem: cada um é um intervalo contínuo do índice
+    (user_id, column, id), consultado em sequência até completar a página.
+    Um OR com "column IS NULL" na mesma condição faria o banco varrer todas as mãos do usuário.
+    """
+    tie = id_column < last_id if descending else id_column > last_id
+    if value is None:
+        # Cursor no bloco de NULLs: resto do bloco e, se ele vem primeiro, depois todas as datas preenchidas
+        segments = [and_(column.is_(None), tie)]
+        return segments + [column.isnot(None)] if null_first else segments
+
+    if descending:
+        segments = [and_(column <= value, or_(column < value, tie))]
+    else:
+        segments = [and_(column >= value, or_(column > value, tie))]
+    # Bloco de NULLs depois das datas preenchidas
+    return segments if null_first else segments + [column.is_(None)]
@@ -0,0 +1,139 @@
+"""
+Vereditos da análise local em códigos compactos
+A análise local de cada mão é gravada como quatro códigos SMALLINT (stack, posição x
+ação, força da mão, diagnóstico) e parâmetros só para spots de push/fold/ICM; o texto
+legível é montado na leitura por render_local_analysis, com o mesmo formato de antes.
+"""
+
+import json
+from typing import Dict, Optional
+
+# Stack do herói
+STACK_NONE = 0
+STACK_PUSH_FOLD = 1   # Spot da tabela de push/fold (params['stack_bb'])
+STACK_SHORT = 2
+STACK_MEDIUM = 3
+STACK_DEEP = 4
+STACK_COMMENTS = (
+    "",
+    "Stack efetivo de {stack_bb} BB: situação de push/fold.",
+    "Stack curto: situação de push/fold.",
+    "Stack médio: é possível abrir mais mãos, mas cuidado com all-ins.",
+    "Stack confortável: margem para jogadas pós-flop.",
+)
+
+# Coerência posição x ação
+POSITION_NONE = 0
+POSITION_EARLY_PASSIVE = 1
+POSITION_EARLY_RAISE = 2
+POSITION_LATE_RAISE = 3
+POSITION_LATE_CALL = 4
+POSITION_COMMENTS = (
+    "",
+    "Jogada passiva em posição inicial pode ser ruim. Prefira abrir raise ou fold.",
+    "Ação agressiva em posição inicial é ok, desde que o range seja tight.",
+    "Boa agressividade em posição final.",
+    "Call em posição final é aceitável, mas avalie odds e agressividade.",
+)
+
+# Força pré-flop
+STRENGTH_UNKNOWN = 0
+STRENGTH_STRONG = 1
+STRENGTH_MEDIUM = 2
+STRENGTH_COMMENTS = ("", "Mão forte pré-flop.", "Mão de força média/baixa — jogue com cautela.")
+
+# Diagnóstico: regras simples seguidas dos vereditos de ICM (app/services/icm_service.py)
+DECISIONS = (
+    'Inconclusivo',
+    'Decisão correta',
+    'Aceitável',
+    'Questionável',
+    'Call correto sob ICM',
+    'Call +chipEV, mas -$EV por ICM',
+    'Call incorreto',
+    'Fold muito tight: o call era +$EV mesmo com ICM',
+    'Fold correto por ICM (o call seria +chipEV)',
+    'Fold correto',
+    'Shove correto sob ICM mesmo quando pago',
+    'Shove depende de fold equity: quando pago é +chipEV, mas -$EV por ICM',
+    'Shove depende de fold equity',
+)
+DECISION_CODES = {text: code for code, text in enumerate(DECISIONS)}
+DECISION_INCONCLUSIVE = 0
+DECISION_CORRECT = 1
+DECISION_ACCEPTABLE = 2
+DECISION_QUESTIONABLE = 3
+FIRST_ICM_DECISION = 4
+
+EXPLANATIONS = {
+    DECISION_CORRECT: "Ação agressiva com mão forte está de acordo com estratégia.",
+    DECISION_ACCEPTABLE: "Call com mão média pode ser ok, mas depende de posição e tamanho de stack.",
+    DECISION_QUESTIONABLE: "Jogada passiva fora de posição com mão média geralmente não é lucrativa.",
+}
+# Vereditos de ICM só substituem o diagnóstico com prêmios conhecidos (icm_service.payout_structure)
+ICM_EXPLANATION = "Decisão de all-in avaliada com ICM (Malmuth-Harville)."
+ICM_EXPLANATIONS = {
+    'final_table': "Decisão de all-in avaliada com ICM (Malmuth-Harville) e estrutura de mesa final.",
+    'informed': "Decisão de all-in avaliada com ICM (Malmuth-Harville) e a estrutura de prêmios do torneio.",
+}
+
+
+def _push_fold_comment(push_fold: Optional[Dict]) -> str:
+    if not push_fold:
+        return ""
+    chart_name = "shove" if push_fold['spot'] == 'open_shove' else "call vs all-in"
+    return (
+        f"{'Dentro' if push_fold['in_chart'] else 'Fora'} da tabela de {chart_name} "
+        f"({push_fold['position']}, {push_fold['stack_bb']} BB): herói fez {push_fold['decision']}, "
+        f"tabela indica {push_fold['chart_action']}."
+    )
+
+
+def _icm_comment(icm: Optional[Dict]) -> str:
+    if not icm:
+        return ""
+    equity_text = f"{icm['hero_equity'] * 100:.1f}%" if icm['hero_equity'] is not None else "N/A"
+    # Sem prêmios conhecidos os números são referência (mesa final presumida), não o diagnóstico
+    reference = "Só referência, prêmios desconhecidos (mesa final presumida): " if icm.get('icm_applies') is False else ""
+    return (
+        f"{reference}{icm['verdict']} (stack {icm['hero_stack_bb']} BB, "
+        f"bubble factor {icm['bubble_factor']:.2f} vs {icm['villain']}; "
+        f"equity necessária {icm['chip_required_equity'] * 100:.1f}% chipEV / "
+        f"{icm['icm_required_equity'] * 100:.1f}% ICM; equity estimada {equity_text})"
+    )
+
+
+def render_local_analysis(hero_position, hero_cards, hero_action, hero_stack, pot_size,
+                          stack_code: int, position_code: int, strength_code: int, decision_code: int,
+                          params: Optional[str] = None) -> str:
+    """Texto da análise local a partir dos códigos (params: JSON com push_fold/icm/stack_bb)"""
+    values = json.loads(params) if params else {}
+    decision = DECISIONS[decision_code] if 0 <= decision_code < len(DECISIONS) else DECISIONS[0]
+    if decision_code >= FIRST_ICM_DECISION:
+        explanation = ICM_EXPLANATIONS.get((values.get('icm') or {}).get('payouts'), ICM_EXPLANATION)
+    else:
+        explanation = EXPLANATIONS.get(decision_code, "")
+
+    return f"""
+ANÁLISE LOCAL DETALHADA
+
+Posição do Herói: {hero_position}
+Cartas do Herói: {hero_cards}
+Ação do Herói: {hero_action}
+Stack do Herói: {hero_stack}
+Tamanho do Pote: {pot_size}
+
+👉 STACK: {STACK_COMMENTS[stack_code].format(stack_bb=values.get('stack_bb'))}
+👉 POSIÇÃO vs AÇÃO: {POSITION_COMMENTS[position_code]}
+👉 FORÇA DA MÃO: {STRENGTH_COMMENTS[strength_code]}
+👉 PUSH/FOLD: {_push_fold_comment(values.get('push_fold')) or "Não se aplica."}
+👉 ICM: {_icm_comment(values.get('icm')) or "Não se aplica (mão fora de spot push/fold)."}
+
+📌 DIAGNÓSTICO: {decision}
+💡 EXPLICAÇÃO: {explanation}
+
+RECOMENDAÇÃO GERAL:
+- Avalie o range da mão para sua posição.
+- Prefira agressividade em posições finais.
+- Evite jogadas marginais em posições iniciais.
+"""
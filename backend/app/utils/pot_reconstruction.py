@@ -0,0 +1,170 @@
+"""
+Reconstrução do pote ação por ação
+Reproduz antes, blinds, calls, bets, raises, devoluções de apostas não pagas e
+all-ins em uma única passada, calculando para cada ação o pote antes dela,
+o valor a pagar, o stack efetivo, o SPR e os side pots formados até ali.
+"""
+
+import json
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from app.utils.advanced_poker_parser import Action, HandReplay
+
+# Ações que não movimentam fichas nem mudam o estado da mão
+PASSIVE_ACTIONS = {'fold', 'check', 'shows', 'mucks', 'collected', 'won'}
+
+
+@dataclass
+class ActionState:
+    """Estado da mesa no momento da ação (antes de ela ser aplicada)"""
+    pot_before: float
+    to_call: float
+    effective_stack: float
+    spr: Optional[float]
+    is_all_in: bool = False
+    side_pots: List[Dict] = field(default_factory=list)
+
+
+class PotTracker:
+    """Estado incremental do pote: stacks, contribuições e apostas da street"""
+
+    def __init__(self, stacks: Dict[str, float]):
+        self.stacks = dict(stacks)
+        self.contributed = {name: 0.0 for name in stacks}
+        self.street_bets = {name: 0.0 for name in stacks}
+        self.folded = set()
+        self.all_in = set()
+        self.street = None
+
+    @property
+    def pot(self) -> float:
+        return sum(self.contributed.values())
+
+    def start_street(self, street: str):
+        if street != self.street:
+            self.street = street
+            self.street_bets = {name: 0.0 for name in self.stacks}
+
+    def state_for(self, player: str) -> ActionState:
+        stack = self.stacks.get(player, 0.0)
+        bet = self.street_bets.get(player, 0.0)
+        to_call = min(max(self.street_bets.values(), default=0.0) - bet, stack)
+        # Fichas que ainda podem ser disputadas: o quanto o maior oponente vivo alcança na street
+        reach = [self.stacks[p] + self.street_bets[p] for p in self.stacks if p != player and p not in self.folded]
+        effective = max(min(stack + bet, max(reach)) - bet, 0.0) if reach else 0.0
+        pot = self.pot
+        return ActionState(
+            pot_before=pot,
+            to_call=max(to_call, 0.0),
+            effective_stack=effective,
+            spr=round(effective / pot, 3) if pot > 0 else None,
+            side_pots=self.side_pots(),
+        )
+
+    def apply(self, action: Action):
+        player = action.player
+        if player not in self.stacks:
+            # Jogador sem linha de assento (ex.: mão cortada); passa a existir com stack zero
+            self.stacks[player] = 0.0
+            self.contributed[player] = 0.0
+            self.street_bets[player] = 0.0
+        kind = action.action_type
+
+        if kind == 'fold':
+            self.folded.add(player)
+        elif kind == 'uncalled_bet':
+            returned = min(action.amount, self.contributed[player])
+            self._move(player, -returned, street=True)
+            self.all_in.discard(player)
+            return
+        elif kind == 'ante':
+            self._move(player, action.amount, street=False)
+        elif kind in ('small_blind', 'big_blind', 'call', 'bet'):
+            self._move(player, action.amount, street=True)
+        elif kind == 'raise':
+            self._move(player, action.total_bet - self.street_bets[player], street=True)
+
+        if kind not in PASSIVE_ACTIONS and (action.is_all_in or self.stacks[player] <= 0):
+            self.all_in.add(player)
+
+    def _move(self, player: str, amount: float, street: bool):
+        # Nunca tirar do jogador mais do que ele tem (hand histories com stacks inconsistentes)
+        amount = min(amount, self.stacks[player]) if amount > 0 else amount
+        self.stacks[player] -= amount
+        self.contributed[player] += amount
+        if street:
+            self.street_bets[player] += amount
+
+    def side_pots(self) -> List[Dict]:
+        """
+        Pote principal e side pots: cada nível de all-in fecha um pote com as
+        contribuições até aquele nível; disputam os jogadores que não foldaram e
+        contribuíram pelo menos até o nível (ou ainda têm fichas para completá-lo).
+        """
+        if not self.all_in:
+            return []
+        levels = sorted({self.contributed[p] for p in self.all_in if self.contributed[p] > 0})
+        if not levels:
+            return []
+        if max(self.contributed.values()) > levels[-1]:
+            levels.append(max(self.contributed.values()))
+
+        pots = []
+        previous = 0.0
+        for level in levels:
+            amount = sum(min(c, level) - min(c, previous) for c in self.contributed.values())
+            eligible = [
+                p for p, c in self.contributed.items()
+                if p not in self.folded and (c >= level or (p not in self.all_in and self.stacks[p] > 0))
+            ]
+            if amount > 0:
+                pots.append({'amount': amount, 'eligible': eligible})
+            previous = level
+        return pots
+
+
+def reconstruct_pots(hand_replay: HandReplay) -> List[Tuple[Action, ActionState]]:
+    """
+    Passada linear sobre antes, blinds e ações de todas as streets; as devoluções
+    de apostas não pagas (street.refunds) entram na sua posição, sem virar ação.
+    Retorna (ação, estado antes da ação) para cada ação das streets, na mesma
+    ordem em que são salvas em HandAction (action_order).
+    """
+    tracker = PotTracker({p.name: float(p.stack) for p in hand_replay.players})
+
+    tracker.start_street('preflop')
+    for forced in hand_replay.forced_bets:
+        tracker.apply(forced)
+
+    result = []
+    for street in hand_replay.streets:
+        if street.name in ('preflop', 'flop', 'turn', 'river'):
+            tracker.start_street(street.name)
+        refunds: Dict[int, List[Action]] = {}
+        for refund in street.refunds:
+            refunds.setdefault(refund.timestamp, []).append(refund)
+        for index, action in enumerate(street.actions):
+            for refund in refunds.pop(index, ()):
+                tracker.apply(refund)
+            state = tracker.state_for(action.player)
+            was_all_in = action.player in tracker.all_in
+            tracker.apply(action)
+            state.is_all_in = not was_all_in and action.player in tracker.all_in
+            result.append((action, state))
+        for remaining in refunds.values():
+            for refund in remaining:
+                tracker.apply(refund)
+    return result
+
+
+def action_state_columns(state: ActionState) -> Dict:
+    """Valores das colunas de estado em HandAction"""
+    return {
+        'pot_before': state.pot_before,
+        'to_call': state.to_call,
+        'effective_stack': state.effective_stack,
+        'spr': state.spr,
+        'is_all_in': state.is_all_in,
+        'side_pots': json.dumps(state.side_pots) if state.side_pots else None,
+    }
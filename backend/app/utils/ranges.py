@@ -0,0 +1,249 @@
+"""
+Representação de ranges pré-flop
+Cada range é uma máscara NumPy sobre os 1326 combos, com as 169 classes de mão
+(AA, AKs, AKo, ...) derivadas por tabelas pré-calculadas.
+"""
+
+from functools import lru_cache
+from itertools import combinations
+from typing import Iterable, List, Optional, Sequence, Union
+
+import numpy as np
+
+from app.utils.hand_evaluator import RANKS, SUITS, parse_cards
+
+# Tabelas de combos: índice 0-1325 <-> par de cartas (a < b)
+COMBO_CARDS = np.array(list(combinations(range(52), 2)), dtype=np.int64)
+COMBO_INDEX = np.full((52, 52), -1, dtype=np.int64)
+COMBO_INDEX[COMBO_CARDS[:, 0], COMBO_CARDS[:, 1]] = np.arange(len(COMBO_CARDS))
+COMBO_INDEX[COMBO_CARDS[:, 1], COMBO_CARDS[:, 0]] = np.arange(len(COMBO_CARDS))
+
+# Classe (0-168) de cada combo: par = alto*13+alto, suited = alto*13+baixo, offsuit = baixo*13+alto
+_high = np.maximum(COMBO_CARDS[:, 0] >> 2, COMBO_CARDS[:, 1] >> 2)
+_low = np.minimum(COMBO_CARDS[:, 0] >> 2, COMBO_CARDS[:, 1] >> 2)
+_suited = (COMBO_CARDS[:, 0] & 3) == (COMBO_CARDS[:, 1] & 3)
+COMBO_CLASS = np.where(_suited | (_high == _low), _high * 13 + _low, _low * 13 + _high)
+
+# Combos que contêm cada carta (para remoção de cartas mortas)
+CARD_COMBOS = np.zeros((52, len(COMBO_CARDS)), dtype=bool)
+CARD_COMBOS[COMBO_CARDS[:, 0], np.arange(len(COMBO_CARDS))] = True
+CARD_COMBOS[COMBO_CARDS[:, 1], np.arange(len(COMBO_CARDS))] = True
+
+
+def class_index(high: int, low: int, suited: bool) -> int:
+    """Índice 0-168 da classe de mão a partir dos ranks (0=2 ... 12=A)"""
+    high, low = max(high, low), min(high, low)
+    if high == low or suited:
+        return high * 13 + low
+    return low * 13 + high
+
+
+def class_name(index: int) -> str:
+    row, col = divmod(index, 13)
+    if row == col:
+        return RANKS[row] * 2
+    if row > col:
+        return RANKS[row] + RANKS[col] + 's'
+    return RANKS[col] + RANKS[row] + 'o'
+
+
+def class_suited(index: int) -> bool:
+    row, col = divmod(index, 13)
+    return row > col
+
+
+CLASS_NAMES = [class_name(i) for i in range(169)]
+CLASS_COMBOS = [np.nonzero(COMBO_CLASS == i)[0] for i in range(169)]
+
+
+def hand_class_index(cards: Union[str, Sequence[str], Sequence[int]]) -> int:
+    """Classe (0-168) das duas cartas do herói ('Ah Kd' -> índice de 'AKo')"""
+    values = _two_cards(cards)
+    return int(COMBO_CLASS[COMBO_INDEX[values[0], values[1]]])
+
+
+def hand_class(cards: Union[str, Sequence[str], Sequence[int]]) -> str:
+    """Nome da classe das duas cartas ('Ah Kd' -> 'AKo')"""
+    return CLASS_NAMES[hand_class_index(cards)]
+
+
+def _two_cards(cards) -> List[int]:
+    if isinstance(cards, str) or (cards and isinstance(cards[0], str)):
+        values = parse_cards(cards)
+    else:
+        values = [int(c) for c in cards]
+    if len(values) != 2:
+        raise ValueError(f"Uma mão pré-flop precisa de 2 cartas: '{cards}'")
+    return values
+
+
+def _rank(char: str, token: str) -> int:
+    if char.upper() not in RANKS:
+        raise ValueError(f"Token de range inválido: '{token}'")
+    return RANKS.index(char.upper())
+
+
+def _class_token(body: str, token: str):
+    """Decompõe 'AKs' / 'AKo' / 'AK' / 'TT' em (alto, baixo, tipo)"""
+    if len(body) not in (2, 3):
+        raise ValueError(f"Token de range inválido: '{token}'")
+    high, low = _rank(body[0], token), _rank(body[1], token)
+    kind = body[2].lower() if len(body) == 3 else ''
+    if kind not in ('', 's', 'o') or (high == low and kind):
+        raise ValueError(f"Token de range inválido: '{token}'")
+    return max(high, low), min(high, low), kind
+
+
+def _class_indices(high: int, low: int, kind: str) -> List[int]:
+    if high == low:
+        return [class_index(high, high, False)]
+    if kind == 's':
+        return [class_index(high, low, True)]
+    if kind == 'o':
+        return [class_index(high, low, False)]
+    return [class_index(high, low, True), class_index(high, low, False)]
+
+
+def _token_classes(token: str) -> List[int]:
+    """Classes cobertas por um token: 'AA', 'AKs', '22+', 'A2s+', 'KTo+', '77-55', 'A5s-A2s'"""
+    if '-' in token:
+        first, last = token.split('-', 1)
+        h1, l1, k1 = _class_token(first, token)
+        h2, l2, k2 = _class_token(last, token)
+        if k1 != k2:
+            raise ValueError(f"Token de range inválido: '{token}'")
+        if h1 == l1 and h2 == l2:
+            return [c for p in range(min(h1, h2), max(h1, h2) + 1) for c in _class_indices(p, p, '')]
+        if h1 != h2:
+            raise ValueError(f"Token de range inválido: '{token}'")
+        return [c for k in range(min(l1, l2), max(l1, l2) + 1) for c in _class_indices(h1, k, k1)]
+
+    plus = token.endswith('+')
+    high, low, kind = _class_token(token[:-1] if plus else token, token)
+    if high == low:
+        pairs = range(high, 13) if plus else [high]
+        return [c for p in pairs for c in _class_indices(p, p, '')]
+    kickers = range(low, high) if plus else [low]
+    return [c for k in kickers for c in _class_indices(high, k, kind)]
+
+
+class Range:
+    """Conjunto imutável de combos pré-flop com operações de conjunto vetorizadas"""
+
+    __slots__ = ('_mask',)
+
+    def __init__(self, mask: Optional[np.ndarray] = None):
+        if mask is None:
+            mask = np.zeros(len(COMBO_CARDS), dtype=bool)
+        mask = np.array(mask, dtype=bool, copy=True)  # Cópia: não congela o array de quem chamou
+        if mask.shape != (len(COMBO_CARDS),):
+            raise ValueError("Máscara de range precisa ter 1326 posições")
+        mask.setflags(write=False)
+        self._mask = mask
+
+    @classmethod
+    def parse(cls, notation: Union[str, Sequence[str], 'Range']) -> 'Range':
+        """Cria um range a partir de notação padrão ('22+, A2s+, KTo+') ou lista de tokens"""
+        if isinstance(notation, Range):
+            return notation
+        tokens = notation.split(',') if isinstance(notation, str) else list(notation)
+        return _parse_cached(tuple(t.strip() for t in tokens if t and t.strip()))
+
+    @classmethod
+    def from_classes(cls, classes: Iterable[Union[int, str]]) -> 'Range':
+        class_mask = np.zeros(169, dtype=bool)
+        for item in classes:
+            class_mask[CLASS_NAMES.index(item) if isinstance(item, str) else item] = True
+        return cls(class_mask[COMBO_CLASS])
+
+    @classmethod
+    def full(cls) -> 'Range':
+        return cls(np.ones(len(COMBO_CARDS), dtype=bool))
+
+    @property
+    def mask(self) -> np.ndarray:
+        return self._mask
+
+    def class_mask(self) -> np.ndarray:
+        """Máscara das 169 classes com pelo menos um combo no range"""
+        result = np.zeros(169, dtype=bool)
+        result[COMBO_CLASS[self._mask]] = True
+        return result
+
+    def hand_classes(self) -> List[str]:
+        return [CLASS_NAMES[i] for i in np.nonzero(self.class_mask())[0]]
+
+    def __contains__(self, hand) -> bool:
+        """Pertinência O(1) de um combo ('Ah Kd', ['Ah', 'Kd'], (c1, c2)) ou classe ('AKo')"""
+        if isinstance(hand, str) and hand.strip() in CLASS_NAMES:
+            return bool(self._mask[CLASS_COMBOS[CLASS_NAMES.index(hand.strip())]].any())
+        cards = _two_cards(hand)
+        return bool(self._mask[COMBO_INDEX[cards[0], cards[1]]])
+
+    def combos(self, dead_cards: Union[str, Sequence, None] = None) -> np.ndarray:
+        """Array (m, 2) dos combos do range, sem os que usam cartas mortas"""
+        return COMBO_CARDS[self._live_mask(dead_cards)]
+
+    def count_combos(self, dead_cards: Union[str, Sequence, None] = None) -> int:
+        """Número de combos considerando remoção de cartas (board, mão do herói)"""
+        return int(self._live_mask(dead_cards).sum())
+
+    def percentage(self) -> float:
+        return len(self) / len(COMBO_CARDS) * 100
+
+    def _live_mask(self, dead_cards) -> np.ndarray:
+        if dead_cards is None or len(dead_cards) == 0:
+            return self._mask
+        dead = parse_cards(dead_cards) if isinstance(dead_cards, str) or isinstance(dead_cards[0], str) else list(dead_cards)
+        return self._mask & ~CARD_COMBOS[dead].any(axis=0)
+
+    def __or__(self, other: 'Range') -> 'Range':
+        return Range(self._mask | Range.parse(other)._mask)
+
+    def __and__(self, other: 'Range') -> 'Range':
+        return Range(self._mask & Range.parse(other)._mask)
+
+    def __sub__(self, other: 'Range') -> 'Range':
+        return Range(self._mask & ~Range.parse(other)._mask)
+
+    def __invert__(self) -> 'Range':
+        return Range(~self._mask)
+
+    def __len__(self) -> int:
+        return int(self._mask.sum())
+
+    def __bool__(self) -> bool:
+        return bool(self._mask.any())
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, Range) and bool(np.array_equal(self._mask, other._mask))
+
+    def __hash__(self) -> int:
+        return hash(self._mask.tobytes())
+
+    def __lt__(self, other: 'Range') -> bool:
+        # Ordem estável para chaves canônicas de cache
+        return self._mask.tobytes() < other._mask.tobytes()
+
+    def __repr__(self) -> str:
+        classes = self.hand_classes()
+        preview = ', '.join(classes[:12]) + (', ...' if len(classes) > 12 else '')
+        return f"<Range {len(self)} combos ({self.percentage():.1f}%): {preview}>"
+
+
+@lru_cache(maxsize=512)
+def _parse_cached(tokens: tuple) -> Range:
+    mask = np.zeros(len(COMBO_CARDS), dtype=bool)
+    class_mask = np.zeros(169, dtype=bool)
+    for token in tokens:
+        if token.lower() in ('random', 'any', '100%', '*'):
+            mask[:] = True
+        elif len(token) == 4 and token[1].lower() in SUITS and token[3].lower() in SUITS:
+            a, b = parse_cards(token)
+            mask[COMBO_INDEX[a, b]] = True
+        else:
+            class_mask[_token_classes(token)] = True
+    mask |= class_mask[COMBO_CLASS]
+    if not mask.any():
+        raise ValueError("Range vazio")
+    return Range(mask)
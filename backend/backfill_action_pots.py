@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Backfill do estado do pote (pot_before, to_call, effective_stack, spr, is_all_in,
+side_pots) nas ações já salvas em hand_actions.
+Processa as mãos em lotes por id (keyset), com uma consulta de ações e um
+bulk update por lote.
+
+Uso: python backfill_action_pots.py [--batch-size 200]
+"""
+
+import argparse
+import sys
+import os
+from collections import defaultdict
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.models.database import SessionLocal
+from app.models.hand import Hand
+from app.models.hand_action import HandAction
+from app.utils.advanced_poker_parser import AdvancedPokerParser
+from app.utils.pot_reconstruction import reconstruct_pots, action_state_columns
+
+
+def _reconstruct(parser: AdvancedPokerParser, raw_hand: str):
+    replay = parser.parse_hand_for_replay(raw_hand or "")
+    return reconstruct_pots(replay) if replay else None
+
+
+def backfill_batch(db, parser: AdvancedPokerParser, hand_rows) -> tuple:
+    """Atualiza as ações de um lote de mãos; retorna (ações atualizadas, mãos ignoradas)"""
+    hand_ids = [hand_id for hand_id, _ in hand_rows]
+    actions_by_hand = defaultdict(list)
+    for action in (
+        db.query(HandAction.id, HandAction.hand_id, HandAction.player_name, HandAction.action_type)
+        .filter(HandAction.hand_id.in_(hand_ids))
+        .order_by(HandAction.hand_id, HandAction.action_order)
+    ):
+        actions_by_hand[action.hand_id].append(action)
+
+    updates = []
+    skipped = 0
+    for hand_id, raw_hand in hand_rows:
+        stored = actions_by_hand.get(hand_id)
+        if not stored:
+            continue
+        states = _reconstruct(parser, raw_hand)
+        # As ações foram salvas a partir do mesmo parse; conferir o alinhamento
+        if not states or len(states) != len(stored) or any(
+            row.player_name != action.player or row.action_type != action.action_type
+            for row, (action, _) in zip(stored, states)
+        ):
+            skipped += 1
+            continue
+        for row, (_, state) in zip(stored, states):
+            updates.append({'id': row.id, **action_state_columns(state)})
+
+    if updates:
+        db.bulk_update_mappings(HandAction, updates)
+    db.commit()
+    return len(updates), skipped
+
+
+def backfill_action_pots(batch_size: int = 200):
+    db = SessionLocal()
+    parser = AdvancedPokerParser(verbose=False)  # Sem o debug por linha no processamento em lote
+    last_id = 0
+    total_updated = 0
+    total_skipped = 0
+    try:
+        while True:
+            pending = (
+                db.query(HandAction.hand_id)
+                .filter(HandAction.pot_before.is_(None), HandAction.hand_id > last_id)
+                .distinct()
+                .order_by(HandAction.hand_id)
+                .limit(batch_size)
+                .subquery()
+            )
+            hand_rows = (
+                db.query(Hand.id, Hand.raw_hand)
+                .filter(Hand.id.in_(db.query(pending.c.hand_id)))
+                .order_by(Hand.id)
+                .all()
+            )
+            if not hand_rows:
+                break
+
+            updated, skipped = backfill_batch(db, parser, hand_rows)
+            total_updated += updated
+            total_skipped += skipped
+            last_id = hand_rows[-1][0]
+            print(f"📊 Lote até mão {last_id}: {updated} ações atualizadas, {skipped} mãos ignoradas")
+
+        print(f"✅ Backfill concluído: {total_updated} ações atualizadas, {total_skipped} mãos com ações divergentes")
+    except Exception as e:
+        print(f"❌ Erro durante o backfill: {e}")
+        db.rollback()
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Backfill do estado do pote em hand_actions")
+    arg_parser.add_argument("--batch-size", type=int, default=200)
+    args = arg_parser.parse_args()
+
+    print("🔧 Backfill de pote / side pots em hand_actions")
+    print("=" * 50)
+    backfill_action_pots(args.batch_size)
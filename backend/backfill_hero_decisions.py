@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Backfill da tabela hero_decisions para as mãos já salvas.
+Processa as mãos sem decisões em lotes por id (keyset), com um commit por lote.
+Com --rebuild, recalcula também as mãos que já têm decisões (novas features);
+a contribuição antiga delas sai dos contadores de gaps e é refeita na próxima análise.
+
+Uso: python backfill_hero_decisions.py [--user-id 1] [--batch-size 200] [--rebuild]
+"""
+
+import argparse
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.models.database import SessionLocal
+from app.models.hand import Hand
+from app.models.hero_decision import HeroDecision
+from app.services.gap_service import GapIdentificationService
+from app.services.hero_decision_service import HeroDecisionService
+
+
+def backfill_hero_decisions(user_id: int = None, batch_size: int = 200, rebuild: bool = False):
+    db = SessionLocal()
+    service = HeroDecisionService()
+    gap_service = GapIdentificationService()
+    last_id = 0
+    total_hands = 0
+    total_decisions = 0
+    try:
+        while True:
+            query = db.query(Hand).filter(Hand.id > last_id)
+            if not rebuild:
+                query = query.filter(~db.query(HeroDecision.id).filter(HeroDecision.hand_id == Hand.id).exists())
+            if user_id:
+                query = query.filter(Hand.user_id == user_id)
+            hands = query.order_by(Hand.id).limit(batch_size).all()
+            if not hands:
+                break
+
+            if rebuild:
+                gap_service.remove_hands(db, hands)
+                db.query(HeroDecision).filter(
+                    HeroDecision.hand_id.in_([hand.id for hand in hands])
+                ).delete(synchronize_session=False)
+                db.expire_all()
+            decisions = sum(service.add_hand(db, hand) for hand in hands)
+            db.commit()
+            total_hands += len(hands)
+            total_decisions += decisions
+            last_id = hands[-1].id
+            print(f"📊 Lote até mão {last_id}: {decisions} decisões em {len(hands)} mãos")
+
+        print(f"✅ Backfill concluído: {total_decisions} decisões extraídas de {total_hands} mãos")
+    except Exception as e:
+        print(f"❌ Erro durante o backfill: {e}")
+        db.rollback()
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Backfill da tabela hero_decisions")
+    arg_parser.add_argument("--user-id", type=int)
+    arg_parser.add_argument("--batch-size", type=int, default=200)
+    arg_parser.add_argument("--rebuild", action="store_true", help="Recalcula mãos que já têm decisões")
+    args = arg_parser.parse_args()
+
+    print("🔧 Backfill de decisões do herói")
+    print("=" * 50)
+    backfill_hero_decisions(args.user_id, args.batch_size, args.rebuild)
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Benchmark do cliente de IA contra o servidor stub local (stub_openrouter_server.py).
+Compara o fluxo antigo (um AsyncClient novo por mão, chamadas em série) com o
+cliente compartilhado (keep-alive, semáforo, retry com jitter).
+
+Uso: python benchmark_ai_client.py [--hands 100] [--latency 0.2] [--concurrency 8] [--error-rate 0.05]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import httpx
+
+from app.services.ai_service import AIAnalysisService
+from app.utils.poker_parser import PokerStarsParser
+from stub_openrouter_server import StubOpenRouterServer
+
+
+def load_hands(count: int):
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "torneio_ingles.txt")
+    with open(path, encoding="utf-8") as f:
+        hands = PokerStarsParser().parse_file(f.read())
+    return (hands * (count // max(len(hands), 1) + 1))[:count]
+
+
+async def run_serial(service: AIAnalysisService, hands) -> float:
+    """Fluxo anterior: cliente novo (TCP + handshake) por mão, uma mão por vez"""
+    start = time.perf_counter()
+    for hand_data in hands:
+        async with httpx.AsyncClient() as client:
+            await client.post(f"{service.base_url}/chat/completions", json={
+                "model": service.model,
+                "messages": [{"role": "user", "content": service._build_analysis_prompt(hand_data)}]
+            }, timeout=30.0)
+    return time.perf_counter() - start
+
+
+async def run_pooled(service: AIAnalysisService, hands) -> float:
+    start = time.perf_counter()
+    await service.analyze_hands(hands, user_id=1)
+    elapsed = time.perf_counter() - start
+    await service.aclose()
+    return elapsed
+
+
+async def main(hand_count: int, latency: float, concurrency: int, error_rate: float):
+    server = StubOpenRouterServer(latency, error_rate)
+    port = await server.start()
+    os.environ["OPENROUTER_BASE_URL"] = f"http://127.0.0.1:{port}/api/v1"
+    os.environ["AI_MAX_CONCURRENCY"] = str(concurrency)
+    os.environ["AI_BACKOFF_BASE"] = "0.05"
+    os.environ["AI_USER_RATE_PER_MINUTE"] = "0"  # Sem limite por usuário no benchmark
+    hands = load_hands(hand_count)
+
+    service = AIAnalysisService()
+    server.connections = server.requests = 0
+    serial = await run_serial(service, hands)
+    serial_connections = server.connections
+
+    server.connections = server.requests = server.max_in_flight = 0
+    pooled = await run_pooled(service, hands)
+    print(f"📊 {len(hands)} mãos, latência {latency}s, erros {error_rate:.0%}")
+    print(f"   Em série, cliente novo por mão: {serial:.2f}s ({len(hands) / serial:.1f} mãos/s, {serial_connections} conexões)")
+    print(f"   Cliente compartilhado (x{concurrency}): {pooled:.2f}s ({len(hands) / pooled:.1f} mãos/s, "
+          f"{server.connections} conexões, {server.requests} requisições, pico {server.max_in_flight} simultâneas)")
+    print(f"✅ Speedup: {serial / pooled:.1f}x")
+    await server.stop()
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Benchmark do cliente de IA")
+    arg_parser.add_argument("--hands", type=int, default=100)
+    arg_parser.add_argument("--latency", type=float, default=0.2)
+    arg_parser.add_argument("--concurrency", type=int, default=8)
+    arg_parser.add_argument("--error-rate", type=float, default=0.0)
+    args = arg_parser.parse_args()
+    asyncio.run(main(args.hands, args.latency, args.concurrency, args.error_rate))
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Benchmark da paginação do histórico de mãos (/api/hands/history/my-hands).
+Compara páginas profundas por OFFSET com as mesmas páginas pelo cursor
+(X-Next-Cursor) em uma conta com N mãos.
+
+Uso: python benchmark_hand_pagination.py [--hands 100000] [--limit 50] [--repeat 5]
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from fastapi import Response
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.models.database import Base
+from app.models import user, hand, hand_action, gap, tournament, coach, subscription, hud_stats, opponent_profile, hero_decision, ai_analysis_job
+from app.models.hand import Hand
+from app.models.user import User
+from app.routers.hands import get_my_hands
+from app.utils.keyset import encode_cursor
+
+DEPTHS = (0, 0.1, 0.5, 0.99)
+
+
+def fetch_page(db, current_user, order_by, limit, skip=0, cursor=None):
+    return asyncio.run(get_my_hands(Response(), skip=skip, limit=limit, cursor=cursor, order_by=order_by,
+                                    gap_filter=None, position_filter=None, action_filter=None,
+                                    date_from=None, date_to=None, hand_range=None, suited=None,
+                                    flop_texture=None, flop_high=None, board_contains=None,
+                                    current_user=current_user, db=db))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark da paginação do histórico de mãos")
+    parser.add_argument("--hands", type=int, default=100000)
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), "pagination.db")
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    db.add(User(id=1, username='hero', email='hero@test.com', full_name='Hero', nickname='Hero', hashed_password='x'))
+    db.commit()
+    print(f"🎲 Gerando {args.hands} mãos...")
+    rng = random.Random(5)
+    start = datetime(2025, 1, 1)
+    db.bulk_insert_mappings(Hand, [
+        dict(user_id=1, hand_id=str(i), raw_hand='', ai_analysis='x' * 500,
+             date_played=start + timedelta(seconds=rng.randint(0, 365 * 86400)))
+        for i in range(args.hands)
+    ])
+    db.commit()
+    current_user = db.get(User, 1)
+
+    ordered = [(row.date_played, row.id) for row in
+               db.query(Hand.date_played, Hand.id).order_by(Hand.date_played.desc(), Hand.id.desc())]
+    for depth in DEPTHS:
+        skip = int(depth * (args.hands - args.limit))
+        cursor = encode_cursor(*ordered[skip - 1]) if skip else None
+        offset_times, cursor_times = [], []
+        for _ in range(args.repeat):
+            db.expunge_all()
+            begin = time.perf_counter()
+            by_offset = fetch_page(db, current_user, "date_desc", args.limit, skip=skip)
+            offset_times.append(time.perf_counter() - begin)
+
+            db.expunge_all()
+            begin = time.perf_counter()
+            by_cursor = fetch_page(db, current_user, "date_desc", args.limit, cursor=cursor)
+            cursor_times.append(time.perf_counter() - begin)
+        assert [h.id for h in by_offset] == [h.id for h in by_cursor], "páginas diferentes"
+        print(f"📊 Página em {skip:>6}: OFFSET {statistics.median(offset_times) * 1000:6.1f} ms | "
+              f"cursor {statistics.median(cursor_times) * 1000:6.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Benchmark da busca textual nas análises das mãos (SQLite FTS5).
+Gera N mãos com análises sintéticas para alguns usuários, indexa e compara a
+busca pelo índice (/api/hands/search) com ILIKE sobre ai_analysis (todas as
+mãos que casam: ranquear exige ver todas).
+
+Uso: python benchmark_hand_search.py [--hands 100000] [--users 20] [--queries 20]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import create_engine, or_
+from sqlalchemy.orm import sessionmaker
+
+from app.models.database import Base
+from app.models import user, hand, hand_action, gap, tournament, coach, subscription, hud_stats, opponent_profile, hero_decision, ai_analysis_job
+from app.models.hand import Hand
+from app.models.user import User
+from app.services.hand_search_service import HandSearchService
+
+PHRASES = [
+    "Overbet no river polariza demais o range.", "Call correto sob ICM na bolha.",
+    "Open raise padrão do botão.", "3-bet light contra abertura larga do cutoff.",
+    "Check-raise no flop com draw de flush.", "Fold muito tight contra shove curto.",
+    "Continuation bet pequena em board seco.", "Float em posição com overcards.",
+    "Limp de posição inicial é um erro.", "Bluff catch bem executado no turn.",
+]
+# Seções genéricas de uma análise real (~2KB por mão)
+BOILERPLATE = (
+    "RESUMO DA SITUAÇÃO: contexto da mão, nível de blinds e stacks relativos. "
+    "ANÁLISE PRÉ-FLOP: range de abertura por posição e ajuste ao field. "
+    "ANÁLISE PÓS-FLOP: textura do board, vantagem de range e de nuts. "
+) * 6
+QUERIES = ["overbet", "icm bolha", "check raise", "float", "bluff turn", "shove", "3 bet cutoff", "flush draw",
+           "player1234", "player77"]
+
+
+def seed_hands(db, count: int, users: int, seed: int = 11):
+    rng = random.Random(seed)
+    for user_id in range(1, users + 1):
+        db.add(User(id=user_id, username=f'u{user_id}', email=f'u{user_id}@test.com', full_name='U',
+                    nickname=f'u{user_id}', hashed_password='x'))
+    db.commit()
+    batch = []
+    for i in range(count):
+        analysis = " ".join(rng.sample(PHRASES, 3)) + f" Vilão: Player{rng.randint(1, 5000)}. " + BOILERPLATE
+        batch.append(Hand(user_id=rng.randint(1, users), hand_id=str(i), raw_hand='', ai_analysis=analysis))
+        if len(batch) == 5000:
+            db.add_all(batch)
+            db.commit()
+            db.expunge_all()
+            batch = []
+    db.add_all(batch)
+    db.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark da busca textual")
+    parser.add_argument("--hands", type=int, default=100000)
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--queries", type=int, default=20)
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), "search.db")
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    print(f"🎲 Gerando e indexando {args.hands} mãos...")
+    start = time.perf_counter()
+    seed_hands(db, args.hands, args.users)
+    print(f"   {time.perf_counter() - start:.1f} s (índice mantido no flush)")
+
+    service = HandSearchService()
+    fts_times, ilike_times = [], []
+    assert service.search(db, 1, "overbet"), "índice vazio"
+    for i in range(args.queries):
+        query = QUERIES[i % len(QUERIES)]
+        user_id = i % args.users + 1
+
+        start = time.perf_counter()
+        results = service.search(db, user_id, query, limit=20)
+        fts_times.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        db.query(Hand.id).filter(
+            Hand.user_id == user_id,
+            *[or_(Hand.ai_analysis.ilike(f'%{term}%')) for term in query.split()]
+        ).all()
+        ilike_times.append(time.perf_counter() - start)
+
+    print(f"📊 FTS5 ranqueado: {statistics.median(fts_times) * 1000:.1f} ms (mediana), "
+          f"{max(fts_times) * 1000:.1f} ms (máx)")
+    print(f"📊 ILIKE: {statistics.median(ilike_times) * 1000:.1f} ms (mediana), "
+          f"{max(ilike_times) * 1000:.1f} ms (máx)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Benchmark do resumo de performance (/api/performance/summary).
+Compara o cálculo anterior (uma consulta por janela de 7/30/90 dias, carregando
+todos os torneios no Python) com a agregação condicional em uma única consulta
+(PerformanceAnalysisService.calculate_performance_windows) e confere que os
+resultados são idênticos. Mede também a soma das linhas diárias (rollup_windows),
+usada pelas rotas, e o gráfico de ROI (loop em Python x SUM ... OVER + LTTB).
+
+Uso: python benchmark_performance_stats.py [--tournaments 50000] [--repeat 5]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import and_, create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.models.database import Base
+from app.models import user, hand, hand_action, gap, tournament, coach, subscription, hud_stats, opponent_profile, hero_decision, ai_analysis_job
+from app.models.tournament import Tournament
+from app.models.user import User
+from app.services.performance_service import PerformanceAnalysisService
+
+WINDOWS = (7, 30, 90)
+
+
+def legacy_performance_stats(db, user_id: int, days_back: int) -> dict:
+    """Cálculo anterior: carrega os torneios da janela e agrega em Python"""
+    cutoff_date = datetime.utcnow() - timedelta(days=days_back)
+    tournaments = db.query(Tournament).filter(
+        and_(Tournament.user_id == user_id, Tournament.date_played >= cutoff_date)
+    ).all()
+    if not tournaments:
+        return PerformanceAnalysisService()._empty_stats()
+
+    total_buy_ins = sum(t.buy_in for t in tournaments)
+    total_prizes = sum(t.prize for t in tournaments)
+    net_profit = total_prizes - total_buy_ins
+    roi_percentage = (net_profit / total_buy_ins * 100) if total_buy_ins > 0 else 0
+    itm_count = len([t for t in tournaments if t.is_itm])
+    positions = [t.position for t in tournaments if t.position]
+    avg_finish = statistics.mean(positions) if positions else 0
+    losses = [t.buy_in for t in tournaments if t.prize == 0]
+    return {
+        'period_days': days_back,
+        'tournaments_played': len(tournaments),
+        'total_buy_ins': round(total_buy_ins, 2),
+        'total_prizes': round(total_prizes, 2),
+        'net_profit': round(net_profit, 2),
+        'roi_percentage': round(roi_percentage, 2),
+        'itm_count': itm_count,
+        'itm_percentage': round(itm_count / len(tournaments) * 100, 2),
+        'avg_finish_position': round(avg_finish, 1) if avg_finish else 0,
+        'best_finish': min(positions) if positions else 0,
+        'worst_finish': max(positions) if positions else 0,
+        'avg_buy_in': round(statistics.mean([t.buy_in for t in tournaments]), 2),
+        'biggest_win': round(max(t.prize for t in tournaments), 2),
+        'biggest_loss': round(max(losses), 2) if losses else 0,
+        'profit_per_tournament': round(net_profit / len(tournaments), 2)
+    }
+
+
+def legacy_roi_chart(db, user_id: int, days_back: int) -> list:
+    """Gráfico anterior: um ponto por torneio, acumulados em um loop Python"""
+    cutoff_date = datetime.utcnow() - timedelta(days=days_back)
+    tournaments = db.query(Tournament).filter(
+        and_(Tournament.user_id == user_id, Tournament.date_played >= cutoff_date)
+    ).order_by(Tournament.date_played).all()
+    cumulative_buy_ins = cumulative_prizes = 0
+    chart_data = []
+    for tournament in tournaments:
+        cumulative_buy_ins += tournament.buy_in
+        cumulative_prizes += tournament.prize
+        cumulative_roi = ((cumulative_prizes - cumulative_buy_ins) / cumulative_buy_ins * 100) if cumulative_buy_ins > 0 else 0
+        chart_data.append({
+            'date': tournament.date_played.strftime('%Y-%m-%d'),
+            'roi': round(cumulative_roi, 2),
+            'profit': round(cumulative_prizes - cumulative_buy_ins, 2),
+            'tournaments': len(chart_data) + 1
+        })
+    return chart_data
+
+
+def seed_tournaments(db, user_id: int, count: int, days: int = 120, seed: int = 7):
+    """Torneios aleatórios espalhados pelos últimos `days` dias"""
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    rows = []
+    for i in range(count):
+        buy_in = rng.choice([1.1, 3.3, 5.5, 11.0, 22.0, 55.0])
+        itm = rng.random() < 0.15
+        prize = round(buy_in * rng.uniform(1.2, 40), 2) if itm else 0.0
+        rows.append(dict(
+            user_id=user_id, tournament_id=str(100000 + i), name='Tournament', buy_in=buy_in,
+            prize=prize, position=rng.choice([None, rng.randint(1, 2000)]), is_itm=itm,
+            roi=(prize - buy_in) / buy_in * 100, platform='PokerStars',
+            date_played=now - timedelta(minutes=rng.uniform(5, days * 1440))
+        ))
+    db.bulk_insert_mappings(Tournament, rows)
+    db.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do resumo de performance")
+    parser.add_argument("--tournaments", type=int, default=50000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), "performance.db")
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    db.add(User(id=1, username='hero', email='hero@test.com', full_name='Hero', nickname='Hero', hashed_password='x'))
+    db.commit()
+    print(f"🎲 Gerando {args.tournaments} torneios...")
+    seed_tournaments(db, 1, args.tournaments)
+
+    service = PerformanceAnalysisService()
+    service.rebuild_daily_stats(db, 1)
+    legacy_times, windowed_times, rollup_times = [], [], []
+    for _ in range(args.repeat):
+        db.expunge_all()
+        start = time.perf_counter()
+        legacy = {days: legacy_performance_stats(db, 1, days) for days in WINDOWS}
+        legacy_times.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        windowed = service.calculate_performance_windows(db, 1, WINDOWS)
+        windowed_times.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        service.rollup_windows(db, 1, WINDOWS)
+        rollup_times.append(time.perf_counter() - start)
+
+    if legacy != windowed:
+        for days in WINDOWS:
+            for key, value in legacy[days].items():
+                if windowed[days][key] != value:
+                    print(f"❌ {days}d {key}: {value} != {windowed[days][key]}")
+        sys.exit(1)
+
+    legacy_ms = statistics.median(legacy_times) * 1000
+    windowed_ms = statistics.median(windowed_times) * 1000
+    print(f"✅ Resultados idênticos nas janelas {WINDOWS}")
+    print(f"📊 3 consultas + agregação em Python: {legacy_ms:.1f} ms")
+    rollup_ms = statistics.median(rollup_times) * 1000
+    print(f"📊 Agregação condicional (1 consulta): {windowed_ms:.1f} ms ({legacy_ms / windowed_ms:.1f}x)")
+    print(f"📊 Linhas diárias (rollup_windows): {rollup_ms:.1f} ms ({legacy_ms / rollup_ms:.1f}x)")
+
+    db.expunge_all()
+    start = time.perf_counter()
+    legacy_chart = legacy_roi_chart(db, 1, 90)
+    legacy_chart_ms = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    chart = service.get_roi_chart_data(db, 1, 90, max_points=500)
+    chart_ms = (time.perf_counter() - start) * 1000
+    print(f"📈 Gráfico de ROI 90 dias: {len(legacy_chart)} pontos em {legacy_chart_ms:.1f} ms -> "
+          f"{len(chart)} pontos (LTTB) em {chart_ms:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Benchmark da codificação compacta da mão nos prompts de IA.
+Compara o prompt antigo (hand history completo + análise local inteira) com o
+atual (hand_encoding_service): tamanho do prompt em tokens (estimativa de
+~4 caracteres por token) e latência ponta a ponta contra o servidor stub local,
+com custo de prefill proporcional aos tokens do prompt.
+
+Uso: python benchmark_prompt_encoding.py [--hands 100] [--latency 0.2] [--token-latency 0.0002] [--concurrency 8]
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import os
+import statistics
+import sys
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.services.ai_service import AIAnalysisService, SYSTEM_PROMPT
+from app.services.local_analysis_service import LocalAnalysisService
+from app.utils.poker_parser import PokerStarsParser
+from stub_openrouter_server import StubOpenRouterServer
+
+
+def estimate_tokens(text: str) -> int:
+    return len(text) // 4
+
+
+def legacy_prompt(hand_data) -> str:
+    """Prompt anterior: metadados, hand history completo e análise local inteira"""
+    return f"""
+Você é um coach profissional de poker especializado em torneios (MTTs) e estratégia GTO. Analise esta mão de poker e forneça feedback técnico detalhado.
+
+INFORMAÇÕES DA MÃO:
+- ID da Mão: {hand_data.get("hand_id", "N/A")}
+- Torneio: {hand_data.get("tournament_id", "N/A")}
+- Mesa: {hand_data.get("table_name", "N/A")}
+- Herói: {hand_data.get("hero_name", "N/A")}
+- Posição: {hand_data.get("hero_position", "N/A")}
+- Cartas do Herói: {hand_data.get("hero_cards", "N/A")}
+- Ação Principal: {hand_data.get("hero_action", "N/A")}
+- Stack do Herói: {hand_data.get("hero_stack", "N/A")}
+- Tamanho do Pot: {hand_data.get("pot_size", "N/A")}
+- Board: {hand_data.get("board_cards", "N/A")}
+
+HAND HISTORY COMPLETA:
+{hand_data.get("raw_hand", "")}
+
+ANÁLISE LOCAL (gerada pelo sistema):
+{hand_data.get("local_analysis", "N/A")}
+
+ANÁLISE SOLICITADA:
+
+1. **RESUMO DA SITUAÇÃO**
+   - Contexto da mão (nível de blinds, stack sizes relativos)
+   - Dinâmica da mesa e posicionamento
+
+2. **AVALIAÇÃO DA JOGADA**
+   - A ação do herói foi correta? (Escala: Excelente/Boa/Aceitável/Ruim/Terrível)
+   - Justificativa técnica baseada em GTO
+
+3. **ANÁLISE TÉCNICA**
+   - Range de mãos apropriado para a posição
+   - Considerações sobre pot odds e implied odds
+   - Leitura de oponentes baseada nas ações
+
+4. **ALTERNATIVAS ESTRATÉGICAS**
+   - Outras linhas de jogo possíveis
+   - Quando cada alternativa seria preferível
+
+5. **PONTOS DE MELHORIA**
+   - Gaps específicos identificados
+   - Conceitos para estudar
+   - Situações similares para praticar
+
+6. **CONTEXTO DE TORNEIO**
+   - Considerações sobre ICM (Independent Chip Model)
+   - Ajustes baseados no estágio do torneio
+   - Gestão de stack e bubble considerations
+
+Seja específico, educativo e construtivo. Use terminologia técnica apropriada mas mantenha explicações claras.
+"""
+
+
+async def load_hands(count: int):
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "torneio_ingles.txt")
+    with open(path, encoding="utf-8") as f, contextlib.redirect_stdout(io.StringIO()):
+        hands = PokerStarsParser().parse_file(f.read())
+    hands = (hands * (count // max(len(hands), 1) + 1))[:count]
+    local_service = LocalAnalysisService()
+    for hand_data in hands:
+        hand_data["local_analysis"] = await local_service.analyze_hand_locally(hand_data)
+    return hands
+
+
+async def run(service: AIAnalysisService, hands, build_prompt):
+    """Monta o prompt e chama o modelo para cada mão; retorna (tempo total, latências)"""
+    latencies = []
+
+    async def one(hand_data):
+        start = time.perf_counter()
+        await service._complete([
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": build_prompt(hand_data)}
+        ])
+        latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(hand_data) for hand_data in hands))
+    return time.perf_counter() - start, latencies
+
+
+async def main(hand_count: int, latency: float, token_latency: float, concurrency: int):
+    server = StubOpenRouterServer(latency, token_latency=token_latency)
+    port = await server.start()
+    os.environ["OPENROUTER_BASE_URL"] = f"http://127.0.0.1:{port}/api/v1"
+    os.environ["AI_MAX_CONCURRENCY"] = str(concurrency)
+    os.environ["AI_USER_RATE_PER_MINUTE"] = "0"
+    hands = await load_hands(hand_count)
+    service = AIAnalysisService()
+
+    build_start = time.perf_counter()
+    compact = [service._build_analysis_prompt(hand_data) for hand_data in hands]
+    build_ms = (time.perf_counter() - build_start) * 1000 / len(hands)
+    legacy_tokens = [estimate_tokens(legacy_prompt(hand_data)) for hand_data in hands]
+    compact_tokens = [estimate_tokens(prompt) for prompt in compact]
+
+    print(f"📊 {len(hands)} mãos, latência {latency}s + {token_latency * 1000:.2f}ms/token, concorrência {concurrency}")
+    print(f"   Tokens do prompt (≈ caracteres/4): antigo média {statistics.mean(legacy_tokens):.0f} "
+          f"(máx {max(legacy_tokens)}), compacto média {statistics.mean(compact_tokens):.0f} (máx {max(compact_tokens)})")
+    print(f"   Montagem do prompt compacto: {build_ms:.2f}ms por mão")
+
+    results = {}
+    for name, build_prompt in (("antigo", legacy_prompt), ("compacto", service._build_analysis_prompt)):
+        server.prompt_tokens = 0
+        total, latencies = await run(service, hands, build_prompt)
+        results[name] = total
+        print(f"   Prompt {name}: {total:.2f}s no total, p50 {statistics.median(latencies) * 1000:.0f}ms, "
+              f"{server.prompt_tokens} tokens enviados")
+    print(f"✅ Redução de tokens: {1 - sum(compact_tokens) / sum(legacy_tokens):.0%}, "
+          f"speedup ponta a ponta: {results['antigo'] / results['compacto']:.1f}x")
+    await service.aclose()
+    await server.stop()
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Benchmark da codificação compacta de mãos nos prompts")
+    arg_parser.add_argument("--hands", type=int, default=100)
+    arg_parser.add_argument("--latency", type=float, default=0.2)
+    arg_parser.add_argument("--token-latency", type=float, default=0.0002)
+    arg_parser.add_argument("--concurrency", type=int, default=8)
+    args = arg_parser.parse_args()
+    asyncio.run(main(args.hands, args.latency, args.token_latency, args.concurrency))
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Gera as tabelas de push/fold (app/ranges/push_fold_charts.npy)
+
+1. Matriz de equity all-in pré-flop 169 x 169 (Monte Carlo vetorizado)
+2. Pesos de remoção de cartas entre classes (pares de combos compatíveis)
+3. Fictitious play para cada célula da grade stack x posição x ante
+
+Uso: python build_push_fold_tables.py [--samples 2000] [--equity-cache /tmp/equity.npy]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.utils.hand_evaluator import evaluate
+from app.utils.ranges import COMBO_CARDS, COMBO_CLASS, CLASS_COMBOS
+from app.services.push_fold_service import (
+    ANTE_GRID, CALL_CHART, PLAYERS_BEHIND_GRID, PUSH_FOLD_TABLE_PATH, SHOVE_CHART,
+    STACK_GRID, TABLE_SHAPE, solve_push_fold,
+)
+
+
+def combo_weights() -> np.ndarray:
+    """Número de pares de combos sem cartas em comum entre cada par de classes"""
+    a, b = COMBO_CARDS[:, 0], COMBO_CARDS[:, 1]
+    overlap = (
+        (a[:, None] == a[None, :]) | (a[:, None] == b[None, :]) |
+        (b[:, None] == a[None, :]) | (b[:, None] == b[None, :])
+    )
+    one_hot = np.zeros((len(COMBO_CARDS), 169))
+    one_hot[np.arange(len(COMBO_CARDS)), COMBO_CLASS] = 1.0
+    return one_hot.T @ (~overlap).astype(float) @ one_hot
+
+
+def equity_matrix(samples: int, seed: int = 0, chunk_rows: int = 200_000) -> np.ndarray:
+    """Equity all-in de cada classe contra cada classe, com pares de combos uniformes"""
+    rng = np.random.default_rng(seed)
+    sizes = np.array([len(c) for c in CLASS_COMBOS])
+    offsets = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+    flat_combos = np.concatenate(CLASS_COMBOS)
+
+    pairs = np.array([(i, j) for i in range(169) for j in range(i, 169)])
+    totals = np.zeros(len(pairs))
+    counts = np.zeros(len(pairs))
+    pairs_per_chunk = max(1, chunk_rows // samples)
+
+    for start in range(0, len(pairs), pairs_per_chunk):
+        block = np.arange(start, min(start + pairs_per_chunk, len(pairs)))
+        rows = np.repeat(block, samples * 2)  # Sobra para a rejeição de combos sobrepostos
+        first, second = pairs[rows, 0], pairs[rows, 1]
+        hand_a = COMBO_CARDS[flat_combos[offsets[first] + rng.integers(sizes[first])]]
+        hand_b = COMBO_CARDS[flat_combos[offsets[second] + rng.integers(sizes[second])]]
+        valid = (hand_a[:, :, None] != hand_b[:, None, :]).all(axis=(1, 2))
+        rows, hand_a, hand_b = rows[valid], hand_a[valid], hand_b[valid]
+
+        keys = rng.random((len(rows), 52))
+        np.put_along_axis(keys, hand_a, 2.0, axis=1)
+        np.put_along_axis(keys, hand_b, 2.0, axis=1)
+        board = np.argpartition(keys, 4, axis=1)[:, :5]
+        score_a = evaluate(np.concatenate([hand_a, board], axis=1))
+        score_b = evaluate(np.concatenate([hand_b, board], axis=1))
+        share = (score_a > score_b) + 0.5 * (score_a == score_b)
+
+        np.add.at(totals, rows, share)
+        np.add.at(counts, rows, 1.0)
+
+    equity = np.full((169, 169), 0.5)
+    values = totals / np.maximum(counts, 1.0)
+    equity[pairs[:, 0], pairs[:, 1]] = values
+    equity[pairs[:, 1], pairs[:, 0]] = 1.0 - values
+    np.fill_diagonal(equity, 0.5)
+    return equity
+
+
+def build_tables(equity: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    tables = np.zeros(TABLE_SHAPE, dtype=np.uint8)
+    for s, stack in enumerate(STACK_GRID):
+        for p, behind in enumerate(PLAYERS_BEHIND_GRID):
+            for a, ante in enumerate(ANTE_GRID):
+                shove, call = solve_push_fold(equity, weights, stack, behind, ante)
+                tables[SHOVE_CHART, s, p, a] = shove > 0.5
+                tables[CALL_CHART, s, p, a] = call > 0.5
+    return tables
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gera as tabelas de push/fold")
+    parser.add_argument("--samples", type=int, default=2000, help="Amostras Monte Carlo por par de classes")
+    parser.add_argument("--equity-cache", help="Arquivo .npy para reaproveitar a matriz de equity")
+    parser.add_argument("--output", default=str(PUSH_FOLD_TABLE_PATH))
+    args = parser.parse_args()
+
+    start = time.time()
+    if args.equity_cache and os.path.exists(args.equity_cache):
+        equity = np.load(args.equity_cache)
+        print(f"📂 Matriz de equity carregada de {args.equity_cache}")
+    else:
+        equity = equity_matrix(args.samples)
+        print(f"✅ Matriz de equity 169x169 calculada em {time.time() - start:.1f}s")
+        if args.equity_cache:
+            np.save(args.equity_cache, equity)
+
+    weights = combo_weights()
+    tables = build_tables(equity, weights)
+    np.save(args.output, tables)
+
+    combos = np.array([len(c) for c in CLASS_COMBOS])
+    heads_up = tables[:, STACK_GRID.index(10), PLAYERS_BEHIND_GRID.index(1), 0]
+    print(f"📊 10 BB heads-up sem ante: shove {combos[heads_up[SHOVE_CHART] == 1].sum() / 13.26:.1f}%, "
+          f"call {combos[heads_up[CALL_CHART] == 1].sum() / 13.26:.1f}%")
+    print(f"🎉 Tabelas salvas em {args.output} ({time.time() - start:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
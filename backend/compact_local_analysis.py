@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Converte a análise local das mãos já salvas (texto de ~1KB por mão) para os
+códigos compactos (local_*_code / local_params) e apaga o texto gravado.
+O texto continua disponível em Hand.local_analysis, montado na leitura.
+Com --icm, refaz as mãos cujo diagnóstico gravado é um veredito de ICM: ele era
+calculado com a estrutura de mesa final em qualquer mesa do torneio.
+
+Uso: python compact_local_analysis.py [--user-id 1] [--batch-size 500] [--icm]
+"""
+
+import argparse
+import contextlib
+import io
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.models.database import SessionLocal
+from app.models.hand import Hand
+from app.services.local_analysis_service import LocalAnalysisService
+from app.utils.local_verdicts import FIRST_ICM_DECISION
+from app.utils.poker_parser import PokerStarsParser
+
+
+def compact_local_analysis(user_id: int = None, batch_size: int = 500, icm: bool = False):
+    db = SessionLocal()
+    service = LocalAnalysisService()
+    parser = PokerStarsParser()
+    last_id = 0
+    total = 0
+    try:
+        while True:
+            pending = Hand.local_decision_code >= FIRST_ICM_DECISION if icm else Hand.local_decision_code.is_(None)
+            query = db.query(Hand).filter(Hand.id > last_id, pending)
+            if user_id:
+                query = query.filter(Hand.user_id == user_id)
+            hands = query.order_by(Hand.id).limit(batch_size).all()
+            if not hands:
+                break
+
+            batch = []
+            for hand in hands:
+                # O stack do herói não era gravado: vem do parse do texto original
+                with contextlib.redirect_stdout(io.StringIO()):
+                    parsed = parser._parse_single_hand(hand.raw_hand or '') or {}
+                batch.append({
+                    'raw_hand': hand.raw_hand or '',
+                    'hero_name': hand.hero_name,
+                    'hero_position': hand.hero_position,
+                    'hero_cards': hand.hero_cards,
+                    'hero_action': hand.hero_action,
+                    'hero_stack': parsed.get('hero_stack'),
+                    'pot_size': hand.pot_size,
+                })
+            for hand, hand_data, verdict in zip(hands, batch, service.analyze_many(batch)):
+                for column, value in verdict.columns().items():
+                    setattr(hand, column, value)
+                hand.hero_stack = hand_data['hero_stack']
+                hand.local_analysis_text = None
+            db.commit()
+            total += len(hands)
+            last_id = hands[-1].id
+            print(f"📦 {total} mãos convertidas")
+        print(f"✅ Análise local compactada em {total} mãos")
+    except Exception as e:
+        print(f"❌ Erro ao compactar análise local: {e}")
+        db.rollback()
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Converte a análise local gravada em texto para códigos")
+    arg_parser.add_argument("--user-id", type=int)
+    arg_parser.add_argument("--batch-size", type=int, default=500)
+    arg_parser.add_argument("--icm", action="store_true", help="Refaz as mãos com diagnóstico de ICM gravado")
+    args = arg_parser.parse_args()
+
+    print("🗜️ Compactando análise local das mãos")
+    print("=" * 50)
+    compact_local_analysis(args.user_id, args.batch_size, args.icm)
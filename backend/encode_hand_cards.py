@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Preenche as colunas de cartas codificadas (hero_class, hero_suited, hero_mask,
+board_mask, flop_texture) das mãos gravadas antes delas existirem.
+Mãos novas já recebem as colunas ao gravar hero_cards/board_cards.
+
+Uso: python encode_hand_cards.py [--user-id 1] [--batch-size 1000]
+"""
+
+import argparse
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.models.database import SessionLocal
+from app.models.hand import Hand
+from app.utils.card_encoding import board_card_columns, hero_card_columns
+
+
+def encode_hand_cards(user_id: int = None, batch_size: int = 1000):
+    db = SessionLocal()
+    last_id = 0
+    total = 0
+    try:
+        while True:
+            query = db.query(Hand.id, Hand.hero_cards, Hand.board_cards).filter(Hand.id > last_id)
+            if user_id:
+                query = query.filter(Hand.user_id == user_id)
+            rows = query.order_by(Hand.id).limit(batch_size).all()
+            if not rows:
+                break
+
+            db.bulk_update_mappings(Hand, [
+                {'id': hand_id, **hero_card_columns(hero_cards), **board_card_columns(board_cards)}
+                for hand_id, hero_cards, board_cards in rows
+            ])
+            db.commit()
+            total += len(rows)
+            last_id = rows[-1].id
+            print(f"📦 {total} mãos codificadas")
+        print(f"✅ Cartas codificadas em {total} mãos")
+    except Exception as e:
+        print(f"❌ Erro ao codificar cartas: {e}")
+        db.rollback()
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Preenche as colunas de cartas codificadas das mãos")
+    arg_parser.add_argument("--user-id", type=int)
+    arg_parser.add_argument("--batch-size", type=int, default=1000)
+    args = arg_parser.parse_args()
+
+    print("🃏 Codificando cartas das mãos")
+    print("=" * 50)
+    encode_hand_cards(args.user_id, args.batch_size)
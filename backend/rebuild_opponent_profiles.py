@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Recalcula o índice de oponentes (opponent_profiles) a partir das mãos já salvas.
+Usado uma vez após a migração (mãos anteriores ao cálculo incremental) ou para
+corrigir divergências. Lê as mãos em lotes por id (keyset) e grava um usuário por vez.
+
+Uso: python rebuild_opponent_profiles.py [--user-id 1] [--batch-size 500]
+"""
+
+import argparse
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.models.database import SessionLocal
+from app.models.hand import Hand
+from app.models.opponent_profile import OpponentProfile
+from app.services.opponent_service import OpponentService
+
+
+def rebuild_user(db, service: OpponentService, user_id: int, batch_size: int) -> tuple:
+    batch = {}
+    last_id = 0
+    total = 0
+    while True:
+        rows = (
+            db.query(Hand.id, Hand.hand_id, Hand.raw_hand, Hand.hero_name, Hand.date_played)
+            .filter(Hand.user_id == user_id, Hand.id > last_id)
+            .order_by(Hand.id)
+            .limit(batch_size)
+            .all()
+        )
+        if not rows:
+            break
+        for row in rows:
+            service.accumulate(batch, {
+                'hand_id': row.hand_id,
+                'raw_hand': row.raw_hand,
+                'hero_name': row.hero_name,
+                'date_played': row.date_played,
+            })
+        total += len(rows)
+        last_id = rows[-1].id
+
+    db.query(OpponentProfile).filter(OpponentProfile.user_id == user_id).delete(synchronize_session=False)
+    service.apply_batch(db, user_id, batch)
+    db.commit()
+    return total, len(batch)
+
+
+def rebuild_opponent_profiles(user_id: int = None, batch_size: int = 500):
+    db = SessionLocal()
+    service = OpponentService()
+    try:
+        if user_id:
+            user_ids = [user_id]
+        else:
+            user_ids = [row[0] for row in db.query(Hand.user_id).distinct().all()]
+
+        for uid in user_ids:
+            total, opponents = rebuild_user(db, service, uid, batch_size)
+            print(f"✅ Usuário {uid}: {opponents} oponentes indexados a partir de {total} mãos")
+    except Exception as e:
+        print(f"❌ Erro ao recalcular índice de oponentes: {e}")
+        db.rollback()
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Recalcula a tabela opponent_profiles")
+    arg_parser.add_argument("--user-id", type=int)
+    arg_parser.add_argument("--batch-size", type=int, default=500)
+    args = arg_parser.parse_args()
+
+    print("🕵️ Recalculando índice de oponentes")
+    print("=" * 50)
+    rebuild_opponent_profiles(args.user_id, args.batch_size)
@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""
+Refaz as linhas diárias de performance (tournament_daily_stats) a partir dos
+torneios já gravados. Necessário uma vez após a migração; depois as linhas são
+mantidas a cada torneio inserido ou alterado.
+
+Uso: python rebuild_performance_rollups.py [--user-id 1]
+"""
+
+import argparse
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.models.database import SessionLocal
+from app.services.performance_service import PerformanceAnalysisService
+
+
+def rebuild_performance_rollups(user_id: int = None):
+    db = SessionLocal()
+    try:
+        rows = PerformanceAnalysisService().rebuild_daily_stats(db, user_id)
+        print(f"✅ {rows} linhas diárias de performance gravadas")
+    except Exception as e:
+        print(f"❌ Erro ao refazer estatísticas diárias: {e}")
+        db.rollback()
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Refaz as estatísticas diárias de performance")
+    arg_parser.add_argument("--user-id", type=int)
+    args = arg_parser.parse_args()
+
+    print("📊 Refazendo estatísticas diárias de performance")
+    print("=" * 50)
+    rebuild_performance_rollups(args.user_id)
@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+Reindexa as mãos já gravadas no índice de busca textual (hand_search).
+Necessário uma vez após a migração; depois o índice é mantido a cada mão
+inserida ou análise gravada.
+
+Uso: python rebuild_search_index.py [--user-id 1] [--batch-size 1000]
+"""
+
+import argparse
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.models.database import SessionLocal
+from app.services.hand_search_service import HandSearchService
+
+
+def rebuild_search_index(user_id: int = None, batch_size: int = 1000):
+    db = SessionLocal()
+    try:
+        total = HandSearchService().rebuild(db, user_id, batch_size)
+        print(f"✅ {total} mãos indexadas para busca")
+    except Exception as e:
+        print(f"❌ Erro ao reindexar mãos: {e}")
+        db.rollback()
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Reindexa as mãos no índice de busca textual")
+    arg_parser.add_argument("--user-id", type=int)
+    arg_parser.add_argument("--batch-size", type=int, default=1000)
+    args = arg_parser.parse_args()
+
+    print("🔎 Reindexando busca textual das mãos")
+    print("=" * 50)
+    rebuild_search_index(args.user_id, args.batch_size)
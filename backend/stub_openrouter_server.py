@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Servidor local compatível com a API de chat completions do OpenRouter, para
+benchmark do cliente de IA. Latência, custo por token do prompt e taxa de erros
+(429/503) configuráveis.
+Implementado só com asyncio (HTTP/1.1 com keep-alive), sem dependências extras.
+
+Uso: python stub_openrouter_server.py [--port 8765] [--latency 0.2] [--token-latency 0.0002] [--error-rate 0.05]
+Depois: OPENROUTER_BASE_URL=http://127.0.0.1:8765/api/v1
+"""
+
+import argparse
+import asyncio
+import json
+import random
+
+
+class StubOpenRouterServer:
+    def __init__(self, latency: float = 0.2, error_rate: float = 0.0, token_latency: float = 0.0):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.token_latency = token_latency  # Segundos por token do prompt (prefill)
+        self.prompt_tokens = 0
+        self.requests = 0
+        self.connections = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._server = None
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> int:
+        self._server = await asyncio.start_server(self._handle, host, port)
+        return self._server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.connections += 1
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+
+                status, payload = await self._respond(request_line.decode("latin-1"), body)
+                data = json.dumps(payload).encode()
+                extra = "Retry-After: 0\r\n" if status == 429 else ""
+                writer.write(
+                    f"HTTP/1.1 {status} {'OK' if status == 200 else 'Error'}\r\n"
+                    f"Content-Type: application/json\r\nContent-Length: {len(data)}\r\n{extra}\r\n".encode() + data
+                )
+                await writer.drain()
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (asyncio.IncompleteReadError, ConnectionResetError):
+            pass
+        finally:
+            writer.close()
+
+    async def _respond(self, request_line: str, body: bytes):
+        if "/chat/completions" not in request_line:
+            return 404, {"error": "not found"}
+        self.requests += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        request = json.loads(body or b"{}")
+        prompt = request.get("messages", [{}])[-1].get("content", "")
+        tokens = sum(len(m.get("content", "")) for m in request.get("messages", [])) // 4
+        self.prompt_tokens += tokens
+        try:
+            await asyncio.sleep(self.latency + tokens * self.token_latency)
+        finally:
+            self.in_flight -= 1
+        if random.random() < self.error_rate:
+            return random.choice((429, 503)), {"error": {"message": "stub error"}}
+        return 200, {
+            "id": f"stub-{self.requests}",
+            "model": request.get("model"),
+            "choices": [{"message": {"role": "assistant", "content": f"Análise simulada ({len(prompt)} caracteres)"}}],
+            "usage": {"prompt_tokens": tokens, "completion_tokens": 8},
+        }
+
+
+async def main(port: int, latency: float, error_rate: float, token_latency: float):
+    server = StubOpenRouterServer(latency, error_rate, token_latency)
+    port = await server.start(port=port)
+    print(f"🤖 Stub OpenRouter em http://127.0.0.1:{port}/api/v1 (latência {latency}s, erros {error_rate:.0%})")
+    await asyncio.Event().wait()
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Servidor stub compatível com OpenRouter")
+    arg_parser.add_argument("--port", type=int, default=8765)
+    arg_parser.add_argument("--latency", type=float, default=0.2)
+    arg_parser.add_argument("--error-rate", type=float, default=0.0)
+    arg_parser.add_argument("--token-latency", type=float, default=0.0)
+    args = arg_parser.parse_args()
+    try:
+        asyncio.run(main(args.port, args.latency, args.error_rate, args.token_latency))
+    except KeyboardInterrupt:
+        print("👋 Stub encerrado")
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Teste do cliente de IA compartilhado: retry com backoff, concorrência limitada
+e limite de taxa por usuário (token bucket)
+"""
+
+import sys
+import os
+import asyncio
+import json
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import httpx
+
+from app.services.ai_service import AIAnalysisService, TokenBucket
+
+HAND = {'hand_id': '1', 'hero_position': 'BTN', 'hero_cards': 'Ah Kd', 'hero_action': 'raise', 'raw_hand': ''}
+
+
+def _completion(text):
+    return httpx.Response(200, json={'choices': [{'message': {'content': text}}]})
+
+
+def _service(handler, **settings):
+    service = AIAnalysisService(transport=httpx.MockTransport(handler))
+    service.backoff_base = 0.001
+    for name, value in settings.items():
+        setattr(service, name, value)
+    return service
+
+
+def test_retry_then_success():
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        if len(calls) < 3:
+            return httpx.Response(503 if len(calls) == 1 else 429, headers={'Retry-After': '0'})
+        return _completion('ok')
+
+    async def run():
+        service = _service(handler)
+        result = await service.analyze_hand(HAND)
+        await service.aclose()
+        return result
+
+    assert asyncio.run(run()) == 'ok'
+    assert len(calls) == 3
+    assert calls[0].url.path.endswith('/chat/completions')
+
+
+def test_fallback_after_retries_and_no_retry_on_400():
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(503 if len(calls) <= 3 else 400)
+
+    async def run():
+        service = _service(handler, max_retries=2)
+        first = await service.analyze_hand(HAND)
+        second = await service.analyze_hand(HAND)
+        await service.aclose()
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert 'ANÁLISE BÁSICA' in first and 'ANÁLISE BÁSICA' in second
+    assert len(calls) == 4  # 3 tentativas com 503 + 1 com 400 (sem retry)
+
+
+def test_bounded_concurrency_keeps_order():
+    state = {'in_flight': 0, 'peak': 0}
+
+    async def handler(request):
+        state['in_flight'] += 1
+        state['peak'] = max(state['peak'], state['in_flight'])
+        await asyncio.sleep(0.01)
+        state['in_flight'] -= 1
+        prompt = json.loads(request.content)['messages'][-1]['content']
+        return _completion(next(line.split('|')[0].strip() for line in prompt.splitlines() if 'Herói:' in line))
+
+    async def run():
+        service = _service(handler, max_concurrency=3)
+        hands = [{**HAND, 'hand_id': str(i), 'hero_name': f'Hero{i}'} for i in range(12)]
+        results = await service.analyze_hands(hands, user_id=1)
+        await service.aclose()
+        return results
+
+    results = asyncio.run(run())
+    assert results == [f'Herói: Hero{i}' for i in range(12)]
+    assert state['peak'] == 3
+
+
+def test_token_bucket_limits_rate():
+    async def run():
+        bucket = TokenBucket(rate=100.0, capacity=2)
+        start = time.monotonic()
+        for _ in range(6):
+            await bucket.acquire()
+        return time.monotonic() - start
+
+    # 2 em rajada + 4 a 100/s
+    assert asyncio.run(run()) >= 0.035
+
+
+if __name__ == "__main__":
+    test_retry_then_success()
+    test_fallback_after_retries_and_no_retry_on_400()
+    test_bounded_concurrency_keeps_order()
+    test_token_bucket_limits_rate()
+    print("✅ Todos os testes do cliente de IA passaram")
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Teste da fila persistente de análises de IA: lease, prioridade,
+retry com backoff, lease vencido, erros sem retry e processamento pelo pool de workers
+"""
+
+import sys
+import os
+import asyncio
+from datetime import datetime, timedelta
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import httpx
+from sqlalchemy.orm import sessionmaker
+
+from app.models.ai_analysis_job import AIAnalysisJob
+from app.models.hand import Hand
+from app.services.ai_service import AIAnalysisService
+from app.services.ai_job_service import (
+    AIJobQueue, AIJobWorkerPool, JOB_DONE, JOB_FAILED, JOB_PENDING, JOB_RUNNING
+)
+from testing_support import session
+
+
+def _hands(db, count):
+    hands = [Hand(user_id=1, hand_id=str(n), hero_name='Hero', hero_position='BTN',
+                  hero_cards='Ah Kd', raw_hand='') for n in range(count)]
+    db.add_all(hands)
+    db.flush()
+    return hands
+
+
+def test_lease_priority_and_exclusive():
+    db = session()
+    queue = AIJobQueue(lease_seconds=60)
+    hands = _hands(db, 3)
+    assert queue.enqueue(db, hands) == 3
+    assert queue.enqueue(db, hands) == 0  # Já na fila
+    db.commit()
+
+    # Usuário abre a última mão: ela passa na frente
+    assert queue.prioritize(db, hands[2].id)
+    db.commit()
+    first = queue.lease(db, 'w1')
+    assert [job.hand_id for job in first] == [hands[2].id]
+    assert first[0].status == JOB_RUNNING and first[0].attempts == 1
+
+    second = queue.lease(db, 'w2', limit=5)
+    assert sorted(job.hand_id for job in second) == [hands[0].id, hands[1].id]
+    assert queue.lease(db, 'w3') == []
+    assert queue.status_counts(db, 1) == {'pending': 0, 'running': 3, 'done': 0, 'failed': 0}
+
+    # Lease vencido: o job volta a ser elegível para outro worker
+    first[0].leased_until = datetime.utcnow() - timedelta(seconds=1)
+    db.commit()
+    retaken = queue.lease(db, 'w4')
+    assert [job.hand_id for job in retaken] == [hands[2].id]
+    assert retaken[0].locked_by == 'w4' and retaken[0].attempts == 2
+    db.close()
+
+
+def test_retry_backoff_then_failed():
+    db = session()
+    queue = AIJobQueue(max_attempts=2, backoff_seconds=60)
+    hand = _hands(db, 1)[0]
+    queue.enqueue(db, [hand])
+    db.commit()
+
+    job = queue.lease(db, 'w1')[0]
+    assert queue.fail(db, job, 'w1', 'timeout', 'básica')
+    assert job.status == JOB_PENDING and job.available_at > datetime.utcnow()
+    assert queue.lease(db, 'w1') == []  # Em backoff
+
+    job.available_at = datetime.utcnow() - timedelta(seconds=1)
+    db.commit()
+    job = queue.lease(db, 'w1')[0]
+    assert queue.fail(db, job, 'w1', 'timeout', 'básica')
+    assert job.status == JOB_FAILED and job.last_error == 'timeout'
+    assert hand.ai_analysis == 'básica' and hand.ai_status == JOB_FAILED
+    db.close()
+
+
+def test_non_retryable_fails_immediately():
+    db = session()
+    queue = AIJobQueue(max_attempts=5)
+    hand = _hands(db, 1)[0]
+    queue.enqueue(db, [hand])
+    db.commit()
+
+    job = queue.lease(db, 'w1')[0]
+    assert queue.fail(db, job, 'w1', '401 Unauthorized', 'básica', retryable=False)
+    assert job.status == JOB_FAILED and job.attempts == 1
+    assert hand.ai_analysis == 'básica'
+    db.close()
+
+
+def test_lost_lease_writes_nothing():
+    db = session()
+    queue = AIJobQueue(lease_seconds=60)
+    hand = _hands(db, 1)[0]
+    queue.enqueue(db, [hand])
+    db.commit()
+
+    # O lease de w1 vence e w2 retoma e conclui o job
+    stale = queue.lease(db, 'w1')[0]
+    stale.leased_until = datetime.utcnow() - timedelta(seconds=1)
+    db.commit()
+    job = queue.lease(db, 'w2')[0]
+    assert not queue.complete(db, job, 'atrasada', 'w1')
+    assert not queue.fail(db, job, 'w1', 'timeout', 'básica')
+    assert job.status == JOB_RUNNING and job.locked_by == 'w2' and hand.ai_analysis is None
+
+    assert queue.complete(db, job, 'análise', 'w2')
+    assert not queue.complete(db, job, 'de novo', 'w2')  # Já concluído
+    db.expire_all()
+    assert hand.ai_analysis == 'análise' and hand.ai_status == JOB_DONE
+    db.close()
+
+
+def test_worker_pool_fills_analyses():
+    db = session()
+    hands = _hands(db, 6)
+    AIJobQueue().enqueue(db, hands)
+    db.commit()
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        if len(calls) == 1:
+            return httpx.Response(503)  # Falha temporária: volta para a fila
+        if len(calls) == 2:
+            return httpx.Response(401)  # Sem retry: falha de vez com a análise básica
+        return httpx.Response(200, json={'choices': [{'message': {'content': 'análise'}}]})
+
+    async def run():
+        ai_service = AIAnalysisService(transport=httpx.MockTransport(handler))
+        ai_service.max_retries = 0
+        pool = AIJobWorkerPool(ai_service, AIJobQueue(backoff_seconds=0),
+                               session_factory=sessionmaker(bind=db.get_bind()), workers=3)
+        processed = await pool.drain()
+        await ai_service.aclose()
+        return processed
+
+    assert asyncio.run(run()) == 7
+    db.expire_all()
+    assert sorted(hand.ai_status for hand in hands) == [JOB_DONE] * 5 + [JOB_FAILED]
+    assert all(hand.ai_analysis == 'análise' for hand in hands if hand.ai_status == JOB_DONE)
+    assert db.query(AIAnalysisJob).filter(AIAnalysisJob.attempts == 2).count() == 1
+    db.close()
+
+
+if __name__ == "__main__":
+    test_lease_priority_and_exclusive()
+    test_retry_backoff_then_failed()
+    test_non_retryable_fails_immediately()
+    test_lost_lease_writes_nothing()
+    test_worker_pool_fills_analyses()
+    print("✅ Fila de análises de IA OK")
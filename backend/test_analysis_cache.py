@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Teste do cache de análises de IA por situação: assinatura canônica,
+eviction LRU/TTL, taxa de acerto e deduplicação de chamadas simultâneas
+"""
+
+import sys
+import os
+import asyncio
+import json
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import httpx
+
+from app.services.ai_service import AIAnalysisService
+from app.services.analysis_cache_service import AnalysisCache, situation_signature, stack_bucket
+
+# Hero abre do BTN com 25 BB, o BB paga e Hero faz c-bet no flop
+RAW_HAND = """PokerStars Hand #{hand_id}: Tournament #400, $0.85+$0.15 USD Hold'em No Limit - Level V (100/200) - 2025/07/30 20:00:03 ET
+Table '400 1' 6-max Seat #1 is the button
+Seat 1: Hero (5000 in chips)
+Seat 2: Alpha (8000 in chips)
+Seat 3: Bravo (8000 in chips)
+Alpha: posts small blind 100
+Bravo: posts big blind 200
+*** HOLE CARDS ***
+Dealt to Hero [{cards}]
+Hero: raises 300 to 500
+Alpha: folds
+Bravo: calls 300
+*** FLOP *** [{flop}]
+Bravo: checks
+Hero: bets 400
+Bravo: folds
+Uncalled bet (400) returned to Hero
+Hero collected 1100 from pot
+*** SUMMARY ***
+Total pot 1100 | Rake 0"""
+
+
+def _hand(hand_id='1', cards='Kh Qh', flop='Ks 9h 2h', cbet=400):
+    raw_hand = RAW_HAND.format(hand_id=hand_id, cards=cards, flop=flop)
+    return {
+        'hand_id': hand_id,
+        'hero_name': 'Hero',
+        'hero_position': 'BTN',
+        'hero_cards': cards,
+        'board_cards': flop,
+        'raw_hand': raw_hand.replace('Hero: bets 400', f'Hero: bets {cbet}'),
+    }
+
+
+def test_signature_ignores_suits_and_hand_id():
+    signature = situation_signature(_hand())
+    # Flop com flush draw e carta alta K (2 = FLUSH_DRAW, 'h' = carta alta de T a A)
+    assert signature == 'BTN|KQs|20-30|R2.5c/xB2|2h'
+    assert situation_signature(_hand('2', 'Kd Qd', 'Kc 9d 2d')) == signature
+    # Outra classe de mão, outra textura ou outro tamanho de aposta: outra situação
+    assert situation_signature(_hand('3', 'Kh Qd')) != signature
+    assert situation_signature(_hand('4', flop='Ks Kh 2h')) != signature
+    assert situation_signature(_hand('5', cbet=1000)) == 'BTN|KQs|20-30|R2.5c/xB5|2h'
+    assert situation_signature(_hand('6', cbet=450)) == signature  # 2.25 BB arredonda para 2
+    assert situation_signature({**_hand(), 'raw_hand': ''}) is None
+
+
+def test_stack_bucket():
+    assert stack_bucket(8) == '0-10'
+    assert stack_bucket(25) == '20-30'
+    assert stack_bucket(150) == '100+'
+
+
+def test_lru_ttl_and_hit_rate():
+    cache = AnalysisCache(max_entries=2, ttl_seconds=60)
+    cache.set('a', 'A')
+    cache.set('b', 'B')
+    assert cache.get('a') == 'A'
+    cache.set('c', 'C')  # 'b' é o menos recente
+    assert cache.get('b') is None
+    assert cache.get('c') == 'C'
+    stats = cache.stats()
+    assert stats['hits'] == 2 and stats['misses'] == 1 and stats['evictions'] == 1
+    assert stats['hit_rate'] == round(2 / 3, 3)
+
+    expiring = AnalysisCache(max_entries=10, ttl_seconds=0.01)
+    expiring.set('a', 'A')
+    time.sleep(0.02)
+    assert expiring.get('a') is None
+
+
+def test_repeated_spots_call_llm_once():
+    calls = []
+
+    async def handler(request):
+        calls.append(request)
+        await asyncio.sleep(0.05)
+        return httpx.Response(200, json={'choices': [{'message': {'content': 'análise'}}]})
+
+    async def run():
+        service = AIAnalysisService(transport=httpx.MockTransport(handler))
+        # Mesma situação em mãos diferentes, ao mesmo tempo e depois
+        first = await service.analyze_hands([_hand(str(i)) for i in range(5)])
+        again = await service.analyze_hand(_hand('9', 'Kd Qd', 'Kc 9d 2d'))
+        await service.aclose()
+        return first, again, service.cache.stats()
+
+    first, again, stats = asyncio.run(run())
+    assert first == ['análise'] * 5 and again == 'análise'
+    assert len(calls) == 1
+    assert stats['entries'] == 1
+
+
+def test_cache_is_per_user():
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(200, json={'choices': [{'message': {'content': f'análise {len(calls)}'}}]})
+
+    async def run():
+        service = AIAnalysisService(transport=httpx.MockTransport(handler))
+        results = [
+            await service.analyze_hand(_hand('1'), user_id=1),
+            await service.analyze_hand(_hand('2'), user_id=2),
+            await service.analyze_hand(_hand('3'), user_id=1),
+        ]
+        await service.aclose()
+        return results
+
+    assert asyncio.run(run()) == ['análise 1', 'análise 2', 'análise 1']
+    assert len(calls) == 2
+
+
+def test_cache_hit_does_not_cite_the_first_hand():
+    prompts = []
+
+    def handler(request):
+        prompt = json.loads(request.content)['messages'][-1]['content']
+        prompts.append(prompt)
+        return httpx.Response(200, json={'choices': [{'message': {'content': prompt}}]})
+
+    async def run():
+        service = AIAnalysisService(transport=httpx.MockTransport(handler))
+        first = await service.analyze_hand(_hand('1', 'Kh Qh', 'Ks 9h 2h'), user_id=1)
+        second = await service.analyze_hand(_hand('2', 'Kd Qd', 'Kc 9d 2d'), user_id=1)
+        await service.aclose()
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert len(prompts) == 1 and second == first
+    # O prompt (e a análise servida à segunda mão) só tem os campos da assinatura
+    for specific in ('Kh', 'Qh', 'Ks', '9h', '2h', 'Hero', 'Bravo', 'PokerStars'):
+        assert specific not in second
+    assert 'KQs' in second and 'R2.5c/xB2' in second
+
+
+def test_failures_are_not_cached():
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(400)
+
+    async def run():
+        service = AIAnalysisService(transport=httpx.MockTransport(handler))
+        results = [await service.analyze_hand(_hand(str(i))) for i in range(2)]
+        await service.aclose()
+        return results, service.cache.stats()
+
+    results, stats = asyncio.run(run())
+    assert all('ANÁLISE BÁSICA' in result for result in results)
+    assert len(calls) == 2
+    assert stats['entries'] == 0
+
+
+if __name__ == "__main__":
+    test_signature_ignores_suits_and_hand_id()
+    test_stack_bucket()
+    test_lru_ttl_and_hit_rate()
+    test_repeated_spots_call_llm_once()
+    test_cache_is_per_user()
+    test_cache_hit_does_not_cite_the_first_hand()
+    test_failures_are_not_cached()
+    print("✅ Cache de análises por situação OK")
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Teste das colunas has_gap/has_error gravadas com a análise de IA
+"""
+
+import sys
+import os
+import asyncio
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from fastapi import Response
+from sqlalchemy import or_
+from sqlalchemy.dialects import mssql
+
+from app.models.hand import Hand
+from app.models.user import User
+from app.routers.hands import _hand_filters, get_my_hands, get_my_hands_count, get_user_stats
+from app.utils.analysis_flags import classify_analysis
+from testing_support import ANALYSES, session
+
+
+def _populate(db):
+    for i, analysis in enumerate(ANALYSES * 3):
+        db.add(Hand(user_id=1, hand_id=str(i), raw_hand='', hero_position='BTN', ai_analysis=analysis))
+    db.commit()
+
+
+def _filters(gap_filter):
+    return dict(gap_filter=gap_filter, position_filter=None, action_filter=None, date_from=None, date_to=None,
+                hand_range=None, suited=None, flop_texture=None, flop_high=None, board_contains=None)
+
+
+def test_classify_analysis():
+    assert classify_analysis(None) == (None, None)
+    assert classify_analysis("Tudo certo") == (False, False)
+    assert classify_analysis("GAP") == (True, False)
+    assert classify_analysis("Error e gap") == (True, True)
+
+
+def test_flags_follow_analysis_writes():
+    hand = Hand(user_id=1, hand_id='1', raw_hand='')
+    assert (hand.has_gap, hand.has_error) == (None, None)
+    hand.ai_analysis = "Mistake no river"
+    assert (hand.has_gap, hand.has_error) == (False, True)
+    hand.ai_analysis = "Sem problemas"
+    assert (hand.has_gap, hand.has_error) == (False, False)
+
+
+def test_filters_match_previous_ilike_scans():
+    db = session()
+    _populate(db)
+    user = db.query(User).get(1)
+    previous = {
+        'ok': [~Hand.ai_analysis.ilike(f'%{word}%') for word in ('gap', 'erro', 'error', 'mistake')],
+        'gap': [Hand.ai_analysis.ilike('%gap%')],
+        'error': [or_(*(Hand.ai_analysis.ilike(f'%{word}%') for word in ('erro', 'error', 'mistake')))],
+    }
+    for gap_filter, conditions in previous.items():
+        expected = {hand.id for hand in db.query(Hand).filter(Hand.user_id == 1, *conditions)}
+        hands = asyncio.run(get_my_hands(Response(), skip=0, limit=100, cursor=None, order_by="created_asc", current_user=user, db=db,
+                                         **_filters(gap_filter)))
+        assert {hand.id for hand in hands} == expected
+        assert asyncio.run(get_my_hands_count(current_user=user, db=db, **_filters(gap_filter))) == {"total": len(expected)}
+
+
+def test_user_stats_counts_flagged_hands():
+    db = session()
+    _populate(db)
+    stats = asyncio.run(get_user_stats(current_user=db.query(User).get(1), db=db))
+    assert stats['total_hands'] == 15
+    assert stats['gaps_found'] == 9
+    for recent in stats['recent_hands']:
+        hand = db.query(Hand).get(recent['id'])
+        assert recent['has_gap'] == bool(hand.has_gap or hand.has_error)
+
+
+def test_flag_filters_compile_on_sql_server():
+    # T-SQL só aceita IS [NOT] NULL: os filtros precisam comparar com 1/0
+    for gap_filter in ('ok', 'gap', 'error'):
+        for condition in _hand_filters(1, gap_filter):
+            sql = str(condition.compile(dialect=mssql.dialect()))
+            assert ' IS 1' not in sql and ' IS 0' not in sql, sql
+
+
+if __name__ == "__main__":
+    test_classify_analysis()
+    test_flags_follow_analysis_writes()
+    test_filters_match_previous_ilike_scans()
+    test_user_stats_counts_flagged_hands()
+    test_flag_filters_compile_on_sql_server()
+    print("✅ Todos os testes das colunas de gap/erro passaram")
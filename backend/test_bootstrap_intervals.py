@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Teste dos intervalos de confiança por bootstrap (ROI, ITM% e posição média)
+"""
+
+import sys
+import os
+from datetime import datetime, timedelta
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+
+from app.services.performance_service import PerformanceAnalysisService
+from app.utils.bootstrap import bootstrap_intervals
+from testing_support import session
+from benchmark_performance_stats import seed_tournaments
+
+
+def _sample(size, seed=3):
+    rng = np.random.default_rng(seed)
+    buy_ins = np.full(size, 10.0)
+    itm = rng.random(size) < 0.2
+    prizes = np.where(itm, rng.uniform(15, 200, size), 0.0)
+    positions = rng.integers(1, 500, size)
+    return buy_ins, prizes, itm, positions
+
+
+def test_intervals_contain_estimate_and_narrow_with_volume():
+    widths = []
+    for size in (100, 2000):
+        buy_ins, prizes, itm, positions = _sample(size)
+        intervals = bootstrap_intervals(buy_ins, prizes, itm, positions, iterations=1000)
+        roi = (prizes.sum() - buy_ins.sum()) / buy_ins.sum() * 100
+        assert intervals['roi']['low'] <= roi <= intervals['roi']['high']
+        assert intervals['itm_percentage']['low'] <= itm.mean() * 100 <= intervals['itm_percentage']['high']
+        assert intervals['avg_finish_position']['low'] <= positions.mean() <= intervals['avg_finish_position']['high']
+        widths.append(intervals['roi']['high'] - intervals['roi']['low'])
+    assert widths[1] < widths[0] / 2
+
+
+def test_chunked_resampling_is_identical():
+    sample = _sample(300)
+    whole = bootstrap_intervals(*sample, iterations=500, seed=7)
+    chunked = bootstrap_intervals(*sample, iterations=500, seed=7, max_elements=300 * 64)
+    assert whole == chunked
+
+
+def test_small_samples_have_no_interval():
+    intervals = bootstrap_intervals([10.0], [0.0], [False], [None])
+    assert intervals == {'roi': None, 'itm_percentage': None, 'avg_finish_position': None}
+    intervals = bootstrap_intervals([10.0, 10.0], [0.0, 30.0], [False, True], [None, 0])
+    assert intervals['roi'] is not None and intervals['avg_finish_position'] is None
+
+
+def test_service_caches_per_data_version():
+    db = session()
+    service = PerformanceAnalysisService()
+    service.bootstrap_iterations = 300
+    seed_tournaments(db, 1, 200, days=20)
+    service.rebuild_daily_stats(db, 1)
+
+    first = service.confidence_intervals(db, 1, 30)
+    assert first['sample_size'] == 200
+    assert service.confidence_intervals(db, 1, 30) is first
+    assert service.interval_cache.hits == 1
+
+    # Torneio novo: nova versão dos dados, intervalo recalculado
+    service.add_tournament_result(db, 1, dict(tournament_id='novo', buy_in=10.0, prize=500.0, position=1,
+                                              date_played=datetime.utcnow() - timedelta(hours=1)))
+    second = service.confidence_intervals(db, 1, 30)
+    assert second['sample_size'] == 201
+    assert service.interval_cache.hits == 1
+    assert service.confidence_intervals(db, 2, 30)['roi'] is None
+
+
+if __name__ == "__main__":
+    test_intervals_contain_estimate_and_narrow_with_volume()
+    test_chunked_resampling_is_identical()
+    test_small_samples_have_no_interval()
+    test_service_caches_per_data_version()
+    print("✅ Todos os testes dos intervalos de confiança passaram")
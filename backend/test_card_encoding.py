@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Teste das colunas de cartas codificadas e dos filtros por cartas do histórico
+"""
+
+import sys
+import os
+import asyncio
+import random
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import text
+
+from app.models.hand import Hand
+from app.models.user import User
+from app.routers.hands import _hand_filters, get_my_hands_count
+from app.utils.board_texture import FLUSH_DRAW, FLUSH_POSSIBLE, PAIRED, TEXTURE_FILTERS, board_texture, texture_codes
+from app.utils.card_encoding import hero_card_columns
+from app.utils.hand_evaluator import int_to_card
+from app.utils.ranges import Range, hand_class
+from testing_support import NO_FILTERS, session
+
+
+def _random_hands(count, seed=3):
+    rng = random.Random(seed)
+    hands = []
+    for i in range(count):
+        cards = [int_to_card(card) for card in rng.sample(range(52), 7)]
+        board = cards[2:2 + rng.choice([0, 3, 4, 5])]
+        hands.append(Hand(user_id=1, hand_id=str(i), raw_hand='', hero_cards=" ".join(cards[:2]),
+                          board_cards=" ".join(board) if board else None))
+    return hands
+
+
+def test_columns_follow_card_writes():
+    hand = Hand(hero_cards="Ah Kh", board_cards="7c 8c 2c Ks")
+    assert (hand_class(hand.hero_cards), hand.hero_suited) == ('AKs', True)
+    assert hand.hero_mask == (1 << 50) | (1 << 46)  # rank * 4 + naipe (c, d, h, s)
+    assert hand.flop_texture == board_texture("7c 8c 2c") and hand.flop_texture & FLUSH_POSSIBLE
+    assert bin(hand.board_mask).count('1') == 4
+
+    hand.hero_cards = "Td Tc"
+    assert hand_class(hand.hero_cards) == 'TT' and hand.hero_suited is False
+    hand.board_cards = None
+    assert (hand.board_mask, hand.flop_texture) == (0, 0)
+    assert hero_card_columns("Xx Kd") == {'hero_class': None, 'hero_suited': None, 'hero_mask': None}
+
+
+def test_texture_codes_match_flags():
+    rng = random.Random(9)
+    flops = [rng.sample(range(52), 3) for _ in range(2000)]
+    for name, (required, forbidden) in TEXTURE_FILTERS.items():
+        codes = set(texture_codes(required, forbidden))
+        for flop in flops:
+            code = board_texture(flop)
+            assert (code in codes) == (code & required == required and not code & forbidden), name
+    assert 0 not in texture_codes(0, FLUSH_POSSIBLE | FLUSH_DRAW)  # Sem flop não é rainbow
+
+
+def _count(db, **filters):
+    user = db.get(User, 1)
+    return asyncio.run(get_my_hands_count(current_user=user, db=db, **dict(NO_FILTERS, **filters)))['total']
+
+
+def test_card_filters_match_python():
+    db = session()
+    hands = _random_hands(600)
+    db.add_all(hands)
+    db.commit()
+
+    def flop_flags(hand):
+        return board_texture(hand.board_cards.split()[:3]) if hand.board_cards else 0
+
+    broadway = Range.parse("AK, AQ, KQ, TT+")
+    cases = [
+        (dict(hand_range="AK, AQ, KQ, TT+"), lambda h: h.hero_cards in broadway),
+        (dict(hand_range="AK, AQ, KQ, TT+", suited=False), lambda h: h.hero_cards in broadway and not h.hero_suited),
+        (dict(suited=True), lambda h: h.hero_cards[1] == h.hero_cards[4]),
+        (dict(flop_texture="monotone"), lambda h: flop_flags(h) & FLUSH_POSSIBLE),
+        (dict(flop_texture="rainbow,unpaired"), lambda h: flop_flags(h) and not flop_flags(h) & (FLUSH_POSSIBLE | FLUSH_DRAW | PAIRED)),
+        (dict(flop_high="a"), lambda h: h.board_cards and 'A' in [card[0] for card in h.board_cards.split()[:3]]),
+        (dict(board_contains="Ah"), lambda h: h.board_cards and 'Ah' in h.board_cards.split()),
+        (dict(board_contains="Ah Ks", flop_texture="two_tone"), lambda h: h.board_cards and {'Ah', 'Ks'} <= set(h.board_cards.split()) and flop_flags(h) & FLUSH_DRAW),
+    ]
+    for filters, predicate in cases:
+        expected = sum(1 for hand in hands if predicate(hand))
+        assert _count(db, **filters) == expected, filters
+        assert expected > 0 or filters.get('board_contains'), filters
+
+
+def test_invalid_card_filters():
+    db = session()
+    for filters in (dict(hand_range="AXo"), dict(flop_texture="wet"), dict(board_contains="Zz")):
+        with pytest.raises(HTTPException) as exc:
+            _count(db, **filters)
+        assert exc.value.status_code == 400
+
+
+def test_card_filters_use_indexes():
+    db = session()
+    db.add_all(_random_hands(200))
+    db.commit()
+    for filters, index in ((dict(hand_range="AKo"), 'ix_hands_user_hero_class'),
+                           (dict(flop_texture="monotone"), 'ix_hands_user_flop_texture')):
+        query = db.query(Hand.id).filter(*_hand_filters(1, **filters))
+        sql = str(query.statement.compile(db.get_bind(), compile_kwargs={"literal_binds": True}))
+        plan = " ".join(str(row) for row in db.execute(text("EXPLAIN QUERY PLAN " + sql)))
+        assert index in plan, plan
+
+
+if __name__ == "__main__":
+    test_columns_follow_card_writes()
+    test_texture_codes_match_flags()
+    test_card_filters_match_python()
+    test_invalid_card_filters()
+    test_card_filters_use_indexes()
+    print("✅ Todos os testes das cartas codificadas passaram")
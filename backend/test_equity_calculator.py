@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Teste do avaliador vetorizado e do cálculo de equity
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+from pydantic import ValidationError
+
+from app.utils.hand_evaluator import evaluate_hand, hand_category, FULL_HOUSE, TWO_PAIR
+from app.services.equity_service import EquityService
+from app.utils.ranges import Range
+from app.models.hand import Hand
+from app.models.schemas import ActionAnalysisRequest
+from app.routers.hands import _calculate_action_equity
+
+
+def test_hand_evaluator_rankings():
+    """Verifica ordenação de categorias e desempates"""
+    assert evaluate_hand('Ac Kc Qc Jc Tc 2d 3h') > evaluate_hand('As Ad Ah Ac Kd 2d 3h')
+    assert hand_category(evaluate_hand('Ac Ad Ah Kc Kd 2d 3h')) == FULL_HOUSE
+    # Quadra: kicker vem da maior carta restante, mesmo que faça par
+    assert evaluate_hand('Ac Ad Ah As 2c 2d Kh') > evaluate_hand('Ac Ad Ah As 3c 3d Qh')
+    # Três pares: o kicker é a maior carta fora dos dois pares principais
+    assert hand_category(evaluate_hand('Qc Qd 3h 3s 2c 2d Ah')) == TWO_PAIR
+    assert evaluate_hand('Qc Qd 3h 3s 2c 2d Ah') > evaluate_hand('Qc Qd 3h 3s 2c 2d Kh')
+    # Wheel perde para sequência de 6
+    assert evaluate_hand('Ac 2d 3h 4s 5c Kd Kh') < evaluate_hand('2c 3d 4h 5s 6c Kd Kh')
+    # Cartas abaixo do top 5 do flush não desempatam
+    assert evaluate_hand('Ac Kc Qc Jc 9c 8d 8h') == evaluate_hand('Ac Kc Qc Jc 9c 2d 3h')
+
+
+def test_equity_values():
+    """Verifica equities conhecidas (exatas e Monte Carlo)"""
+    service = EquityService()
+
+    river = service.calculate_equity('2c 7d', 'As Ks Qs Js Ts', ['random'])
+    assert river['method'] == 'exact'
+    assert river['equity'] == 0.5
+
+    turn = service.calculate_equity('Ah Kh', 'Qh Jh 2c 3d', ['AA'])
+    assert turn['method'] == 'exact'
+    assert 0.0 < turn['equity'] < 1.0
+
+    preflop = service.calculate_equity('Ah Ad', None, [Range.parse('KK')])
+    assert preflop['method'] == 'monte_carlo'
+    assert abs(preflop['equity'] - 0.82) < 0.02
+
+    # Entrada idêntica (em outra ordem) deve vir do cache
+    hits_before = service.cache_info().hits
+    service.calculate_equity(['Ad', 'Ah'], '', ['KK'])
+    assert service.cache_info().hits == hits_before + 1
+
+    print(f"✅ AA vs KK: {preflop['equity']:.3f}")
+
+
+def test_multiway_equity():
+    """Verifica equity multiway"""
+    service = EquityService()
+    result = service.calculate_equity('Ah Kh', '', ['random', 'random', 'random'], iterations=30000)
+    assert abs(result['equity'] - 0.41) < 0.03
+
+
+def test_multiway_equity_in_process_pool():
+    """Monte Carlo dividido entre os processos do pool"""
+    result = EquityService().calculate_equity('Ah Kh', '', ['random', 'random', 'random'],
+                                              iterations=30001, use_processes=True)
+    assert abs(result['equity'] - 0.41) < 0.03
+    assert result['samples'] >= 30001
+
+
+
+def test_action_request_validation():
+    """Oponentes e ranges inválidos viram erro de validação (422), não 500"""
+    for invalid in ({'opponents': 'dois'}, {'opponents': 0}, {'opponents': 10},
+                    {'villain_ranges': ['random'] * 10}, {'villain_ranges': ['A' * 501]}):
+        with pytest.raises(ValidationError):
+            ActionAnalysisRequest(**invalid)
+
+    request = ActionAnalysisRequest(hero_cards='Ah Kh', opponents='2', street='preflop')
+    action_data = request.model_dump()
+    assert action_data['opponents'] == 2 and action_data['street'] == 'preflop'
+    equity = _calculate_action_equity(Hand(id=1, hero_cards='2c 3d'), action_data)
+    assert 0.4 < equity['equity'] < 0.6  # AKs contra 2 mãos aleatórias (~0.50; contra 1, ~0.67)
+
+
+if __name__ == "__main__":
+    test_hand_evaluator_rankings()
+    test_equity_values()
+    test_multiway_equity()
+    test_multiway_equity_in_process_pool()
+    test_action_request_validation()
+    print("✅ Todos os testes de equity passaram")
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Teste da análise de gaps incremental (mãos marcadas como contadas + contadores diários)
+"""
+
+import sys
+import os
+import json
+from datetime import datetime, timedelta
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.models.gap import Gap, GapDailyCount
+from app.models.hand import Hand
+from app.models.hero_decision import HeroDecision
+from app.services.gap_service import GapIdentificationService
+from app.services.hero_decision_service import FACING_OPEN, POSITION_CODES
+from testing_support import add_hand, decision, session
+
+BB_FOLD = decision(0, 'preflop', 'BB', FACING_OPEN, 'fold', to_call_bb10=15, aggressor_position=POSITION_CODES['BTN'])
+
+
+def _bb_fold(db, number, days_ago=0):
+    db_hand = add_hand(db, number, [BB_FOLD])
+    db_hand.created_at = datetime.utcnow() - timedelta(days=days_ago)
+    return db_hand
+
+
+def _bb_overfold(db):
+    row = db.query(GapDailyCount).filter(GapDailyCount.gap_type == 'bb_overfold').one()
+    return row.opportunities, row.count, json.loads(row.sample_hands)
+
+
+def test_idempotent_and_incremental():
+    db = session()
+    service = GapIdentificationService()
+    for n in range(6):
+        _bb_fold(db, n)
+    db.commit()
+
+    first = service.analyze_user_gaps(db, 1)
+    second = service.analyze_user_gaps(db, 1)
+    assert [g['frequency'] for g in first] == [g['frequency'] for g in second] == [6]
+    assert db.query(Gap).one().frequency == 6
+    # Segunda chamada não encontra mãos novas
+    assert service.update_gap_counters(db, 1) == 0
+
+    _bb_fold(db, 6)
+    db.commit()
+    assert service.update_gap_counters(db, 1) == 1
+    assert db.query(Hand).filter(Hand.gap_counted.is_(False)).count() == 0
+    gaps = service.analyze_user_gaps(db, 1)
+    assert gaps[0]['frequency'] == 7 and db.query(Gap).one().frequency == 7
+    db.close()
+
+
+def test_decisions_added_later_are_counted():
+    db = session()
+    service = GapIdentificationService()
+    # Mão antiga ainda sem decisões (ex.: anterior à tabela hero_decisions)
+    old = Hand(user_id=1, hand_id='old', hero_name='Hero')
+    db.add(old)
+    for n in range(3):
+        _bb_fold(db, n)
+    db.commit()
+    assert service.update_gap_counters(db, 1) == 3
+    assert not old.gap_counted
+
+    # O backfill grava as decisões da mão antiga, de id menor que as já contadas
+    db.add(HeroDecision(user_id=1, hand=old, **BB_FOLD))
+    db.commit()
+    assert service.update_gap_counters(db, 1) == 1
+    assert _bb_overfold(db)[:2] == (4, 4)
+    db.close()
+
+
+def test_remove_hands_subtracts():
+    db = session()
+    service = GapIdentificationService()
+    hands = [_bb_fold(db, n) for n in range(3)]
+    db.commit()
+    service.update_gap_counters(db, 1)
+    assert _bb_overfold(db)[:2] == (3, 3)
+
+    # Mão apagada: sai das contagens e das mãos de exemplo
+    removed_id = hands[2].id
+    assert service.remove_hands(db, [hands[2]]) == 1
+    db.delete(hands[2])
+    db.commit()
+    opportunities, count, samples = _bb_overfold(db)
+    assert (opportunities, count) == (2, 2)
+    assert removed_id not in samples and len(samples) == 2
+
+    # Decisões recalculadas (backfill --rebuild): sai e volta a ser contada uma vez só
+    service.remove_hands(db, [hands[0]])
+    db.commit()
+    assert not hands[0].gap_counted and _bb_overfold(db)[:2] == (1, 1)
+    assert service.update_gap_counters(db, 1) == 1
+    assert _bb_overfold(db)[:2] == (2, 2)
+    db.close()
+
+
+def test_window_by_day():
+    db = session()
+    service = GapIdentificationService()
+    for n in range(5):
+        _bb_fold(db, n, days_ago=40)
+    for n in range(5, 11):
+        _bb_fold(db, n)
+    db.commit()
+
+    recent = service.evaluate_rules(db, 1, days_back=30)
+    assert recent['hands_analyzed'] == 6
+    rules = {r['rule']: r for r in recent['rules']}
+    assert rules['bb_overfold']['count'] == 6
+
+    wide = service.evaluate_rules(db, 1, days_back=60)
+    assert wide['hands_analyzed'] == 11
+    assert db.query(GapDailyCount).filter(GapDailyCount.gap_type == 'bb_overfold').count() == 2
+    db.close()
+
+
+if __name__ == "__main__":
+    test_idempotent_and_incremental()
+    test_decisions_added_later_are_counted()
+    test_remove_hands_subtracts()
+    test_window_by_day()
+    print("✅ Todos os testes da análise de gaps incremental passaram")
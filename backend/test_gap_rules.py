@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Teste do motor de regras de gaps sobre hero_decisions
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.models.gap import Gap
+from app.services.gap_rules_service import GapRulesService, exceed_confidence
+from app.services.gap_service import GapIdentificationService
+from app.services.hero_decision_service import FACING_BET, FACING_NONE, FACING_OPEN, POSITION_CODES
+from testing_support import add_hand, decision, session
+
+
+def _populate(db):
+    hands = {}
+    # 8 mãos: folda o BB contra open do BTN
+    for n in range(8):
+        hands[n] = add_hand(db, n, [decision(0, 'preflop', 'BB', FACING_OPEN, 'fold',
+                                             to_call_bb10=15, aggressor_position=POSITION_CODES['BTN'])])
+    # 6 mãos: abre do CO, checam para ele no flop e ele checa atrás
+    for n in range(8, 14):
+        hands[n] = add_hand(db, n, [
+            decision(0, 'preflop', 'CO', FACING_NONE, 'raise'),
+            decision(1, 'flop', 'CO', FACING_NONE, 'check', in_position=True),
+        ])
+    # 2 mãos: paga 3-bet e checa o flop (não é agressor pré-flop)
+    for n in range(14, 16):
+        hands[n] = add_hand(db, n, [
+            decision(0, 'preflop', 'BTN', FACING_NONE, 'raise'),
+            decision(1, 'preflop', 'BTN', FACING_OPEN + 1, 'call'),
+            decision(2, 'flop', 'BTN', FACING_NONE, 'check', in_position=True),
+            decision(3, 'flop', 'BTN', FACING_BET, 'call', in_position=True),
+        ])
+    db.commit()
+    return hands
+
+
+def test_rules_single_pass():
+    db = session()
+    hands = _populate(db)
+    evaluation = GapRulesService().evaluate(db, 1)
+    assert evaluation['hands_analyzed'] == 16
+    rules = {result['rule']: result for result in evaluation['rules']}
+
+    assert rules['bb_overfold']['opportunities'] == 8 and rules['bb_overfold']['count'] == 8
+    assert rules['bb_overfold']['flagged']
+    assert len(rules['bb_overfold']['sample_hands']) == 8
+    assert hands[7].id in rules['bb_overfold']['sample_hands']
+
+    # Só as 6 mãos em que o herói foi o último agressor pré-flop contam como c-bet perdida
+    assert rules['missed_cbet_ip']['opportunities'] == 6 and rules['missed_cbet_ip']['flagged']
+    assert rules['fold_to_cbet']['opportunities'] == 2 and rules['fold_to_cbet']['count'] == 0
+    assert rules['open_limp_ep']['opportunities'] == 0 and not rules['open_limp_ep']['flagged']
+    db.close()
+
+
+def test_confidence():
+    assert exceed_confidence(0, 0, 0.5) == 0.0
+    assert exceed_confidence(9, 10, 0.5) > 0.99
+    assert exceed_confidence(1, 10, 0.5) < 0.01
+    assert abs(exceed_confidence(5, 10, 0.5) - 0.5) < 1e-9
+
+
+def test_gap_service_uses_rules():
+    db = session()
+    _populate(db)
+    gaps = GapIdentificationService().analyze_user_gaps(db, 1)
+    types = {g['type'] for g in gaps}
+    assert {'bb_overfold', 'missed_cbet_ip'} <= types
+    assert db.query(Gap).filter(Gap.user_id == 1, Gap.gap_type == 'bb_overfold').one().frequency == 8
+    db.close()
+
+
+if __name__ == "__main__":
+    test_rules_single_pass()
+    test_confidence()
+    test_gap_service_uses_rules()
+    print("✅ Todos os testes do motor de regras de gaps passaram")
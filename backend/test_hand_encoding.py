@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Teste da codificação compacta da mão usada nos prompts de IA
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.services.ai_service import AIAnalysisService
+from app.services.hand_encoding_service import encode_hand, local_analysis_notes
+from testing_support import BB_DEFEND, SHOVE
+
+
+def test_encode_hand():
+    assert encode_hand(BB_DEFEND) == "\n".join([
+        "Blinds 100/200 | 6 jogadores | valores em BB | * = herói",
+        "Stacks: LJ 40 | HJ 40 | CO 40 | BTN 40 | SB 40 | BB* 25 [Kh Qh]",
+        "PF (1.5): CO r2.5 | BB* c",
+        "F [Ks 9h 2h] (5.5): BB* x | CO b3 (55%) | BB* c",
+        "T [2c] (11.5): BB* x | CO x",
+        "R [5d] (11.5): BB* b5 (43%) | CO f",
+        "Resultado: BB* leva 12.5",
+    ])
+
+
+def test_encode_all_in_runout():
+    lines = encode_hand(SHOVE).split("\n")
+    assert lines[0] == "Blinds 100/200 ante 20 | 3 jogadores | valores em BB | * = herói"
+    assert lines[2] == "PF (1.8): BTN r14.9 ai | BB* c ai"
+    assert lines[3:6] == ["F [2c 7d Ts]", "T [Kd]", "R [3s]"]
+    assert lines[6] == "Resultado: BB* mostra [Ah 9h] | BTN mostra [Qc Jc] | BB* leva 20.8"
+
+
+def test_prompt_uses_compact_encoding():
+    service = AIAnalysisService()
+    local = "👉 STACK: Stack médio.\n👉 PUSH/FOLD: Não se aplica.\n👉 ICM: Decisão correta (stack 10 BB)\n📌 DIAGNÓSTICO: Inconclusivo"
+    prompt = service._build_analysis_prompt({'raw_hand': BB_DEFEND, 'local_analysis': local})
+    assert "F [Ks 9h 2h] (5.5): BB* x | CO b3 (55%) | BB* c" in prompt
+    assert "Seat 1:" not in prompt and "SUMMARY" not in prompt
+    assert "ICM: Decisão correta (stack 10 BB)" in prompt and "STACK" not in prompt
+
+    # Sem codificação possível: volta ao hand history completo
+    fallback = service._build_analysis_prompt({'raw_hand': 'texto qualquer', 'hero_cards': 'Ah Kd'})
+    assert "HAND HISTORY COMPLETA" in fallback and "texto qualquer" in fallback
+
+
+def test_local_analysis_notes():
+    assert local_analysis_notes(None) == []
+    assert local_analysis_notes("👉 PUSH/FOLD: Dentro da tabela de shove") == ["PUSH/FOLD: Dentro da tabela de shove"]
+
+
+if __name__ == "__main__":
+    test_encode_hand()
+    test_encode_all_in_runout()
+    test_prompt_uses_compact_encoding()
+    test_local_analysis_notes()
+    print("✅ Codificação compacta da mão OK")
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Teste das contagens por filtro do histórico (facetas) e do cache por usuário
+"""
+
+import sys
+import os
+import asyncio
+from datetime import datetime
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import event
+
+from app.models.hand import Hand
+from app.models.user import User
+from app.routers.hands import get_filter_options, get_hand_facets, get_my_hands_count
+from app.services.hand_facet_service import HandFacetService
+from testing_support import ANALYSES, NO_FILTERS, session
+
+POSITIONS = ['BTN', 'CO', 'BB', None]
+ACTIONS = ['raise', 'call', 'fold']
+DATES = [datetime(2025, 11, 3, 20), datetime(2025, 12, 31, 23, 59), datetime(2026, 1, 5), None]
+
+
+def _populate(db):
+    for i in range(60):
+        db.add(Hand(user_id=1, hand_id=str(i), raw_hand='', hero_position=POSITIONS[i % 4],
+                    hero_action=ACTIONS[i % 3], ai_analysis=ANALYSES[i % len(ANALYSES)],
+                    date_played=DATES[(i // 2) % len(DATES)]))
+    db.commit()
+
+
+class _QueryCounter:
+    """Consultas em hands executadas dentro do bloco"""
+
+    def __init__(self, db):
+        self.engine = db.get_bind()
+        self.statements = []
+
+    def _listener(self, conn, cursor, statement, *args):
+        if 'FROM hands' in statement:
+            self.statements.append(statement)
+
+    def __enter__(self):
+        event.listen(self.engine, "before_cursor_execute", self._listener)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, "before_cursor_execute", self._listener)
+
+
+def _count(db, **filters):
+    user = db.get(User, 1)
+    return asyncio.run(get_my_hands_count(current_user=user, db=db, **dict(NO_FILTERS, **filters)))['total']
+
+
+def test_facets_match_filtered_counts():
+    db = session()
+    _populate(db)
+    facets = HandFacetService().facets(db, 1)
+    assert facets['total'] == 60
+    for facet in facets['positions']:
+        assert facet['count'] == _count(db, position_filter=facet['value'])
+    assert {facet['value'] for facet in facets['positions']} == {'BTN', 'CO', 'BB'}
+    for facet in facets['actions']:
+        assert facet['count'] == _count(db, action_filter=facet['value'])
+    for facet in facets['gap_status']:
+        assert facet['count'] == _count(db, gap_filter=facet['value'])
+
+    hands = db.query(Hand).filter(Hand.user_id == 1).all()
+    months = sorted({hand.date_played.strftime('%Y-%m') for hand in hands if hand.date_played})
+    assert [facet['value'] for facet in facets['months']] == months
+    for facet in facets['months']:
+        assert facet['count'] == sum(1 for hand in hands if hand.date_played and hand.date_played.strftime('%Y-%m') == facet['value'])
+
+
+def test_one_query_then_cache_until_commit():
+    db = session()
+    _populate(db)
+    db.add(User(id=2, username='other', email='other@test.com', full_name='Other', nickname='Other', hashed_password='x'))
+    db.commit()
+    service = HandFacetService()
+    with _QueryCounter(db) as counter:
+        service.facets(db, 1)
+        service.facets(db, 1)
+    assert len(counter.statements) == 1
+    other = service.facets(db, 2)
+
+    # Alteração desfeita não invalida
+    db.add(Hand(user_id=1, hand_id='x', raw_hand='', hero_position='SB'))
+    db.flush()
+    db.rollback()
+    assert service.facets(db, 1)['total'] == 60
+
+    db.add(Hand(user_id=1, hand_id='new', raw_hand='', hero_position='SB', hero_action='raise'))
+    db.commit()
+    facets = service.facets(db, 1)
+    assert facets['total'] == 61
+    assert {'value': 'SB', 'count': 1} in facets['positions']
+    assert service.facets(db, 2) is other  # Cache do outro usuário continua
+
+    # Análise nova muda o status de gap; mão removida sai das contagens
+    hand = db.query(Hand).filter(Hand.hand_id == 'new').one()
+    hand.ai_analysis = "Um gap claro no turn."
+    db.commit()
+    gap_before = next(f['count'] for f in facets['gap_status'] if f['value'] == 'gap')
+    assert next(f['count'] for f in service.facets(db, 1)['gap_status'] if f['value'] == 'gap') == gap_before + 1
+    db.delete(hand)
+    db.commit()
+    assert service.facets(db, 1)['total'] == 60
+
+
+def test_endpoints_use_facets():
+    db = session()
+    _populate(db)
+    user = db.get(User, 1)
+    facets = asyncio.run(get_hand_facets(current_user=user, db=db))
+    options = asyncio.run(get_filter_options(current_user=user, db=db))
+    assert options['positions'] == [facet['value'] for facet in facets['positions']]
+    assert options['facets'] == facets  # Contagens nos rótulos dos filtros, sem outra requisição
+    assert set(options['actions']) == set(ACTIONS)
+
+
+if __name__ == "__main__":
+    test_facets_match_filtered_counts()
+    test_one_query_then_cache_until_commit()
+    test_endpoints_use_facets()
+    print("✅ Todos os testes das facetas do histórico passaram")
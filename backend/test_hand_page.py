@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Teste da página do histórico com o total filtrado em uma só consulta
+"""
+
+import sys
+import os
+import asyncio
+from datetime import datetime, timedelta
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+from fastapi import Response
+from sqlalchemy import event
+
+from app.models.hand import Hand
+from app.models.user import User
+from app.routers.hands import get_my_hands, get_my_hands_count, get_my_hands_page
+from testing_support import ANALYSES, NO_FILTERS, session
+
+START = datetime(2026, 1, 1)
+FILTERS = [
+    NO_FILTERS,
+    dict(NO_FILTERS, gap_filter="gap"),
+    dict(NO_FILTERS, gap_filter="ok", position_filter="BTN"),
+    dict(NO_FILTERS, gap_filter="all", action_filter="raise", date_from="2026-01-01T05:00:00Z"),
+    dict(NO_FILTERS, position_filter="SB"),
+]
+
+
+def _populate(db):
+    for i in range(40):
+        db.add(Hand(user_id=1, hand_id=str(i), raw_hand='', hero_position='BTN' if i % 3 else 'BB',
+                    hero_action='raise' if i % 2 else 'call', ai_analysis=ANALYSES[i % len(ANALYSES)],
+                    date_played=START + timedelta(hours=i % 17)))
+    db.commit()
+
+
+def _page(db, user, filters, cursor=None, skip=0, limit=7):
+    return asyncio.run(get_my_hands_page(skip=skip, limit=limit, cursor=cursor, order_by="date_desc",
+                                         current_user=user, db=db, **filters))
+
+
+@pytest.mark.parametrize("filters", FILTERS)
+def test_page_matches_list_and_count(filters):
+    db = session()
+    _populate(db)
+    user = db.get(User, 1)
+    expected_total = asyncio.run(get_my_hands_count(current_user=user, db=db, **filters))['total']
+    expected_ids = [hand.id for hand in asyncio.run(get_my_hands(
+        Response(), skip=0, limit=100, cursor=None, order_by="date_desc", current_user=user, db=db, **filters
+    ))]
+    assert len(expected_ids) == expected_total
+
+    walked, cursor = [], None
+    while True:
+        page = _page(db, user, filters, cursor)
+        assert page['total'] == expected_total
+        walked += [hand.id for hand in page['hands']]
+        cursor = page['next_cursor']
+        if cursor is None:
+            break
+    assert walked == expected_ids
+
+    # Página por skip, inclusive além do fim
+    assert [hand.id for hand in _page(db, user, filters, skip=7)['hands']] == expected_ids[7:14]
+    beyond = _page(db, user, filters, skip=500)
+    assert (beyond['hands'], beyond['total']) == ([], expected_total)
+
+
+def test_first_page_is_one_query():
+    db = session()
+    _populate(db)
+    user = db.get(User, 1)
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(db.get_bind(), "before_cursor_execute", listener)
+    try:
+        page = _page(db, user, FILTERS[1])
+    finally:
+        event.remove(db.get_bind(), "before_cursor_execute", listener)
+    # A outra consulta é a carga em lote do status dos jobs de IA (relacionamento da mão)
+    hand_queries = [statement for statement in statements if 'FROM hands' in statement]
+    assert len(hand_queries) == 1
+    assert 'OVER ()' in hand_queries[0]
+    assert page['total'] == 16  # 2 de cada 5 análises têm gap
+
+
+def test_cursor_without_total_counts_once():
+    db = session()
+    _populate(db)
+    user = db.get(User, 1)
+    response = Response()
+    asyncio.run(get_my_hands(response, skip=0, limit=7, cursor=None, order_by="date_desc",
+                             current_user=user, db=db, **FILTERS[0]))
+    page = _page(db, user, FILTERS[0], cursor=response.headers["X-Next-Cursor"])
+    assert page['total'] == 40
+    assert page['next_cursor'] is not None
+
+
+if __name__ == "__main__":
+    for filters in FILTERS:
+        test_page_matches_list_and_count(filters)
+    test_first_page_is_one_query()
+    test_cursor_without_total_counts_once()
+    print("✅ Todos os testes da página com total passaram")
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Teste da paginação por cursor do histórico de mãos
+"""
+
+import sys
+import os
+import asyncio
+from datetime import datetime, timedelta
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+from fastapi import HTTPException, Response
+
+from app.models.hand import Hand
+from app.models.user import User
+from app.routers.hands import get_my_hands
+from app.utils.keyset import InvalidCursor, decode_cursor, encode_cursor, nulls_first
+from testing_support import session
+
+START = datetime(2026, 1, 1)
+
+
+def _populate(db):
+    """Datas repetidas (empate resolvido pelo id) e mãos sem data"""
+    for i in range(23):
+        date_played = None if i % 7 == 3 else START + timedelta(hours=i // 3)
+        db.add(Hand(user_id=1, hand_id=str(i), raw_hand='', date_played=date_played,
+                    created_at=START + timedelta(minutes=(i * 5) % 11)))
+    db.commit()
+
+
+def _expected(db, order_by):
+    """Ordem completa: chave (coluna, id), NULLs onde o SQLite os põe"""
+    key = 'date_played' if order_by.startswith('date') else 'created_at'
+    descending = order_by.endswith('desc')
+    hands = db.query(Hand).filter(Hand.user_id == 1).all()
+    null_first = nulls_first('sqlite', descending)
+    with_value = sorted((h for h in hands if getattr(h, key) is not None),
+                        key=lambda h: (getattr(h, key), h.id), reverse=descending)
+    without = sorted((h for h in hands if getattr(h, key) is None), key=lambda h: h.id, reverse=descending)
+    ordered = without + with_value if null_first else with_value + without
+    return [hand.id for hand in ordered]
+
+
+def _page(db, user, order_by, cursor=None, skip=0, limit=5):
+    response = Response()
+    hands = asyncio.run(get_my_hands(response, skip=skip, limit=limit, cursor=cursor, order_by=order_by,
+                                     gap_filter=None, position_filter=None, action_filter=None,
+                                     date_from=None, date_to=None, hand_range=None, suited=None,
+                                     flop_texture=None, flop_high=None, board_contains=None,
+                                     current_user=user, db=db))
+    return [hand.id for hand in hands], response.headers.get("X-Next-Cursor")
+
+
+@pytest.mark.parametrize("order_by", ["date_asc", "date_desc", "created_asc", "created_desc"])
+def test_cursor_walk_matches_full_order(order_by):
+    db = session()
+    _populate(db)
+    user = db.get(User, 1)
+    expected = _expected(db, order_by)
+
+    walked, cursor, pages = [], None, 0
+    while True:
+        ids, cursor = _page(db, user, order_by, cursor)
+        walked += ids
+        pages += 1
+        if cursor is None:
+            break
+    assert walked == expected
+    assert pages == 5  # 23 mãos, 5 por página, sem página vazia no fim
+
+    # skip continua funcionando para quem ainda pagina por offset
+    assert _page(db, user, order_by, skip=10)[0] == expected[10:15]
+
+
+def test_cursor_round_trip_and_invalid():
+    assert decode_cursor(encode_cursor(START, 42)) == (START, 42, None)
+    assert decode_cursor(encode_cursor(None, 7, total=23)) == (None, 7, 23)
+    for cursor in ("???", "bm9wZQ", encode_cursor(START, 1)[:-3]):
+        with pytest.raises(InvalidCursor):
+            decode_cursor(cursor)
+
+    db = session()
+    _populate(db)
+    with pytest.raises(HTTPException) as exc:
+        _page(db, db.get(User, 1), "date_asc", cursor="???")
+    assert exc.value.status_code == 400
+
+
+if __name__ == "__main__":
+    for order in ("date_asc", "date_desc", "created_asc", "created_desc"):
+        test_cursor_walk_matches_full_order(order)
+    test_cursor_round_trip_and_invalid()
+    print("✅ Todos os testes da paginação por cursor passaram")
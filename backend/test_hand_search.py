@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Teste da busca textual nas análises das mãos (índice FTS5 no SQLite)
+"""
+
+import sys
+import os
+import asyncio
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import text
+
+from app.models.hand import Hand
+from app.models.user import User
+from app.routers.hands import search_hands
+from app.services.hand_search_service import HandSearchService, query_terms, search_document
+from app.services.local_analysis_service import LocalAnalysisService
+from app.utils.poker_parser import PokerStarsParser
+from testing_support import BB_DEFEND, SHOVE, session
+
+service = HandSearchService()
+
+
+def _ids(db, query, user_id=1):
+    return [hand_id for hand_id, _ in service.search(db, user_id, query)]
+
+
+def _populate(db):
+    db.add(User(id=2, username='other', email='other@test.com', full_name='Other', nickname='Other', hashed_password='x'))
+    hands = [
+        Hand(user_id=1, hand_id='1', raw_hand=BB_DEFEND, ai_analysis="Overbet no river contra um range capado. Overbet bom."),
+        Hand(user_id=1, hand_id='2', raw_hand='', ai_analysis="Overbet exagerado."),
+        Hand(user_id=1, hand_id='3', raw_hand='', ai_analysis="Linha padrão, sem observações."),
+        Hand(user_id=2, hand_id='4', raw_hand='', ai_analysis="Overbet do outro usuário."),
+    ]
+    db.add_all(hands)
+    db.commit()
+    return hands
+
+
+def test_query_terms_strip_syntax():
+    assert query_terms('"Overbet" OR -icm* (river)') == ['overbet', 'or', 'icm', 'river']
+    assert query_terms('!!') == []
+
+
+def test_index_follows_inserts_updates_and_deletes():
+    db = session()
+    hands = _populate(db)
+    assert sorted(_ids(db, "overbet")) == [hands[0].id, hands[1].id]
+    assert sorted(_ids(db, "overb")) == [hands[0].id, hands[1].id]
+    assert _ids(db, "overbet", user_id=2) == [hands[3].id]
+    assert _ids(db, "analise") == []
+
+    hands[2].ai_analysis = "Análise: faltou overbet aqui."
+    db.commit()
+    assert hands[2].id in _ids(db, "overbet")
+    assert _ids(db, "analise") == [hands[2].id]  # Sem acento casa com acento
+
+    db.delete(hands[0])
+    db.commit()
+    assert hands[0].id not in _ids(db, "overbet")
+
+
+def test_ranking_prefers_repeated_terms():
+    db = session()
+    db.add_all([
+        Hand(user_id=1, hand_id='1', raw_hand='', ai_analysis="Faltou valor aqui."),
+        Hand(user_id=1, hand_id='2', raw_hand='', ai_analysis="Valor, valor, valor."),
+    ])
+    db.commit()
+    hand_ids, scores = zip(*service.search(db, 1, "valor"))
+    assert db.get(Hand, hand_ids[0]).hand_id == '2'
+    assert scores[0] > scores[1]
+
+
+def test_document_includes_players_and_local_verdict():
+    db = session()
+    hand_data = PokerStarsParser().parse_file(SHOVE)[0]
+    verdict = LocalAnalysisService().analyze_many([hand_data])[0]
+    hand = Hand(user_id=1, hand_id='icm', raw_hand=hand_data['raw_hand'], hero_position=hand_data['hero_position'],
+                hero_cards=hand_data['hero_cards'], hero_action=hand_data['hero_action'], **verdict.columns())
+    db.add(hand)
+    db.commit()
+    assert 'ICM' in search_document(hand)
+    assert _ids(db, "icm") == [hand.id]
+    assert _ids(db, "alpha") == [hand.id]  # Nome do vilão
+    assert _ids(db, "recomendação") == []  # Texto genérico da análise local fica de fora
+
+
+def test_search_endpoint_and_rebuild():
+    db = session()
+    hands = _populate(db)
+    ids = [hand.id for hand in hands]
+    user = db.get(User, 1)
+    response = asyncio.run(search_hands(q="overbet river", skip=0, limit=20, current_user=user, db=db))
+    assert [result['id'] for result in response['results']] == [ids[0]]
+    assert 'river' in response['results'][0]['snippet'].lower()
+
+    db.execute(text("DELETE FROM hand_search"))
+    db.commit()
+    assert _ids(db, "overbet") == []
+    assert service.rebuild(db) == 4
+    assert sorted(_ids(db, "overbet")) == ids[:2]
+
+
+if __name__ == "__main__":
+    test_query_terms_strip_syntax()
+    test_index_follows_inserts_updates_and_deletes()
+    test_ranking_prefers_repeated_terms()
+    test_document_includes_players_and_local_verdict()
+    test_search_endpoint_and_rebuild()
+    print("✅ Todos os testes da busca textual passaram")
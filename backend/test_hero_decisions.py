@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Teste da extração de decisões do herói (hero_decisions) e da textura do board
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.models.database import Base
+from app.models import user, hand, hand_action, gap, tournament, coach, subscription, hud_stats, opponent_profile, hero_decision
+from app.models.user import User
+from app.models.hand import Hand
+from app.models.hero_decision import HeroDecision
+from app.services.hero_decision_service import (
+    HeroDecisionService, POSITION_CODES, STREET_CODES, ACTION_CODES,
+    FACING_OPEN, FACING_BET, FACING_NONE
+)
+from app.utils.board_texture import board_texture, describe_texture, FLUSH_DRAW, PAIRED, STRAIGHT_POSSIBLE, FLUSH_POSSIBLE
+from app.utils.ranges import hand_class_index
+from testing_support import BB_DEFEND
+
+
+def test_board_texture():
+    code = board_texture('Ks 9h 2h')
+    assert code & FLUSH_DRAW and not code & PAIRED
+    assert describe_texture(code)['high_card'] == 'K'
+    assert board_texture('Ah 2h 3h') & (FLUSH_POSSIBLE | STRAIGHT_POSSIBLE) == FLUSH_POSSIBLE | STRAIGHT_POSSIBLE
+    assert board_texture('Ks 9h 2h 2c') & PAIRED
+    assert board_texture('') == 0
+
+
+def test_extract_decisions():
+    service = HeroDecisionService()
+    decisions = service.extract_decisions(service.parse_replay(BB_DEFEND))
+    assert len(decisions) == 5
+
+    preflop = decisions[0]
+    assert preflop['street'] == STREET_CODES['preflop']
+    assert preflop['position'] == POSITION_CODES['BB']
+    assert preflop['facing'] == FACING_OPEN
+    assert preflop['aggressor_position'] == POSITION_CODES['CO']
+    assert preflop['action'] == ACTION_CODES['call']
+    assert preflop['stack_bb10'] == 240 and preflop['to_call_bb10'] == 15
+    assert preflop['pot_bb10'] == 40 and preflop['players'] == 2
+    assert preflop['hand_class'] == hand_class_index('Kh Qh')
+
+    flop_check, flop_call = decisions[1], decisions[2]
+    assert flop_check['facing'] == FACING_NONE and flop_call['facing'] == FACING_BET
+    assert flop_call['board_texture'] == board_texture('Ks 9h 2h')
+    assert not flop_call['in_position']
+    assert decisions[4]['action'] == ACTION_CODES['bet'] and decisions[4]['amount_bb10'] == 50
+
+
+def test_spot_query_and_cascade():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    db.add(User(id=1, username='hero', email='hero@test.com', full_name='Hero', nickname='Hero', hashed_password='x'))
+    db_hand = Hand(user_id=1, hand_id='300', hero_name='Hero', raw_hand=BB_DEFEND)
+    db.add(db_hand)
+    assert HeroDecisionService().add_hand(db, db_hand) == 5
+    db.commit()
+
+    # "BB defendendo contra open do CO com 20-30 BB"
+    spot = db.query(HeroDecision).filter(
+        HeroDecision.user_id == 1,
+        HeroDecision.street == STREET_CODES['preflop'],
+        HeroDecision.position == POSITION_CODES['BB'],
+        HeroDecision.facing == FACING_OPEN,
+        HeroDecision.aggressor_position == POSITION_CODES['CO'],
+        HeroDecision.stack_bb10.between(200, 300)
+    ).all()
+    assert len(spot) == 1 and spot[0].hand_id == db_hand.id
+
+    db.delete(db_hand)
+    db.commit()
+    assert db.query(HeroDecision).count() == 0
+    db.close()
+
+
+if __name__ == "__main__":
+    test_board_texture()
+    test_extract_decisions()
+    test_spot_query_and_cascade()
+    print("✅ Todos os testes de decisões do herói passaram")
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Teste das estatísticas de HUD incrementais (VPIP, PFR, 3-bet, AF, WTSD, c-bet)
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.models.database import Base
+from app.models import user, hand, hand_action, gap, tournament, coach, subscription, hud_stats
+from app.models.user import User
+from app.services.hud_stats_service import HudStatsService
+
+HEADER = """PokerStars Hand #1: Tournament #2, $0.85+$0.15 USD Hold'em No Limit - Level I (10/20) - 2025/07/30 20:00:03 ET
+Table '2 1' 9-max Seat #1 is the button
+Seat 1: Alpha (1500 in chips)
+Seat 2: Bravo (1500 in chips)
+Seat 3: Hero (1500 in chips)
+Bravo: posts small blind 10
+Hero: posts big blind 20
+*** HOLE CARDS ***
+Dealt to Hero [Ah Kd]
+"""
+
+# Alpha abre, Hero 3-beta do BB, c-beta o flop, paga o turn e vai ao showdown
+THREE_BET_CBET = HEADER + """Alpha: raises 40 to 60
+Bravo: folds
+Hero: raises 140 to 200
+Alpha: calls 140
+*** FLOP *** [2c 7d Ts]
+Hero: bets 200
+Alpha: calls 200
+*** TURN *** [2c 7d Ts] [Jh]
+Hero: checks
+Alpha: bets 400
+Hero: calls 400
+*** RIVER *** [2c 7d Ts Jh] [3s]
+Hero: checks
+Alpha: checks
+*** SHOW DOWN ***
+Hero: shows [Ah Kd]
+*** SUMMARY ***"""
+
+# Alpha abre e Hero folda o BB
+FOLD_TO_OPEN = HEADER + """Alpha: raises 40 to 60
+Bravo: folds
+Hero: folds
+*** SUMMARY ***"""
+
+# Walk: todos foldam para o BB
+WALK = HEADER + """Alpha: folds
+Bravo: folds
+*** SUMMARY ***"""
+
+
+def _hand(raw_hand):
+    return {'raw_hand': raw_hand, 'hero_name': 'Hero', 'hero_position': 'BB'}
+
+
+def test_extract_counters():
+    service = HudStatsService()
+    counters = service.extract_counters(_hand(THREE_BET_CBET))
+    assert counters['vpip'] == 1 and counters['pfr'] == 1
+    assert counters['three_bet'] == 1 and counters['three_bet_opportunities'] == 1
+    assert counters['cbet'] == 1 and counters['cbet_opportunities'] == 1
+    assert counters['postflop_aggressive'] == 1 and counters['postflop_calls'] == 1
+    assert counters['saw_flop'] == 1 and counters['went_to_showdown'] == 1
+
+    counters = service.extract_counters(_hand(FOLD_TO_OPEN))
+    assert counters['hands'] == 1 and counters['vpip'] == 0
+    assert counters['three_bet_opportunities'] == 1 and counters['three_bet'] == 0
+
+    counters = service.extract_counters(_hand(WALK))
+    assert counters['hands'] == 1 and counters['vpip'] == 0 and counters['saw_flop'] == 0
+
+
+def test_incremental_panel():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    db.add(User(id=1, username='hero', email='hero@test.com', full_name='Hero', nickname='Hero', hashed_password='x'))
+    db.commit()
+
+    service = HudStatsService()
+    service.add_hands(db, 1, [_hand(THREE_BET_CBET), _hand(FOLD_TO_OPEN)])
+    db.commit()
+    service.add_hands(db, 1, [_hand(WALK), {**_hand(THREE_BET_CBET), 'hero_position': 'BTN'}])
+    db.commit()
+
+    panel = service.get_panel(db, 1)
+    assert panel['hands'] == 4
+    assert panel['stats']['vpip'] == 50.0
+    assert panel['stats']['three_bet'] == round(2 / 3 * 100, 1)
+    assert panel['stats']['wtsd'] == 100.0
+    assert panel['stats']['af'] == 1.0
+    assert [p['position'] for p in panel['positions']] == ['BB', 'BTN']
+    assert panel['positions'][0]['hands'] == 3
+
+    # Remoção de uma mão desfaz a contribuição
+    service.add_hands(db, 1, [_hand(WALK)], sign=-1)
+    db.commit()
+    assert service.get_panel(db, 1)['hands'] == 3
+    db.close()
+
+
+if __name__ == "__main__":
+    test_extract_counters()
+    test_incremental_panel()
+    print("✅ Todos os testes de HUD passaram")
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Teste da análise local em lote com vereditos em códigos compactos
+"""
+
+import sys
+import os
+import asyncio
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.models.hand import Hand
+from app.services.local_analysis_service import LocalAnalysisService
+from app.utils.local_verdicts import (
+    DECISION_CORRECT, DECISION_QUESTIONABLE, FIRST_ICM_DECISION, ICM_EXPLANATIONS, POSITION_EARLY_PASSIVE,
+    STACK_DEEP, STACK_PUSH_FOLD, STRENGTH_STRONG
+)
+from app.utils.poker_parser import PokerStarsParser
+from testing_support import SHOVE
+
+RAISE = {'hand_id': '1', 'hero_position': 'button', 'hero_cards': 'Ah Kd', 'hero_action': 'raise',
+         'hero_stack': 50, 'pot_size': 300.0, 'raw_hand': ''}
+LIMP = {'hand_id': '2', 'hero_position': 'utg', 'hero_cards': '7h 6d', 'hero_action': 'limp',
+        'hero_stack': 50, 'pot_size': 300.0, 'raw_hand': ''}
+
+
+def _hand(hand_data, verdict):
+    return Hand(hero_position=hand_data['hero_position'], hero_cards=hand_data['hero_cards'],
+                hero_action=hand_data['hero_action'], hero_stack=hand_data['hero_stack'],
+                pot_size=hand_data['pot_size'], **verdict.columns())
+
+
+def test_simple_rule_codes():
+    raise_verdict, limp_verdict = LocalAnalysisService().analyze_many([RAISE, LIMP])
+    assert (raise_verdict.stack, raise_verdict.strength, raise_verdict.decision) == (STACK_DEEP, STRENGTH_STRONG, DECISION_CORRECT)
+    assert (limp_verdict.position, limp_verdict.decision) == (POSITION_EARLY_PASSIVE, DECISION_QUESTIONABLE)
+    # Sem push/fold nada além dos códigos é gravado
+    assert raise_verdict.columns()['local_params'] is None
+    assert raise_verdict.push_fold is None
+
+
+def test_rendered_text_matches_service():
+    service = LocalAnalysisService()
+    text = asyncio.run(service.analyze_hand_locally(RAISE))
+    assert '📌 DIAGNÓSTICO: Decisão correta' in text
+    assert '👉 FORÇA DA MÃO: Mão forte pré-flop.' in text
+    assert _hand(RAISE, service.analyze_many([RAISE])[0]).local_analysis == text
+
+
+def test_push_fold_spot_keeps_params():
+    hand_data = PokerStarsParser().parse_file(SHOVE)[0]
+    service = LocalAnalysisService()
+    verdict = service.analyze_many([hand_data])[0]
+    assert verdict.stack == STACK_PUSH_FOLD
+    assert verdict.push_fold['spot'] == 'call_vs_shove'
+    # Mesa qualquer do torneio: prêmios desconhecidos, o ICM não decide o diagnóstico
+    assert verdict.decision < FIRST_ICM_DECISION
+    assert verdict.params['icm']['icm_applies'] is False
+
+    text = _hand(hand_data, verdict).local_analysis
+    assert text == verdict.render(hand_data)
+    assert f"Stack efetivo de {verdict.params['stack_bb']} BB" in text
+    assert '👉 ICM: Só referência, prêmios desconhecidos (mesa final presumida): Call' in text
+    assert 'mesa final.' not in text
+
+
+def test_icm_verdict_on_final_table():
+    hand_data = dict(PokerStarsParser().parse_file(SHOVE)[0], final_table=True)
+    verdict = LocalAnalysisService().analyze_many([hand_data])[0]
+    assert verdict.decision >= FIRST_ICM_DECISION
+    text = verdict.render(hand_data)
+    assert '👉 ICM: Call' in text and ICM_EXPLANATIONS['final_table'] in text
+
+
+def test_equity_memoized_per_hand_class():
+    service = LocalAnalysisService()
+    calls = []
+    calculate = service.equity_service.calculate_equity
+
+    def counting(*args, **kwargs):
+        calls.append(args)
+        return calculate(*args, **kwargs)
+
+    service.equity_service.calculate_equity = counting
+    hand_data = PokerStarsParser().parse_file(SHOVE)[0]
+    verdicts = service.analyze_many([hand_data, dict(hand_data), dict(hand_data)])
+    assert len(calls) == 1
+    assert len({verdict.decision for verdict in verdicts}) == 1
+
+
+def test_legacy_text_preserved():
+    hand = Hand(local_analysis_text="ANÁLISE LOCAL antiga")
+    assert hand.local_analysis == "ANÁLISE LOCAL antiga"
+    assert Hand().local_analysis is None
+
+
+if __name__ == "__main__":
+    test_simple_rule_codes()
+    test_rendered_text_matches_service()
+    test_push_fold_spot_keeps_params()
+    test_icm_verdict_on_final_table()
+    test_equity_memoized_per_hand_class()
+    test_legacy_text_preserved()
+    print("✅ Todos os testes da análise local em códigos passaram")
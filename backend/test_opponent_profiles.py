@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Teste do índice de oponentes incremental e da busca por prefixo
+"""
+
+import sys
+import os
+from datetime import datetime
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.models.database import Base
+from app.models import user, hand, hand_action, gap, tournament, coach, subscription, hud_stats, opponent_profile
+from app.models.user import User
+from app.services.opponent_service import OpponentService
+
+HEADER = """PokerStars Hand #{hand_id}: Tournament #2, $0.85+$0.15 USD Hold'em No Limit - Level I (10/20) - 2025/07/30 20:00:03 ET
+Table '2 1' 9-max Seat #1 is the button
+Seat 1: Alpha (1500 in chips)
+Seat 2: Bravo_99 (1500 in chips)
+Seat 3: Hero (1500 in chips)
+Bravo_99: posts small blind 10
+Hero: posts big blind 20
+*** HOLE CARDS ***
+Dealt to Hero [Ah Kd]
+"""
+
+# Alpha abre, Bravo_99 folda, Hero paga; Alpha c-beta e mostra no showdown
+SHOWDOWN = HEADER + """Alpha: raises 40 to 60
+Bravo_99: folds
+Hero: calls 40
+*** FLOP *** [2c 7d Ts]
+Hero: checks
+Alpha: bets 80
+Hero: calls 80
+*** TURN *** [2c 7d Ts] [Jh]
+Hero: checks
+Alpha: checks
+*** RIVER *** [2c 7d Ts Jh] [3s]
+Hero: checks
+Alpha: checks
+*** SHOW DOWN ***
+Alpha: shows [Qs Qh] (a pair of Queens)
+Hero: mucks hand
+*** SUMMARY ***"""
+
+# Bravo_99 completa o SB e Hero passa
+LIMP = HEADER + """Alpha: folds
+Bravo_99: calls 10
+Hero: checks
+*** FLOP *** [2c 7d Ts]
+Bravo_99: checks
+Hero: bets 20
+Bravo_99: folds
+*** SUMMARY ***"""
+
+
+def _hand(hand_id, raw_hand, day=1):
+    return {
+        'hand_id': str(hand_id),
+        'raw_hand': raw_hand.format(hand_id=hand_id),
+        'hero_name': 'Hero',
+        'hero_position': 'BB',
+        'date_played': datetime(2025, 7, day, 20, 0, 3),
+    }
+
+
+def _session():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    db.add(User(id=1, username='hero', email='hero@test.com', full_name='Hero', nickname='Hero', hashed_password='x'))
+    db.commit()
+    return db
+
+
+def test_opponent_counters():
+    db = _session()
+    service = OpponentService()
+    service.add_hands(db, 1, [_hand(1, SHOWDOWN), _hand(2, LIMP, day=2)])
+    db.commit()
+
+    alpha = service.get_profile(db, 1, 'Alpha')
+    assert alpha['hands'] == 2
+    assert alpha['counters']['vpip'] == 1 and alpha['counters']['pfr'] == 1
+    assert alpha['stats']['cbet'] == 100.0 and alpha['stats']['wtsd'] == 100.0
+    assert alpha['showdown_hands'][0]['cards'] == 'Qs Qh'
+    assert alpha['showdown_hands'][0]['hand_class'] == 'QQ'
+
+    bravo = service.get_profile(db, 1, 'Bravo_99')
+    assert bravo['hands'] == 2 and bravo['stats']['vpip'] == 50.0
+    assert bravo['last_seen'].startswith('2025-07-02')
+    # O herói não entra no próprio índice de oponentes
+    assert service.get_profile(db, 1, 'Hero') is None
+
+    # Remoção de uma mão desfaz a contribuição e a mão mostrada
+    service.add_hands(db, 1, [_hand(1, SHOWDOWN)], sign=-1)
+    db.commit()
+    alpha = service.get_profile(db, 1, 'Alpha')
+    assert alpha['hands'] == 1 and alpha['counters']['pfr'] == 0
+    assert alpha['showdown_hands'] == []
+    db.close()
+
+
+def test_prefix_search():
+    db = _session()
+    service = OpponentService()
+    service.add_hands(db, 1, [_hand(1, SHOWDOWN)])
+    db.commit()
+
+    assert [o['name'] for o in service.search(db, 1, 'al')] == ['Alpha']
+    assert [o['name'] for o in service.search(db, 1, 'BRAVO_')] == ['Bravo_99']
+    # Curingas do LIKE são tratados como texto
+    assert service.search(db, 1, '%') == []
+    assert service.search(db, 1, 'b_a') == []
+    assert [o['name'] for o in service.search(db, 1)] == ['Alpha', 'Bravo_99']
+    assert service.search(db, 1, min_hands=2) == []
+    assert service.search(db, 2) == []
+    db.close()
+
+
+if __name__ == "__main__":
+    test_opponent_counters()
+    test_prefix_search()
+    print("✅ Todos os testes do índice de oponentes passaram")
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Teste das estatísticas diárias de performance (tournament_daily_stats)
+mantidas de forma incremental
+"""
+
+import sys
+import os
+from datetime import datetime, timedelta
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.models.tournament import Tournament, TournamentDailyStats
+from app.services.performance_service import PerformanceAnalysisService, ROLLUP_EXTREMES, ROLLUP_SUMS
+from testing_support import session
+from benchmark_performance_stats import seed_tournaments
+
+WINDOWS = (7, 30, 90, 365)
+
+
+def _rows(db):
+    return {
+        row.day: tuple(round(getattr(row, key), 6) if getattr(row, key) is not None else None
+                       for key in ROLLUP_SUMS + ROLLUP_EXTREMES)
+        for row in db.query(TournamentDailyStats).filter(TournamentDailyStats.user_id == 1)
+    }
+
+
+def test_incremental_matches_rebuild():
+    db = session()
+    service = PerformanceAnalysisService()
+    seed_tournaments(db, 1, 400, days=40)
+    tournaments = db.query(Tournament).order_by(Tournament.id).all()
+    for start in range(0, len(tournaments), 50):
+        service.record_tournaments(db, tournaments[start:start + 50])
+        db.commit()
+    incremental = _rows(db)
+
+    assert service.rebuild_daily_stats(db, 1) == len(incremental)
+    assert _rows(db) == incremental
+    assert len(incremental) <= 41
+
+
+def test_rollup_windows_match_exact_query():
+    db = session()
+    service = PerformanceAnalysisService()
+    seed_tournaments(db, 1, 800, days=400)
+    # Janelas dos rollups são alinhadas ao dia: sem torneios nos dias de corte
+    today = datetime.utcnow().date()
+    for days in WINDOWS:
+        start = datetime.combine(today - timedelta(days=days), datetime.min.time())
+        db.query(Tournament).filter(Tournament.date_played >= start,
+                                    Tournament.date_played < start + timedelta(days=1)).delete()
+    db.commit()
+    service.rebuild_daily_stats(db)
+
+    assert service.rollup_windows(db, 1, WINDOWS) == service.calculate_performance_windows(db, 1, WINDOWS)
+
+
+def test_update_tournament_refreshes_affected_days():
+    db = session()
+    service = PerformanceAnalysisService()
+    now = datetime.utcnow()
+    busted = service.add_tournament_result(db, 1, dict(tournament_id='1', buy_in=50.0, prize=0.0, position=80,
+                                                       date_played=now - timedelta(days=2)))
+    service.add_tournament_result(db, 1, dict(tournament_id='2', buy_in=10.0, prize=0.0, position=40,
+                                              date_played=now - timedelta(days=2)))
+    assert service.calculate_performance_stats(db, 1, 7)['biggest_loss'] == 50.0
+
+    # Resultado corrigido: passa a ser ITM e muda de dia
+    service.update_tournament_result(db, 1, busted.id, {'prize': 120.0, 'position': 3,
+                                                        'date_played': now - timedelta(days=1)})
+    stats = service.calculate_performance_stats(db, 1, 7)
+    assert (stats['tournaments_played'], stats['itm_count']) == (2, 1)
+    assert (stats['biggest_loss'], stats['biggest_win']) == (10.0, 120.0)
+    assert (stats['best_finish'], stats['worst_finish']) == (3, 40)
+    assert len(_rows(db)) == 2
+    assert service.update_tournament_result(db, 2, busted.id, {'prize': 0.0}) is None
+
+
+if __name__ == "__main__":
+    test_incremental_matches_rebuild()
+    test_rollup_windows_match_exact_query()
+    test_update_tournament_refreshes_affected_days()
+    print("✅ Todos os testes das estatísticas diárias passaram")
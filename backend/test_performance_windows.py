@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Teste das estatísticas de performance por janela em uma única consulta
+"""
+
+import sys
+import os
+from datetime import datetime, timedelta
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy.dialects import mssql
+
+from app.services.performance_service import PerformanceAnalysisService
+from testing_support import session
+from benchmark_performance_stats import legacy_performance_stats, seed_tournaments
+
+
+def test_windows_match_legacy_calculation():
+    db = session()
+    seed_tournaments(db, 1, 600, days=120)
+    windows = PerformanceAnalysisService().calculate_performance_windows(db, 1, (7, 30, 90))
+    for days in (7, 30, 90):
+        assert windows[days] == legacy_performance_stats(db, 1, days)
+        assert windows[days]['period_days'] == days
+
+
+def test_single_window_edge_cases():
+    db = session()
+    service = PerformanceAnalysisService()
+    assert service.calculate_performance_stats(db, 1, 7) == service._empty_stats()
+
+    # Todos no ITM (sem perdas) e posições nulas/zero ignoradas
+    now = datetime.utcnow()
+    for i, position in enumerate([None, 0, 3, 9]):
+        service.add_tournament_result(db, 1, dict(tournament_id=str(i), buy_in=10.0, prize=25.0, position=position,
+                                                  date_played=now - timedelta(days=i + 1)))
+    service.add_tournament_result(db, 1, dict(tournament_id='old', buy_in=10.0, prize=0.0, position=1,
+                                              date_played=now - timedelta(days=60)))
+
+    for stats in (service.calculate_performance_stats(db, 1, 30), service.calculate_performance_windows(db, 1, (30,))[30]):
+        assert stats['tournaments_played'] == 4
+        assert stats['biggest_loss'] == 0
+        assert (stats['best_finish'], stats['worst_finish'], stats['avg_finish_position']) == (3, 9, 6.0)
+        assert stats['itm_percentage'] == 100.0
+    assert service.calculate_performance_windows(db, 1, (30, 90))[90]['biggest_loss'] == 10.0
+    assert service.rollup_windows(db, 1, (30, 90))[90]['biggest_loss'] == 10.0
+
+
+def test_windows_query_compiles_for_sql_server():
+    db = session()
+    captured = []
+    query = db.query
+
+    def capturing(*columns):
+        captured.append(query(*columns))
+        return captured[-1]
+
+    db.query = capturing
+    PerformanceAnalysisService().calculate_performance_windows(db, 1, (7,))
+    sql = str(captured[0].statement.compile(dialect=mssql.dialect()))
+    assert ' IS 1' not in sql
+    # Média de posição em ponto flutuante (AVG de inteiro trunca no SQL Server)
+    assert 'avg(CASE' in sql and 'CAST(tournaments.position AS FLOAT)' in sql
+
+
+if __name__ == "__main__":
+    test_windows_match_legacy_calculation()
+    test_single_window_edge_cases()
+    test_windows_query_compiles_for_sql_server()
+    print("✅ Todos os testes das janelas de performance passaram")
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Teste da reconstrução de pote, valor a pagar, SPR e side pots por ação
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.utils.advanced_poker_parser import AdvancedPokerParser, parse_hand_for_table_replay
+from app.utils.pot_reconstruction import reconstruct_pots, PotTracker
+
+MULTIWAY_ALL_IN = """PokerStars Hand #100: Tournament #200, $0.85+$0.15 USD Hold'em No Limit - Level V (100/200) - 2025/07/30 20:00:03 ET
+Table '200 1' 9-max Seat #1 is the button
+Seat 1: Alpha (1000 in chips)
+Seat 2: Bravo (3000 in chips)
+Seat 3: Charlie (5000 in chips)
+Alpha: posts the ante 50
+Bravo: posts the ante 50
+Charlie: posts the ante 50
+Bravo: posts small blind 100
+Charlie: posts big blind 200
+*** HOLE CARDS ***
+Dealt to Alpha [Ah Ad]
+Alpha: raises 750 to 950 and is all-in
+Bravo: raises 2000 to 2950 and is all-in
+Charlie: calls 2750
+*** FLOP *** [2c 7d Ts]
+*** TURN *** [2c 7d Ts] [Jh]
+*** RIVER *** [2c 7d Ts Jh] [3s]
+*** SHOW DOWN ***
+*** SUMMARY ***
+Total pot 7150 Main pot 3000. Side pot 4150. | Rake 0"""
+
+UNCALLED_BET = """PokerStars Hand #101: Tournament #200, $0.85+$0.15 USD Hold'em No Limit - Level V (100/200) - 2025/07/30 20:01:03 ET
+Table '200 1' 9-max Seat #1 is the button
+Seat 1: Alpha (4000 in chips)
+Seat 2: Bravo (3000 in chips)
+Bravo: posts small blind 100
+Alpha: posts big blind 200
+*** HOLE CARDS ***
+Dealt to Alpha [Kh Qd]
+Bravo: calls 100
+Alpha: checks
+*** FLOP *** [2c 7d Ts]
+Bravo: checks
+Alpha: bets 300
+Bravo: folds
+Uncalled bet (300) returned to Alpha
+Alpha collected 400 from pot
+*** SUMMARY ***
+Total pot 400 | Rake 0"""
+
+
+def _states(hand_text):
+    replay = AdvancedPokerParser().parse_hand_for_replay(hand_text)
+    return replay, reconstruct_pots(replay)
+
+
+def test_multiway_all_in_side_pots():
+    replay, states = _states(MULTIWAY_ALL_IN)
+    assert replay.blinds['ante'] == 50
+    assert [a.action_type for a in replay.forced_bets] == ['ante', 'ante', 'ante', 'small_blind', 'big_blind']
+
+    alpha, bravo, charlie = states[0][1], states[1][1], states[2][1]
+    assert alpha.pot_before == 450 and alpha.to_call == 200
+    assert alpha.effective_stack == 950 and alpha.spr == round(950 / 450, 3)
+    assert alpha.is_all_in and states[0][0].is_all_in
+
+    assert bravo.pot_before == 1400 and bravo.to_call == 850
+    assert bravo.effective_stack == 2850
+    assert charlie.pot_before == 4250 and charlie.to_call == 2750
+    assert not charlie.is_all_in
+    # Charlie ainda pode pagar: disputa os dois potes já formados pelos all-ins
+    assert [pot['eligible'] for pot in charlie.side_pots] == [['Alpha', 'Bravo', 'Charlie'], ['Bravo', 'Charlie']]
+
+    # Depois de todas as ações: pote principal de 3000 (antes incluídas) e side pot de 4000
+    tracker = PotTracker({'Alpha': 1000, 'Bravo': 3000, 'Charlie': 5000})
+    for action in replay.forced_bets + replay.streets[0].actions:
+        tracker.apply(action)
+    pots = tracker.side_pots()
+    assert pots[0] == {'amount': 3000, 'eligible': ['Alpha', 'Bravo', 'Charlie']}
+    assert pots[1] == {'amount': 4000, 'eligible': ['Bravo', 'Charlie']}
+    assert tracker.pot == 7000
+
+
+def test_uncalled_bet_is_returned():
+    replay, states = _states(UNCALLED_BET)
+    by_type = [(a.player, a.action_type, s) for a, s in states]
+    bet = next(s for p, t, s in by_type if t == 'bet')
+    assert bet.pot_before == 400 and bet.to_call == 0
+    assert bet.effective_stack == 2800 and bet.spr == 7.0
+
+    fold = next(s for p, t, s in by_type if t == 'fold')
+    assert fold.pot_before == 700 and fold.to_call == 300
+
+    # Depois da devolução, o pote volta a 400
+    collected = next(s for p, t, s in by_type if t == 'collected')
+    assert collected.pot_before == 400
+
+
+def test_uncalled_bet_stays_out_of_replay():
+    replay, states = _states(UNCALLED_BET)
+    assert all(a.action_type != 'uncalled_bet' for a, _ in states)
+    assert all(a.action_type != 'uncalled_bet' for street in replay.streets for a in street.actions)
+    assert [r.player for street in replay.streets for r in street.refunds] == ['Alpha']
+
+    # O frontend soma ao pote cada valor das ações do replay
+    table_replay = parse_hand_for_table_replay(UNCALLED_BET)
+    action_types = [a['action'] for street in table_replay['streets'] for a in street['actions']]
+    assert 'uncalled_bet' not in action_types
+    assert 'bet' in action_types and 'fold' in action_types
+
+
+if __name__ == "__main__":
+    test_multiway_all_in_side_pots()
+    test_uncalled_bet_is_returned()
+    test_uncalled_bet_stays_out_of_replay()
+    print("✅ Todos os testes de reconstrução de pote passaram")
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Teste da representação de ranges pré-flop (169 classes / 1326 combos)
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+import pytest
+
+from app.utils.ranges import Range, hand_class, CLASS_NAMES
+
+
+def test_combo_counts():
+    assert len(Range.parse('random')) == 1326
+    assert len(Range.parse('22+')) == 78
+    assert len(Range.parse('A2s+')) == 48
+    assert len(Range.parse('KTo+')) == 36
+    assert len(Range.parse('AK')) == 16
+    assert len(Range.parse('77-55')) == 18
+    assert len(Range.parse('A5s-A2s')) == 16
+    assert len(Range.parse('AhKd, AsKs')) == 2
+    assert len(CLASS_NAMES) == 169
+
+
+def test_membership_and_classes():
+    shove = Range.parse('22+, A2s+, KTo+')
+    assert 'Ah Kh' in shove
+    assert 'Ah Kd' not in shove
+    assert ['Ks', 'Td'] in shove
+    assert 'A5s' in shove
+    assert 'K9o' not in shove
+    assert '7c 2d' not in shove
+    assert hand_class('Ah Kd') == 'AKo'
+    assert hand_class('Td Th') == 'TT'
+    assert hand_class('5s As') == 'A5s'
+    assert Range.parse('JJ+, AQ+').hand_classes() == sorted(
+        ['JJ', 'QQ', 'KK', 'AA', 'AKs', 'AKo', 'AQs', 'AQo'], key=CLASS_NAMES.index
+    )
+
+
+def test_set_operations():
+    pairs = Range.parse('22+')
+    premium = Range.parse('TT+, AK')
+    assert len(pairs | premium) == 78 + 16
+    assert (pairs & premium) == Range.parse('TT+')
+    assert len(pairs - premium) == 78 - 30
+    assert len(~pairs) == 1326 - 78
+    # Mesma notação em outra forma gera o mesmo range (chave de cache)
+    assert Range.parse('AKs, AKo') == Range.parse('AK')
+    assert hash(Range.parse('AKs, AKo')) == hash(Range.parse('AK'))
+
+
+def test_card_removal():
+    assert Range.parse('AA').count_combos('Ah Kd') == 3
+    assert Range.parse('AK').count_combos('Ah Kd') == 9
+    assert Range.parse('random').count_combos(['Ah', 'Kd', '2c', '7s', 'Td']) == 1081
+    assert Range.parse('KK').combos('Ks Kh Kd').shape == (0, 2)
+
+
+def test_invalid_notation():
+    with pytest.raises(ValueError):
+        Range.parse('AXs')
+    with pytest.raises(ValueError):
+        Range.parse('AKs-QJs')
+    with pytest.raises(ValueError):
+        Range.parse('')
+
+
+def test_mask_is_copied():
+    mask = np.zeros(1326, dtype=bool)
+    frozen = Range(mask)
+    mask[0] = True  # O array de quem chamou continua gravável
+    assert len(frozen) == 0
+    assert not frozen.mask.flags.writeable
+
+
+if __name__ == "__main__":
+    test_combo_counts()
+    test_membership_and_classes()
+    test_set_operations()
+    test_card_removal()
+    test_invalid_notation()
+    test_mask_is_copied()
+    print("✅ Todos os testes de ranges passaram")
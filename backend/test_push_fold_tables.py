@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Teste das tabelas pré-calculadas de push/fold
+"""
+
+import sys
+import os
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.services.push_fold_service import (
+    PushFoldService, load_push_fold_tables, SHOVE_CHART, CALL_CHART, TABLE_SHAPE
+)
+
+
+HAND_TEMPLATE = """PokerStars Hand #1: Tournament #2, $0.85+$0.15 USD Hold'em No Limit - Level X (200/400) - 2025/07/30 20:00:03 ET
+Table '2 1' 9-max Seat #1 is the button
+Seat 1: Alpha (20000 in chips)
+Seat 2: Bravo (6000 in chips)
+Seat 3: Charlie (9000 in chips)
+Seat 4: Hero (3200 in chips)
+Alpha: posts the ante 50
+Bravo: posts the ante 50
+Charlie: posts the ante 50
+Hero: posts the ante 50
+Bravo: posts small blind 200
+Charlie: posts big blind 400
+*** HOLE CARDS ***
+Dealt to Hero [{cards}]
+{actions}
+*** SUMMARY ***"""
+
+
+def _hand(cards, actions, hero='Hero'):
+    template = HAND_TEMPLATE
+    if hero != 'Hero':
+        # Troca os assentos: o herói passa a ocupar o lugar de `hero`
+        template = template.replace('Hero', '@').replace(hero, 'Hero').replace('@', hero)
+    return {'raw_hand': template.format(cards=cards, actions=actions), 'hero_name': 'Hero', 'hero_cards': cards}
+
+
+def test_tables_shape_and_sanity():
+    tables = load_push_fold_tables()
+    assert tables is not None and tables.shape == TABLE_SHAPE
+    service = PushFoldService()
+    # AA é shove e call em toda a grade
+    assert tables[:, :, :, :, 168].all()
+    # Heads-up 10 BB sem ante: shove ~58% e call ~37% das mãos (Nash)
+    assert 50 < service.chart_range(SHOVE_CHART, 10, 1, 0.0).percentage() < 66
+    assert 30 < service.chart_range(CALL_CHART, 10, 1, 0.0).percentage() < 45
+    # Ranges mais largos com stacks menores e em posições finais
+    assert service.chart_range(SHOVE_CHART, 5, 1, 0.125).percentage() > service.chart_range(SHOVE_CHART, 15, 1, 0.125).percentage()
+    assert service.chart_range(SHOVE_CHART, 10, 2, 0.125).percentage() > service.chart_range(SHOVE_CHART, 10, 8, 0.125).percentage()
+    assert service.in_chart(SHOVE_CHART, 'Ah Kd', 12, 8, 0.125)
+    assert not service.in_chart(SHOVE_CHART, '7c 2d', 15, 8, 0.125)
+
+
+def test_classify_hero_decisions():
+    service = PushFoldService()
+    # Hero é o primeiro a agir com 8 BB (3 jogadores atrás) e folda AKo: fora da tabela
+    spot = service.classify_decision(_hand('Ah Kd', 'Hero: folds'))
+    assert spot['spot'] == 'open_shove'
+    assert spot['players_behind'] == 3
+    assert spot['decision'] == 'fold' and spot['in_chart'] is False
+    assert spot['stack_bb'] == 8.0
+
+    spot = service.classify_decision(_hand('Ah Kd', 'Hero: raises 2750 to 3150 and is all-in'))
+    assert spot['decision'] == 'shove' and spot['in_chart'] is True
+
+    spot = service.classify_decision(_hand('7c 2d', 'Hero: raises 2750 to 3150 and is all-in'))
+    assert spot['in_chart'] is False and spot['chart_action'] == 'fold'
+
+    # Hero no BB pagando o all-in de 8 BB do primeiro a agir
+    shove = 'Charlie: raises 2750 to 3150 and is all-in\nAlpha: folds\nBravo: folds\n'
+    spot = service.classify_decision(_hand('Ah Kd', shove + 'Hero: calls 2750', hero='Charlie'))
+    assert spot['spot'] == 'call_vs_shove' and spot['players_behind'] == 3
+    assert spot['decision'] == 'call' and spot['in_chart'] is True
+    spot = service.classify_decision(_hand('7c 2d', shove + 'Hero: calls 2750', hero='Charlie'))
+    assert spot['in_chart'] is False
+
+    # Limp do herói não é decisão de push/fold
+    assert service.classify_decision(_hand('Ah Kd', 'Hero: calls 400')) is None
+
+
+def test_lookup_latency():
+    service = PushFoldService()
+    start = time.time()
+    for _ in range(10000):
+        service.in_chart(SHOVE_CHART, 'Qs Jd', 9, 4, 0.125)
+    assert time.time() - start < 1.0
+
+
+if __name__ == "__main__":
+    test_tables_shape_and_sanity()
+    test_classify_hero_decisions()
+    test_lookup_latency()
+    print("✅ Todos os testes de push/fold passaram")
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Teste do gráfico de ROI: acumulados por função de janela no SQL e redução LTTB
+"""
+
+import sys
+import os
+from datetime import datetime, timedelta
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+
+from app.services.performance_service import PerformanceAnalysisService
+from app.utils.downsampling import lttb_indices
+from testing_support import session
+from benchmark_performance_stats import legacy_roi_chart, seed_tournaments
+
+
+def test_lttb_keeps_endpoints_and_spikes():
+    ys = [0.0] * 200
+    ys[57], ys[140] = 50.0, -40.0
+    indices = lttb_indices(range(200), ys, 20)
+    assert len(indices) == 20
+    assert indices[0] == 0 and indices[-1] == 199
+    assert indices == sorted(set(indices))
+    assert 57 in indices and 140 in indices
+    assert lttb_indices(range(10), ys[:10], 50) == list(range(10))
+
+
+def test_lttb_preserves_curve_shape():
+    xs = np.arange(2000)
+    ys = np.sin(xs / 150) * 100
+    indices = lttb_indices(xs, ys, 100)
+    sampled = ys[indices]
+    assert sampled.max() > 99 and sampled.min() < -99
+    # Interpolando os pontos mantidos a curva original é reconstruída
+    assert np.abs(np.interp(xs, xs[indices], sampled) - ys).max() < 2
+
+
+def test_chart_matches_cumulative_loop():
+    db = session()
+    seed_tournaments(db, 1, 500, days=60)
+    service = PerformanceAnalysisService()
+    assert service.get_roi_chart_data(db, 1, 90) == legacy_roi_chart(db, 1, 90)
+    assert service.get_roi_chart_data(db, 2, 90) == []
+
+
+def test_chart_downsampled_to_max_points():
+    db = session()
+    seed_tournaments(db, 1, 500, days=60)
+    service = PerformanceAnalysisService()
+    full = service.get_roi_chart_data(db, 1, 90)
+    chart = service.get_roi_chart_data(db, 1, 90, max_points=40)
+    assert len(chart) == 40
+    assert chart[0] == full[0] and chart[-1] == full[-1]
+    assert all(point == full[point['tournaments'] - 1] for point in chart)
+    # Maior lucro acumulado (pico da curva) sobrevive à redução
+    peak = max(full, key=lambda point: point['profit'])
+    assert peak in chart
+
+
+if __name__ == "__main__":
+    test_lttb_keeps_endpoints_and_spikes()
+    test_lttb_preserves_curve_shape()
+    test_chart_matches_cumulative_loop()
+    test_chart_downsampled_to_max_points()
+    print("✅ Todos os testes do gráfico de ROI passaram")
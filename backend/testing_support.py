@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Apoio comum dos testes: banco SQLite em memória com o usuário 1,
+decisões/mãos de exemplo e mãos do PokerStars usadas em vários arquivos
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.models.database import Base
+from app.models import user, hand, hand_action, gap, tournament, coach, subscription, hud_stats, opponent_profile, hero_decision
+from app.models.user import User
+from app.models.hand import Hand
+from app.models.hero_decision import HeroDecision
+from app.services.hero_decision_service import ACTION_CODES, POSITION_CODES, STREET_CODES
+
+# Filtros do histórico todos desligados (parâmetros de _hand_filters)
+NO_FILTERS = dict(gap_filter=None, position_filter=None, action_filter=None, date_from=None, date_to=None,
+                  hand_range=None, suited=None, flop_texture=None, flop_high=None, board_contains=None)
+
+# Textos de análise da IA: ok, gap, erro, gap + erro e sem análise
+ANALYSES = [
+    "Ótima linha, nada a corrigir.",
+    "Há um GAP de agressividade no flop.",
+    "Erro: call muito largo.",
+    "Classic mistake and a gap in range.",
+    None,
+]
+
+
+# CO abre, Hero defende o BB com 24 BB atrás e paga a c-bet no flop
+BB_DEFEND = """PokerStars Hand #300: Tournament #400, $0.85+$0.15 USD Hold'em No Limit - Level V (100/200) - 2025/07/30 20:00:03 ET
+Table '400 1' 6-max Seat #5 is the button
+Seat 1: Hero (5000 in chips)
+Seat 2: Alpha (8000 in chips)
+Seat 3: Bravo (8000 in chips)
+Seat 4: Charlie (8000 in chips)
+Seat 5: Delta (8000 in chips)
+Seat 6: Echo (8000 in chips)
+Echo: posts small blind 100
+Hero: posts big blind 200
+*** HOLE CARDS ***
+Dealt to Hero [Kh Qh]
+Alpha: folds
+Bravo: folds
+Charlie: raises 300 to 500
+Delta: folds
+Echo: folds
+Hero: calls 300
+*** FLOP *** [Ks 9h 2h]
+Hero: checks
+Charlie: bets 600
+Hero: calls 600
+*** TURN *** [Ks 9h 2h] [2c]
+Hero: checks
+Charlie: checks
+*** RIVER *** [Ks 9h 2h 2c] [5d]
+Hero: bets 1000
+Charlie: folds
+Uncalled bet (1000) returned to Hero
+Hero collected 2500 from pot
+*** SUMMARY ***
+Total pot 2500 | Rake 0"""
+
+# 3 jogadores, 10 BB: BTN dá shove, Hero paga no BB, board corre sem ações
+SHOVE = """PokerStars Hand #301: Tournament #400, $0.85+$0.15 USD Hold'em No Limit - Level V (100/200) - 2025/07/30 20:05:00 ET
+Table '400 1' 6-max Seat #2 is the button
+Seat 1: Hero (2000 in chips)
+Seat 2: Alpha (3000 in chips)
+Seat 3: Bravo (5000 in chips)
+Hero: posts the ante 20
+Alpha: posts the ante 20
+Bravo: posts the ante 20
+Bravo: posts small blind 100
+Hero: posts big blind 200
+*** HOLE CARDS ***
+Dealt to Hero [Ah 9h]
+Alpha: raises 2780 to 2980 and is all-in
+Bravo: folds
+Hero: calls 1780 and is all-in
+Uncalled bet (1000) returned to Alpha
+*** FLOP *** [2c 7d Ts]
+*** TURN *** [2c 7d Ts] [Kd]
+*** RIVER *** [2c 7d Ts Kd] [3s]
+*** SHOW DOWN ***
+Hero: shows [Ah 9h] (high card Ace)
+Alpha: shows [Qc Jc] (high card King)
+Hero collected 4160 from pot
+*** SUMMARY ***
+Total pot 4160 | Rake 0"""
+
+
+def session():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    db.add(User(id=1, username='hero', email='hero@test.com', full_name='Hero', nickname='Hero', hashed_password='x'))
+    db.commit()
+    return db
+
+
+def decision(order, street, position, facing, action, **extra):
+    return dict(
+        decision_order=order, street=STREET_CODES[street], position=POSITION_CODES[position],
+        stack_bb10=extra.get('stack_bb10', 300), pot_bb10=25, to_call_bb10=extra.get('to_call_bb10', 0),
+        players=2, facing=facing, aggressor_position=extra.get('aggressor_position'),
+        in_position=extra.get('in_position', False), action=ACTION_CODES[action]
+    )
+
+
+def add_hand(db, number, decisions):
+    db_hand = Hand(user_id=1, hand_id=str(number), hero_name='Hero')
+    db.add(db_hand)
+    db.add_all(HeroDecision(user_id=1, hand=db_hand, **columns) for columns in decisions)
+    return db_hand
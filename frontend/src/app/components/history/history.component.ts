@@ -25,11 +25,21 @@ interface Hand {
   created_at: string;
 }
 
+interface FacetCount {
+  value: string;
+  count: number;
+}
+
 interface FilterOptions {
   positions: string[];
   actions: string[];
   gap_options: Array<{value: string, label: string}>;
   order_options: Array<{value: string, label: string}>;
+  facets?: {
+    positions: FacetCount[];
+    actions: FacetCount[];
+    gap_status: FacetCount[];
+  };
 }
 
 interface HandReplay {
@@ -83,6 +93,9 @@ export class HistoryComponent implements OnInit {
   currentPage = 1;
   pageSize = 20;
   totalPages = 0;
+  // Cursor (keyset) de cada página já alcançada: próxima/anterior seguem o cursor,
+  // skip fica só para saltos a páginas ainda não visitadas
+  private pageCursors: { [page: number]: string } = {};
 
   // Filtros
   filters = {
@@ -141,19 +154,32 @@ export class HistoryComponent implements OnInit {
     }
   }
 
+  // Rótulo do filtro com a quantidade de mãos (facetas)
+  facetLabel(label: string, dimension: 'positions' | 'actions' | 'gap_status', value: string): string {
+    const facet = this.filterOptions.facets?.[dimension]?.find(item => item.value === value);
+    return facet ? `${label} (${facet.count})` : label;
+  }
+
   async loadHands() {
     this.loading = true;
     try {
-      const skip = (this.currentPage - 1) * this.pageSize;
-      
-      // Carregar mãos
-      this.apiService.getMyHands({
-        skip,
+      const pageNumber = this.currentPage;
+      const cursor = this.pageCursors[pageNumber];
+      const position = cursor ? { cursor } : { skip: (pageNumber - 1) * this.pageSize };
+
+      // Carregar mãos e contagem total em uma requisição
+      this.apiService.getMyHandsPage({
+        ...position,
         limit: this.pageSize,
         ...this.filters
       }).subscribe({
-        next: (hands) => {
-          this.hands = hands;
+        next: (page) => {
+          this.hands = page.hands;
+          this.totalHands = page.total;
+          this.totalPages = Math.ceil(this.totalHands / this.pageSize);
+          if (page.next_cursor) {
+            this.pageCursors[pageNumber + 1] = page.next_cursor;
+          }
         },
         error: (error) => {
           console.error('Erro ao carregar histórico:', error);
@@ -161,17 +187,6 @@ export class HistoryComponent implements OnInit {
         }
       });
 
-      // Carregar contagem total
-      this.apiService.getMyHandsCount(this.filters).subscribe({
-        next: (countResponse) => {
-          this.totalHands = countResponse.total;
-          this.totalPages = Math.ceil(this.totalHands / this.pageSize);
-        },
-        error: (error) => {
-          console.error('Erro ao carregar contagem:', error);
-        }
-      });
-
     } catch (error) {
       console.error('Erro ao carregar histórico:', error);
       this.notificationService.error('Erro ao carregar histórico de mãos');
@@ -182,6 +197,7 @@ export class HistoryComponent implements OnInit {
 
   onFilterChange() {
     this.currentPage = 1;
+    this.pageCursors = {};
     this.loadHands();
   }
 
@@ -122,6 +122,20 @@ export class ApiService {
       .pipe(catchError(this.handleError));
   }
 
+  // Página do histórico com o total filtrado (uma requisição)
+  getMyHandsPage(params: any): Observable<{hands: Hand[], total: number, next_cursor?: string}> {
+    const queryParams = new URLSearchParams();
+    
+    Object.keys(params).forEach(key => {
+      if (params[key] !== null && params[key] !== undefined && params[key] !== '') {
+        queryParams.append(key, params[key].toString());
+      }
+    });
+
+    return this.http.get<{hands: Hand[], total: number, next_cursor?: string}>(`${this.apiUrl}/hands/history/my-hands/page?${queryParams}`)
+      .pipe(catchError(this.handleError));
+  }
+
   // Opções de filtros
   getFilterOptions(): Observable<any> {
     return this.http.get(`${this.apiUrl}/hands/history/filters/options`)